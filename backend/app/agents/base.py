@@ -3,8 +3,8 @@ BaseAgent class and AgentOutput dataclass for JobPilot agent framework.
 
 Every agent inherits from BaseAgent and overrides ``execute()``.  The ``run()``
 entry point handles the full lifecycle: brake check, execute, record output
-to the database, record an activity feed entry, and publish a real-time
-WebSocket event via Redis pub/sub.
+to the database, record an activity feed entry, update the running briefing
+digest, and publish a real-time WebSocket event via Redis pub/sub.
 
 Langfuse ``@observe()`` is applied to ``run()`` for automatic tracing.
 Celery tasks that invoke agents must create an explicit Langfuse trace at task
@@ -83,7 +83,8 @@ class BaseAgent:
         2. ``execute()`` -- abstract, subclasses override with agent-specific logic
         3. ``_record_output()`` -- persists to ``agent_outputs`` table
         4. ``_record_activity()`` -- persists to ``agent_activities`` table
-        5. ``_publish_event()`` -- pushes to Redis pub/sub for WebSocket clients
+        5. ``_update_briefing_digest()`` -- folds the result into the daily digest
+        6. ``_publish_event()`` -- pushes to Redis pub/sub for WebSocket clients
 
     Class attributes:
         agent_type: Identifier string (e.g. ``"job_scout"``, ``"resume"``).
@@ -123,6 +124,11 @@ class BaseAgent:
         except Exception as exc:
             logger.error("Failed to record activity for user=%s: %s", user_id, exc)
 
+        try:
+            await self._update_briefing_digest(user_id, output)
+        except Exception as exc:
+            logger.error("Failed to update briefing digest for user=%s: %s", user_id, exc)
+
         try:
             await self._publish_event(user_id, output)
         except Exception as exc:
@@ -177,6 +183,12 @@ class BaseAgent:
             session.add(activity)
             await session.commit()
 
+    async def _update_briefing_digest(self, user_id: str, output: AgentOutput) -> None:
+        """Fold this run's output into the user's running briefing digest."""
+        from app.agents.briefing.digest import record_agent_output
+
+        await record_agent_output(user_id, self.agent_type, output.to_dict())
+
     async def _publish_event(self, user_id: str, output: AgentOutput) -> None:
         """Push a real-time update via Redis pub/sub for WebSocket clients."""
         import redis.asyncio as aioredis
@@ -244,6 +256,10 @@ class BaseAgent:
             session.add(item)
             await session.commit()
 
+        from app.agents.briefing.digest import refresh_pending_approvals
+
+        await refresh_pending_approvals(user_id)
+
         # Publish approval event for WebSocket
         try:
             r = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
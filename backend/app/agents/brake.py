@@ -13,6 +13,7 @@ State is stored in Redis:
 Functions:
     - ``check_brake(user_id)`` -- returns True if brake is active
     - ``check_brake_or_raise(user_id)`` -- raises BrakeActive if braked
+    - ``paused_users(user_ids)`` -- the braked subset of many users (one MGET)
     - ``activate_brake(user_id)`` -- sets brake, publishes event, schedules verification
     - ``resume_agents(user_id)`` -- clears brake, publishes event
     - ``get_brake_state(user_id)`` -- returns current state dict
@@ -26,6 +27,7 @@ import json
 import logging
 import uuid
 from datetime import datetime, timezone
+from typing import Iterable
 
 logger = logging.getLogger(__name__)
 
@@ -91,6 +93,23 @@ async def check_brake_or_raise(user_id: str) -> None:
         raise BrakeActive(f"Emergency brake active for {user_id}")
 
 
+async def paused_users(user_ids: Iterable[str]) -> set[str]:
+    """Return the subset of ``user_ids`` whose emergency brake is active.
+
+    For bulk writers (e.g. reverse matching) that act for many users at
+    once; a single Redis MGET regardless of how many users are checked.
+    """
+    ids = list(dict.fromkeys(user_ids))
+    if not ids:
+        return set()
+    r = await _get_redis()
+    try:
+        flags = await r.mget([f"paused:{user_id}" for user_id in ids])
+    finally:
+        await r.aclose()
+    return {user_id for user_id, flag in zip(ids, flags) if flag is not None}
+
+
 async def activate_brake(user_id: str) -> dict:
     """Activate the emergency brake for a user.
 
@@ -0,0 +1,361 @@
+"""
+Running briefing digest for JobPilot daily briefings.
+
+Instead of re-scanning 24h of ``agent_outputs`` and ``agent_activities``
+for every briefing, each agent completion folds its result into a small
+per-user digest row (``briefing_digests``). The digest holds:
+
+- ``match_count`` / ``applications_sent`` counters
+- ``top_matches`` -- highest-scoring new matches (capped)
+- ``status_changes`` -- applications submitted and pipeline transitions
+- ``warnings`` -- failed or review-needed agent results
+- ``pending_approvals`` -- the user's pending approval count, recounted
+  whenever the row is written (agent completion, new approval request,
+  briefing consumption)
+
+The generator reads the digest as part of its single gathering query and
+then *consumes* it, so the next briefing only covers newer activity. The
+digest is mirrored to Redis so the lite fallback can render it, pending
+count included, without touching the database.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_TOP_MATCH_LIMIT = 10
+_STATUS_CHANGE_LIMIT = 20
+_WARNING_LIMIT = 10
+
+_DIGEST_CACHE_TTL = 86400 * 2  # 48h, same as the briefing cache
+
+# Agent actions that contribute to the digest, by agent type.
+_STATUS_CHANGE_ACTIONS = {
+    "apply": {"application_submitted"},
+    "pipeline": {"pipeline_status_updated"},
+}
+_WARNING_ACTIONS = {"application_failed", "pipeline_failed", "pipeline_review_needed"}
+
+# Everything the digest summarises. The generator only skips raw
+# ``agent_outputs`` rows with these actions (and the activity rows logged
+# alongside them) for users with a digest; anything else is still scanned.
+DIGEST_ACTIONS = frozenset(
+    {action for actions in _STATUS_CHANGE_ACTIONS.values() for action in actions}
+    | _WARNING_ACTIONS
+)
+# The apply agent logs this warning activity next to every
+# ``application_failed`` output, which the digest already carries.
+DIGEST_ACTIVITY_EVENTS = frozenset({"agent.apply.failed"})
+
+# How far back a briefing looks when nothing has been briefed yet.
+BRIEFING_LOOKBACK = timedelta(hours=24)
+
+
+def _digest_cache_key(user_id: str) -> str:
+    return f"briefing_digest:{user_id}"
+
+
+def empty_digest() -> Dict[str, Any]:
+    """Return a digest with zeroed counters and empty lists."""
+    return {
+        "match_count": 0,
+        "applications_sent": 0,
+        "top_matches": [],
+        "status_changes": [],
+        "warnings": [],
+    }
+
+
+def is_digest_relevant(agent_type: str, output: Dict[str, Any]) -> bool:
+    """Whether an agent output changes the digest (avoids no-op writes)."""
+    action = output.get("action", "")
+    if agent_type == "job_scout":
+        return bool((output.get("data") or {}).get("matches_created"))
+    return action in _STATUS_CHANGE_ACTIONS.get(agent_type, ()) or action in _WARNING_ACTIONS
+
+
+def merge_agent_output(
+    digest: Dict[str, Any],
+    agent_type: str,
+    output: Dict[str, Any],
+    at: datetime,
+) -> Dict[str, Any]:
+    """Fold one agent output into ``digest`` and return the new digest.
+
+    Pure function: ``digest`` is not mutated. List sections are capped so
+    the row stays small no matter how many agent runs land in a window.
+    """
+    merged = {**empty_digest(), **digest}
+    merged = {k: list(v) if isinstance(v, list) else v for k, v in merged.items()}
+    action = output.get("action", "")
+    data = output.get("data") or {}
+    stamp = at.isoformat()
+
+    if agent_type == "job_scout":
+        merged["match_count"] += int(data.get("matches_created") or 0)
+        candidates = merged["top_matches"] + [
+            {**m, "at": stamp} for m in data.get("top_matches") or []
+        ]
+        candidates.sort(key=lambda m: float(m.get("score") or 0), reverse=True)
+        merged["top_matches"] = candidates[:_TOP_MATCH_LIMIT]
+
+    if action in _STATUS_CHANGE_ACTIONS.get(agent_type, ()):
+        if action == "application_submitted":
+            merged["applications_sent"] += 1
+        change = {
+            "agent_type": agent_type,
+            "event": action,
+            "detail": output.get("rationale", ""),
+            "at": stamp,
+        }
+        for key in ("application_id", "job_id", "old_status", "new_status"):
+            if data.get(key) is not None:
+                change[key] = data[key]
+        merged["status_changes"] = ([change] + merged["status_changes"])[:_STATUS_CHANGE_LIMIT]
+
+    if action in _WARNING_ACTIONS:
+        warning = {
+            "title": f"{agent_type}: {output.get('rationale', action)}",
+            "event_type": f"agent.{agent_type}.{action}",
+            "data": data,
+            "at": stamp,
+        }
+        merged["warnings"] = ([warning] + merged["warnings"])[:_WARNING_LIMIT]
+
+    return merged
+
+
+def subtract_consumed(
+    current: Dict[str, Any], consumed: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Remove what a briefing consumed, keeping anything recorded since.
+
+    Counters are decremented by the consumed amounts and list entries that
+    were part of the consumed snapshot are dropped, so agent completions
+    racing with briefing generation roll into the next window.
+    """
+    remaining = {**empty_digest(), **current}
+    for counter in ("match_count", "applications_sent"):
+        remaining[counter] = max(0, int(remaining[counter]) - int(consumed.get(counter) or 0))
+    for section in ("top_matches", "status_changes", "warnings"):
+        seen = {json.dumps(item, sort_keys=True, default=str) for item in consumed.get(section) or []}
+        remaining[section] = [
+            item for item in remaining[section]
+            if json.dumps(item, sort_keys=True, default=str) not in seen
+        ]
+    return remaining
+
+
+def has_activity(digest: Optional[Dict[str, Any]]) -> bool:
+    """Whether a digest holds anything worth briefing on."""
+    if not digest:
+        return False
+    return bool(
+        digest.get("match_count")
+        or digest.get("applications_sent")
+        or digest.get("top_matches")
+        or digest.get("status_changes")
+        or digest.get("warnings")
+    )
+
+
+def digest_to_sections(digest: Dict[str, Any]) -> Dict[str, Any]:
+    """Project a digest onto the generator's raw briefing sections."""
+    return {
+        "match_count": int(digest.get("match_count") or 0),
+        "applications_sent": int(digest.get("applications_sent") or 0),
+        "recent_matches": [
+            {
+                "id": m.get("job_id"),
+                "output": {
+                    "action": "job_match",
+                    "title": m.get("title", "Unknown"),
+                    "company": m.get("company", "Unknown"),
+                    "score": m.get("score"),
+                    "rationale": m.get("reason", ""),
+                },
+                "created_at": m.get("at"),
+            }
+            for m in digest.get("top_matches") or []
+        ],
+        "application_updates": [
+            {
+                "id": c.get("application_id"),
+                "agent_type": c.get("agent_type"),
+                "output": {
+                    key: value for key, value in c.items()
+                    if key not in ("agent_type", "at")
+                },
+                "created_at": c.get("at"),
+            }
+            for c in digest.get("status_changes") or []
+        ],
+        "agent_warnings": [
+            {
+                "title": w.get("title"),
+                "event_type": w.get("event_type"),
+                "data": w.get("data"),
+                "created_at": w.get("at"),
+            }
+            for w in digest.get("warnings") or []
+        ],
+    }
+
+
+# ---------------------------------------------------------------------------
+# Persistence
+# ---------------------------------------------------------------------------
+
+
+async def _update_digest_row(
+    user_id: str, update, window_start: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """Apply ``update(content) -> content`` to the user's digest row.
+
+    The row is created on first use, with its window opening one
+    ``BRIEFING_LOOKBACK`` ago, and locked for the read-modify-write so
+    concurrent agent completions for the same user serialise. Passing
+    ``window_start`` moves the window forward. The pending approval count
+    is recounted on every write.
+    """
+    from sqlalchemy import func, select
+    from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+    from app.db.engine import AsyncSessionLocal
+    from app.db.models import ApprovalQueueItem, BriefingDigest
+
+    now = datetime.now(timezone.utc)
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            pg_insert(BriefingDigest)
+            .values(
+                user_id=user_id,
+                window_start=now - BRIEFING_LOOKBACK,
+                content=empty_digest(),
+            )
+            .on_conflict_do_nothing(index_elements=["user_id"])
+        )
+        result = await session.execute(
+            select(BriefingDigest)
+            .where(BriefingDigest.user_id == user_id)
+            .with_for_update()
+        )
+        row = result.scalar_one()
+        pending = await session.execute(
+            select(func.count()).select_from(ApprovalQueueItem).where(
+                ApprovalQueueItem.user_id == user_id,
+                ApprovalQueueItem.status == "pending",
+            )
+        )
+        content = update(dict(row.content or {}))
+        content["pending_approvals"] = int(pending.scalar() or 0)
+        row.content = content
+        if window_start is not None:
+            row.window_start = window_start
+        await session.commit()
+    return content
+
+
+async def _mirror_to_cache(user_id: str, content: Dict[str, Any]) -> None:
+    """Mirror the digest to Redis for DB-free lite briefings."""
+    try:
+        import redis.asyncio as aioredis
+
+        from app.config import settings
+
+        r = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+        try:
+            await r.set(
+                _digest_cache_key(user_id),
+                json.dumps(content, default=str),
+                ex=_DIGEST_CACHE_TTL,
+            )
+        finally:
+            await r.aclose()
+    except Exception as exc:
+        logger.warning("Failed to cache briefing digest for user=%s: %s", user_id, exc)
+
+
+async def record_agent_output(
+    user_id: str, agent_type: str, output: Dict[str, Any]
+) -> None:
+    """Fold a completed agent's output into the user's running digest."""
+    if not is_digest_relevant(agent_type, output):
+        return
+
+    at = datetime.now(timezone.utc)
+    content = await _update_digest_row(
+        user_id, lambda current: merge_agent_output(current, agent_type, output, at)
+    )
+    await _mirror_to_cache(user_id, content)
+
+
+async def refresh_pending_approvals(user_id: str) -> None:
+    """Recount the digest's pending approvals after a new approval request."""
+    try:
+        content = await _update_digest_row(user_id, lambda current: current)
+        await _mirror_to_cache(user_id, content)
+    except Exception as exc:
+        logger.warning("Failed to refresh pending approvals for user=%s: %s", user_id, exc)
+
+
+async def consume_digest(
+    user_id: str, consumed: Dict[str, Any], gathered_at: datetime
+) -> None:
+    """Subtract a briefing's consumed snapshot from the running digest.
+
+    The window moves to ``gathered_at`` so the next briefing only scans
+    raw rows recorded after this one read them.
+    """
+    try:
+        content = await _update_digest_row(
+            user_id,
+            lambda current: subtract_consumed(current, consumed),
+            window_start=gathered_at,
+        )
+        await _mirror_to_cache(user_id, content)
+    except Exception as exc:
+        logger.warning("Failed to consume briefing digest for user=%s: %s", user_id, exc)
+
+
+async def get_cached_digest(user_id: str) -> Optional[Dict[str, Any]]:
+    """Read the Redis mirror of the digest (no database access)."""
+    try:
+        import redis.asyncio as aioredis
+
+        from app.config import settings
+
+        r = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+        try:
+            cached = await r.get(_digest_cache_key(user_id))
+        finally:
+            await r.aclose()
+        return json.loads(cached) if cached else None
+    except Exception as exc:
+        logger.warning("Failed to read briefing digest for user=%s: %s", user_id, exc)
+        return None
+
+
+def top_matches_from_scored(
+    scored_jobs: List[tuple], limit: int = 5
+) -> List[Dict[str, Any]]:
+    """Summarise the best (job, score, rationale) tuples for the digest."""
+    top: List[Dict[str, Any]] = []
+    for job, score, rationale in sorted(scored_jobs, key=lambda t: t[1], reverse=True)[:limit]:
+        try:
+            reason = json.loads(rationale).get("summary", "")
+        except (TypeError, ValueError, AttributeError):
+            reason = str(rationale or "")
+        top.append({
+            "job_id": str(getattr(job, "id", "")),
+            "title": str(getattr(job, "title", "") or ""),
+            "company": str(getattr(job, "company", "") or ""),
+            "score": score,
+            "reason": reason,
+        })
+    return top
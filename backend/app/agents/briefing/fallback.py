@@ -6,8 +6,9 @@ a lite briefing from Redis cache (48h TTL) and schedules a retry in 1 hour.
 
 Fallback hierarchy:
     1. Full briefing (generator.py) -- LLM-summarised, fresh data
-    2. Lite briefing from Redis cache -- last successful briefing data
-    3. Minimal briefing -- "check back soon" message (no cache available)
+    2. Lite briefing from the running digest mirror (digest.py) -- today's data
+    3. Lite briefing from Redis cache -- last successful briefing data
+    4. Minimal briefing -- "check back soon" message (no cache available)
 """
 
 from __future__ import annotations
@@ -89,15 +90,49 @@ async def generate_briefing_with_fallback(user_id: str) -> Dict[str, Any]:
 async def generate_lite_briefing(user_id: str) -> Dict[str, Any]:
     """Generate a lite briefing from cached data.
 
-    Checks Redis for the last successful briefing (cached with 48h TTL).
-    If cache hit: returns a lite briefing with the cached data.
-    If cache miss: returns a minimal "check back soon" message.
+    Prefers the Redis mirror of the running briefing digest, which reflects
+    agent activity since the last briefing and is rendered without any LLM
+    call. Otherwise checks Redis for the last successful briefing (cached
+    with 48h TTL). If neither exists, returns a minimal "check back soon"
+    message. The pending approval count comes from the digest mirror (as
+    of its last write); without one, the cached count (or zero) is shown.
+    Nothing here touches the database.
 
     Returns:
         Lite briefing content dict.
     """
     now = datetime.now(timezone.utc)
 
+    from app.agents.briefing.digest import (
+        digest_to_sections,
+        get_cached_digest,
+        has_activity,
+    )
+
+    digest = await get_cached_digest(user_id)
+    pending = (digest or {}).get("pending_approvals")
+    if has_activity(digest):
+        from app.agents.briefing.generator import _build_no_llm_briefing
+
+        rendered = _build_no_llm_briefing(
+            {**digest_to_sections(digest), "pending_approvals": pending or 0}
+        )
+        return {
+            "briefing_type": "lite",
+            "summary": (
+                "We're having some trouble generating your full briefing today. "
+                "Here's what your agents have done since your last briefing:"
+            ),
+            "actions_needed": rendered["actions_needed"],
+            "new_matches": rendered["new_matches"][:5],
+            "activity_log": rendered["activity_log"][:5],
+            "metrics": rendered["metrics"],
+            "last_known_pipeline": rendered["activity_log"][:3],
+            "cached_matches": rendered["new_matches"][:5],
+            "generated_at": now.isoformat(),
+            "cached_from": "digest",
+        }
+
     try:
         import redis.asyncio as aioredis
 
@@ -111,6 +146,13 @@ async def generate_lite_briefing(user_id: str) -> Dict[str, Any]:
 
         if cached:
             previous = json.loads(cached)
+            metrics = previous.get("metrics", {
+                "total_matches": 0,
+                "pending_approvals": 0,
+                "applications_sent": 0,
+            })
+            if pending is not None:
+                metrics = {**metrics, "pending_approvals": pending}
             return {
                 "briefing_type": "lite",
                 "summary": (
@@ -120,11 +162,7 @@ async def generate_lite_briefing(user_id: str) -> Dict[str, Any]:
                 "actions_needed": previous.get("actions_needed", []),
                 "new_matches": previous.get("new_matches", [])[:5],
                 "activity_log": previous.get("activity_log", [])[:5],
-                "metrics": previous.get("metrics", {
-                    "total_matches": 0,
-                    "pending_approvals": 0,
-                    "applications_sent": 0,
-                }),
+                "metrics": metrics,
                 "last_known_pipeline": previous.get("activity_log", [])[:3],
                 "cached_matches": previous.get("new_matches", [])[:5],
                 "generated_at": now.isoformat(),
@@ -140,12 +178,14 @@ async def generate_lite_briefing(user_id: str) -> Dict[str, Any]:
     return {
         "briefing_type": "lite",
         "summary": "We're having some trouble today. Check back soon!",
-        "actions_needed": [],
+        "actions_needed": (
+            [f"Review {pending} pending approval(s)"] if pending else []
+        ),
         "new_matches": [],
         "activity_log": [],
         "metrics": {
             "total_matches": 0,
-            "pending_approvals": 0,
+            "pending_approvals": pending or 0,
             "applications_sent": 0,
         },
         "generated_at": now.isoformat(),
@@ -1,9 +1,10 @@
 """
 Briefing generator for JobPilot daily briefings.
 
-Gathers data from agent outputs, application statuses, pending approvals,
-and agent activity warnings, then summarises via an LLM call into a
-structured briefing. Stores the result in the ``briefings`` table and
+Gathers the running briefing digest (see ``digest.py``) and pending
+approvals -- or, for users without a digest yet, recent agent outputs and
+activity warnings -- then summarises via an LLM call into a structured
+briefing. Stores the result in the ``briefings`` table and
 caches it in Redis (48h TTL) for fallback use.
 
 Works even without real job data (Phase 4) -- placeholder sections are
@@ -15,176 +16,273 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
-from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
 
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
-# Data gathering (parallel, with per-query timeout)
+# Data gathering (one session, one round-trip, with overall timeout)
 # ---------------------------------------------------------------------------
 
 _QUERY_TIMEOUT_SECONDS = 15
 
+_MATCH_LIMIT = 20
+_UPDATE_LIMIT = 20
+_APPROVAL_CARD_LIMIT = 10
+_WARNING_LIMIT = 10
 
-async def _get_recent_matches(user_id: str) -> List[Dict[str, Any]]:
-    """Fetch recent job matches from agent_outputs (last 24h)."""
-    try:
-        from sqlalchemy import select
 
-        from app.db.engine import AsyncSessionLocal
-        from app.db.models import AgentOutput as AgentOutputModel
-
-        since = datetime.now(timezone.utc) - timedelta(hours=24)
-        async with AsyncSessionLocal() as session:
-            result = await session.execute(
-                select(AgentOutputModel)
-                .where(
-                    AgentOutputModel.user_id == user_id,
-                    AgentOutputModel.agent_type == "job_scout",
-                    AgentOutputModel.created_at >= since,
-                )
-                .order_by(AgentOutputModel.created_at.desc())
-                .limit(20)
-            )
-            rows = result.scalars().all()
-            return [
-                {
-                    "id": str(row.id),
-                    "output": row.output,
-                    "created_at": row.created_at.isoformat() if row.created_at else None,
-                }
-                for row in rows
-            ]
-    except Exception as exc:
-        logger.warning("Failed to fetch recent matches for user=%s: %s", user_id, exc)
-        return []
+def _build_briefing_data_query(user_id: str, since: datetime):
+    """Build a single UNION ALL statement returning every briefing section.
 
+    Each branch is tagged with a ``section`` literal and projected onto the
+    same column shape (id, kind, title, rationale, payload, created_at,
+    total) so one round-trip on one pooled connection returns all sections.
+    The approval branch carries ``count(*) OVER ()``, which is evaluated
+    before LIMIT and therefore yields the full pending count alongside the
+    newest cards. Rows come back newest-first across all sections.
 
-async def _get_application_updates(user_id: str) -> List[Dict[str, Any]]:
-    """Fetch application/pipeline status changes (last 24h)."""
-    try:
-        from sqlalchemy import select
-
-        from app.db.engine import AsyncSessionLocal
-        from app.db.models import AgentOutput as AgentOutputModel
+    When the user has a running ``briefing_digests`` row it is returned as
+    its own branch. The ``agent_outputs``/``agent_activities`` branches then
+    skip the job scout runs and the actions the digest already summarises
+    (``DIGEST_ACTIONS``/``DIGEST_ACTIVITY_EVENTS``) and only scan rows
+    newer than the digest's ``window_start``; any other row is still
+    briefed once.
+    """
+    from sqlalchemy import (
+        Integer,
+        Text,
+        and_,
+        cast,
+        exists,
+        func,
+        literal,
+        literal_column,
+        null,
+        or_,
+        select,
+        union_all,
+    )
 
-        since = datetime.now(timezone.utc) - timedelta(hours=24)
-        async with AsyncSessionLocal() as session:
-            result = await session.execute(
-                select(AgentOutputModel)
-                .where(
-                    AgentOutputModel.user_id == user_id,
-                    AgentOutputModel.agent_type.in_(["apply", "pipeline"]),
-                    AgentOutputModel.created_at >= since,
-                )
-                .order_by(AgentOutputModel.created_at.desc())
-                .limit(20)
+    from app.agents.briefing.digest import DIGEST_ACTIONS, DIGEST_ACTIVITY_EVENTS
+    from app.db.models import AgentActivity, ApprovalQueueItem, BriefingDigest
+    from app.db.models import AgentOutput as AgentOutputModel
+
+    def _branch(section: str, *, id_col, kind, title, rationale, payload,
+                created_at, total, where, limit):
+        subq = (
+            select(
+                literal(section).label("section"),
+                cast(id_col, Text).label("id"),
+                cast(kind, Text).label("kind"),
+                title.label("title"),
+                rationale.label("rationale"),
+                payload.label("payload"),
+                created_at.label("created_at"),
+                total.label("total"),
             )
-            rows = result.scalars().all()
-            return [
-                {
-                    "id": str(row.id),
-                    "agent_type": row.agent_type if hasattr(row.agent_type, 'value') else str(row.agent_type),
-                    "output": row.output,
-                    "created_at": row.created_at.isoformat() if row.created_at else None,
-                }
-                for row in rows
-            ]
-    except Exception as exc:
-        logger.warning("Failed to fetch app updates for user=%s: %s", user_id, exc)
-        return []
-
-
-async def _get_pending_approval_count(user_id: str) -> int:
-    """Count pending approval queue items."""
-    try:
-        from sqlalchemy import func, select
-
-        from app.db.engine import AsyncSessionLocal
-        from app.db.models import ApprovalQueueItem
+            .where(*where)
+            .order_by(created_at.desc())
+            .limit(limit)
+            .subquery(section)
+        )
+        return select(*subq.c)
+
+    no_text = cast(null(), Text)
+    no_total = cast(null(), Integer)
+    no_digest = ~exists().where(BriefingDigest.user_id == user_id)
+    window_start = (
+        select(BriefingDigest.window_start)
+        .where(BriefingDigest.user_id == user_id)
+        .scalar_subquery()
+    )
 
-        async with AsyncSessionLocal() as session:
-            result = await session.execute(
-                select(func.count(ApprovalQueueItem.id)).where(
-                    ApprovalQueueItem.user_id == user_id,
-                    ApprovalQueueItem.status == "pending",
-                )
-            )
-            return result.scalar_one_or_none() or 0
-    except Exception as exc:
-        logger.warning("Failed to count approvals for user=%s: %s", user_id, exc)
-        return 0
+    def _not_in_digest(created_at, uncovered):
+        """Rows the digest does not summarise, since it was last consumed."""
+        return or_(no_digest, and_(uncovered, created_at >= window_start))
+
+    output_action = AgentOutputModel.output["action"].astext
+
+    digest = _branch(
+        "digest",
+        id_col=BriefingDigest.id,
+        kind=no_text,
+        title=no_text,
+        rationale=no_text,
+        payload=BriefingDigest.content,
+        created_at=BriefingDigest.window_start,
+        total=no_total,
+        where=(BriefingDigest.user_id == user_id,),
+        limit=1,
+    )
 
+    matches = _branch(
+        "recent_matches",
+        id_col=AgentOutputModel.id,
+        kind=AgentOutputModel.agent_type,
+        title=no_text,
+        rationale=no_text,
+        payload=AgentOutputModel.output,
+        created_at=AgentOutputModel.created_at,
+        total=no_total,
+        where=(
+            AgentOutputModel.user_id == user_id,
+            AgentOutputModel.agent_type == "job_scout",
+            AgentOutputModel.created_at >= since,
+            no_digest,
+        ),
+        limit=_MATCH_LIMIT,
+    )
+    updates = _branch(
+        "application_updates",
+        id_col=AgentOutputModel.id,
+        kind=AgentOutputModel.agent_type,
+        title=no_text,
+        rationale=no_text,
+        payload=AgentOutputModel.output,
+        created_at=AgentOutputModel.created_at,
+        total=no_total,
+        where=(
+            AgentOutputModel.user_id == user_id,
+            AgentOutputModel.agent_type.in_(["apply", "pipeline"]),
+            AgentOutputModel.created_at >= since,
+            _not_in_digest(
+                AgentOutputModel.created_at,
+                or_(output_action.is_(None), output_action.notin_(DIGEST_ACTIONS)),
+            ),
+        ),
+        limit=_UPDATE_LIMIT,
+    )
+    approvals = _branch(
+        "pending_approvals",
+        id_col=ApprovalQueueItem.id,
+        kind=ApprovalQueueItem.agent_type,
+        title=no_text,
+        rationale=ApprovalQueueItem.rationale,
+        payload=ApprovalQueueItem.payload,
+        created_at=ApprovalQueueItem.created_at,
+        total=func.count().over(),
+        where=(
+            ApprovalQueueItem.user_id == user_id,
+            ApprovalQueueItem.status == "pending",
+        ),
+        limit=_APPROVAL_CARD_LIMIT,
+    )
+    warnings = _branch(
+        "agent_warnings",
+        id_col=AgentActivity.id,
+        kind=AgentActivity.event_type,
+        title=AgentActivity.title,
+        rationale=no_text,
+        payload=AgentActivity.data,
+        created_at=AgentActivity.created_at,
+        total=no_total,
+        where=(
+            AgentActivity.user_id == user_id,
+            AgentActivity.severity == "warning",
+            AgentActivity.created_at >= since,
+            _not_in_digest(
+                AgentActivity.created_at,
+                AgentActivity.event_type.notin_(DIGEST_ACTIVITY_EVENTS),
+            ),
+        ),
+        limit=_WARNING_LIMIT,
+    )
+    return union_all(digest, matches, updates, approvals, warnings).order_by(
+        literal_column("created_at").desc()
+    )
 
-async def _get_pending_approval_cards(user_id: str) -> List[Dict[str, Any]]:
-    """Fetch pending approval items with job details for briefing cards."""
-    try:
-        from sqlalchemy import select
 
-        from app.db.engine import AsyncSessionLocal
-        from app.db.models import ApprovalQueueItem
+def _isoformat(value: Any) -> Optional[str]:
+    return value.isoformat() if value else None
 
-        async with AsyncSessionLocal() as session:
-            result = await session.execute(
-                select(ApprovalQueueItem)
-                .where(
-                    ApprovalQueueItem.user_id == user_id,
-                    ApprovalQueueItem.status == "pending",
-                )
-                .order_by(ApprovalQueueItem.created_at.desc())
-                .limit(10)
-            )
-            rows = result.scalars().all()
-            cards = []
-            for row in rows:
-                payload = row.payload or {}
-                cards.append({
-                    "item_id": str(row.id),
-                    "job_title": payload.get("job_title", "Unknown"),
-                    "company": payload.get("company", "Unknown"),
-                    "submission_method": payload.get("submission_method", "unknown"),
-                    "rationale": row.rationale or "",
-                })
-            return cards
-    except Exception as exc:
-        logger.warning("Failed to fetch approval cards for user=%s: %s", user_id, exc)
-        return []
 
+def _rows_to_sections(rows) -> Dict[str, Any]:
+    """Split tagged UNION rows back into the per-section structures.
 
-async def _get_agent_warnings(user_id: str) -> List[Dict[str, Any]]:
-    """Fetch recent agent warnings/issues (last 24h)."""
+    A ``digest`` row, when present, supplies the match, update and warning
+    sections and is kept under ``"digest"`` so it can be consumed once the
+    briefing is stored.
+    """
+    from app.agents.briefing.digest import digest_to_sections
+
+    sections: Dict[str, Any] = {
+        "recent_matches": [],
+        "application_updates": [],
+        "pending_approvals": 0,
+        "agent_warnings": [],
+        "pending_approval_cards": [],
+    }
+    recent = sections["recent_matches"]
+    updates = sections["application_updates"]
+    warnings = sections["agent_warnings"]
+    cards = sections["pending_approval_cards"]
+
+    for row in rows:
+        section = row.section
+        if section == "digest":
+            digest = dict(row.payload or {})
+            sections.update(digest_to_sections(digest))
+            sections["digest"] = digest
+        elif section == "recent_matches":
+            recent.append({
+                "id": row.id,
+                "output": row.payload,
+                "created_at": _isoformat(row.created_at),
+            })
+        elif section == "application_updates":
+            updates.append({
+                "id": row.id,
+                "agent_type": row.kind,
+                "output": row.payload,
+                "created_at": _isoformat(row.created_at),
+            })
+        elif section == "pending_approvals":
+            payload = row.payload or {}
+            sections["pending_approvals"] = row.total or 0
+            cards.append({
+                "item_id": row.id,
+                "job_title": payload.get("job_title", "Unknown"),
+                "company": payload.get("company", "Unknown"),
+                "submission_method": payload.get("submission_method", "unknown"),
+                "rationale": row.rationale or "",
+            })
+        elif section == "agent_warnings":
+            warnings.append({
+                "title": row.title,
+                "event_type": row.kind,
+                "data": row.payload,
+                "created_at": _isoformat(row.created_at),
+            })
+    return sections
+
+
+async def _gather_briefing_data(user_id: str) -> Dict[str, Any]:
+    """Fetch every briefing section with one session and one statement.
+
+    Replaces the previous fan-out of five concurrent sessions, which could
+    hold the whole default pool (``pool_size=5``) for a single briefing.
+    Returns empty sections when the query fails or times out. The
+    ``gathered_at`` timestamp becomes the digest's next ``window_start``.
+    """
+    gathered_at = datetime.now(timezone.utc)
     try:
-        from sqlalchemy import select
-
+        from app.agents.briefing.digest import BRIEFING_LOOKBACK
         from app.db.engine import AsyncSessionLocal
-        from app.db.models import AgentActivity
 
-        since = datetime.now(timezone.utc) - timedelta(hours=24)
+        stmt = _build_briefing_data_query(user_id, gathered_at - BRIEFING_LOOKBACK)
         async with AsyncSessionLocal() as session:
-            result = await session.execute(
-                select(AgentActivity)
-                .where(
-                    AgentActivity.user_id == user_id,
-                    AgentActivity.severity == "warning",
-                    AgentActivity.created_at >= since,
-                )
-                .order_by(AgentActivity.created_at.desc())
-                .limit(10)
+            result = await asyncio.wait_for(
+                session.execute(stmt), timeout=_QUERY_TIMEOUT_SECONDS
             )
-            rows = result.scalars().all()
-            return [
-                {
-                    "title": row.title,
-                    "event_type": row.event_type,
-                    "data": row.data,
-                    "created_at": row.created_at.isoformat() if row.created_at else None,
-                }
-                for row in rows
-            ]
+            rows = result.all()
+        sections = _rows_to_sections(rows)
     except Exception as exc:
-        logger.warning("Failed to fetch warnings for user=%s: %s", user_id, exc)
-        return []
+        logger.warning("Failed to gather briefing data for user=%s: %s", user_id, exc)
+        sections = _rows_to_sections([])
+    sections["gathered_at"] = gathered_at
+    return sections
 
 
 # ---------------------------------------------------------------------------
@@ -255,10 +353,15 @@ def _build_no_llm_briefing(raw_data: Dict[str, Any]) -> Dict[str, Any]:
     approvals = raw_data.get("pending_approvals", 0)
     updates = raw_data.get("application_updates", [])
     approval_cards = raw_data.get("pending_approval_cards", [])
+    match_count = raw_data.get("match_count", len(matches))
+    applications_sent = raw_data.get(
+        "applications_sent",
+        len([u for u in updates if u.get("agent_type") == "apply"]),
+    )
 
     return {
         "summary": (
-            f"Today you have {len(matches)} new job match(es), "
+            f"Today you have {match_count} new job match(es), "
             f"{approvals} pending approval(s), and {len(updates)} pipeline update(s)."
         ),
         "actions_needed": (
@@ -266,8 +369,9 @@ def _build_no_llm_briefing(raw_data: Dict[str, Any]) -> Dict[str, Any]:
         ),
         "new_matches": [
             {
-                "title": m.get("output", {}).get("action", "Unknown"),
-                "company": "See details",
+                "title": m.get("output", {}).get("title")
+                or m.get("output", {}).get("action", "Unknown"),
+                "company": m.get("output", {}).get("company", "See details"),
                 "reason": m.get("output", {}).get("rationale", ""),
             }
             for m in matches[:10]
@@ -277,11 +381,9 @@ def _build_no_llm_briefing(raw_data: Dict[str, Any]) -> Dict[str, Any]:
             for u in updates[:10]
         ],
         "metrics": {
-            "total_matches": len(matches),
+            "total_matches": match_count,
             "pending_approvals": approvals,
-            "applications_sent": len(
-                [u for u in updates if u.get("agent_type") == "apply"]
-            ),
+            "applications_sent": applications_sent,
         },
         "pending_approval_cards": approval_cards,
     }
@@ -327,29 +429,20 @@ def _build_empty_state_briefing() -> Dict[str, Any]:
 async def generate_full_briefing(user_id: str) -> Dict[str, Any]:
     """Generate a complete daily briefing for a user.
 
-    Gathers data in parallel (with per-query 15s timeout), summarises
-    via LLM (30s timeout), stores in ``briefings`` table, and caches
-    the result in Redis with 48h TTL for fallback use.
+    Gathers all sections in a single query on one pooled connection
+    (15s timeout), summarises via LLM (30s timeout), stores in ``briefings``
+    table, caches the result in Redis with 48h TTL for fallback use, and
+    consumes the running digest so the next briefing starts fresh.
 
     Returns:
         The briefing content dict.
     """
-    # Gather data in parallel with timeouts
-    gather_results = await asyncio.gather(
-        asyncio.wait_for(_get_recent_matches(user_id), timeout=_QUERY_TIMEOUT_SECONDS),
-        asyncio.wait_for(_get_application_updates(user_id), timeout=_QUERY_TIMEOUT_SECONDS),
-        asyncio.wait_for(_get_pending_approval_count(user_id), timeout=_QUERY_TIMEOUT_SECONDS),
-        asyncio.wait_for(_get_agent_warnings(user_id), timeout=_QUERY_TIMEOUT_SECONDS),
-        asyncio.wait_for(_get_pending_approval_cards(user_id), timeout=_QUERY_TIMEOUT_SECONDS),
-        return_exceptions=True,
-    )
-
-    # Handle any timed-out queries gracefully
-    recent_matches = gather_results[0] if not isinstance(gather_results[0], BaseException) else []
-    application_updates = gather_results[1] if not isinstance(gather_results[1], BaseException) else []
-    pending_approvals = gather_results[2] if not isinstance(gather_results[2], BaseException) else 0
-    agent_warnings = gather_results[3] if not isinstance(gather_results[3], BaseException) else []
-    approval_cards = gather_results[4] if not isinstance(gather_results[4], BaseException) else []
+    data = await _gather_briefing_data(user_id)
+    recent_matches = data["recent_matches"]
+    application_updates = data["application_updates"]
+    pending_approvals = data["pending_approvals"]
+    agent_warnings = data["agent_warnings"]
+    approval_cards = data["pending_approval_cards"]
 
     # Check for empty state (new user, no data at all)
     has_any_data = (
@@ -370,6 +463,9 @@ async def generate_full_briefing(user_id: str) -> Dict[str, Any]:
             "agent_warnings": agent_warnings,
             "pending_approval_cards": approval_cards,
         }
+        for counter in ("match_count", "applications_sent"):
+            if counter in data:
+                raw_data[counter] = data[counter]
         briefing_content = await _llm_summarise(raw_data)
 
     now = datetime.now(timezone.utc)
@@ -383,6 +479,12 @@ async def generate_full_briefing(user_id: str) -> Dict[str, Any]:
     # Cache in Redis for fallback (48h TTL)
     await _cache_briefing(user_id, briefing_content)
 
+    # Start the next digest window from what this briefing did not cover
+    if data.get("digest") is not None:
+        from app.agents.briefing.digest import consume_digest
+
+        await consume_digest(user_id, data["digest"], data["gathered_at"])
+
     logger.info(
         "Full briefing generated for user=%s id=%s matches=%d approvals=%d",
         user_id,
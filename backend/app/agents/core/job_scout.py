@@ -17,6 +17,12 @@ from typing import Any
 from uuid import uuid4
 
 from app.agents.base import AgentOutput, BaseAgent
+from app.services.job_features import (
+    MAX_SKILL_WORDS,
+    SENIORITY_KEYWORDS,
+    job_features,
+    skill_words,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +56,7 @@ class JobScoutAgent(BaseAgent):
         5. Score each job against preferences
         6. Filter deal-breaker violations
         7. Create Match records for qualifying jobs
+        7b. Queue reverse matching of newly inserted jobs to other users
         8. Return AgentOutput with summary
 
         Args:
@@ -92,8 +99,9 @@ class JobScoutAgent(BaseAgent):
         from app.db.engine import AsyncSessionLocal
         from app.services.job_dedup import upsert_jobs
 
+        new_jobs: list[Any] = []
         async with AsyncSessionLocal() as session:
-            stored_jobs = await upsert_jobs(raw_jobs, session)
+            stored_jobs = await upsert_jobs(raw_jobs, session, new_jobs=new_jobs)
 
             # 5 & 6. Score and filter (heuristic pass)
             from app.config import settings
@@ -108,7 +116,17 @@ class JobScoutAgent(BaseAgent):
                 if score >= heuristic_threshold:
                     scored_jobs.append((job, score, rationale))
 
-            # 5b. LLM refinement for jobs passing pre-filter (concurrent)
+            # 5a. Learned preferences (one query, applied in bulk) so learned
+            # negatives prune jobs before any LLM calls are made
+            adjuster = await self._load_preference_adjuster(user_id, session)
+            if adjuster and scored_jobs:
+                scored_jobs = [
+                    (job, score, rationale)
+                    for job, score, rationale in adjuster.apply(scored_jobs)
+                    if score >= heuristic_threshold
+                ]
+
+            # 5b. LLM refinement for the top-k jobs passing pre-filter (concurrent)
             if settings.LLM_SCORING_ENABLED and scored_jobs:
                 from app.services.job_scoring import score_job_with_llm
 
@@ -123,13 +141,14 @@ class JobScoutAgent(BaseAgent):
                                 heuristic_score=h_score,
                             )
                             if result.used_llm:
+                                llm_score = adjuster.adjust(job, result.score)
                                 rationale_data = {
                                     "summary": result.rationale,
                                     "top_reasons": result.top_reasons or [result.rationale],
                                     "concerns": result.concerns or [],
                                     "confidence": result.confidence or _derive_confidence_from_score(result.score),
                                 }
-                                return (job, result.score, json.dumps(rationale_data))
+                                return (job, llm_score, json.dumps(rationale_data))
                             return (job, h_score, h_rationale)
                         except Exception as exc:
                             logger.warning(
@@ -139,9 +158,22 @@ class JobScoutAgent(BaseAgent):
                             )
                             return (job, h_score, h_rationale)
 
-                scored_jobs = list(await asyncio.gather(
-                    *(_refine(j, s, r) for j, s, r in scored_jobs)
-                ))
+                # Only the closest jobs by embedding are worth an LLM call;
+                # the rest keep their heuristic score.
+                from app.services.semantic_matching import select_for_refinement
+
+                refine_idx = await select_for_refinement(
+                    [job for job, _, _ in scored_jobs],
+                    preferences,
+                    profile,
+                    top_k=settings.SEMANTIC_TOP_K,
+                    session=session,
+                )
+                refined = await asyncio.gather(
+                    *(_refine(*scored_jobs[i]) for i in refine_idx)
+                )
+                for i, result in zip(refine_idx, refined):
+                    scored_jobs[i] = result
 
             # 6b. Ensure all rationales are structured JSON
             from app.services.job_scoring import parse_rationale
@@ -169,7 +201,19 @@ class JobScoutAgent(BaseAgent):
 
             await session.commit()
 
+        if matches_created:
+            # Only after the commit, so a concurrent feed rebuild cannot
+            # cache pre-insert rows under the new version.
+            from app.services.match_feed_cache import bump_match_version
+
+            await bump_match_version(user_id)
+
+        # 7b. Offer the newly ingested jobs to every other interested user
+        self._queue_reverse_matching(user_id, new_jobs)
+
         # 8. Return summary
+        from app.agents.briefing.digest import top_matches_from_scored
+
         avg_score = (
             sum(s for _, s, _ in scored_jobs) / len(scored_jobs)
             if scored_jobs
@@ -188,9 +232,45 @@ class JobScoutAgent(BaseAgent):
                 "jobs_stored": len(stored_jobs),
                 "matches_created": matches_created,
                 "average_score": round(avg_score, 1),
+                "top_matches": top_matches_from_scored(scored_jobs) if matches_created else [],
             },
         )
 
+    # ------------------------------------------------------------------
+    # Reverse matching
+    # ------------------------------------------------------------------
+
+    def _queue_reverse_matching(self, user_id: str, new_jobs: list[Any]) -> None:
+        """Queue ``fan_out_new_jobs`` for jobs this run inserted (best-effort)."""
+        from app.config import settings
+
+        if not new_jobs or not settings.REVERSE_MATCHING_ENABLED:
+            return
+        try:
+            from app.worker.tasks import fan_out_new_jobs
+
+            fan_out_new_jobs.delay([str(job.id) for job in new_jobs], str(user_id))
+        except Exception as exc:
+            logger.warning(
+                "Could not queue reverse matching for %d jobs: %s", len(new_jobs), exc
+            )
+
+    # ------------------------------------------------------------------
+    # Learned preferences
+    # ------------------------------------------------------------------
+
+    async def _load_preference_adjuster(self, user_id: str, session: Any):
+        """Compile the user's learned preferences; empty on failure."""
+        from app.services.preference_learning import PreferenceAdjuster
+
+        try:
+            return await PreferenceAdjuster.load(user_id, session)
+        except Exception as exc:
+            logger.warning(
+                "Could not load learned preferences for user=%s: %s", user_id, exc
+            )
+            return PreferenceAdjuster()
+
     # ------------------------------------------------------------------
     # Search query building
     # ------------------------------------------------------------------
@@ -321,14 +401,15 @@ class JobScoutAgent(BaseAgent):
         if not target_titles:
             return 12  # Neutral score if no preference
 
-        job_title = (getattr(job, "title", "") or "").lower()
+        features = job_features(job)
+        job_title = features.title
+        title_words = features.title_tokens
         for target in target_titles:
             target_lower = target.lower()
             if target_lower in job_title or job_title in target_lower:
                 return 25  # Exact/substring match
             # Check word overlap
             target_words = set(target_lower.split())
-            title_words = set(job_title.split())
             overlap = target_words & title_words
             if len(overlap) >= len(target_words) * 0.5:
                 return 20  # Partial match
@@ -339,8 +420,9 @@ class JobScoutAgent(BaseAgent):
         """Score location match (0-20)."""
         target_locations = preferences.get("target_locations") or []
         work_arrangement = preferences.get("work_arrangement")
-        job_remote = getattr(job, "remote", False)
-        job_location = (getattr(job, "location", "") or "").lower()
+        features = job_features(job)
+        job_remote = features.remote
+        job_location = features.location
 
         # Remote job + user wants remote = perfect match
         if job_remote and work_arrangement == "remote":
@@ -364,18 +446,14 @@ class JobScoutAgent(BaseAgent):
         salary_min_pref = preferences.get("salary_minimum")
         salary_target = preferences.get("salary_target")
 
-        job_salary_min = getattr(job, "salary_min", None)
-        job_salary_max = getattr(job, "salary_max", None)
-
         if not salary_min_pref and not salary_target:
             return 10  # Neutral if no preference
 
-        if not job_salary_min and not job_salary_max:
+        # Best available salary figure (max, else min)
+        job_salary = job_features(job).salary
+        if not job_salary:
             return 10  # Unknown salary, neutral
 
-        # Use the best available salary figure
-        job_salary = job_salary_max or job_salary_min or 0
-
         if salary_target and job_salary >= salary_target:
             return 20  # Meets or exceeds target
         elif salary_min_pref and job_salary >= salary_min_pref:
@@ -397,14 +475,19 @@ class JobScoutAgent(BaseAgent):
         if not user_skills:
             return 10  # Neutral
 
-        description = (getattr(job, "description", "") or "").lower()
-        title = (getattr(job, "title", "") or "").lower()
-        text = f"{title} {description}"
+        features = job_features(job)
 
-        if not text.strip():
+        if not features.text.strip():
             return 10  # Neutral
 
-        matches = sum(1 for skill in user_skills if skill.lower() in text)
+        matches = 0
+        for skill in user_skills:
+            words = skill_words(skill)
+            if len(words) > MAX_SKILL_WORDS:
+                found = skill.lower() in features.text
+            else:
+                found = bool(words) and " ".join(words) in features.skill_terms
+            matches += found
         if not user_skills:
             return 10
 
@@ -417,26 +500,16 @@ class JobScoutAgent(BaseAgent):
         if not target_seniority:
             return 8  # Neutral
 
-        title = (getattr(job, "title", "") or "").lower()
-        description = (getattr(job, "description", "") or "").lower()
-        text = f"{title} {description}"
-
-        seniority_keywords = {
-            "junior": ["junior", "entry level", "entry-level", "associate", "jr."],
-            "mid": ["mid-level", "mid level", "intermediate"],
-            "senior": ["senior", "sr.", "lead", "principal"],
-            "staff": ["staff", "principal", "distinguished"],
-            "manager": ["manager", "director", "head of", "vp"],
-        }
+        features = job_features(job)
 
         for level in target_seniority:
             level_lower = level.lower()
+            # Known levels were detected (by name or keyword) at upsert
+            if level_lower in SENIORITY_KEYWORDS:
+                if level_lower in features.seniority:
+                    return 15
             # Direct match
-            if level_lower in text:
-                return 15
-            # Keyword match
-            keywords = seniority_keywords.get(level_lower, [])
-            if any(kw in text for kw in keywords):
+            elif level_lower in features.text:
                 return 15
 
         return 3  # No match
@@ -476,8 +549,9 @@ class JobScoutAgent(BaseAgent):
         Returns True if a deal-breaker IS violated (job should be excluded).
         """
         # Excluded companies
+        features = job_features(job)
         excluded_companies = preferences.get("excluded_companies") or []
-        job_company = (getattr(job, "company", "") or "").lower()
+        job_company = features.company
         for exc_company in excluded_companies:
             if exc_company.lower() in job_company:
                 logger.debug(
@@ -489,9 +563,7 @@ class JobScoutAgent(BaseAgent):
 
         # Excluded industries
         excluded_industries = preferences.get("excluded_industries") or []
-        description = (getattr(job, "description", "") or "").lower()
-        title = (getattr(job, "title", "") or "").lower()
-        text = f"{title} {description}"
+        text = features.text
         for industry in excluded_industries:
             if industry.lower() in text:
                 logger.debug(
@@ -504,10 +576,8 @@ class JobScoutAgent(BaseAgent):
         # Salary below minimum
         salary_min_pref = preferences.get("salary_minimum")
         if salary_min_pref:
-            job_salary_max = getattr(job, "salary_max", None)
-            job_salary_min = getattr(job, "salary_min", None)
             # Only reject if salary is known AND below minimum
-            best_salary = job_salary_max or job_salary_min
+            best_salary = features.salary
             if best_salary and best_salary < salary_min_pref:
                 logger.debug(
                     "Deal-breaker: salary %d below minimum %d for job '%s'",
@@ -550,8 +620,10 @@ class JobScoutAgent(BaseAgent):
     ) -> int:
         """Create Match records for scored jobs, skipping existing matches.
 
-        Checks for existing (user_id, job_id) pairs before inserting to
-        prevent duplicate matches on repeated agent runs.
+        Inserts with ``ON CONFLICT DO NOTHING`` on ``(user_id, job_id)``,
+        so a pair that already exists -- from an earlier run or inserted
+        concurrently by the reverse-matching fan-out -- is skipped rather
+        than failing the run.
 
         Args:
             user_id: User ID for the matches.
@@ -561,42 +633,31 @@ class JobScoutAgent(BaseAgent):
         Returns:
             Number of new matches created.
         """
-        from sqlalchemy import select
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
 
         from app.db.models import Match
 
         if not scored_jobs:
             return 0
 
-        # Fetch existing matches for this user to avoid duplicates
-        job_ids = [job.id for job, _, _ in scored_jobs]
+        rows = [
+            {
+                "id": uuid4(),
+                "user_id": user_id,
+                "job_id": job.id,
+                "score": score,
+                "rationale": rationale,
+                "status": "new",
+            }
+            for job, score, rationale in scored_jobs
+        ]
         result = await session.execute(
-            select(Match.job_id).where(
-                Match.user_id == user_id,
-                Match.job_id.in_(job_ids),
-            )
+            pg_insert(Match)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=["user_id", "job_id"])
+            .returning(Match.id)
         )
-        existing_job_ids = {row[0] for row in result.all()}
-
-        count = 0
-        for job, score, rationale in scored_jobs:
-            if job.id in existing_job_ids:
-                logger.debug(
-                    "Skipping existing match for user=%s job=%s", user_id, job.id
-                )
-                continue
-            match = Match(
-                id=uuid4(),
-                user_id=user_id,
-                job_id=job.id,
-                score=score,
-                rationale=rationale,
-                status="new",
-            )
-            session.add(match)
-            count += 1
-
-        await session.flush()
+        count = len(result.scalars().all())
         logger.info("Created %d new matches for user=%s (skipped %d existing)",
-                     count, user_id, len(existing_job_ids))
+                    count, user_id, len(rows) - count)
         return count
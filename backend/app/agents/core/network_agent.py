@@ -63,7 +63,7 @@ class NetworkAgent(BaseAgent):
 
         # Step 1: Warm path analysis
         warm_paths = await self._analyze_warm_paths(
-            target_companies, connection_data
+            target_companies, connection_data, user_id=user_id
         )
 
         # Step 2: Relationship opportunity identification
@@ -122,18 +122,37 @@ class NetworkAgent(BaseAgent):
         self,
         target_companies: list[str],
         connection_data: dict[str, Any],
+        user_id: str | None = None,
     ) -> list[dict[str, Any]]:
         """Analyze warm paths to target companies via user connections.
 
-        Delegates to WarmPathService (story 9-2).
+        Delegates to WarmPathService (story 9-2). When ``user_id`` is given,
+        ``connection_data`` is merged into the user's persisted connection
+        graph first and paths are found in the full graph; if that fails the
+        service builds a graph from ``connection_data`` alone.
         """
         from app.services.network.warm_path import WarmPathService
 
         logger.info(
             "Analyzing warm paths for %d companies", len(target_companies)
         )
+        graph = None
+        if user_id:
+            from app.services.network.connection_graph import (
+                update_connection_graph,
+            )
+
+            try:
+                graph = await update_connection_graph(user_id, connection_data)
+            except Exception as exc:
+                logger.warning(
+                    "Connection graph unavailable for user=%s: %s", user_id, exc
+                )
+
         service = WarmPathService()
-        paths = await service.analyze(target_companies, connection_data)
+        paths = await service.analyze(
+            target_companies, connection_data, graph=graph
+        )
         return [p.to_dict() for p in paths]
 
     async def _identify_opportunities(
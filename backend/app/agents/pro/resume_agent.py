@@ -5,6 +5,12 @@ Given a user's master resume (structured profile data) and a target job,
 produces a tailored resume optimized for the role.  Stores the result in
 the ``documents`` table with type=RESUME and a job_id reference.
 
+Tailoring is incremental (``app.services.resume_tailoring``): sections
+already tailored for a job with a strongly overlapping requirement set
+are reused, and only the remaining sections are sent to the LLM. The ATS
+score and keyword lists are computed locally (``app.services.ats_scoring``)
+rather than reported by the LLM.
+
 Architecture: Extends BaseAgent (ADR-1 custom orchestrator).
 CRITICAL: NEVER fabricates qualifications not present in the master resume.
 """
@@ -13,12 +19,16 @@ from __future__ import annotations
 
 import json
 import logging
-from typing import Any
+import time
+from typing import TYPE_CHECKING, Any
 
 from pydantic import BaseModel
 
 from app.agents.base import AgentOutput, BaseAgent
 
+if TYPE_CHECKING:
+    from app.services.resume_tailoring import ResumeSection, TailoringPlan
+
 logger = logging.getLogger(__name__)
 
 
@@ -36,8 +46,15 @@ class TailoredSection(BaseModel):
     changes_made: list[str]
 
 
+class TailoringResponse(BaseModel):
+    """Structured LLM output: the tailored sections and why."""
+
+    sections: list[TailoredSection]
+    tailoring_rationale: str
+
+
 class TailoredResume(BaseModel):
-    """Full tailored resume output from the LLM."""
+    """Full tailored resume, as stored in the document."""
 
     sections: list[TailoredSection]
     keywords_incorporated: list[str]
@@ -65,8 +82,6 @@ keywords.
 4. Add relevant skills from the user's skill set that match the job \
 requirements.
 5. Optimize the professional summary to align with the target role.
-6. Return an ATS score (0-100) based on keyword match percentage.
-7. List keywords you incorporated and keywords still missing.
 """
 
 
@@ -89,10 +104,11 @@ class ResumeAgent(BaseAgent):
         1. Load user context (profile with skills, experience, education)
         2. Load target job from database
         3. Analyze job requirements
-        4. Tailor resume via LLM
-        5. Calculate keyword gaps
-        6. Store tailored document
-        7. Return AgentOutput with rationale and stats
+        4. Plan which sections a similar, already-tailored job can supply
+        5. Tailor the remaining sections via LLM
+        6. Score keyword coverage locally (ATS analysis)
+        7. Store tailored document and remember its sections
+        8. Return AgentOutput with rationale, stats and tailoring savings
 
         Args:
             user_id: Clerk user ID.
@@ -102,6 +118,15 @@ class ResumeAgent(BaseAgent):
             AgentOutput with tailoring summary.
         """
         from app.agents.orchestrator import get_user_context
+        from app.services.ats_scoring import analyze_resume, load_idf_table
+        from app.services.resume_tailoring import (
+            job_fingerprint,
+            load_tailoring_history,
+            normalize_section_name,
+            plan_tailoring,
+            remember_tailoring,
+            split_master_resume,
+        )
 
         job_id = task_data.get("job_id")
         if not job_id:
@@ -137,26 +162,66 @@ class ResumeAgent(BaseAgent):
         # 3. Analyze job requirements
         job_analysis = self._analyze_job(job)
 
-        # 4. Tailor resume via LLM
-        try:
-            tailored = await self._tailor_resume(profile, job_analysis)
-        except Exception as exc:
-            logger.error("LLM tailoring failed for user=%s job=%s: %s", user_id, job_id, exc)
-            return AgentOutput(
-                action="resume_tailoring_failed",
-                rationale=f"LLM tailoring error: {exc}",
-                confidence=0.0,
-                data={"error": "llm_failure"},
-            )
+        # 4. Plan which sections a similar, already-tailored job can supply
+        sections = split_master_resume(profile)
+        fingerprint = job_fingerprint(job_analysis)
+        history = await load_tailoring_history(user_id)
+        plan = plan_tailoring(sections, fingerprint, history)
+
+        # 5. Tailor the remaining sections via LLM
+        generated = None
+        usage = {"prompt_tokens": 0, "completion_tokens": 0, "latency_ms": 0.0}
+        if plan.regenerate:
+            try:
+                generated, usage = await self._tailor_resume(plan.regenerate, job_analysis)
+            except Exception as exc:
+                logger.error("LLM tailoring failed for user=%s job=%s: %s", user_id, job_id, exc)
+                return AgentOutput(
+                    action="resume_tailoring_failed",
+                    rationale=f"LLM tailoring error: {exc}",
+                    confidence=0.0,
+                    data={"error": "llm_failure"},
+                )
+        merged = self._merge_sections(sections, plan, generated)
+
+        # 6. Score keyword coverage locally (ATS analysis)
+        analysis = analyze_resume(
+            job_analysis["title"],
+            job_analysis["description"],
+            {"sections": [s.model_dump() for s in merged.sections]},
+            await load_idf_table(),
+        )
+        tailored = TailoredResume(
+            sections=merged.sections,
+            keywords_incorporated=analysis.matched,
+            keywords_missing=analysis.missing,
+            ats_score=analysis.score,
+            tailoring_rationale=merged.tailoring_rationale,
+        )
+        keyword_gaps = {
+            "matched": analysis.matched,
+            "missing": analysis.missing,
+            "match_rate": analysis.match_rate,
+        }
 
-        # 5. Calculate keyword gaps
-        keyword_gaps = self._calculate_keyword_gaps(job_analysis, tailored)
+        # 7. Store tailored document and remember its sections
+        document_id = await self._store_document(
+            user_id, job_id, tailored, analysis.to_dict()
+        )
 
-        # 6. Store tailored document
-        document_id = await self._store_document(user_id, job_id, tailored)
+        baseline = usage if plan.mode == "full" else (plan.baseline or usage)
+        await remember_tailoring(
+            user_id,
+            job_id,
+            sections,
+            fingerprint,
+            {normalize_section_name(s.section_name): s.model_dump() for s in tailored.sections},
+            baseline,
+        )
 
-        # 7. Build output
+        # 8. Build output
         sections_modified = [s.section_name for s in tailored.sections if s.changes_made]
+        tokens_used = usage["prompt_tokens"] + usage["completion_tokens"]
 
         return AgentOutput(
             action="resume_tailored",
@@ -169,6 +234,21 @@ class ResumeAgent(BaseAgent):
                 "sections_modified": sections_modified,
                 "keyword_gaps": keyword_gaps,
                 "keywords_incorporated": tailored.keywords_incorporated,
+                "tailoring": {
+                    "mode": plan.mode,
+                    "source_job_id": plan.source_job_id,
+                    "similarity": plan.similarity,
+                    "sections_reused": sorted(plan.reused),
+                    "sections_regenerated": [s.name for s in plan.regenerate],
+                    "tokens_used": tokens_used,
+                    "llm_latency_ms": usage["latency_ms"],
+                    "tokens_saved": max(
+                        baseline["prompt_tokens"] + baseline["completion_tokens"] - tokens_used, 0
+                    ),
+                    "latency_saved_ms": round(
+                        max(baseline["latency_ms"] - usage["latency_ms"], 0.0), 1
+                    ),
+                },
             },
         )
 
@@ -186,7 +266,7 @@ class ResumeAgent(BaseAgent):
             result = await session.execute(
                 text(
                     "SELECT id, title, company, description, location, "
-                    "salary_min, salary_max, employment_type, remote "
+                    "salary_min, salary_max, employment_type, remote, features "
                     "FROM jobs WHERE id = :jid"
                 ),
                 {"jid": job_id},
@@ -199,32 +279,12 @@ class ResumeAgent(BaseAgent):
         description = job.get("description") or ""
         title = job.get("title") or ""
 
-        # Extract keywords from description (simple word frequency approach)
-        words = description.lower().split()
-        # Filter common words, keep meaningful terms
-        stop_words = {
-            "the", "a", "an", "and", "or", "but", "in", "on", "at", "to",
-            "for", "of", "with", "by", "from", "is", "are", "was", "were",
-            "be", "been", "being", "have", "has", "had", "do", "does", "did",
-            "will", "would", "could", "should", "may", "might", "must",
-            "shall", "can", "need", "we", "you", "they", "it", "he", "she",
-            "this", "that", "these", "those", "our", "your", "their", "its",
-            "not", "no", "as", "if", "so", "up", "out", "about", "into",
-            "through", "during", "before", "after", "above", "below",
-            "between", "under", "over", "all", "each", "every", "both",
-            "few", "more", "most", "other", "some", "such", "than", "too",
-            "very", "just", "also", "now", "here", "there", "when", "where",
-            "how", "what", "which", "who", "whom", "why", "while",
-        }
-        keywords = [w.strip(".,;:!?()[]{}\"'") for w in words if len(w) > 2]
-        keywords = [w for w in keywords if w and w not in stop_words]
+        # Top description keywords, precomputed at upsert (jobs.features)
+        from types import SimpleNamespace
 
-        # Count frequency, take top keywords
-        freq: dict[str, int] = {}
-        for kw in keywords:
-            freq[kw] = freq.get(kw, 0) + 1
-        sorted_kw = sorted(freq.items(), key=lambda x: x[1], reverse=True)
-        top_keywords = [kw for kw, _ in sorted_kw[:30]]
+        from app.services.job_features import job_features
+
+        top_keywords = list(job_features(SimpleNamespace(**job)).keywords)
 
         return {
             "title": title,
@@ -235,34 +295,46 @@ class ResumeAgent(BaseAgent):
         }
 
     async def _tailor_resume(
-        self, profile: dict[str, Any], job_analysis: dict[str, Any]
-    ) -> TailoredResume:
-        """Call the LLM to produce a tailored resume."""
+        self, sections: list[ResumeSection], job_analysis: dict[str, Any]
+    ) -> tuple[TailoringResponse, dict[str, Any]]:
+        """Call the LLM to tailor the given master resume sections.
+
+        Returns the parsed output and the call's usage: ``prompt_tokens``,
+        ``completion_tokens`` and ``latency_ms``.
+        """
         from openai import AsyncOpenAI
 
         client = AsyncOpenAI()
 
-        # Build user message with profile and job context
-        user_message = self._build_tailoring_prompt(profile, job_analysis)
+        # Build user message with the sections and job context
+        user_message = self._build_tailoring_prompt(sections, job_analysis)
 
+        start = time.perf_counter()
         completion = await client.beta.chat.completions.parse(
             model="gpt-4o-mini",
             messages=[
                 {"role": "system", "content": _SYSTEM_PROMPT},
                 {"role": "user", "content": user_message},
             ],
-            response_format=TailoredResume,
+            response_format=TailoringResponse,
         )
+        latency_ms = round((time.perf_counter() - start) * 1000, 1)
 
         parsed = completion.choices[0].message.parsed
         if parsed is None:
             raise ValueError("LLM returned no parsed content")
 
+        usage = completion.usage
+        call_usage = {
+            "prompt_tokens": usage.prompt_tokens if usage else 0,
+            "completion_tokens": usage.completion_tokens if usage else 0,
+            "latency_ms": latency_ms,
+        }
+
         # Track cost
         try:
             from app.observability.cost_tracker import track_llm_cost
 
-            usage = completion.usage
             if usage:
                 await track_llm_cost(
                     user_id="system",
@@ -274,97 +346,79 @@ class ResumeAgent(BaseAgent):
         except Exception as exc:
             logger.debug("Cost tracking failed: %s", exc)
 
-        return parsed
+        return parsed, call_usage
 
     def _build_tailoring_prompt(
-        self, profile: dict[str, Any], job_analysis: dict[str, Any]
+        self, sections: list[ResumeSection], job_analysis: dict[str, Any]
     ) -> str:
-        """Build the user-facing prompt for resume tailoring."""
-        sections = []
-
-        sections.append("## TARGET JOB")
-        sections.append(f"Title: {job_analysis['title']}")
-        sections.append(f"Company: {job_analysis['company']}")
-        sections.append(f"Description:\n{job_analysis['description'][:3000]}")
-
-        sections.append("\n## USER'S MASTER RESUME DATA")
-
-        if profile.get("headline"):
-            sections.append(f"Headline: {profile['headline']}")
-
-        if profile.get("skills"):
-            skills = profile["skills"]
-            if isinstance(skills, list):
-                sections.append(f"Skills: {', '.join(skills)}")
-            else:
-                sections.append(f"Skills: {skills}")
-
-        if profile.get("experience"):
-            sections.append("\nExperience:")
-            exp = profile["experience"]
-            if isinstance(exp, list):
-                for item in exp:
-                    if isinstance(item, dict):
-                        sections.append(
-                            f"- {item.get('title', '')} at {item.get('company', '')} "
-                            f"({item.get('start_date', '')} - {item.get('end_date', 'Present')})"
-                        )
-                        if item.get("description"):
-                            sections.append(f"  {item['description']}")
-                    else:
-                        sections.append(f"- {item}")
-
-        if profile.get("education"):
-            sections.append("\nEducation:")
-            edu = profile["education"]
-            if isinstance(edu, list):
-                for item in edu:
-                    if isinstance(item, dict):
-                        sections.append(
-                            f"- {item.get('degree', '')} in {item.get('field', '')} "
-                            f"from {item.get('institution', '')} ({item.get('graduation_year', '')})"
-                        )
-                    else:
-                        sections.append(f"- {item}")
-
-        sections.append(
-            "\nPlease tailor the resume sections for this specific job. "
-            "Return each section with original and tailored content."
-        )
+        """Build the user-facing prompt for tailoring the given sections."""
+        lines = []
 
-        return "\n".join(sections)
+        lines.append("## TARGET JOB")
+        lines.append(f"Title: {job_analysis['title']}")
+        lines.append(f"Company: {job_analysis['company']}")
+        lines.append(f"Description:\n{job_analysis['description'][:3000]}")
 
-    def _calculate_keyword_gaps(
-        self, job_analysis: dict[str, Any], tailored: TailoredResume
-    ) -> dict[str, Any]:
-        """Compare job keywords with tailored resume content."""
-        job_keywords = set(job_analysis.get("keywords", []))
+        lines.append("\n## USER'S MASTER RESUME DATA")
+        for section in sections:
+            lines.append(f"\n[{section.name}]")
+            lines.append(section.content)
 
-        # Gather all text from tailored sections
-        tailored_text = " ".join(
-            s.tailored_content.lower() for s in tailored.sections
+        lines.append(
+            "\nPlease tailor the resume sections for this specific job. "
+            "Return each section with original and tailored content, using "
+            "the bracketed heading as its section_name."
         )
 
-        matched = []
-        missing = []
-        for kw in job_keywords:
-            if kw in tailored_text:
-                matched.append(kw)
-            else:
-                missing.append(kw)
+        return "\n".join(lines)
 
-        return {
-            "matched": matched,
-            "missing": missing,
-            "match_rate": len(matched) / max(len(job_keywords), 1),
-        }
+    def _merge_sections(
+        self,
+        sections: list[ResumeSection],
+        plan: TailoringPlan,
+        generated: TailoringResponse | None,
+    ) -> TailoringResponse:
+        """Combine reused and freshly generated sections in master order."""
+        if not plan.reused and generated is not None:
+            return generated
+
+        from app.services.resume_tailoring import normalize_section_name
+
+        by_name = (
+            {normalize_section_name(s.section_name): s for s in generated.sections}
+            if generated
+            else {}
+        )
+        merged = []
+        for section in sections:
+            if section.name in plan.reused:
+                merged.append(TailoredSection.model_validate(plan.reused[section.name]))
+            elif section.name in by_name:
+                merged.append(by_name.pop(section.name))
+        merged.extend(by_name.values())
+
+        reuse_note = (
+            f"Reused {len(plan.reused)} section(s) tailored for a similar job "
+            f"({plan.similarity:.0%} requirement overlap)."
+        )
+        return TailoringResponse(
+            sections=merged,
+            tailoring_rationale=(
+                f"{generated.tailoring_rationale} {reuse_note}" if generated else reuse_note
+            ),
+        )
 
     async def _store_document(
-        self, user_id: str, job_id: str, tailored: TailoredResume
+        self,
+        user_id: str,
+        job_id: str,
+        tailored: TailoredResume,
+        ats_analysis: dict[str, Any] | None = None,
     ) -> str:
         """Store the tailored resume as a Document record.
 
-        Auto-increments version for the same user+job combo.
+        Auto-increments version for the same user+job combo and caches
+        the ATS analysis on the row.
         Returns the new document ID as a string.
         """
         from uuid import uuid4
@@ -401,9 +455,10 @@ class ResumeAgent(BaseAgent):
 
             await session.execute(
                 text(
-                    "INSERT INTO documents (id, user_id, type, version, content, job_id, schema_version) "
+                    "INSERT INTO documents "
+                    "(id, user_id, type, version, content, job_id, schema_version, ats_analysis) "
                     "VALUES (:id, (SELECT id FROM users WHERE clerk_id = :uid), "
-                    "'resume', :ver, :content, :jid, 1)"
+                    "'resume', :ver, :content, :jid, 1, :ats)"
                 ),
                 {
                     "id": doc_id,
@@ -411,6 +466,7 @@ class ResumeAgent(BaseAgent):
                     "jid": job_id,
                     "ver": next_version,
                     "content": content,
+                    "ats": json.dumps(ats_analysis) if ats_analysis is not None else None,
                 },
             )
             await session.commit()
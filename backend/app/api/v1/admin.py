@@ -8,11 +8,12 @@ that the caller holds an organization admin role.
 
 from __future__ import annotations
 
+import asyncio
 import csv
 import io
 from datetime import date, datetime, timedelta
 from typing import List, Optional
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile
 from fastapi.responses import StreamingResponse
@@ -40,6 +41,7 @@ class BulkUploadResponse(BaseModel):
     invalid: int
     queued: int
     errors: List[RowErrorSchema]
+    errors_truncated: bool = False  # more than MAX_REPORTED_ERRORS invalid rows
 
 
 class InviteRequest(BaseModel):
@@ -142,59 +144,82 @@ async def bulk_upload_employees(
 ):
     """Upload a CSV of employee emails for bulk onboarding.
 
-    Parses and validates the CSV, queues valid rows for invitation
-    processing via a Celery task, and returns a summary with errors.
+    Streams and validates the CSV a chunk at a time, queues each chunk's
+    valid rows for invitation processing via a Celery task, and returns a
+    summary with the first MAX_REPORTED_ERRORS row errors (``invalid``
+    counts all of them). Header and row-cap errors are caught by a first
+    pass, before anything is queued. The admin gets one
+    ``system.onboarding.completed`` event once every chunk is processed.
     """
+    import redis.asyncio as aioredis
+
+    from app.config import settings
     from app.db.engine import AsyncSessionLocal
     from app.services.enterprise.audit import log_audit_event
-    from app.services.enterprise.csv_onboarding import CSVOnboardingService
+    from app.services.enterprise.bulk_onboarding import seal_upload, track_upload_chunk
+    from app.services.enterprise.csv_onboarding import (
+        MAX_REPORTED_ERRORS,
+        CSVOnboardingService,
+    )
+    from app.worker.tasks import bulk_onboard_employees
 
-    content = await file.read()
     service = CSVOnboardingService()
 
     try:
-        rows = service.parse_csv(content)
+        total = await asyncio.to_thread(service.count_rows, file.file)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
 
-    async with AsyncSessionLocal() as session:
-        async with session.begin():
-            validation = await service.validate_rows(rows, admin_ctx.org_id, session)
-
+    upload_id = uuid4().hex
+    r = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+    try:
+        async with AsyncSessionLocal() as session:
+            errors = []
+            invalid = 0
             queued = 0
-            if validation.valid_rows:
-                from app.worker.tasks import bulk_onboard_employees
-
-                bulk_onboard_employees.delay(
-                    org_id=admin_ctx.org_id,
-                    valid_rows=validation.valid_rows,
+            async for chunk in service.validate_stream(file.file, admin_ctx.org_id, session):
+                # End the lookup's read transaction so no connection is held
+                # while the next chunk is parsed
+                await session.commit()
+                invalid += len(chunk.invalid_rows)
+                errors.extend(
+                    RowErrorSchema(
+                        row_number=e.row_number,
+                        email=e.email,
+                        error_reason=e.error_reason,
+                    )
+                    for e in chunk.invalid_rows[:MAX_REPORTED_ERRORS - len(errors)]
                 )
-                queued = len(validation.valid_rows)
+                if chunk.valid_rows:
+                    await track_upload_chunk(r, upload_id)
+                    bulk_onboard_employees.delay(
+                        org_id=admin_ctx.org_id,
+                        valid_rows=chunk.valid_rows,
+                        invited_by=admin_ctx.user_id,
+                        org_name=admin_ctx.org_name,
+                        upload_id=upload_id,
+                    )
+                    queued += len(chunk.valid_rows)
+            await seal_upload(r, upload_id, admin_ctx.user_id, admin_ctx.org_id)
 
             summary = {
-                "total": len(rows),
-                "valid": len(validation.valid_rows),
-                "invalid": len(validation.invalid_rows),
+                "total": total,
+                "valid": queued,
+                "invalid": invalid,
                 "queued": queued,
             }
 
-            await log_audit_event(
-                session=session,
-                org_id=admin_ctx.org_id,
-                actor_id=admin_ctx.user_id,
-                action="bulk_upload",
-                resource_type="csv_onboarding",
-                changes=summary,
-            )
-
-    errors = [
-        RowErrorSchema(
-            row_number=e.row_number,
-            email=e.email,
-            error_reason=e.error_reason,
-        )
-        for e in validation.invalid_rows
-    ]
+            async with session.begin():
+                await log_audit_event(
+                    session=session,
+                    org_id=admin_ctx.org_id,
+                    actor_id=admin_ctx.user_id,
+                    action="bulk_upload",
+                    resource_type="csv_onboarding",
+                    changes=summary,
+                )
+    finally:
+        await r.aclose()
 
     return BulkUploadResponse(
         total=summary["total"],
@@ -202,6 +227,7 @@ async def bulk_upload_employees(
         invalid=summary["invalid"],
         queued=summary["queued"],
         errors=errors,
+        errors_truncated=invalid > len(errors),
     )
 
 
@@ -267,6 +267,7 @@ async def update_pii_config(
     from app.services.enterprise.pii_detection import (
         DEFAULT_PATTERNS,
         PIIDetectionService,
+        invalidate_scanner,
     )
 
     # Validate regexes compile
@@ -298,6 +299,9 @@ async def update_pii_config(
                 .values(settings=current_settings)
             )
 
+    # Recompile the org's scanner on its next scan
+    invalidate_scanner(admin_ctx.org_id)
+
     return PIIConfigResponse(
         patterns=pattern_dicts,
         whitelist=body.whitelist,
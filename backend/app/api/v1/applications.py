@@ -7,15 +7,18 @@ Provides:
     - POST /applications/queue/{id}/approve  -- approve and dispatch
     - POST /applications/queue/{id}/reject   -- reject application
     - POST /applications/queue/batch-approve -- approve multiple items
+    - POST /applications/queue/batch-approve/stream -- same, NDJSON per item
 """
 
 from __future__ import annotations
 
+import json
 import logging
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from app.auth.clerk import get_current_user_id
@@ -541,42 +544,68 @@ async def reject_item(
     return {"status": "rejected", "item_id": item_id}
 
 
-@router.post("/queue/batch-approve", response_model=BatchApproveResponse)
-async def batch_approve(
-    body: BatchApproveRequest,
-    user_id: str = Depends(get_current_user_id),
-):
-    """Approve multiple pending applications at once."""
+def _require_item_ids(body: BatchApproveRequest) -> None:
     if not body.item_ids:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="item_ids list cannot be empty",
         )
 
-    approved = 0
-    failed = 0
-    details = []
 
-    for item_id in body.item_ids:
-        try:
-            await approve_item(item_id=item_id, user_id=user_id)
-            approved += 1
-            details.append({"item_id": item_id, "status": "approved"})
-        except HTTPException as exc:
-            failed += 1
-            details.append({
-                "item_id": item_id,
-                "status": "failed",
-                "error": exc.detail,
-            })
+@router.post("/queue/batch-approve", response_model=BatchApproveResponse)
+async def batch_approve(
+    body: BatchApproveRequest,
+    user_id: str = Depends(get_current_user_id),
+):
+    """Approve multiple pending applications at once.
+
+    Missing cover letters are generated first; see
+    ``app.services.batch_apply.approve_batch``.
+    """
+    from app.services.batch_apply import approve_batch
+
+    _require_item_ids(body)
+
+    details = [
+        result
+        async for result in approve_batch(user_id, body.item_ids)
+        if result["status"] in ("approved", "failed")
+    ]
+    approved = sum(1 for d in details if d["status"] == "approved")
 
     return BatchApproveResponse(
         approved=approved,
-        failed=failed,
+        failed=len(details) - approved,
         details=details,
     )
 
 
+@router.post("/queue/batch-approve/stream")
+async def batch_approve_stream(
+    body: BatchApproveRequest,
+    user_id: str = Depends(get_current_user_id),
+):
+    """Approve multiple pending applications, streaming per-item results.
+
+    Emits one JSON object per line as each item settles (including
+    ``cover_letter_generated`` progress lines), then a final
+    ``{"status": "complete", "approved": n, "failed": n}`` line.
+    """
+    from app.services.batch_apply import approve_batch
+
+    _require_item_ids(body)
+
+    async def _lines():
+        counts = {"approved": 0, "failed": 0}
+        async for result in approve_batch(user_id, body.item_ids):
+            if result["status"] in counts:
+                counts[result["status"]] += 1
+            yield json.dumps(result) + "\n"
+        yield json.dumps({"status": "complete", **counts}) + "\n"
+
+    return StreamingResponse(_lines(), media_type="application/x-ndjson")
+
+
 # ---------------------------------------------------------------------------
 # Follow-up suggestions endpoints (Story 6-7)
 # ---------------------------------------------------------------------------
@@ -326,7 +326,8 @@ async def get_document_diff(
         # 1. Load the tailored document (verify ownership + type + has job_id)
         doc_result = await session.execute(
             text("""
-                SELECT d.id, d.type, d.content, d.job_id, d.version, d.created_at
+                SELECT d.id, d.type, d.content, d.job_id, d.version, d.created_at,
+                       d.ats_analysis
                 FROM documents d
                 JOIN users u ON d.user_id = u.id
                 WHERE d.id = :doc_id::uuid
@@ -423,15 +424,28 @@ async def get_document_diff(
             "change_type": change_type,
         })
 
+    # 6. ATS metrics: the cached local analysis when present
+    from app.services.ats_scoring import is_current
+
+    analysis = tailored_row.get("ats_analysis")
+    if is_current(analysis):
+        ats_score = analysis["score"]
+        keywords_incorporated = analysis["matched"]
+        keywords_missing = analysis["missing"]
+    else:
+        ats_score = tailored_content.get("ats_score")
+        keywords_incorporated = tailored_content.get("keywords_incorporated", [])
+        keywords_missing = tailored_content.get("keywords_missing", [])
+
     return {
         "document_id": str(tailored_row["id"]),
         "master_document_id": str(master_row["id"]),
         "version": tailored_row["version"],
         "job": job_context,
         "sections": sections_diff,
-        "ats_score": tailored_content.get("ats_score"),
-        "keywords_incorporated": tailored_content.get("keywords_incorporated", []),
-        "keywords_missing": tailored_content.get("keywords_missing", []),
+        "ats_score": ats_score,
+        "keywords_incorporated": keywords_incorporated,
+        "keywords_missing": keywords_missing,
         "tailoring_rationale": tailored_content.get("tailoring_rationale", ""),
     }
 
@@ -452,6 +466,54 @@ _ATS_FORMAT_RECOMMENDATIONS = [
 ]
 
 
+def _ats_response(document_id: str, analysis: dict) -> dict:
+    """ATS analysis response body from a cached ``ats_scoring`` analysis."""
+    ats_score = analysis.get("score", 0)
+    keywords_missing = analysis.get("missing", [])
+
+    # Build warning if score < 70
+    warning = None
+    if ats_score < 70 and keywords_missing:
+        missing_list = ", ".join(keywords_missing[:10])
+        warning = f"Consider adding: {missing_list}"
+
+    return {
+        "document_id": document_id,
+        "ats_score": ats_score,
+        "keywords_matched": analysis.get("matched", []),
+        "keywords_missing": keywords_missing,
+        "match_rate": analysis.get("match_rate", 0.0),
+        "warning": warning,
+        "format_recommendations": _ATS_FORMAT_RECOMMENDATIONS,
+    }
+
+
+@router.get("/ats-analysis")
+async def list_ats_analyses(
+    refresh: bool = Query(False, description="Recompute cached analyses"),
+    user_id: str = Depends(get_current_user_id),
+):
+    """
+    Return ATS analysis for every tailored resume of the user.
+
+    Analyses are cached on each document; missing or outdated ones (all
+    of them with ``refresh``) are computed locally in one pass and stored.
+    """
+    from app.db.engine import AsyncSessionLocal
+    from app.services.ats_scoring import analyze_user_documents
+
+    async with AsyncSessionLocal() as session:
+        results = await analyze_user_documents(session, user_id, refresh=refresh)
+
+    return {
+        "documents": [
+            {**_ats_response(r["document_id"], r["analysis"]), "job_id": r["job_id"]}
+            for r in results
+        ],
+        "total": len(results),
+    }
+
+
 @router.get("/{document_id}/ats-analysis")
 async def get_ats_analysis(
     document_id: str,
@@ -461,17 +523,19 @@ async def get_ats_analysis(
     Return ATS (Applicant Tracking System) analysis for a tailored resume.
 
     Includes ATS score, keyword match analysis, warnings for low scores,
-    and format recommendations.
+    and format recommendations. The analysis is cached on the document;
+    it is computed locally (TF-IDF keyword coverage) on first request.
     """
     from sqlalchemy import text
 
     from app.db.engine import AsyncSessionLocal
+    from app.services.ats_scoring import analyze_user_documents, is_current
 
     async with AsyncSessionLocal() as session:
         # Load the tailored document (verify ownership + type + has job_id)
         doc_result = await session.execute(
             text("""
-                SELECT d.id, d.type, d.content, d.job_id
+                SELECT d.id, d.type, d.job_id, d.ats_analysis
                 FROM documents d
                 JOIN users u ON d.user_id = u.id
                 WHERE d.id = :doc_id::uuid
@@ -495,34 +559,17 @@ async def get_ats_analysis(
                 detail="ATS analysis is only available for tailored resumes (documents with a job_id).",
             )
 
-    # Parse content JSON
-    try:
-        content = json.loads(row["content"]) if row["content"] else {}
-    except (json.JSONDecodeError, TypeError):
-        content = {}
-
-    ats_score = content.get("ats_score", 0)
-    keywords_matched = content.get("keywords_incorporated", [])
-    keywords_missing = content.get("keywords_missing", [])
-
-    total_keywords = len(keywords_matched) + len(keywords_missing)
-    match_rate = len(keywords_matched) / max(total_keywords, 1)
-
-    # Build warning if score < 70
-    warning = None
-    if ats_score < 70 and keywords_missing:
-        missing_list = ", ".join(keywords_missing[:10])
-        warning = f"Consider adding: {missing_list}"
+        analysis = row.get("ats_analysis")
+        if not is_current(analysis):
+            results = await analyze_user_documents(session, user_id, [str(row["id"])])
+            if not results:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Document not found.",
+                )
+            analysis = results[0]["analysis"]
 
-    return {
-        "document_id": str(row["id"]),
-        "ats_score": ats_score,
-        "keywords_matched": keywords_matched,
-        "keywords_missing": keywords_missing,
-        "match_rate": round(match_rate, 2),
-        "warning": warning,
-        "format_recommendations": _ATS_FORMAT_RECOMMENDATIONS,
-    }
+    return _ats_response(str(row["id"]), analysis)
 
 
 class CoverLetterRequest(BaseModel):
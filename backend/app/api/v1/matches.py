@@ -4,29 +4,58 @@ Matches API endpoints.
 Provides endpoints for listing and updating job matches:
   - GET /matches — paginated list filtered by status, with joined Job data
   - PATCH /matches/{match_id} — update match status (new -> saved/dismissed)
+  - POST /matches/swipes — apply many status changes in one request
+
+``GET /matches`` supports two pagination modes. Offset mode (``page``) is
+kept for existing clients; keyset mode (``cursor``) seeks directly to the
+next ``(score, id)`` position using ``ix_matches_user_status_score_id`` so
+deep pages cost the same as the first. Every response carries a
+``next_cursor`` so clients can switch to keyset mode after page 1. Totals
+are cached briefly in Redis instead of re-running ``COUNT(*)`` per page.
+
+The first pages of each feed and ``/top-pick`` are served from the
+pre-rendered window in ``app.services.match_feed_cache``, which is
+invalidated by a per-user version bump whenever matches change.
 """
 
 from __future__ import annotations
 
+import base64
+import json
 import logging
 from datetime import datetime
-from typing import List, Optional
+from decimal import Decimal, InvalidOperation
+from typing import List, Optional, Tuple
+from uuid import UUID, uuid4
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from pydantic import BaseModel, Field, field_validator
-from sqlalchemy import func, select
+from sqlalchemy import and_, case, func, insert, literal, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.auth.clerk import get_current_user_id
 from app.db.models import Job, Match, MatchStatus, SwipeEvent, User
 from app.db.session import get_db
+from app.services import match_feed_cache
 from app.services.job_scoring import parse_rationale
+from app.services.match_feed_cache import FEED_WINDOW_SIZE, FeedWindow
+from app.services.preference_learning import record_swipe_stats, schedule_pattern_detection
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/matches", tags=["matches"])
 
+# List views return descriptions trimmed to this many characters in
+# ``description=truncated`` mode.
+DESCRIPTION_PREVIEW_CHARS = 300
+
+# Short-lived cache for per-(user, status) totals shown in pagination meta.
+_TOTAL_CACHE_TTL_SECONDS = 60
+
+# Upper bound on status changes accepted by POST /matches/swipes.
+MAX_BULK_SWIPES = 100
+
 
 # ============================================================
 # ensure_user_exists dependency
@@ -83,10 +112,11 @@ class MatchResponse(BaseModel):
 
 
 class PaginationMeta(BaseModel):
-    page: int
+    page: Optional[int] = None  # None in cursor mode
     per_page: int
     total: int
     total_pages: int
+    next_cursor: Optional[str] = None
 
 
 class MatchListMeta(BaseModel):
@@ -109,13 +139,111 @@ class MatchStatusUpdate(BaseModel):
         return v
 
 
+class SwipeItem(MatchStatusUpdate):
+    match_id: UUID
+
+
+class BulkSwipeRequest(BaseModel):
+    swipes: List[SwipeItem] = Field(min_length=1, max_length=MAX_BULK_SWIPES)
+
+
+class BulkSwipeResponse(BaseModel):
+    updated: List[str]
+    skipped: List[str]  # not found, not owned, or no longer 'new'
+
+
 # ============================================================
 # Helpers
 # ============================================================
 
 
-def _match_to_response(match: Match) -> MatchResponse:
-    """Convert an ORM Match (with loaded job) to a MatchResponse."""
+def _sort_score(match: Match) -> Optional[str]:
+    return None if match.score is None else str(match.score)
+
+
+def _encode_sort_key(score: Optional[str], match_id: str) -> str:
+    raw = json.dumps([score, str(match_id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _encode_cursor(match: Match) -> str:
+    """Encode a match's ``(score, id)`` sort key as an opaque cursor."""
+    return _encode_sort_key(_sort_score(match), match.id)
+
+
+def _decode_cursor(cursor: str) -> Tuple[Optional[Decimal], str]:
+    """Decode a cursor from ``_encode_cursor``; raises HTTP 400 if malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        score, match_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return (None if score is None else Decimal(score)), str(UUID(match_id))
+    except (ValueError, TypeError, AttributeError, InvalidOperation):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _after_cursor(score: Optional[Decimal], match_id: str):
+    """Keyset predicate for rows after ``(score, id)`` in feed order.
+
+    Feed order is ``score DESC, id ASC``; PostgreSQL sorts NULL scores
+    first under DESC, so a NULL cursor continues through the remaining
+    NULL-score rows and then all scored rows. The redundant
+    ``score <= cursor`` bound is what lets the feed index seek; the OR
+    alone is only applied as a filter, scanning every row before the cursor.
+    """
+    if score is None:
+        return or_(
+            and_(Match.score.is_(None), Match.id > match_id),
+            Match.score.is_not(None),
+        )
+    return and_(
+        Match.score <= score,
+        or_(
+            Match.score < score,
+            and_(Match.score == score, Match.id > match_id),
+        ),
+    )
+
+
+async def _count_matches(db: AsyncSession, user_id, match_status: MatchStatus) -> int:
+    """Return the match total for a status, cached briefly in Redis."""
+    from app.cache.redis_client import cache_get, cache_set
+
+    key = match_feed_cache.total_key(user_id, match_status.value)
+    try:
+        cached = await cache_get(key)
+        if cached is not None:
+            return int(cached)
+    except Exception as exc:
+        logger.debug("Match total cache read failed: %s", exc)
+
+    count_q = (
+        select(func.count())
+        .select_from(Match)
+        .where(Match.user_id == user_id, Match.status == match_status)
+    )
+    total = (await db.execute(count_q)).scalar_one()
+
+    try:
+        await cache_set(key, str(total), ttl=_TOTAL_CACHE_TTL_SECONDS)
+    except Exception as exc:
+        logger.debug("Match total cache write failed: %s", exc)
+    return total
+
+
+def _trim_description(description: Optional[str], mode: str) -> Optional[str]:
+    if description is None:
+        return None
+    if mode == "truncated" and len(description) > DESCRIPTION_PREVIEW_CHARS:
+        return description[:DESCRIPTION_PREVIEW_CHARS].rstrip() + "…"
+    return description
+
+
+def _match_to_response(match: Match, description: str = "full") -> MatchResponse:
+    """Convert an ORM Match (with loaded job) to a MatchResponse.
+
+    ``description`` is ``"full"``, ``"truncated"`` or ``"none"``; in
+    ``"none"`` mode the column is deferred and must not be touched.
+    """
     job = match.job
     rationale_dict = parse_rationale(match.rationale)
 
@@ -133,7 +261,7 @@ def _match_to_response(match: Match) -> MatchResponse:
             salary_min=job.salary_min,
             salary_max=job.salary_max,
             url=job.url,
-            description=job.description,
+            description=None if description == "none" else _trim_description(job.description, description),
             employment_type=job.employment_type,
             h1b_sponsor_status=job.h1b_sponsor_status.value if hasattr(job.h1b_sponsor_status, 'value') else (str(job.h1b_sponsor_status) if job.h1b_sponsor_status else None),
             posted_at=job.posted_at.isoformat() if isinstance(job.posted_at, datetime) else None,
@@ -143,6 +271,55 @@ def _match_to_response(match: Match) -> MatchResponse:
     )
 
 
+async def _feed_window(
+    db: AsyncSession, user_id, match_status: MatchStatus, offset: int, limit: int
+) -> Optional[FeedWindow]:
+    """Return a current cached window covering ``[offset, offset + limit)``.
+
+    Rebuilds the window from the database on a miss. Returns None if Redis
+    is unavailable so the caller can fall back to its own query.
+    """
+    window, version = await match_feed_cache.get_window(user_id, match_status.value)
+    if window is not None and window.covers(offset, limit):
+        return window
+    if version is None:
+        return None
+
+    result = await db.execute(
+        select(Match)
+        .options(selectinload(Match.job))
+        .where(Match.user_id == user_id, Match.status == match_status)
+        .order_by(Match.score.desc(), Match.id)
+        .limit(FEED_WINDOW_SIZE + 1)
+    )
+    rows = list(result.scalars().all())
+    complete = len(rows) <= FEED_WINDOW_SIZE
+    rows = rows[:FEED_WINDOW_SIZE]
+    total = len(rows) if complete else await _count_matches(db, user_id, match_status)
+
+    window = FeedWindow(
+        version=version,
+        total=total,
+        items=[
+            {"sort_score": _sort_score(m), "match": _match_to_response(m).model_dump()}
+            for m in rows
+        ],
+        complete=complete,
+    )
+    await match_feed_cache.store_window(user_id, match_status.value, window)
+    return window
+
+
+def _cached_to_response(item: dict, description: str = "full") -> MatchResponse:
+    """Rebuild a MatchResponse from a window item, trimming the description."""
+    response = MatchResponse.model_validate(item["match"])
+    if description == "none":
+        response.job.description = None
+    else:
+        response.job.description = _trim_description(response.job.description, description)
+    return response
+
+
 # ============================================================
 # Endpoints
 # ============================================================
@@ -153,10 +330,23 @@ async def get_matches(
     user: User = Depends(ensure_user_exists),
     db: AsyncSession = Depends(get_db),
     status: str = Query(default="new", description="Filter by match status"),
-    page: int = Query(default=1, ge=1, description="Page number"),
+    page: int = Query(default=1, ge=1, description="Page number (offset mode)"),
     per_page: int = Query(default=20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(
+        default=None,
+        description="Opaque next_cursor from a previous page (keyset mode; overrides page)",
+    ),
+    description: str = Query(
+        default="full",
+        pattern="^(full|truncated|none)$",
+        description="Job description detail: full, truncated preview, or none",
+    ),
 ):
-    """Return paginated matches for the current user, filtered by status."""
+    """Return paginated matches for the current user, filtered by status.
+
+    Results are ordered by ``score DESC, id ASC``. Pass ``cursor`` for
+    keyset pagination; otherwise ``page`` selects an offset page.
+    """
     # Validate status
     try:
         match_status = MatchStatus(status)
@@ -166,38 +356,65 @@ async def get_matches(
             detail=f"Invalid status '{status}'. Valid values: {[s.value for s in MatchStatus]}",
         )
 
-    # Count total
-    count_q = (
-        select(func.count())
-        .select_from(Match)
-        .where(Match.user_id == user.id, Match.status == match_status)
-    )
-    total_result = await db.execute(count_q)
-    total = total_result.scalar_one()
-
-    # Fetch page
     offset = (page - 1) * per_page
+    if cursor is None and page * per_page <= FEED_WINDOW_SIZE:
+        window = await _feed_window(db, user.id, match_status, offset, per_page)
+        if window is not None:
+            items = window.items[offset:offset + per_page]
+            has_more = offset + per_page < window.total and bool(items)
+            next_cursor = (
+                _encode_sort_key(items[-1]["sort_score"], items[-1]["match"]["id"])
+                if has_more else None
+            )
+            return MatchListResponse(
+                data=[_cached_to_response(item, description) for item in items],
+                meta=MatchListMeta(
+                    pagination=PaginationMeta(
+                        page=page,
+                        per_page=per_page,
+                        total=window.total,
+                        total_pages=max(1, (window.total + per_page - 1) // per_page),
+                        next_cursor=next_cursor,
+                    )
+                ),
+            )
+
+    total = await _count_matches(db, user.id, match_status)
+
+    job_loader = selectinload(Match.job)
+    if description == "none":
+        job_loader = job_loader.defer(Job.description)
+
+    # Fetch page (one row extra to know whether a next page exists)
     q = (
         select(Match)
-        .options(selectinload(Match.job))
+        .options(job_loader)
         .where(Match.user_id == user.id, Match.status == match_status)
-        .order_by(Match.score.desc())
-        .offset(offset)
-        .limit(per_page)
+        .order_by(Match.score.desc(), Match.id)
+        .limit(per_page + 1)
     )
+    if cursor is not None:
+        q = q.where(_after_cursor(*_decode_cursor(cursor)))
+    else:
+        q = q.offset(offset)
     result = await db.execute(q)
-    matches = result.scalars().all()
+    matches = list(result.scalars().all())
+
+    has_more = len(matches) > per_page
+    matches = matches[:per_page]
+    next_cursor = _encode_cursor(matches[-1]) if has_more else None
 
     total_pages = max(1, (total + per_page - 1) // per_page)
 
     return MatchListResponse(
-        data=[_match_to_response(m) for m in matches],
+        data=[_match_to_response(m, description) for m in matches],
         meta=MatchListMeta(
             pagination=PaginationMeta(
-                page=page,
+                page=None if cursor is not None else page,
                 per_page=per_page,
                 total=total,
                 total_pages=total_pages,
+                next_cursor=next_cursor,
             )
         ),
     )
@@ -208,12 +425,21 @@ async def get_top_pick(
     user: User = Depends(ensure_user_exists),
     db: AsyncSession = Depends(get_db),
 ):
-    """Return the single highest-scoring 'new' match for the current user."""
+    """Return the single highest-scoring 'new' match for the current user.
+
+    Served from the head of the cached ``new`` feed window when available.
+    """
+    window = await _feed_window(db, user.id, MatchStatus.NEW, 0, 1)
+    if window is not None:
+        if not window.items:
+            return Response(status_code=204)
+        return _cached_to_response(window.items[0])
+
     q = (
         select(Match)
         .options(selectinload(Match.job))
         .where(Match.user_id == user.id, Match.status == MatchStatus.NEW)
-        .order_by(Match.score.desc())
+        .order_by(Match.score.desc(), Match.id)
         .limit(1)
     )
     result = await db.execute(q)
@@ -268,5 +494,96 @@ async def update_match_status(
     )
     db.add(swipe_event)
     await db.flush()
+    await record_swipe_stats(
+        user.id,
+        [{
+            "action": body.status,
+            "job_company": swipe_event.job_company,
+            "job_location": swipe_event.job_location,
+            "job_remote": swipe_event.job_remote,
+            "job_employment_type": swipe_event.job_employment_type,
+        }],
+        db,
+    )
+
+    # Commit before invalidating so a concurrent feed rebuild cannot cache
+    # the pre-swipe rows under the new version.
+    await db.commit()
+    await match_feed_cache.remove_from_window(user.id, match.id)
+    await schedule_pattern_detection(user.id)
 
     return _match_to_response(match)
+
+
+@router.post("/swipes", response_model=BulkSwipeResponse)
+async def bulk_update_match_status(
+    body: BulkSwipeRequest,
+    user: User = Depends(ensure_user_exists),
+    db: AsyncSession = Depends(get_db),
+):
+    """Apply many new -> saved/dismissed transitions at once.
+
+    Uses a single ``UPDATE ... FROM jobs ... RETURNING`` for every match
+    still in ``new``, one multi-row ``SwipeEvent`` insert built from the
+    returned job attributes and one swipe-statistics upsert. Matches that
+    are missing, owned by someone else or already swiped are reported in
+    ``skipped``. If a match appears more than once, the last status wins.
+    """
+    statuses = {str(item.match_id): item.status for item in body.swipes}
+    dismissed = [mid for mid, s in statuses.items() if s == "dismissed"]
+    status_type = Match.__table__.c.status.type
+
+    result = await db.execute(
+        update(Match)
+        .where(
+            Match.id.in_(list(statuses)),
+            Match.user_id == user.id,
+            Match.status == MatchStatus.NEW,
+            Match.job_id == Job.id,
+        )
+        .values(
+            status=case(
+                (Match.id.in_(dismissed), literal(MatchStatus.DISMISSED, status_type)),
+                else_=literal(MatchStatus.SAVED, status_type),
+            )
+        )
+        .returning(
+            Match.id,
+            Job.company,
+            Job.location,
+            Job.remote,
+            Job.salary_min,
+            Job.salary_max,
+            Job.employment_type,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    rows = result.all()
+
+    if rows:
+        events = [
+            {
+                "id": uuid4(),
+                "user_id": user.id,
+                "match_id": row.id,
+                "action": statuses[str(row.id)],
+                "job_company": row.company,
+                "job_location": row.location,
+                "job_remote": row.remote,
+                "job_salary_min": row.salary_min,
+                "job_salary_max": row.salary_max,
+                "job_employment_type": row.employment_type,
+            }
+            for row in rows
+        ]
+        await db.execute(insert(SwipeEvent).values(events))
+        await record_swipe_stats(user.id, events, db)
+        await db.commit()
+        await match_feed_cache.remove_from_window(user.id, *(row.id for row in rows))
+        await schedule_pattern_detection(user.id)
+
+    updated = {str(row.id) for row in rows}
+    return BulkSwipeResponse(
+        updated=[mid for mid in statuses if mid in updated],
+        skipped=[mid for mid in statuses if mid not in updated],
+    )
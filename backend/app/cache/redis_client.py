@@ -6,22 +6,33 @@ health check, and graceful shutdown. All Redis-dependent modules
 should use this instead of creating their own connections.
 """
 
+import asyncio
+
 import redis.asyncio as redis
 
 from app.config import settings
 
 _pool: redis.ConnectionPool | None = None
+_pool_loop: asyncio.AbstractEventLoop | None = None
 
 
 async def get_redis_pool() -> redis.ConnectionPool:
-    """Get or create the shared connection pool."""
-    global _pool
-    if _pool is None:
+    """Get or create the shared connection pool.
+
+    Connections belong to the event loop that opened them. Celery tasks run
+    each coroutine in a fresh loop (``asyncio.run``), so the pool is
+    recreated when the running loop changes instead of handing out
+    connections bound to a closed loop.
+    """
+    global _pool, _pool_loop
+    loop = asyncio.get_running_loop()
+    if _pool is None or _pool_loop is not loop:
         _pool = redis.ConnectionPool.from_url(
             settings.REDIS_URL,
             max_connections=20,
             decode_responses=True,
         )
+        _pool_loop = loop
     return _pool
 
 
@@ -60,7 +71,8 @@ async def redis_health_check() -> bool:
 
 async def close_redis_pool() -> None:
     """Close the connection pool on app shutdown."""
-    global _pool
+    global _pool, _pool_loop
     if _pool is not None:
         await _pool.disconnect()
         _pool = None
+        _pool_loop = None
@@ -69,6 +69,12 @@ class Settings(BaseSettings):
     # --- Job Matching ---
     MATCH_SCORE_THRESHOLD: int = 40
     LLM_SCORING_ENABLED: bool = True
+    # Jobs sent to LLM refinement per scout run, picked by embedding
+    # similarity to the user's profile (0 refines every job).
+    SEMANTIC_TOP_K: int = 25
+    SEMANTIC_EMBEDDING_PROVIDER: str = "local"  # "local" (lexical hashing fallback) or "openai"
+    # Match jobs a scout run inserts against every other user's preferences.
+    REVERSE_MATCHING_ENABLED: bool = True
 
     # --- Google OAuth (Gmail integration) ---
     GOOGLE_CLIENT_ID: str = ""
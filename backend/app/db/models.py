@@ -13,7 +13,9 @@ from uuid import uuid4
 from sqlalchemy import (
     Boolean,
     Column,
+    Date,
     DateTime,
+    Float,
     Enum,
     ForeignKey,
     Index,
@@ -308,6 +310,36 @@ class AuditLog(Base):
     actor = relationship("User")
 
 
+class OrgDailyMetric(TimestampMixin, Base):
+    """Per-(org, UTC day) outcome counters for enterprise dashboards.
+
+    Maintained by the rollup tasks in ``enterprise.metrics_rollup`` so
+    metrics and ROI reports are range sums over a few rows per day instead
+    of scans of the raw applications and activity tables. Applications are
+    bucketed by ``applied_at``; ``active_user_ids`` backs distinct active
+    counts over a range and is never returned by the services.
+    """
+
+    __tablename__ = "org_daily_metrics"
+    __table_args__ = (
+        UniqueConstraint("org_id", "day", name="uq_org_daily_metric"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    org_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("organizations.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    day = Column(Date, nullable=False)
+    applications = Column(Integer, nullable=False, default=0)
+    interviews = Column(Integer, nullable=False, default=0)  # interview or offer
+    placements = Column(Integer, nullable=False, default=0)  # offer
+    placement_days_sum = Column(Float, nullable=False, default=0.0)  # enrollment -> offer
+    jobs_reviewed = Column(Integer, nullable=False, default=0)
+    active_user_ids = Column(ARRAY(UUID(as_uuid=True)), server_default="{}")
+
+
 class Invitation(Base):
     """Employee invitation record for enterprise onboarding.
 
@@ -401,6 +433,7 @@ class Job(TimestampMixin, Base):
     source_id = Column(Text, nullable=True)  # External API job ID
     raw_data = Column(JSONB, nullable=True)  # Full API response
     posted_at = Column(DateTime(timezone=True), nullable=True)
+    features = Column(JSONB, nullable=True)  # Scoring features (job_features)
 
     # Relationships
     applications = relationship("Application", back_populates="job")
@@ -433,6 +466,17 @@ class Application(SoftDeleteMixin, TimestampMixin, Base):
 
 class Match(SoftDeleteMixin, TimestampMixin, Base):
     __tablename__ = "matches"
+    __table_args__ = (
+        # Serves the feed's ORDER BY and keyset predicate (see api/v1/matches.py)
+        Index(
+            "ix_matches_user_status_score_id",
+            "user_id",
+            "status",
+            text("score DESC"),
+            "id",
+        ),
+        UniqueConstraint("user_id", "job_id", name="uq_matches_user_job"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     user_id = Column(
@@ -505,6 +549,30 @@ class LearnedPreference(SoftDeleteMixin, TimestampMixin, Base):
     user = relationship("User", backref="learned_preferences")
 
 
+class SwipePatternStat(TimestampMixin, Base):
+    """Running per-user swipe counts for one job attribute value.
+
+    Maintained by upsert as swipes are recorded so preference learning is
+    a threshold query over these counters instead of a swipe-log rescan.
+    """
+
+    __tablename__ = "swipe_pattern_stats"
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id", "pattern_type", "pattern_value", name="uq_swipe_pattern_stat"
+        ),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    user_id = Column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    pattern_type = Column(Text, nullable=False)  # company | location | remote | employment_type
+    pattern_value = Column(Text, nullable=False)
+    total = Column(Integer, nullable=False, default=0)
+    dismissed = Column(Integer, nullable=False, default=0)
+
+
 class Document(SoftDeleteMixin, TimestampMixin, Base):
     __tablename__ = "documents"
 
@@ -523,12 +591,28 @@ class Document(SoftDeleteMixin, TimestampMixin, Base):
         nullable=True,
     )
     schema_version = Column(Integer, nullable=False, default=1)
+    ats_analysis = Column(JSONB, nullable=True)  # Cached ats_scoring analysis
 
     # Relationships
     user = relationship("User", back_populates="documents")
     job = relationship("Job", back_populates="documents")
 
 
+class AtsIdfSnapshot(TimestampMixin, Base):
+    """Term document frequencies over the jobs corpus for ATS scoring.
+
+    Rebuilt nightly by ``ats_scoring.build_idf_table``; only the latest
+    row is kept. ``doc_freq`` maps each term (word or two-word phrase) to
+    the number of postings containing it.
+    """
+
+    __tablename__ = "ats_idf_snapshots"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    corpus_size = Column(Integer, nullable=False)
+    doc_freq = Column(JSONB, nullable=False)
+
+
 class AgentAction(SoftDeleteMixin, TimestampMixin, Base):
     __tablename__ = "agent_actions"
 
@@ -626,6 +710,54 @@ class Briefing(TimestampMixin, Base):
     user = relationship("User", backref="briefings")
 
 
+class BriefingDigest(TimestampMixin, Base):
+    """Running per-user digest of agent results since the last briefing.
+
+    Updated incrementally as agents complete so briefing generation reads
+    one small row instead of re-scanning ``agent_outputs`` and
+    ``agent_activities``.
+    """
+
+    __tablename__ = "briefing_digests"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        unique=True,
+    )
+    window_start = Column(DateTime(timezone=True), nullable=False)
+    content = Column(JSONB, nullable=False, server_default="{}")  # Digest counters and lists
+
+    # Relationships
+    user = relationship("User", backref="briefing_digest")
+
+
+class NetworkGraph(TimestampMixin, Base):
+    """A user's imported professional network as a persisted adjacency graph.
+
+    ``graph`` holds the nodes, edges and the user's own schools (see
+    ``app.services.network.connection_graph``). It is merged in place as new
+    connection data is imported so warm paths never need a full rebuild.
+    """
+
+    __tablename__ = "network_graphs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        unique=True,
+    )
+    graph = Column(JSONB, nullable=False, server_default="{}")
+    node_count = Column(Integer, nullable=False, default=0)
+
+    # Relationships
+    user = relationship("User", backref="network_graph")
+
+
 class AgentActivity(TimestampMixin, Base):
     """Agent activity feed persistence for real-time and historical display."""
 
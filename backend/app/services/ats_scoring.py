@@ -0,0 +1,380 @@
+"""
+Local ATS keyword analysis for tailored resumes.
+
+Replaces the ATS score and keyword lists the tailoring LLM used to
+self-report with a deterministic TF-IDF scorer:
+
+- ``build_idf_table`` (nightly Celery task) counts, over the whole
+  ``jobs`` corpus, how many postings contain each term -- single words
+  and two-word phrases such as ``distributed systems`` -- and stores the
+  counts as one ``ats_idf_snapshots`` row;
+- ``extract_keywords`` ranks a job's terms by TF-IDF against that table,
+  so boilerplate every posting shares ("experience", "team") sinks and
+  the role's distinguishing skills rise. Phrases are only considered once
+  they appear in at least ``MIN_DOC_FREQ`` postings;
+- ``score_resume`` returns the IDF-weighted share of those keywords the
+  resume text covers, as a 0-100 score.
+
+Analysing a document is pure CPU and takes about a millisecond once the
+IDF table is loaded (memoised per process for
+``_IDF_RELOAD_SECONDS``). Results are cached on the document row
+(``documents.ats_analysis``); ``analyze_user_documents`` fills in every
+missing or outdated analysis for a user in one pass. Bump
+``ANALYSIS_VERSION`` when the tokenizer or the scoring changes.
+
+Architecture: Pure scoring functions plus snapshot I/O; called by
+``ResumeAgent``, the documents API and the ``rebuild_ats_idf_table`` task.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Mapping, Optional
+from uuid import UUID
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import AtsIdfSnapshot, Document, DocumentType, Job, User
+from app.services.job_features import STOP_WORDS
+
+logger = logging.getLogger(__name__)
+
+ANALYSIS_VERSION = 1
+
+# Keywords scored per job.
+MAX_KEYWORDS = 25
+
+# Postings a term must appear in to be kept in the IDF table (and, for
+# two-word phrases, to be treated as a phrase at all).
+MIN_DOC_FREQ = 2
+
+# Most frequent terms kept per snapshot; rarer terms score as unseen.
+MAX_IDF_TERMS = 50_000
+
+# Title terms count this many times towards a job's term frequencies.
+TITLE_WEIGHT = 2
+
+_IDF_RELOAD_SECONDS = 60 * 60
+
+_JOB_BATCH_SIZE = 1000
+
+# Words, keeping technology spellings intact: c++, c#, node.js, ci/cd.
+_TOKEN_RE = re.compile(r"[a-z][a-z0-9+#]*(?:[./-][a-z0-9+#]+)*")
+
+_idf_memo: Optional[tuple[float, "IdfTable"]] = None
+
+
+@dataclass(frozen=True)
+class IdfTable:
+    """Document frequencies of terms across the jobs corpus."""
+
+    corpus_size: int = 0
+    doc_freq: Mapping[str, int] = field(default_factory=dict)
+    version: Optional[str] = None
+
+    def idf(self, term: str) -> float:
+        """Smoothed inverse document frequency (1.0 for an empty corpus)."""
+        return math.log((1 + self.corpus_size) / (1 + self.doc_freq.get(term, 0))) + 1
+
+
+@dataclass(frozen=True)
+class AtsAnalysis:
+    """Keyword coverage of one resume against one job."""
+
+    score: int  # 0-100, IDF-weighted keyword coverage
+    matched: list[str]
+    missing: list[str]
+    match_rate: float  # matched / all keywords, unweighted
+    keywords: list[tuple[str, float]]  # (term, weight), heaviest first
+    idf_version: Optional[str] = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON form cached in ``documents.ats_analysis``."""
+        return {
+            "version": ANALYSIS_VERSION,
+            "score": self.score,
+            "matched": self.matched,
+            "missing": self.missing,
+            "match_rate": self.match_rate,
+            "keywords": [[term, weight] for term, weight in self.keywords],
+            "idf_version": self.idf_version,
+        }
+
+
+def is_current(cached: Any) -> bool:
+    """Whether a cached ``ats_analysis`` value can be served as is."""
+    return isinstance(cached, dict) and cached.get("version") == ANALYSIS_VERSION
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercased word tokens, trailing punctuation stripped."""
+    return [t.rstrip(".-/") for t in _TOKEN_RE.findall(text.lower())]
+
+
+def extract_terms(text: str) -> Counter:
+    """Counts of a text's words and adjacent non-stop-word pairs."""
+    tokens = tokenize(text)
+    terms: Counter = Counter()
+    for i, token in enumerate(tokens):
+        if len(token) < 2 or token in STOP_WORDS:
+            continue
+        terms[token] += 1
+        if i + 1 < len(tokens):
+            nxt = tokens[i + 1]
+            if len(nxt) >= 2 and nxt not in STOP_WORDS:
+                terms[f"{token} {nxt}"] += 1
+    return terms
+
+
+def extract_keywords(
+    title: str,
+    description: str,
+    idf: IdfTable,
+    limit: int = MAX_KEYWORDS,
+) -> list[tuple[str, float]]:
+    """A job's ``limit`` heaviest terms as ``(term, weight)`` pairs.
+
+    Weight is sublinear TF times IDF. Two-word terms are kept only when
+    the IDF table knows them as phrases; single words already covered by
+    a higher-ranked phrase are dropped so they are not counted twice.
+    """
+    counts = extract_terms(description)
+    for term, n in extract_terms(title).items():
+        counts[term] += n * TITLE_WEIGHT
+
+    ranked = sorted(
+        (
+            (term, round((1 + math.log(tf)) * idf.idf(term), 4))
+            for term, tf in counts.items()
+            if " " not in term or idf.doc_freq.get(term, 0) >= MIN_DOC_FREQ
+        ),
+        key=lambda kw: (-kw[1], kw[0]),
+    )
+
+    keywords: list[tuple[str, float]] = []
+    in_phrases: set[str] = set()
+    for term, weight in ranked:
+        if term in in_phrases:
+            continue
+        keywords.append((term, weight))
+        if " " in term:
+            in_phrases.update(term.split())
+        if len(keywords) == limit:
+            break
+    return keywords
+
+
+def resume_text(content: Mapping[str, Any]) -> str:
+    """Text of a tailored resume document's sections."""
+    return "\n".join(
+        str(section.get("tailored_content") or "")
+        for section in content.get("sections") or ()
+        if isinstance(section, Mapping)
+    )
+
+
+def score_resume(
+    text: str,
+    keywords: list[tuple[str, float]],
+    idf_version: Optional[str] = None,
+) -> AtsAnalysis:
+    """Score resume ``text`` by weighted coverage of job ``keywords``."""
+    present = extract_terms(text)
+    matched = [term for term, _ in keywords if term in present]
+    missing = [term for term, _ in keywords if term not in present]
+    total = sum(weight for _, weight in keywords)
+    covered = sum(weight for term, weight in keywords if term in present)
+    return AtsAnalysis(
+        score=round(100 * covered / total) if total else 0,
+        matched=matched,
+        missing=missing,
+        match_rate=round(len(matched) / len(keywords), 2) if keywords else 0.0,
+        keywords=keywords,
+        idf_version=idf_version,
+    )
+
+
+def analyze_resume(
+    title: str,
+    description: str,
+    content: Mapping[str, Any],
+    idf: IdfTable,
+) -> AtsAnalysis:
+    """Extract a job's keywords and score a tailored resume against them."""
+    keywords = extract_keywords(title or "", description or "", idf)
+    return score_resume(resume_text(content), keywords, idf.version)
+
+
+# ---------------------------------------------------------------------------
+# IDF snapshots
+# ---------------------------------------------------------------------------
+
+
+def count_document_frequencies(texts: Iterable[str]) -> tuple[int, Counter]:
+    """Number of texts and, per term, how many of them contain it."""
+    doc_freq: Counter = Counter()
+    corpus_size = 0
+    for text in texts:
+        corpus_size += 1
+        doc_freq.update(extract_terms(text).keys())
+    return corpus_size, doc_freq
+
+
+async def build_idf_table(session: AsyncSession) -> IdfTable:
+    """Recount term document frequencies over ``jobs`` and store a snapshot.
+
+    Streams the corpus in ``_JOB_BATCH_SIZE`` batches, keeps the
+    ``MAX_IDF_TERMS`` most common terms seen in at least ``MIN_DOC_FREQ``
+    postings, replaces the previous snapshot and commits.
+    """
+    corpus_size = 0
+    doc_freq: Counter = Counter()
+    result = await session.stream(
+        select(Job.title, Job.description).execution_options(yield_per=_JOB_BATCH_SIZE)
+    )
+    async for partition in result.partitions(_JOB_BATCH_SIZE):
+        n, counts = count_document_frequencies(
+            f"{title or ''}\n{description or ''}" for title, description in partition
+        )
+        corpus_size += n
+        doc_freq.update(counts)
+
+    kept = {
+        term: df
+        for term, df in doc_freq.most_common(MAX_IDF_TERMS)
+        if df >= MIN_DOC_FREQ
+    }
+    snapshot = AtsIdfSnapshot(corpus_size=corpus_size, doc_freq=kept)
+    session.add(snapshot)
+    await session.flush()
+    await session.execute(delete(AtsIdfSnapshot).where(AtsIdfSnapshot.id != snapshot.id))
+    await session.commit()
+
+    logger.info("ATS IDF table rebuilt: %d jobs, %d terms", corpus_size, len(kept))
+    table = IdfTable(corpus_size, kept, str(snapshot.id))
+    _remember_idf(table)
+    return table
+
+
+def _remember_idf(table: IdfTable) -> None:
+    global _idf_memo
+    _idf_memo = (time.monotonic(), table)
+
+
+async def load_idf_table(session: Optional[AsyncSession] = None) -> IdfTable:
+    """The latest IDF snapshot, memoised per process.
+
+    Returns an empty table (plain term-frequency ranking) when no snapshot
+    exists yet or it cannot be read.
+    """
+    if _idf_memo is not None and time.monotonic() - _idf_memo[0] < _IDF_RELOAD_SECONDS:
+        return _idf_memo[1]
+
+    stmt = (
+        select(AtsIdfSnapshot.id, AtsIdfSnapshot.corpus_size, AtsIdfSnapshot.doc_freq)
+        .order_by(AtsIdfSnapshot.created_at.desc())
+        .limit(1)
+    )
+    try:
+        if session is None:
+            from app.db.engine import AsyncSessionLocal
+
+            async with AsyncSessionLocal() as own_session:
+                row = (await own_session.execute(stmt)).first()
+        else:
+            row = (await session.execute(stmt)).first()
+    except Exception as exc:
+        logger.warning("Could not load ATS IDF table: %s", exc)
+        return IdfTable()
+
+    table = IdfTable(row[1], row[2] or {}, str(row[0])) if row else IdfTable()
+    _remember_idf(table)
+    return table
+
+
+# ---------------------------------------------------------------------------
+# Document analyses
+# ---------------------------------------------------------------------------
+
+
+async def analyze_user_documents(
+    session: AsyncSession,
+    user_id: str,
+    document_ids: Optional[list[str]] = None,
+    refresh: bool = False,
+) -> list[dict[str, Any]]:
+    """ATS analyses of a user's tailored resumes, computing missing ones.
+
+    Loads every live tailored resume (or just ``document_ids``) with its
+    job in one query, scores those without a current cached analysis
+    (all of them with ``refresh``) and writes the new analyses back in
+    one bulk UPDATE.
+
+    Args:
+        session: Active async database session.
+        user_id: Clerk user ID owning the documents.
+        document_ids: Restrict to these documents.
+        refresh: Recompute cached analyses too.
+
+    Returns:
+        ``{"document_id", "job_id", "analysis"}`` dicts, newest first.
+    """
+    stmt = (
+        select(
+            Document.id,
+            Document.job_id,
+            Document.content,
+            Document.ats_analysis,
+            Job.title,
+            Job.description,
+        )
+        .join(User, Document.user_id == User.id)
+        .join(Job, Document.job_id == Job.id)
+        .where(
+            User.clerk_id == user_id,
+            Document.type == DocumentType.RESUME,
+            Document.deleted_at.is_(None),
+        )
+        .order_by(Document.created_at.desc())
+    )
+    if document_ids is not None:
+        stmt = stmt.where(Document.id.in_([UUID(str(d)) for d in document_ids]))
+    rows = (await session.execute(stmt)).all()
+
+    idf: Optional[IdfTable] = None
+    keywords_by_job: dict[Any, list[tuple[str, float]]] = {}
+    updates = []
+    results = []
+    for doc_id, job_id, content, cached, title, description in rows:
+        if not refresh and is_current(cached):
+            analysis = cached
+        else:
+            if idf is None:
+                idf = await load_idf_table(session)
+            if job_id not in keywords_by_job:
+                keywords_by_job[job_id] = extract_keywords(title or "", description or "", idf)
+            analysis = score_resume(
+                resume_text(_parse_content(content)), keywords_by_job[job_id], idf.version
+            ).to_dict()
+            updates.append({"id": doc_id, "ats_analysis": analysis})
+        results.append({"document_id": str(doc_id), "job_id": str(job_id), "analysis": analysis})
+
+    if updates:
+        await session.execute(update(Document), updates)
+        await session.commit()
+    return results
+
+
+def _parse_content(content: Optional[str]) -> dict[str, Any]:
+    try:
+        parsed = json.loads(content) if content else {}
+    except (ValueError, TypeError):
+        return {}
+    return parsed if isinstance(parsed, dict) else {}
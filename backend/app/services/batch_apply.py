@@ -0,0 +1,314 @@
+"""
+Batch approval of approval-queue applications.
+
+Approving items one at a time costs a session, a SELECT, an UPDATE and a
+commit per item, and submits whatever cover letter the queue item
+happened to reference -- often none.  ``approve_batch`` runs a bulk
+approval as one pipeline:
+
+1. one query loads every requested queue item with the user's profile,
+   and a second, in the same session, loads their jobs and the latest
+   cover letter already stored for each (items whose payload ``job_id``
+   is not a UUID are reported as failed rather than sent to the
+   database);
+2. cover letters still missing for pending items are generated
+   concurrently, one per job, with at most ``COVER_LETTER_CONCURRENCY``
+   LLM calls in flight, each after checking the user's emergency brake;
+3. the new letters and every status change are written in one
+   transaction;
+4. approved items are dispatched to the ApplyAgent.
+
+Per-item results are yielded as soon as they are known so the API can
+stream them back while letters are still being written.  Items whose
+letter could not be generated, including because the brake was pulled
+mid-batch, are reported as failed and stay pending.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional
+from uuid import UUID, uuid4
+
+logger = logging.getLogger(__name__)
+
+# Cover letter LLM calls in flight at once for one batch.
+COVER_LETTER_CONCURRENCY = 5
+
+_ITEMS_SQL = """
+SELECT aq.id, aq.status, aq.payload, u.id AS user_pk,
+       p.headline, p.skills, p.experience, p.education
+FROM approval_queue aq
+JOIN users u ON u.id = aq.user_id
+LEFT JOIN profiles p ON p.user_id = u.id
+WHERE u.clerk_id = :uid AND aq.id IN :ids
+"""
+
+_JOBS_SQL = """
+SELECT j.id AS job_id, j.title, j.company, j.description, j.location,
+       j.salary_min, j.salary_max, j.employment_type, j.remote,
+       cl.latest_id AS cover_letter_id,
+       COALESCE(cl.max_version, 0) AS cover_letter_version
+FROM jobs j
+LEFT JOIN LATERAL (
+    SELECT MAX(d.version) AS max_version,
+           (ARRAY_AGG(d.id ORDER BY d.version DESC)
+               FILTER (WHERE d.deleted_at IS NULL))[1] AS latest_id
+    FROM documents d
+    WHERE d.user_id = :user_pk AND d.job_id = j.id AND d.type = 'cover_letter'
+) cl ON TRUE
+WHERE j.id IN :job_ids
+"""
+
+_JOB_FIELDS = (
+    "title", "company", "description", "location",
+    "salary_min", "salary_max", "employment_type", "remote",
+)
+
+
+# Job columns of an item whose job is missing or not referenced.
+_NO_JOB = {
+    "job_id": None, **dict.fromkeys(_JOB_FIELDS),
+    "cover_letter_id": None, "cover_letter_version": 0,
+}
+
+
+def _failed(item_id: str, error: str) -> Dict[str, Any]:
+    return {"item_id": item_id, "status": "failed", "error": error}
+
+
+def _canonical(item_id: str) -> Optional[str]:
+    try:
+        return str(UUID(item_id))
+    except (TypeError, ValueError):
+        return None
+
+
+def _job_ref(payload: Optional[Dict[str, Any]]) -> Optional[str]:
+    """The payload's ``job_id`` as given, or None when the item has none."""
+    job_id = (payload or {}).get("job_id")
+    return None if job_id is None else str(job_id)
+
+
+async def _prefetch(user_id: str, item_ids: List[str]) -> List[Dict[str, Any]]:
+    """Load the queue items with their profile, jobs and cover letters.
+
+    Payload ``job_id``s are validated here rather than cast in SQL, so a
+    malformed one leaves only its own item without a job.
+    """
+    from sqlalchemy import bindparam, text
+
+    from app.db.engine import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            text(_ITEMS_SQL).bindparams(bindparam("ids", expanding=True)),
+            {"uid": user_id, "ids": item_ids},
+        )
+        rows = [dict(row) for row in result.mappings().all()]
+
+        job_ids = {_canonical(_job_ref(row["payload"]) or "") for row in rows} - {None}
+        jobs: Dict[str, Dict[str, Any]] = {}
+        if job_ids:
+            result = await session.execute(
+                text(_JOBS_SQL).bindparams(bindparam("job_ids", expanding=True)),
+                {"user_pk": rows[0]["user_pk"], "job_ids": sorted(job_ids)},
+            )
+            jobs = {str(job["job_id"]): dict(job) for job in result.mappings().all()}
+
+    for row in rows:
+        job_id = _canonical(_job_ref(row["payload"]) or "")
+        row.update(jobs.get(job_id or "", _NO_JOB))
+    return rows
+
+
+def _profile(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "skills": row.get("skills") or [],
+        "headline": row.get("headline"),
+        "experience": row.get("experience") or [],
+        "education": row.get("education") or [],
+    }
+
+
+async def _dispatch(user_id: str, payload: Dict[str, Any]) -> None:
+    try:
+        from app.agents.orchestrator import dispatch_task
+
+        await dispatch_task("apply", user_id, payload)
+    except Exception as exc:
+        logger.warning("Failed to dispatch apply task after approval: %s", exc)
+
+
+async def approve_batch(
+    user_id: str,
+    item_ids: List[str],
+    concurrency: int = COVER_LETTER_CONCURRENCY,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Approve many queue items, yielding one result per item as it settles.
+
+    Yields ``{"item_id", "status": "failed", "error"}`` for items that
+    cannot be approved, ``{"item_id", "status": "cover_letter_generated",
+    "cover_letter_document_id"}`` as each missing letter is written, and
+    ``{"item_id", "status": "approved", "cover_letter_document_id"}``
+    once the batch has committed and the apply tasks are dispatched.
+
+    Args:
+        user_id: Clerk user ID owning the queue items.
+        item_ids: Approval queue item IDs; duplicates are ignored.
+        concurrency: Cover letter LLM calls in flight at once.
+    """
+    from sqlalchemy import bindparam, text
+
+    from app.agents.base import BrakeActive
+    from app.agents.brake import check_brake_or_raise
+    from app.agents.pro.cover_letter_agent import CoverLetterAgent
+    from app.db.engine import AsyncSessionLocal
+
+    item_ids = list(dict.fromkeys(item_ids))
+    canonical = {i: _canonical(i) for i in item_ids}
+    valid_ids = [c for c in canonical.values() if c]
+    rows = {str(r["id"]): r for r in await _prefetch(user_id, valid_ids)} if valid_ids else {}
+
+    pending: Dict[str, Dict[str, Any]] = {}
+    for item_id in item_ids:
+        row = rows.get(canonical[item_id] or "")
+        if row is None:
+            yield _failed(item_id, "Approval item not found")
+        elif row["status"] != "pending":
+            yield _failed(item_id, f"Item is already '{row['status']}', cannot approve")
+        elif _job_ref(row["payload"]) is not None and not _canonical(_job_ref(row["payload"])):
+            yield _failed(item_id, "Item payload has an invalid job_id")
+        else:
+            pending[item_id] = row
+    if not pending:
+        return
+
+    # Existing letters are reused; one new letter is written per job.
+    letter_ids: Dict[str, Optional[str]] = {}
+    to_generate: Dict[str, Dict[str, Any]] = {}
+    profile = _profile(next(iter(pending.values())))
+    can_generate = bool(profile["skills"] or profile["experience"])
+    for item_id, row in pending.items():
+        payload = row["payload"] or {}
+        if payload.get("cover_letter_document_id"):
+            letter_ids[item_id] = payload["cover_letter_document_id"]
+        elif row["cover_letter_id"] is not None:
+            letter_ids[item_id] = str(row["cover_letter_id"])
+        elif row["job_id"] is not None and can_generate:
+            to_generate.setdefault(str(row["job_id"]), row)
+        else:
+            letter_ids[item_id] = None
+
+    documents: List[Dict[str, Any]] = []
+    if to_generate:
+        agent = CoverLetterAgent()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _generate(job_id: str, row: Dict[str, Any]):
+            job = {"id": job_id, **{f: row[f] for f in _JOB_FIELDS}}
+            async with semaphore:
+                try:
+                    # Called under the brake like any agent step, since the
+                    # agent's run() entry point is bypassed here.
+                    await check_brake_or_raise(user_id)
+                    return job_id, await agent._generate_cover_letter(profile, job), None
+                except BrakeActive:
+                    return job_id, None, "Emergency brake active, cover letter not generated"
+                except Exception as exc:
+                    logger.error(
+                        "LLM cover letter generation failed for user=%s job=%s: %s",
+                        user_id, job_id, exc,
+                    )
+                    return job_id, None, "Cover letter generation failed"
+
+        tasks = [asyncio.create_task(_generate(j, r)) for j, r in to_generate.items()]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                job_id, letter, error = await next_done
+                job_items = [
+                    i for i, r in pending.items()
+                    if str(r["job_id"]) == job_id and i not in letter_ids
+                ]
+                if letter is None:
+                    for item_id in job_items:
+                        yield _failed(item_id, error)
+                    continue
+                doc_id = str(uuid4())
+                documents.append({
+                    "id": doc_id,
+                    "user_pk": to_generate[job_id]["user_pk"],
+                    "ver": to_generate[job_id]["cover_letter_version"] + 1,
+                    "content": json.dumps(letter.model_dump()),
+                    "jid": job_id,
+                })
+                for item_id in job_items:
+                    letter_ids[item_id] = doc_id
+                    yield {
+                        "item_id": item_id,
+                        "status": "cover_letter_generated",
+                        "cover_letter_document_id": doc_id,
+                    }
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    approvable = [i for i in pending if i in letter_ids]
+    if not approvable:
+        return
+
+    async with AsyncSessionLocal() as session:
+        if documents:
+            await session.execute(
+                text(
+                    "INSERT INTO documents (id, user_id, type, version, content, job_id, schema_version) "
+                    "VALUES (:id, :user_pk, 'cover_letter', :ver, :content, :jid, 1)"
+                ),
+                documents,
+            )
+        result = await session.execute(
+            text(
+                "UPDATE approval_queue "
+                "SET status = 'approved', decided_at = :now "
+                "WHERE id IN :ids AND status = 'pending' "
+                "RETURNING id"
+            ).bindparams(bindparam("ids", expanding=True)),
+            {"ids": [canonical[i] for i in approvable], "now": datetime.now(timezone.utc)},
+        )
+        approved = {str(item_id) for item_id in result.scalars().all()}
+
+        payloads: Dict[str, Dict[str, Any]] = {}
+        patches = []
+        for item_id in approvable:
+            if canonical[item_id] not in approved:
+                continue
+            payload = dict(pending[item_id]["payload"] or {})
+            if letter_ids[item_id] and payload.get("cover_letter_document_id") != letter_ids[item_id]:
+                payload["cover_letter_document_id"] = letter_ids[item_id]
+                patches.append({"iid": canonical[item_id], "payload": json.dumps(payload)})
+            payloads[item_id] = payload
+        if patches:
+            await session.execute(
+                text(
+                    "UPDATE approval_queue SET payload = CAST(:payload AS jsonb) "
+                    "WHERE id = :iid"
+                ),
+                patches,
+            )
+        await session.commit()
+
+    await asyncio.gather(*(_dispatch(user_id, p) for p in payloads.values()))
+
+    for item_id in approvable:
+        if item_id in payloads:
+            yield {
+                "item_id": item_id,
+                "status": "approved",
+                "cover_letter_document_id": letter_ids[item_id],
+            }
+        else:
+            # Approved or rejected elsewhere since the prefetch.
+            yield _failed(item_id, "Item is no longer pending")
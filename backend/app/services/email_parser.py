@@ -3,15 +3,18 @@ Email status detection service for the Pipeline Agent.
 
 Analyzes email subject and body text to detect application status changes
 using keyword/pattern matching. Returns structured results with confidence
-scores and evidence snippets.
+scores and evidence snippets. Ambiguous emails can be sent to an LLM one at
+a time (``detect_enhanced``) or in packed batches (``detect_many``).
 """
 
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
 import re
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -31,43 +34,45 @@ class StatusDetection:
 # Pattern definitions
 # ---------------------------------------------------------------------------
 
-# Each pattern: (compiled regex, application_status, base confidence)
+# Each pattern: (compiled regex, application_status, base confidence,
+# required keywords). A pattern can only match if one of its keywords
+# (lowercase literals every match must contain) occurs in the text.
 _REJECTION_PATTERNS = [
-    (re.compile(r"decided\s+to\s+(move|proceed)\s+forward\s+with\s+other", re.I), "rejected", 0.95),
-    (re.compile(r"not\s+(be\s+)?moving\s+forward\s+with\s+your", re.I), "rejected", 0.95),
-    (re.compile(r"unfortunately.{0,40}(not\s+selected|will\s+not\s+be\s+proceeding)", re.I), "rejected", 0.90),
-    (re.compile(r"after\s+careful\s+consideration.{0,40}(other\s+candidates|different\s+direction)", re.I), "rejected", 0.90),
-    (re.compile(r"position\s+has\s+been\s+filled", re.I), "rejected", 0.90),
-    (re.compile(r"regret\s+to\s+inform", re.I), "rejected", 0.85),
-    (re.compile(r"we\s+will\s+not\s+be\s+able\s+to\s+offer", re.I), "rejected", 0.90),
+    (re.compile(r"decided\s+to\s+(move|proceed)\s+forward\s+with\s+other", re.I), "rejected", 0.95, ("decided",)),
+    (re.compile(r"not\s+(be\s+)?moving\s+forward\s+with\s+your", re.I), "rejected", 0.95, ("moving",)),
+    (re.compile(r"unfortunately.{0,40}(not\s+selected|will\s+not\s+be\s+proceeding)", re.I), "rejected", 0.90, ("unfortunately",)),
+    (re.compile(r"after\s+careful\s+consideration.{0,40}(other\s+candidates|different\s+direction)", re.I), "rejected", 0.90, ("careful",)),
+    (re.compile(r"position\s+has\s+been\s+filled", re.I), "rejected", 0.90, ("filled",)),
+    (re.compile(r"regret\s+to\s+inform", re.I), "rejected", 0.85, ("regret",)),
+    (re.compile(r"we\s+will\s+not\s+be\s+able\s+to\s+offer", re.I), "rejected", 0.90, ("offer",)),
 ]
 
 _INTERVIEW_PATTERNS = [
-    (re.compile(r"(like|love)\s+to\s+schedule\s+(an?\s+)?interview", re.I), "interview", 0.95),
-    (re.compile(r"invite\s+you\s+(to|for)\s+(an?\s+)?interview", re.I), "interview", 0.95),
-    (re.compile(r"would\s+you\s+be\s+available\s+(for|to).{0,30}(interview|call|chat)", re.I), "interview", 0.90),
-    (re.compile(r"schedule\s+(a\s+)?(phone|video|technical|onsite)\s+(screen|interview|call)", re.I), "interview", 0.90),
-    (re.compile(r"(next\s+step|move\s+forward).{0,30}(interview|conversation|discussion)", re.I), "interview", 0.85),
-    (re.compile(r"pleased\s+to\s+advance\s+you", re.I), "interview", 0.85),
+    (re.compile(r"(like|love)\s+to\s+schedule\s+(an?\s+)?interview", re.I), "interview", 0.95, ("schedule",)),
+    (re.compile(r"invite\s+you\s+(to|for)\s+(an?\s+)?interview", re.I), "interview", 0.95, ("invite",)),
+    (re.compile(r"would\s+you\s+be\s+available\s+(for|to).{0,30}(interview|call|chat)", re.I), "interview", 0.90, ("available",)),
+    (re.compile(r"schedule\s+(a\s+)?(phone|video|technical|onsite)\s+(screen|interview|call)", re.I), "interview", 0.90, ("schedule",)),
+    (re.compile(r"(next\s+step|move\s+forward).{0,30}(interview|conversation|discussion)", re.I), "interview", 0.85, ("step", "forward")),
+    (re.compile(r"pleased\s+to\s+advance\s+you", re.I), "interview", 0.85, ("advance",)),
 ]
 
 _OFFER_PATTERNS = [
-    (re.compile(r"pleased\s+to\s+(offer|extend)", re.I), "offer", 0.95),
-    (re.compile(r"(offer\s+letter|formal\s+offer)\s+(attached|enclosed|for\s+your)", re.I), "offer", 0.95),
-    (re.compile(r"congratulations.{0,30}(offer|selected|chosen)", re.I), "offer", 0.90),
-    (re.compile(r"we('d|\s+would)\s+like\s+to\s+offer\s+you", re.I), "offer", 0.95),
+    (re.compile(r"pleased\s+to\s+(offer|extend)", re.I), "offer", 0.95, ("pleased",)),
+    (re.compile(r"(offer\s+letter|formal\s+offer)\s+(attached|enclosed|for\s+your)", re.I), "offer", 0.95, ("offer",)),
+    (re.compile(r"congratulations.{0,30}(offer|selected|chosen)", re.I), "offer", 0.90, ("congratulations",)),
+    (re.compile(r"we('d|\s+would)\s+like\s+to\s+offer\s+you", re.I), "offer", 0.95, ("offer",)),
 ]
 
 _APPLIED_PATTERNS = [
-    (re.compile(r"(thank\s+you|thanks)\s+for\s+(applying|your\s+application)", re.I), "applied", 0.80),
-    (re.compile(r"(received|confirm).{0,20}(your\s+application|your\s+submission)", re.I), "applied", 0.85),
-    (re.compile(r"application.{0,20}(received|submitted\s+successfully)", re.I), "applied", 0.85),
+    (re.compile(r"(thank\s+you|thanks)\s+for\s+(applying|your\s+application)", re.I), "applied", 0.80, ("thank",)),
+    (re.compile(r"(received|confirm).{0,20}(your\s+application|your\s+submission)", re.I), "applied", 0.85, ("received", "confirm")),
+    (re.compile(r"application.{0,20}(received|submitted\s+successfully)", re.I), "applied", 0.85, ("application",)),
 ]
 
 _SCREENING_PATTERNS = [
-    (re.compile(r"(reviewing|review)\s+your\s+(application|resume|profile)", re.I), "screening", 0.75),
-    (re.compile(r"your\s+application\s+is\s+(\w+\s+)?(being\s+)?reviewed", re.I), "screening", 0.75),
-    (re.compile(r"(shortlisted|under\s+consideration)", re.I), "screening", 0.80),
+    (re.compile(r"(reviewing|review)\s+your\s+(application|resume|profile)", re.I), "screening", 0.75, ("review",)),
+    (re.compile(r"your\s+application\s+is\s+(\w+\s+)?(being\s+)?reviewed", re.I), "screening", 0.75, ("reviewed",)),
+    (re.compile(r"(shortlisted|under\s+consideration)", re.I), "screening", 0.80, ("shortlisted", "consideration")),
 ]
 
 # Ordered from highest-signal to lowest to avoid ambiguity
@@ -79,11 +84,142 @@ _ALL_PATTERNS = (
     + _APPLIED_PATTERNS
 )
 
+# Characters that IGNORECASE matches to an ASCII letter but str.lower()
+# does not map onto it (dotted/dotless i, long s).
+_CASE_FOLD_FIXES = str.maketrans({"\u0130": "i", "\u0131": "i", "\u017f": "s"})
+
+
+def _fold(text: str) -> str:
+    """Lowercase ``text`` the way IGNORECASE compares ASCII letters."""
+    if not text.isascii():
+        text = text.translate(_CASE_FOLD_FIXES)
+    return text.lower()
+
+
 CONFIDENCE_THRESHOLD = 0.7
 
 
+class StatusPatternClassifier:
+    """Compiled multi-pattern classifier behind ``EmailStatusDetector.detect``.
+
+    The subject and full text are each case-folded once and checked for
+    every pattern's required keywords (substring scans in C); only
+    patterns whose keywords occur are run, in priority order, and a
+    pattern is skipped once it can no longer beat the best confidence.
+    The result is identical to running every pattern over the text and
+    re-running each match over the subject for the boost.
+    """
+
+    def __init__(self, patterns=_ALL_PATTERNS) -> None:
+        self._patterns = [
+            (pattern, status, base, min(base + 0.05, 1.0), keywords)
+            for pattern, status, base, keywords in patterns
+        ]
+        for pattern, _, _, _, keywords in self._patterns:
+            assert keywords and all(k.islower() for k in keywords), pattern.pattern
+
+    def classify(self, subject: str, body: str) -> StatusDetection | None:
+        """Best detection for the email, or None if no pattern matches."""
+        text = f"{subject}\n{body}"
+        folded_text = _fold(text)
+        folded_subject = _fold(subject)
+
+        best: StatusDetection | None = None
+        for pattern, status, base_confidence, boosted, keywords in self._patterns:
+            if best is not None and boosted <= best.confidence:
+                continue
+            if not any(k in folded_text for k in keywords):
+                continue
+            match = pattern.search(text)
+            if match is None:
+                continue
+
+            confidence = base_confidence
+            if any(k in folded_subject for k in keywords) and pattern.search(subject):
+                confidence = boosted
+
+            if best is None or confidence > best.confidence:
+                best = StatusDetection(
+                    detected_status=status,
+                    confidence=confidence,
+                    evidence_snippet=EmailStatusDetector._extract_snippet(text, match),
+                    is_ambiguous=confidence < CONFIDENCE_THRESHOLD,
+                )
+        return best
+
+
+_CLASSIFIER = StatusPatternClassifier()
+
+_STATUSES = ("rejected", "interview", "offer", "applied", "screening")
+
+# Emails packed into one LLM prompt, and prompts in flight at once.
+LLM_BATCH_SIZE = 10
+LLM_BATCH_CONCURRENCY = 4
+
+_LLM_TOKENS_PER_EMAIL = 60
+
+_BATCH_PROMPT = (
+    "Classify each email below into one of these application statuses: "
+    "rejected, interview, offer, applied, screening. "
+    "Use 'none' for an email that is not about a job application status. "
+    "Respond with JSON only: {\"results\": [{\"id\": <email number>, "
+    "\"status\": \"...\", \"confidence\": 0.0-1.0, \"evidence\": \"brief quote\"}]}, "
+    "one entry per email.\n\n"
+)
+
+
+def _llm_detection(data: Any) -> StatusDetection:
+    """StatusDetection from one parsed LLM answer (ambiguous if unusable)."""
+    status = data.get("status", "none") if isinstance(data, dict) else "none"
+    try:
+        confidence = float(data.get("confidence", 0.5))
+    except (TypeError, ValueError, AttributeError):
+        status = "none"
+    if status not in _STATUSES:
+        return StatusDetection(
+            detected_status=None,
+            confidence=0.0,
+            evidence_snippet="",
+            is_ambiguous=True,
+            detection_method="llm",
+        )
+
+    evidence = str(data.get("evidence") or "")[:200]
+
+    return StatusDetection(
+        detected_status=status,
+        confidence=confidence,
+        evidence_snippet=evidence,
+        is_ambiguous=confidence < CONFIDENCE_THRESHOLD,
+        detection_method="llm",
+    )
+
+
+def _prefer(result: StatusDetection, llm_result: StatusDetection) -> StatusDetection:
+    """Pick between an ambiguous regex result and the LLM's answer."""
+    # If LLM gives a confident result, prefer it
+    if not llm_result.is_ambiguous and llm_result.detected_status is not None:
+        return llm_result
+
+    # If LLM also ambiguous but found something, prefer LLM if higher confidence
+    if llm_result.detected_status is not None and (
+        result.detected_status is None or llm_result.confidence > result.confidence
+    ):
+        return llm_result
+
+    # Fall back to regex result (even if ambiguous)
+    return result
+
+
 class EmailStatusDetector:
-    """Detects application status changes from email content."""
+    """Detects application status changes from email content.
+
+    The OpenAI client used for LLM fallback is opened on first use and
+    shared by every call on this detector; ``aclose()`` releases it.
+    """
+
+    def __init__(self) -> None:
+        self._llm_client = None
 
     def detect(self, subject: str, body: str) -> StatusDetection:
         """Analyze email subject and body for application status signals.
@@ -105,24 +241,7 @@ class EmailStatusDetector:
                 is_ambiguous=True,
             )
 
-        best_match: StatusDetection | None = None
-
-        for pattern, status, base_confidence in _ALL_PATTERNS:
-            match = pattern.search(text)
-            if match:
-                snippet = self._extract_snippet(text, match)
-                # Boost confidence if pattern matches in subject
-                confidence = base_confidence
-                if pattern.search(subject):
-                    confidence = min(confidence + 0.05, 1.0)
-
-                if best_match is None or confidence > best_match.confidence:
-                    best_match = StatusDetection(
-                        detected_status=status,
-                        confidence=confidence,
-                        evidence_snippet=snippet,
-                        is_ambiguous=confidence < CONFIDENCE_THRESHOLD,
-                    )
+        best_match = _CLASSIFIER.classify(subject, body)
 
         if best_match is not None:
             return best_match
@@ -140,8 +259,6 @@ class EmailStatusDetector:
 
         Called as fallback when regex detection is ambiguous.
         """
-        import json
-
         text = f"Subject: {subject}\n\nBody: {body[:500]}"
 
         prompt = (
@@ -153,51 +270,57 @@ class EmailStatusDetector:
         )
 
         try:
-            from openai import AsyncOpenAI
-
-            from app.config import settings
-
-            client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
-            response = await client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.0,
-                max_tokens=100,
-            )
-            content = response.choices[0].message.content or ""
-            data = json.loads(content)
-
-            status = data.get("status", "none")
-            if status == "none" or status not in (
-                "rejected", "interview", "offer", "applied", "screening"
-            ):
-                return StatusDetection(
-                    detected_status=None,
-                    confidence=0.0,
-                    evidence_snippet="",
-                    is_ambiguous=True,
-                    detection_method="llm",
-                )
-
-            confidence = float(data.get("confidence", 0.5))
-            evidence = data.get("evidence", "")[:200]
-
-            return StatusDetection(
-                detected_status=status,
-                confidence=confidence,
-                evidence_snippet=evidence,
-                is_ambiguous=confidence < CONFIDENCE_THRESHOLD,
-                detection_method="llm",
-            )
+            data = await self._complete_json(prompt, max_tokens=100)
+            return _llm_detection(data)
         except Exception as exc:
             logger.warning("LLM classification failed: %s", exc)
-            return StatusDetection(
-                detected_status=None,
-                confidence=0.0,
-                evidence_snippet="",
-                is_ambiguous=True,
-                detection_method="llm",
+            return _llm_detection({})
+
+    async def detect_batch_with_llm(
+        self,
+        emails: list[tuple[str, str]],
+        batch_size: int = LLM_BATCH_SIZE,
+        concurrency: int = LLM_BATCH_CONCURRENCY,
+        strict: bool = False,
+    ) -> list[StatusDetection]:
+        """Classify many ``(subject, body)`` emails with packed LLM prompts.
+
+        Emails are sent ``batch_size`` per prompt, ``concurrency`` prompts
+        at a time, each tagged with an ID the response is mapped back by.
+        An email whose batch fails or that is missing from the response
+        gets the same ambiguous result ``detect_with_llm`` returns on error;
+        with ``strict`` a failed LLM call raises instead.
+        """
+        results = [_llm_detection({}) for _ in emails]
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _classify(offset: int) -> None:
+            batch = emails[offset:offset + batch_size]
+            prompt = _BATCH_PROMPT + "\n\n".join(
+                f"### Email {i}\nSubject: {subject}\n\nBody: {body[:500]}"
+                for i, (subject, body) in enumerate(batch, start=1)
             )
+            async with semaphore:
+                try:
+                    data = await self._complete_json(
+                        prompt, max_tokens=_LLM_TOKENS_PER_EMAIL * len(batch) + 20
+                    )
+                except Exception as exc:
+                    logger.warning("Batched LLM classification failed: %s", exc)
+                    if strict:
+                        raise
+                    return
+            items = data.get("results") if isinstance(data, dict) else None
+            for item in items if isinstance(items, list) else []:
+                try:
+                    index = int(item["id"]) - 1
+                except (KeyError, TypeError, ValueError):
+                    continue
+                if 0 <= index < len(batch):
+                    results[offset + index] = _llm_detection(item)
+
+        await asyncio.gather(*(_classify(o) for o in range(0, len(emails), batch_size)))
+        return results
 
     async def detect_enhanced(self, subject: str, body: str) -> StatusDetection:
         """Try regex detection first, fall back to LLM if ambiguous."""
@@ -209,19 +332,50 @@ class EmailStatusDetector:
 
         # If regex found nothing or was ambiguous, try LLM
         llm_result = await self.detect_with_llm(subject, body)
+        return _prefer(result, llm_result)
 
-        # If LLM gives a confident result, prefer it
-        if not llm_result.is_ambiguous and llm_result.detected_status is not None:
-            return llm_result
+    async def detect_many(
+        self, emails: list[tuple[str, str]], strict: bool = False
+    ) -> list[StatusDetection]:
+        """``detect_enhanced`` for a list of ``(subject, body)`` emails.
 
-        # If LLM also ambiguous but found something, prefer LLM if higher confidence
-        if llm_result.detected_status is not None and (
-            result.detected_status is None or llm_result.confidence > result.confidence
-        ):
-            return llm_result
+        Regex runs on every email; only the ambiguous ones go to the LLM,
+        together, through ``detect_batch_with_llm`` (``strict`` is passed
+        through).
+        """
+        results = [self.detect(subject, body) for subject, body in emails]
+        pending = [
+            i for i, result in enumerate(results)
+            if result.is_ambiguous or result.detected_status is None
+        ]
+        if pending:
+            llm_results = await self.detect_batch_with_llm(
+                [emails[i] for i in pending], strict=strict
+            )
+            for i, llm_result in zip(pending, llm_results):
+                results[i] = _prefer(results[i], llm_result)
+        return results
+
+    async def aclose(self) -> None:
+        """Close the LLM client, if one was opened."""
+        if self._llm_client is not None:
+            client, self._llm_client = self._llm_client, None
+            await client.close()
+
+    async def _complete_json(self, prompt: str, max_tokens: int) -> Any:
+        if self._llm_client is None:
+            from openai import AsyncOpenAI
 
-        # Fall back to regex result (even if ambiguous)
-        return result
+            from app.config import settings
+
+            self._llm_client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        response = await self._llm_client.chat.completions.create(
+            model="gpt-3.5-turbo",
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.0,
+            max_tokens=max_tokens,
+        )
+        return json.loads(response.choices[0].message.content or "")
 
     @staticmethod
     def _extract_snippet(text: str, match: re.Match) -> str:
@@ -2,16 +2,33 @@
 
 Orchestrates fetching emails from connected providers (Gmail/Outlook)
 and running status detection via the Pipeline Agent for each matched email.
+
+A user's connections are scanned concurrently, and ``scan_users_emails``
+scans many users at once with bounded concurrency. All Gmail traffic in a
+scan shares one pooled client, and the emails of a user's scan are
+classified together so ambiguous ones reach the LLM in packed batches.
+Gmail connections sync incrementally from their stored ``sync_cursor``
+(historyId), which is advanced only after the fetched emails have been
+processed.
+
+Scans run only when the user asks (``POST /integrations/email/scan``).
+Detections are returned to the caller rather than stored, so a
+background scan would move the cursors past emails nobody ever sees.
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from dataclasses import dataclass, field
+from datetime import datetime, timezone
 from typing import Any
 
 logger = logging.getLogger(__name__)
 
+# Users scanned at once by scan_users_emails().
+USER_SCAN_CONCURRENCY = 10
+
 
 @dataclass
 class ScanResult:
@@ -33,7 +50,8 @@ async def _get_user_connections(user_id: str) -> list[dict[str, Any]]:
     async with AsyncSessionLocal() as session:
         result = await session.execute(
             text(
-                "SELECT id, provider, email_address, access_token_encrypted "
+                "SELECT id, provider, email_address, access_token_encrypted, "
+                "sync_cursor "
                 "FROM email_connections "
                 "WHERE user_id = (SELECT id FROM users WHERE clerk_id = :uid) "
                 "AND status = 'active' "
@@ -49,6 +67,7 @@ async def _get_user_connections(user_id: str) -> list[dict[str, Any]]:
             "provider": row["provider"],
             "email_address": row["email_address"],
             "access_token": row["access_token_encrypted"],
+            "sync_cursor": row.get("sync_cursor"),
         }
         for row in rows
     ]
@@ -56,31 +75,135 @@ async def _get_user_connections(user_id: str) -> list[dict[str, Any]]:
 
 async def _fetch_emails_for_connection(
     connection: dict[str, Any],
-) -> list[dict[str, str]]:
-    """Fetch job-related emails from a connected provider."""
+    gmail_client=None,
+) -> tuple[list[dict[str, str]], str | None]:
+    """Fetch job-related emails from a connected provider.
+
+    Returns:
+        The emails and the sync cursor to store once they are processed
+        (None for providers without incremental sync).
+    """
     provider = connection["provider"]
     access_token = connection["access_token"]
 
     if provider == "gmail":
-        from app.services.gmail_service import fetch_job_emails
+        from app.services.gmail_service import sync_job_emails
 
-        return await fetch_job_emails(access_token)
+        sync = await sync_job_emails(
+            access_token, connection.get("sync_cursor"), client=gmail_client
+        )
+        return sync.emails, sync.history_id
     elif provider == "outlook":
         from app.services.outlook_service import fetch_job_emails
 
-        return await fetch_job_emails(access_token)
+        return await fetch_job_emails(access_token), None
     else:
         logger.warning("Unknown email provider: %s", provider)
-        return []
+        return [], None
+
+
+async def _record_sync(connection_id: str, cursor: str | None) -> None:
+    """Store the connection's new sync cursor and last_sync_at."""
+    from sqlalchemy import text
+
+    from app.db.engine import AsyncSessionLocal
 
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            text(
+                "UPDATE email_connections "
+                "SET sync_cursor = COALESCE(:cursor, sync_cursor), "
+                "last_sync_at = :now "
+                "WHERE id = :id"
+            ),
+            {"cursor": cursor, "now": datetime.now(timezone.utc), "id": connection_id},
+        )
+        await session.commit()
+
+
+async def _fetch_connection(
+    connection: dict[str, Any],
+    gmail_client=None,
+) -> tuple[list[dict[str, str]], str | None] | None:
+    """``_fetch_emails_for_connection``, or None if the fetch failed."""
+    try:
+        return await _fetch_emails_for_connection(connection, gmail_client)
+    except Exception as exc:
+        logger.error(
+            "Failed to fetch emails from %s: %s", connection["provider"], exc
+        )
+        return None
 
-async def scan_user_emails(user_id: str) -> ScanResult:
+
+async def _scan_connections(
+    connections: list[dict[str, Any]],
+    detector,
+    gmail_client,
+) -> ScanResult:
+    """Fetch every connection concurrently, then classify all emails at once.
+
+    Classifying the whole scan together lets the detector batch every
+    ambiguous email into a few LLM prompts. A connection's sync cursor is
+    stored only after its emails have been classified.
+    """
+    fetched = await asyncio.gather(
+        *(_fetch_connection(c, gmail_client) for c in connections)
+    )
+    scan = ScanResult(errors=sum(1 for f in fetched if f is None))
+    synced = [(c, f) for c, f in zip(connections, fetched) if f is not None]
+    emails = [email for _, (conn_emails, _) in synced for email in conn_emails]
+
+    try:
+        results = await detector.detect_many(
+            [(email.get("subject", ""), email.get("snippet", "")) for email in emails],
+            strict=True,
+        )
+    except Exception as exc:
+        # Keep the old cursors so the next scan fetches these emails again.
+        logger.error("Status detection failed; sync cursors not advanced: %s", exc)
+        scan.errors += len(synced)
+        return scan
+
+    for email, result in zip(emails, results):
+        scan.emails_processed += 1
+        scan.details.append({
+            "email_id": email.get("id", ""),
+            "subject": email.get("subject", ""),
+            "detected_status": result.detected_status,
+            "confidence": result.confidence,
+            "detection_method": result.detection_method,
+            "is_ambiguous": result.is_ambiguous,
+        })
+
+        if result.detected_status is not None:
+            if result.is_ambiguous:
+                scan.flagged_for_review += 1
+            else:
+                scan.statuses_detected += 1
+
+    for connection, (_, cursor) in synced:
+        try:
+            await _record_sync(connection["id"], cursor)
+        except Exception as exc:
+            # The next scan re-reads from the old cursor; nothing is lost.
+            logger.warning("Failed to store sync cursor for %s: %s", connection["id"], exc)
+    return scan
+
+
+async def scan_user_emails(user_id: str, gmail_client=None) -> ScanResult:
     """Scan all connected email accounts for application status updates.
 
-    Fetches emails from Gmail/Outlook, runs status detection on each,
-    and returns a summary of results.
+    Fetches emails from Gmail/Outlook (all connections concurrently), runs
+    status detection on all of them (ambiguous ones go to the LLM in
+    batches), and returns a summary of results.
+
+    Args:
+        user_id: Clerk user ID.
+        gmail_client: Pooled client from ``gmail_service.gmail_client()``
+            to share across users; one is created when needed otherwise.
     """
     from app.services.email_parser import EmailStatusDetector
+    from app.services.gmail_service import gmail_client as new_gmail_client
 
     connections = await _get_user_connections(user_id)
 
@@ -88,44 +211,40 @@ async def scan_user_emails(user_id: str) -> ScanResult:
         return ScanResult()
 
     detector = EmailStatusDetector()
-    scan = ScanResult()
+    try:
+        if gmail_client is not None or not any(c["provider"] == "gmail" for c in connections):
+            return await _scan_connections(connections, detector, gmail_client)
+        async with new_gmail_client() as client:
+            return await _scan_connections(connections, detector, client)
+    finally:
+        await detector.aclose()
+
+
+async def scan_users_emails(
+    user_ids: list[str],
+    concurrency: int = USER_SCAN_CONCURRENCY,
+) -> dict[str, ScanResult]:
+    """Scan many users' inboxes, ``concurrency`` users at a time.
+
+    All Gmail requests share one pooled client. A failing user is counted
+    as one error and does not affect the others. Like ``scan_user_emails``
+    this advances each connection's sync cursor, so the caller owns the
+    returned details: emails scanned here are not fetched again.
+    """
+    from app.services.gmail_service import gmail_client
 
-    for connection in connections:
-        try:
-            emails = await _fetch_emails_for_connection(connection)
-        except Exception as exc:
-            logger.error(
-                "Failed to fetch emails from %s: %s", connection["provider"], exc
-            )
-            scan.errors += 1
-            continue
-
-        for email in emails:
-            scan.emails_processed += 1
-            subject = email.get("subject", "")
-            snippet = email.get("snippet", "")
-
-            try:
-                result = await detector.detect_enhanced(subject, snippet)
-            except Exception as exc:
-                logger.error("Detection failed for email %s: %s", email.get("id"), exc)
-                scan.errors += 1
-                continue
-
-            detail = {
-                "email_id": email.get("id", ""),
-                "subject": subject,
-                "detected_status": result.detected_status,
-                "confidence": result.confidence,
-                "detection_method": result.detection_method,
-                "is_ambiguous": result.is_ambiguous,
-            }
-            scan.details.append(detail)
-
-            if result.detected_status is not None:
-                if result.is_ambiguous:
-                    scan.flagged_for_review += 1
-                else:
-                    scan.statuses_detected += 1
+    semaphore = asyncio.Semaphore(concurrency)
 
-    return scan
+    async with gmail_client() as client:
+
+        async def _one(user_id: str) -> ScanResult:
+            async with semaphore:
+                try:
+                    return await scan_user_emails(user_id, gmail_client=client)
+                except Exception as exc:
+                    logger.error("Email scan failed for user=%s: %s", user_id, exc)
+                    return ScanResult(errors=1)
+
+        results = await asyncio.gather(*(_one(uid) for uid in user_ids))
+
+    return dict(zip(user_ids, results))
@@ -415,12 +415,15 @@ class EmailService:
         try:
             text_content = ""
             
+            from .resume_extraction import run_extraction
+
+            # Parsers run in the extraction process pool, off the event loop
             if filename.lower().endswith('.pdf'):
                 # Parse PDF
-                text_content = self._parse_pdf(file_content)
+                text_content = await run_extraction(EmailService._parse_pdf, file_content)
             elif filename.lower().endswith(('.docx', '.doc')):
                 # Parse Word document
-                text_content = self._parse_docx(file_content)
+                text_content = await run_extraction(EmailService._parse_docx, file_content)
             else:
                 return ResumeParsingResult(
                     success=False,
@@ -445,7 +448,8 @@ class EmailService:
                 error_message=str(e)
             )
     
-    def _parse_pdf(self, file_content: bytes) -> str:
+    @staticmethod
+    def _parse_pdf(file_content: bytes) -> str:
         """Extract text from PDF file"""
         text = ""
         try:
@@ -461,7 +465,8 @@ class EmailService:
         
         return text
     
-    def _parse_docx(self, file_content: bytes) -> str:
+    @staticmethod
+    def _parse_docx(file_content: bytes) -> str:
         """Extract text from DOCX file"""
         text = ""
         try:
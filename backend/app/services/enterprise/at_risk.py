@@ -5,6 +5,12 @@ Identifies employees who may be disengaging based on activity signals:
 - No applications submitted in 30+ days
 - Stalled pipeline (no application status changes in 21+ days)
 
+All three criteria are evaluated set-based: one statement with a members
+CTE and a per-user application activity CTE, LEFT JOINed together, flags
+every member of one organization (or of every organization) at once. Rows
+are streamed from a server-side cursor in batches, so the daily job over
+all organizations is a single round-trip regardless of organization size.
+
 CRITICAL PRIVACY CONSTRAINT: Admin-facing outputs contain ONLY user_id,
 name, email, and engagement_status. Never application titles, pipeline
 details, job matches, or any individual activity data.
@@ -13,14 +19,15 @@ details, job matches, or any individual activity data.
 from __future__ import annotations
 
 import logging
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Literal, Optional
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional
 from uuid import UUID
 
-from sqlalchemy import func, select
+from sqlalchemy import Select, and_, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.models import Application, OrganizationMember, User
+from app.db.models import Application, Organization, OrganizationMember, User
 
 logger = logging.getLogger(__name__)
 
@@ -29,12 +36,114 @@ LOGIN_INACTIVE_DAYS = 14
 APPLICATION_INACTIVE_DAYS = 30
 PIPELINE_STALLED_DAYS = 21
 
+# Member rows fetched per round-trip when streaming detection results
+RISK_BATCH_SIZE = 5000
+
 EngagementStatus = Literal["at_risk", "active", "placed", "opted_out"]
 
 
+@dataclass(frozen=True)
+class MemberRisk:
+    """Detection result for one organization member (internal only)."""
+
+    org_id: UUID
+    user_id: UUID
+    login_inactive: bool
+    no_recent_applications: bool
+    pipeline_stalled: bool
+
+    @property
+    def at_risk(self) -> bool:
+        return self.login_inactive or self.no_recent_applications or self.pipeline_stalled
+
+
+def member_risk_statement(now: datetime, org_id: Optional[UUID] = None) -> Select:
+    """One statement flagging every member against all three criteria.
+
+    ``members`` is every (org, user) membership, optionally restricted to
+    one org; ``application_activity`` aggregates each member's latest
+    ``applied_at`` and ``updated_at`` in one pass over their applications.
+    A member with no applications has no activity row, so it counts as
+    having no recent applications but never as a stalled pipeline.
+    """
+    members = select(OrganizationMember.org_id, OrganizationMember.user_id)
+    if org_id is not None:
+        members = members.where(OrganizationMember.org_id == org_id)
+    members = members.cte("members")
+
+    activity = (
+        select(
+            Application.user_id,
+            func.max(Application.applied_at).label("last_applied_at"),
+            func.max(Application.updated_at).label("last_updated_at"),
+        )
+        .where(Application.user_id.in_(select(members.c.user_id)))
+        .group_by(Application.user_id)
+        .cte("application_activity")
+    )
+
+    login_threshold = now - timedelta(days=LOGIN_INACTIVE_DAYS)
+    app_threshold = now - timedelta(days=APPLICATION_INACTIVE_DAYS)
+    pipeline_threshold = now - timedelta(days=PIPELINE_STALLED_DAYS)
+
+    return (
+        select(
+            members.c.org_id,
+            members.c.user_id,
+            func.coalesce(User.updated_at < login_threshold, False).label("login_inactive"),
+            or_(
+                activity.c.last_applied_at.is_(None),
+                activity.c.last_applied_at < app_threshold,
+            ).label("no_recent_applications"),
+            and_(
+                activity.c.user_id.is_not(None),
+                or_(
+                    activity.c.last_updated_at.is_(None),
+                    activity.c.last_updated_at < pipeline_threshold,
+                ),
+            ).label("pipeline_stalled"),
+        )
+        .select_from(members)
+        .outerjoin(User, User.id == members.c.user_id)
+        .outerjoin(activity, activity.c.user_id == members.c.user_id)
+        .order_by(members.c.org_id)
+    )
+
+
 class AtRiskDetectionService:
     """Service for detecting at-risk employees and returning privacy-safe summaries."""
 
+    async def stream_member_risk(
+        self,
+        session: AsyncSession,
+        org_id: Optional[str] = None,
+        batch_size: int = RISK_BATCH_SIZE,
+    ) -> AsyncIterator[List[MemberRisk]]:
+        """Yield :class:`MemberRisk` batches, ordered by organization.
+
+        Runs :func:`member_risk_statement` once over a server-side cursor.
+
+        Args:
+            session: Active async database session.
+            org_id: Restrict to one organization (default: all of them).
+            batch_size: Rows fetched and yielded per batch.
+        """
+        stmt = member_risk_statement(
+            datetime.now(timezone.utc), UUID(org_id) if org_id else None
+        )
+        result = await session.stream(stmt.execution_options(yield_per=batch_size))
+        async for partition in result.partitions(batch_size):
+            yield [
+                MemberRisk(
+                    org_id=row[0],
+                    user_id=row[1],
+                    login_inactive=bool(row[2]),
+                    no_recent_applications=bool(row[3]),
+                    pipeline_stalled=bool(row[4]),
+                )
+                for row in partition
+            ]
+
     async def detect_at_risk(
         self,
         session: AsyncSession,
@@ -45,7 +154,7 @@ class AtRiskDetectionService:
         Evaluates employees against three criteria:
         1. Last login (updated_at proxy) older than 14 days
         2. No applications submitted in 30+ days
-        3. No application status changes in 21+ days
+        3. No application status changes in 21+ days (users with applications)
 
         Users matching ANY criterion are considered at-risk.
 
@@ -56,77 +165,17 @@ class AtRiskDetectionService:
         Returns:
             List of user_id strings flagged as at-risk.
         """
-        now = datetime.now(timezone.utc)
-        org_uuid = UUID(org_id)
-
-        # Get all member user IDs for the org
-        members_result = await session.execute(
-            select(OrganizationMember.user_id).where(
-                OrganizationMember.org_id == org_uuid
-            )
-        )
-        member_user_ids = [row[0] for row in members_result.all()]
-
-        if not member_user_ids:
-            return []
-
-        at_risk_ids: set = set()
-
-        # Criterion 1: Not logged in for 14+ days (using updated_at as proxy)
-        login_threshold = now - timedelta(days=LOGIN_INACTIVE_DAYS)
-        inactive_login_result = await session.execute(
-            select(User.id).where(
-                User.id.in_(member_user_ids),
-                User.updated_at < login_threshold,
-            )
-        )
-        for row in inactive_login_result.all():
-            at_risk_ids.add(str(row[0]))
-
-        # Criterion 2: No applications submitted in 30+ days
-        app_threshold = now - timedelta(days=APPLICATION_INACTIVE_DAYS)
-        # Find users who HAVE recent applications
-        active_applicants_result = await session.execute(
-            select(Application.user_id).where(
-                Application.user_id.in_(member_user_ids),
-                Application.applied_at >= app_threshold,
-            ).distinct()
-        )
-        active_applicant_ids = {row[0] for row in active_applicants_result.all()}
-
-        # Users with NO recent applications are at-risk
-        for uid in member_user_ids:
-            if uid not in active_applicant_ids:
-                at_risk_ids.add(str(uid))
-
-        # Criterion 3: Stalled pipeline (no status changes in 21+ days)
-        pipeline_threshold = now - timedelta(days=PIPELINE_STALLED_DAYS)
-        # Find users who HAVE recent pipeline activity
-        active_pipeline_result = await session.execute(
-            select(Application.user_id).where(
-                Application.user_id.in_(member_user_ids),
-                Application.updated_at >= pipeline_threshold,
-            ).distinct()
-        )
-        active_pipeline_ids = {row[0] for row in active_pipeline_result.all()}
-
-        # Users who have applications but no recent updates are at-risk
-        users_with_apps_result = await session.execute(
-            select(Application.user_id).where(
-                Application.user_id.in_(member_user_ids),
-            ).distinct()
-        )
-        users_with_apps = {row[0] for row in users_with_apps_result.all()}
-
-        for uid in users_with_apps:
-            if uid not in active_pipeline_ids:
-                at_risk_ids.add(str(uid))
+        members = 0
+        at_risk_ids: List[str] = []
+        async for batch in self.stream_member_risk(session, org_id):
+            members += len(batch)
+            at_risk_ids.extend(str(m.user_id) for m in batch if m.at_risk)
 
         logger.info(
             "detect_at_risk: org=%s, members=%d, at_risk=%d",
-            org_id, len(member_user_ids), len(at_risk_ids),
+            org_id, members, len(at_risk_ids),
         )
-        return list(at_risk_ids)
+        return at_risk_ids
 
     async def get_employee_summaries(
         self,
@@ -192,11 +241,10 @@ class AtRiskDetectionService:
         session: AsyncSession,
         org_id: str,
     ) -> Dict[str, Any]:
-        """Batch evaluate and log engagement statuses for an organization.
+        """Evaluate and log engagement statuses for one organization.
 
-        This is called by the daily Celery task. Since engagement_status
-        is computed dynamically (not persisted), this method runs detection
-        and logs the results for monitoring.
+        Since engagement_status is computed dynamically (not persisted),
+        this runs detection and logs the results for monitoring.
 
         Args:
             session: Active async database session.
@@ -205,26 +253,52 @@ class AtRiskDetectionService:
         Returns:
             Dict with org_id, total members, and at_risk count.
         """
-        org_uuid = UUID(org_id)
+        total_members = 0
+        at_risk_count = 0
+        async for batch in self.stream_member_risk(session, org_id):
+            total_members += len(batch)
+            at_risk_count += sum(m.at_risk for m in batch)
 
-        # Count members
-        member_count_result = await session.execute(
-            select(func.count()).select_from(OrganizationMember).where(
-                OrganizationMember.org_id == org_uuid
-            )
-        )
-        total_members = member_count_result.scalar() or 0
+        return self._log_org_status(org_id, total_members, at_risk_count)
 
-        # Detect at-risk
-        at_risk_ids = await self.detect_at_risk(session, org_id)
+    async def update_all_engagement_statuses(
+        self,
+        session: AsyncSession,
+        batch_size: int = RISK_BATCH_SIZE,
+    ) -> List[Dict[str, Any]]:
+        """Evaluate and log engagement statuses for every organization.
 
+        Called by the daily Celery task: one detection statement for all
+        organizations, streamed in ``batch_size`` batches. Organizations
+        without members are reported with zero counts.
+
+        Returns:
+            One ``update_engagement_statuses``-shaped dict per organization.
+        """
+        orgs_result = await session.execute(select(Organization.id))
+        counts: Dict[str, List[int]] = {
+            str(row[0]): [0, 0] for row in orgs_result.all()
+        }
+
+        async for batch in self.stream_member_risk(session, batch_size=batch_size):
+            for member in batch:
+                org_counts = counts.setdefault(str(member.org_id), [0, 0])
+                org_counts[0] += 1
+                org_counts[1] += member.at_risk
+
+        return [
+            self._log_org_status(org_id, total, at_risk)
+            for org_id, (total, at_risk) in counts.items()
+        ]
+
+    @staticmethod
+    def _log_org_status(org_id: str, total_members: int, at_risk_count: int) -> Dict[str, Any]:
         logger.info(
             "update_engagement_statuses: org=%s, total=%d, at_risk=%d",
-            org_id, total_members, len(at_risk_ids),
+            org_id, total_members, at_risk_count,
         )
-
         return {
             "org_id": org_id,
             "total_members": total_members,
-            "at_risk_count": len(at_risk_ids),
+            "at_risk_count": at_risk_count,
         }
@@ -0,0 +1,249 @@
+"""Bulk employee onboarding pipeline for validated CSV uploads.
+
+Turns the valid rows of a CSV upload (see ``CSVOnboardingService``) into
+invitations and invitation emails:
+
+1. All invitations are written in one transaction with set-based
+   statements (``InvitationService.create_invitations``), so an upload of
+   ``MAX_BATCH_SIZE`` rows costs a handful of round trips instead of a
+   transaction per row.
+2. Emails go out after the commit as Resend batch requests, a few in
+   flight at once (``send_email_batches``). A failed batch is reported
+   per recipient; the invitations stay valid and can be re-sent.
+
+Progress is reported through ``on_progress``; the Celery task publishes
+it to the inviting admin's ``agent:status`` channel with
+``publish_onboarding_event``. An upload is queued as one task per chunk;
+``track_upload_chunk``, ``seal_upload`` and ``finish_upload_chunk`` sum
+the chunks' outcomes in a Redis hash so the admin gets a single
+``system.onboarding.completed`` event once the last chunk is done.
+
+Architecture: Called from the ``bulk_onboard_employees`` Celery task,
+which the ``/admin/employees/bulk-upload`` endpoint enqueues.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.db.models import Organization, OrganizationMember, OrgRole
+from app.services.enterprise.invitation import InvitationService
+from app.services.transactional_email import build_invitation_email, send_email_batches
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[str, dict], Awaitable[None]]
+
+# Per-upload hash: ``pending`` chunks, summed outcome counters, ``sealed``
+# once every chunk is queued and ``completed`` once the event is sent.
+_UPLOAD_KEY = "onboarding:upload:{upload_id}"
+UPLOAD_TTL_SECONDS = 24 * 60 * 60
+_UPLOAD_COUNTERS = ("processed", "emails_sent", "failed", "total")
+
+
+async def onboard_employees(
+    session: AsyncSession,
+    org_id: str,
+    rows: list[dict],
+    invited_by: str | None = None,
+    org_name: str | None = None,
+    on_progress: ProgressCallback | None = None,
+) -> dict[str, Any]:
+    """Invite every row and dispatch the invitation emails.
+
+    Args:
+        session: Active async DB session; committed once the invitations
+            are written.
+        org_id: Organization UUID string.
+        rows: Validated CSV rows with ``email`` and optional names.
+        invited_by: Admin user UUID string; defaults to the org's first admin.
+        org_name: Organization name for the email; loaded when omitted.
+        on_progress: Awaited with ``(stage, data)`` after the invitations
+            commit (``"invitations_created"``) and after each email batch
+            (``"emails"``).
+
+    Returns:
+        Dict with ``invited``, ``emails_sent`` and ``errors`` (per email).
+    """
+    if invited_by is None or org_name is None:
+        name, admin_id = await _load_org_context(session, org_id)
+        org_name = org_name or name
+        invited_by = invited_by or admin_id
+    if invited_by is None:
+        raise ValueError(f"Organization {org_id} has no admin to send invitations")
+
+    invitations = await InvitationService().create_invitations(
+        session=session, org_id=org_id, rows=rows, invited_by=invited_by
+    )
+    await session.commit()
+    total = len(invitations)
+    if on_progress is not None:
+        await on_progress("invitations_created", {"invited": total, "total": len(rows)})
+
+    base_url = getattr(settings, "FRONTEND_URL", "https://app.jobpilot.ai")
+    messages = [
+        build_invitation_email(
+            to=inv["email"],
+            admin_name=org_name,
+            company_name=org_name,
+            accept_url=f"{base_url}/invitations/{inv['token']}/accept",
+            decline_url=f"{base_url}/invitations/{inv['token']}/decline",
+            recipient_first_name=inv["first_name"],
+        )
+        for inv in invitations
+    ]
+
+    async def _email_progress(sent: int, failed: int) -> None:
+        if on_progress is not None:
+            await on_progress("emails", {"sent": sent, "failed": failed, "total": total})
+
+    dispatch = await send_email_batches(messages, on_progress=_email_progress)
+    logger.info(
+        "Bulk onboarding for org %s: %d invited, %d emails sent, %d failed",
+        org_id,
+        total,
+        dispatch["sent"],
+        len(dispatch["failed"]),
+    )
+    return {
+        "invited": total,
+        "emails_sent": dispatch["sent"],
+        "errors": dispatch["failed"],
+    }
+
+
+async def publish_onboarding_event(
+    redis: Any,
+    user_id: str,
+    event_type: str,
+    title: str,
+    data: dict,
+) -> None:
+    """Publish an onboarding event to the admin's ``agent:status`` channel.
+
+    Best effort: a Redis failure is logged, never raised, so progress
+    reporting cannot fail an onboarding run.
+    """
+    try:
+        await redis.publish(
+            f"agent:status:{user_id}",
+            json.dumps(
+                {
+                    "type": event_type,
+                    "event_id": str(uuid.uuid4()),
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                    "user_id": user_id,
+                    "title": title,
+                    "severity": "info",
+                    "data": data,
+                }
+            ),
+        )
+    except Exception as exc:
+        logger.warning("Failed to publish %s for user %s: %s", event_type, user_id, exc)
+
+
+async def track_upload_chunk(redis: Any, upload_id: str) -> None:
+    """Count one more queued chunk for ``upload_id``; call before queuing it.
+
+    Best effort: without Redis the upload still runs, only its completion
+    event may be missing.
+    """
+    key = _UPLOAD_KEY.format(upload_id=upload_id)
+    try:
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.hincrby(key, "pending", 1)
+            pipe.expire(key, UPLOAD_TTL_SECONDS)
+            await pipe.execute()
+    except Exception as exc:
+        logger.warning("Failed to track onboarding upload %s: %s", upload_id, exc)
+
+
+async def seal_upload(redis: Any, upload_id: str, user_id: str, org_id: str) -> None:
+    """Mark every chunk of ``upload_id`` as queued.
+
+    Sends the completion event here if the chunks already finished (or
+    none had valid rows). Best effort.
+    """
+    key = _UPLOAD_KEY.format(upload_id=upload_id)
+    try:
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, "sealed", 1)
+            pipe.hget(key, "pending")
+            pipe.expire(key, UPLOAD_TTL_SECONDS)
+            _, pending, _ = await pipe.execute()
+        if int(pending or 0) <= 0:
+            await _complete_upload(redis, key, user_id, org_id)
+    except Exception as exc:
+        logger.warning("Failed to seal onboarding upload %s: %s", upload_id, exc)
+
+
+async def finish_upload_chunk(
+    redis: Any, upload_id: str, user_id: str, org_id: str, summary: dict
+) -> None:
+    """Add one finished chunk's counters to ``upload_id``.
+
+    The chunk that finishes last after the upload is sealed sends the
+    single ``system.onboarding.completed`` event. Best effort.
+    """
+    key = _UPLOAD_KEY.format(upload_id=upload_id)
+    try:
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.hincrby(key, "pending", -1)
+            for name in _UPLOAD_COUNTERS:
+                pipe.hincrby(key, name, int(summary.get(name, 0)))
+            pipe.hget(key, "sealed")
+            results = await pipe.execute()
+        if results[0] <= 0 and results[-1]:
+            await _complete_upload(redis, key, user_id, org_id)
+    except Exception as exc:
+        logger.warning("Failed to record onboarding chunk for %s: %s", upload_id, exc)
+
+
+async def _complete_upload(redis: Any, key: str, user_id: str, org_id: str) -> None:
+    # Sealing and the last chunk can both see zero pending; send once.
+    if not await redis.hsetnx(key, "completed", 1):
+        return
+    totals = await redis.hgetall(key)
+    counters = {name: int(totals.get(name, 0)) for name in _UPLOAD_COUNTERS}
+    await publish_onboarding_event(
+        redis,
+        user_id,
+        "system.onboarding.completed",
+        f"{counters['processed']} employees invited",
+        {"status": "completed", "org_id": org_id, **counters},
+    )
+
+
+async def _load_org_context(
+    session: AsyncSession, org_id: str
+) -> tuple[str | None, str | None]:
+    """Return the org's name and its longest-standing admin (one query)."""
+    first_admin = (
+        select(OrganizationMember.user_id)
+        .where(
+            OrganizationMember.org_id == Organization.id,
+            OrganizationMember.role == OrgRole.ADMIN,
+        )
+        .order_by(OrganizationMember.created_at)
+        .limit(1)
+        .scalar_subquery()
+    )
+    result = await session.execute(
+        select(Organization.name, first_admin.label("admin_id")).where(
+            Organization.id == UUID(org_id)
+        )
+    )
+    row = result.first()
+    if row is None:
+        return None, None
+    return row.name, str(row.admin_id) if row.admin_id else None
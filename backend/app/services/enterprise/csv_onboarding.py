@@ -3,18 +3,31 @@
 Parses and validates CSV files containing employee email lists for
 bulk organization onboarding. Handles email format validation,
 duplicate detection, and existing account checks.
+
+Two entry points:
+
+- ``parse_csv`` + ``validate_rows``: whole-file, for in-memory uploads of
+  up to ``MAX_BATCH_SIZE`` rows.
+- ``count_rows`` + ``validate_stream``: incremental, for file uploads of
+  up to ``MAX_STREAM_ROWS`` rows. Rows are decoded (in a worker thread)
+  and validated a chunk at a time, so memory stays flat in the file size;
+  only the seen-set of fixed-size email digests grows with the row count.
 """
 
 from __future__ import annotations
 
+import asyncio
 import codecs
 import csv
+import hashlib
 import io
+import itertools
 import re
 from dataclasses import dataclass, field
+from typing import AsyncIterator, BinaryIO, Iterator
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.models import OrganizationMember, User
@@ -28,6 +41,16 @@ _EMAIL_PATTERN = re.compile(
 
 MAX_BATCH_SIZE = 1000
 
+# Row cap for streamed uploads; bounds the seen-set and the number of
+# onboarding tasks queued per upload.
+MAX_STREAM_ROWS = 100_000
+
+# Rows validated (one DB lookup) and queued together when streaming.
+STREAM_CHUNK_SIZE = MAX_BATCH_SIZE
+
+# Row errors returned for one streamed upload; the rest are only counted.
+MAX_REPORTED_ERRORS = 1000
+
 REQUIRED_HEADERS = {"email"}
 OPTIONAL_HEADERS = {"first_name", "last_name", "department"}
 ALL_HEADERS = REQUIRED_HEADERS | OPTIONAL_HEADERS
@@ -50,6 +73,51 @@ class ValidationResult:
     invalid_rows: list[RowError] = field(default_factory=list)
 
 
+class _SeenEmails:
+    """Emails seen so far in an upload, as 64-bit digests.
+
+    Each entry costs the same regardless of email length. A digest
+    collision (odds ~1e-9 at 100k rows) would flag a row as a duplicate.
+    """
+
+    def __init__(self) -> None:
+        self._digests: set[int] = set()
+
+    def add(self, email: str) -> bool:
+        """Record ``email``; False if it was already seen."""
+        digest = int.from_bytes(
+            hashlib.blake2b(email.encode(), digest_size=8).digest(), "big"
+        )
+        if digest in self._digests:
+            return False
+        self._digests.add(digest)
+        return True
+
+
+def _check_headers(fieldnames: list[str] | None) -> None:
+    if fieldnames is None:
+        raise ValueError("CSV file is empty or has no headers")
+
+    # Normalize header names
+    headers = {h.strip().lower() for h in fieldnames}
+    if not REQUIRED_HEADERS.issubset(headers):
+        missing = REQUIRED_HEADERS - headers
+        raise ValueError(f"Missing required CSV headers: {', '.join(missing)}")
+
+
+def _take(rows: Iterator[tuple[int, dict]], n: int) -> list[tuple[int, dict]]:
+    return list(itertools.islice(rows, n))
+
+
+def _normalize_row(row: dict) -> dict:
+    # Normalize keys and strip values
+    return {
+        k.strip().lower(): (v.strip() if v else "")
+        for k, v in row.items()
+        if k and k.strip().lower() in ALL_HEADERS
+    }
+
+
 class CSVOnboardingService:
     """Service for parsing and validating employee CSV uploads."""
 
@@ -71,15 +139,7 @@ class CSVOnboardingService:
 
         text = file_content.decode("utf-8")
         reader = csv.DictReader(io.StringIO(text))
-
-        if reader.fieldnames is None:
-            raise ValueError("CSV file is empty or has no headers")
-
-        # Normalize header names
-        headers = {h.strip().lower() for h in reader.fieldnames}
-        if not REQUIRED_HEADERS.issubset(headers):
-            missing = REQUIRED_HEADERS - headers
-            raise ValueError(f"Missing required CSV headers: {', '.join(missing)}")
+        _check_headers(reader.fieldnames)
 
         rows = []
         for i, row in enumerate(reader, start=2):  # Row 1 is header
@@ -87,16 +147,87 @@ class CSVOnboardingService:
                 raise ValueError(
                     f"CSV exceeds maximum batch size of {MAX_BATCH_SIZE} rows"
                 )
-            # Normalize keys and strip values
-            normalized = {
-                k.strip().lower(): (v.strip() if v else "")
-                for k, v in row.items()
-                if k and k.strip().lower() in ALL_HEADERS
-            }
-            rows.append(normalized)
+            rows.append(_normalize_row(row))
 
         return rows
 
+    def iter_rows(
+        self, stream: BinaryIO, max_rows: int = MAX_STREAM_ROWS
+    ) -> Iterator[tuple[int, dict]]:
+        """Decode a binary CSV stream incrementally.
+
+        Args:
+            stream: Readable binary file object (e.g. ``UploadFile.file``),
+                left open.
+            max_rows: Row cap.
+
+        Yields:
+            ``(row_number, row)`` pairs; row 1 is the header.
+
+        Raises:
+            ValueError: On missing headers or more than ``max_rows`` rows.
+        """
+        # utf-8-sig strips a BOM; newline="" as the csv module expects.
+        text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+        try:
+            reader = csv.DictReader(text)
+            _check_headers(reader.fieldnames)
+            for i, row in enumerate(reader, start=2):  # Row 1 is header
+                if i - 1 > max_rows:
+                    raise ValueError(
+                        f"CSV exceeds maximum batch size of {max_rows} rows"
+                    )
+                yield i, _normalize_row(row)
+        finally:
+            text.detach()  # keep the caller's stream open
+
+    def count_rows(self, stream: BinaryIO, max_rows: int = MAX_STREAM_ROWS) -> int:
+        """Check headers and row cap of a seekable stream, then rewind it.
+
+        Lets the caller reject an upload before ``validate_stream`` has
+        queued anything for it.
+
+        Raises:
+            ValueError: As ``iter_rows``.
+        """
+        try:
+            return sum(1 for _ in self.iter_rows(stream, max_rows))
+        finally:
+            stream.seek(0)
+
+    async def validate_stream(
+        self,
+        stream: BinaryIO,
+        org_id: str,
+        session: AsyncSession,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+        max_rows: int = MAX_STREAM_ROWS,
+    ) -> AsyncIterator[ValidationResult]:
+        """Validate a binary CSV stream chunk by chunk.
+
+        Same rules as ``validate_rows``; duplicates are detected across
+        the whole upload. Each chunk is read and decoded in a worker
+        thread, so parsing never blocks the event loop; the next chunk is
+        only read once the caller asks for it.
+
+        Args:
+            stream: Readable binary file object, left open.
+            org_id: The organization UUID string.
+            session: Active async DB session.
+            chunk_size: Rows per existing-account lookup and per result.
+            max_rows: Row cap.
+
+        Yields:
+            One ValidationResult per chunk of up to ``chunk_size`` rows.
+
+        Raises:
+            ValueError: As ``iter_rows``.
+        """
+        seen = _SeenEmails()
+        rows = self.iter_rows(stream, max_rows)
+        while chunk := await asyncio.to_thread(_take, rows, chunk_size):
+            yield await self._validate_chunk(chunk, org_id, session, seen)
+
     async def validate_rows(
         self,
         rows: list[dict],
@@ -113,31 +244,43 @@ class CSVOnboardingService:
         Returns:
             ValidationResult with valid and invalid rows.
         """
-        result = ValidationResult()
-        seen_emails: dict[str, int] = {}
-
-        # Collect all emails for batch DB lookup
-        all_emails = [r.get("email", "").lower() for r in rows]
-
-        # Batch query: find existing users by email
-        existing_users_result = await session.execute(
-            select(User.id, User.email).where(User.email.in_(all_emails))
+        return await self._validate_chunk(
+            list(enumerate(rows, start=2)),  # Row 1 is header
+            org_id,
+            session,
+            _SeenEmails(),
         )
-        existing_users = {row.email.lower(): row.id for row in existing_users_result}
 
-        # Batch query: find org members by user_id
-        if existing_users:
-            org_members_result = await session.execute(
-                select(OrganizationMember.user_id).where(
+    async def _validate_chunk(
+        self,
+        numbered_rows: list[tuple[int, dict]],
+        org_id: str,
+        session: AsyncSession,
+        seen: _SeenEmails,
+    ) -> ValidationResult:
+        """Validate ``(row_number, row)`` pairs with one existing-account lookup."""
+        result = ValidationResult()
+
+        # One lookup for every distinct email: existing accounts, joined to
+        # their membership in this org (NULL when they belong elsewhere).
+        all_emails = sorted({r.get("email", "").lower() for _, r in numbered_rows})
+        existing_result = await session.execute(
+            select(User.email, OrganizationMember.user_id.label("member_id"))
+            .outerjoin(
+                OrganizationMember,
+                and_(
+                    OrganizationMember.user_id == User.id,
                     OrganizationMember.org_id == UUID(org_id),
-                    OrganizationMember.user_id.in_(list(existing_users.values())),
-                )
+                ),
             )
-            org_member_ids = {row.user_id for row in org_members_result}
-        else:
-            org_member_ids = set()
+            .where(User.email.in_(all_emails))
+        )
+        # email -> already a member of this org
+        existing_users = {
+            row.email.lower(): row.member_id is not None for row in existing_result
+        }
 
-        for i, row in enumerate(rows, start=2):  # Row 1 is header
+        for i, row in numbered_rows:
             email = row.get("email", "").lower()
 
             # Email format validation
@@ -148,17 +291,15 @@ class CSVOnboardingService:
                 continue
 
             # Duplicate detection within CSV
-            if email in seen_emails:
+            if not seen.add(email):
                 result.invalid_rows.append(
                     RowError(row_number=i, email=email, error_reason="duplicate_in_upload")
                 )
                 continue
-            seen_emails[email] = i
 
             # Existing account detection
             if email in existing_users:
-                user_id = existing_users[email]
-                if user_id in org_member_ids:
+                if existing_users[email]:
                     result.invalid_rows.append(
                         RowError(
                             row_number=i,
@@ -8,13 +8,14 @@ from __future__ import annotations
 
 import logging
 from datetime import datetime, timedelta, timezone
-from uuid import UUID
+from uuid import UUID, uuid4
 
-from sqlalchemy import select, update
+from sqlalchemy import insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
 from app.db.models import (
+    AuditLog,
     Invitation,
     InvitationStatus,
     Organization,
@@ -86,6 +87,114 @@ class InvitationService:
         logger.info("Invitation created: id=%s email=%s org=%s", invitation.id, email, org_id)
         return invitation
 
+    async def create_invitations(
+        self,
+        session: AsyncSession,
+        org_id: str,
+        rows: list[dict],
+        invited_by: str,
+    ) -> list[dict]:
+        """Create invitations for many employees with set-based statements.
+
+        Bulk counterpart of ``create_invitation`` with the same effects --
+        pending invitations for the same emails are revoked, and every
+        revocation and creation is audited -- in four statements regardless
+        of the row count: one ``UPDATE ... RETURNING`` for the revocations
+        and multi-row inserts for the invitations and both audit sets. Ids
+        and tokens are generated here, so nothing has to be read back.
+
+        Args:
+            session: Active async database session (caller manages transaction).
+            org_id: Organization UUID string.
+            rows: Dicts with ``email`` and optional ``first_name`` / ``last_name``.
+                Emails repeated within ``rows`` are invited once.
+            invited_by: Admin user UUID string who is sending the invites.
+
+        Returns:
+            One dict per created invitation with ``id``, ``email``, ``token``,
+            ``first_name`` and ``last_name``.
+        """
+        org_uuid = UUID(org_id) if isinstance(org_id, str) else org_id
+        inviter_uuid = UUID(invited_by) if isinstance(invited_by, str) else invited_by
+        expires_at = datetime.now(timezone.utc) + timedelta(days=INVITATION_EXPIRY_DAYS)
+
+        invitations: dict[str, dict] = {}
+        for row in rows:
+            email = row.get("email", "").lower().strip()
+            if email and email not in invitations:
+                invitations[email] = {
+                    "id": uuid4(),
+                    "email": email,
+                    "token": uuid4(),
+                    "first_name": row.get("first_name") or None,
+                    "last_name": row.get("last_name") or None,
+                }
+        if not invitations:
+            return []
+
+        revoked = (
+            await session.execute(
+                update(Invitation)
+                .where(
+                    Invitation.org_id == org_uuid,
+                    Invitation.email.in_(list(invitations)),
+                    Invitation.status == InvitationStatus.PENDING,
+                )
+                .values(status=InvitationStatus.REVOKED)
+                .returning(Invitation.id, Invitation.email)
+                .execution_options(synchronize_session=False)
+            )
+        ).all()
+
+        await session.execute(
+            insert(Invitation),
+            [
+                {
+                    **inv,
+                    "org_id": org_uuid,
+                    "invited_by": inviter_uuid,
+                    "status": InvitationStatus.PENDING,
+                    "expires_at": expires_at,
+                }
+                for inv in invitations.values()
+            ],
+        )
+
+        audit_rows = [
+            {
+                "org_id": org_uuid,
+                "actor_id": inviter_uuid,
+                "action": "invitation_revoked",
+                "resource_type": "invitation",
+                "resource_id": row.id,
+                "changes": {"email": row.email, "reason": "replaced_by_new_invitation"},
+            }
+            for row in revoked
+        ] + [
+            {
+                "org_id": org_uuid,
+                "actor_id": inviter_uuid,
+                "action": "invitation_created",
+                "resource_type": "invitation",
+                "resource_id": inv["id"],
+                "changes": {
+                    "email": inv["email"],
+                    "first_name": inv["first_name"],
+                    "last_name": inv["last_name"],
+                },
+            }
+            for inv in invitations.values()
+        ]
+        await session.execute(insert(AuditLog), audit_rows)
+
+        logger.info(
+            "Invitations created: %d (revoked %d pending) org=%s",
+            len(invitations),
+            len(revoked),
+            org_id,
+        )
+        return list(invitations.values())
+
     async def accept_invitation(
         self,
         session: AsyncSession,
@@ -0,0 +1,78 @@
+"""Query planner for enterprise dashboard metrics.
+
+Dashboards need many scalar metrics over a handful of sources (the daily
+rollup, the member list, org settings). Instead of one statement per
+metric awaited one after another, services register named ``Metric``
+expressions in groups. Metrics of one group share FROM/WHERE and are
+fused into a single ``SELECT``; a metric with its own predicate becomes
+``agg(...) FILTER (WHERE ...)`` rather than a separate statement. The
+groups run one after another on the caller's session, so a dashboard
+request holds a single pooled connection.
+
+Architecture: Used by ``EnterpriseMetricsService`` and
+``ROIReportService``; the org totals they share are planned by
+``metrics_rollup.add_org_totals``.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+@dataclass(frozen=True)
+class Metric:
+    """One named value computed by an SQL expression."""
+
+    name: str
+    expr: Any
+    where: Any = None  # own predicate, emitted as FILTER (WHERE ...)
+
+    def column(self) -> Any:
+        expr = self.expr if self.where is None else self.expr.filter(self.where)
+        return expr.label(self.name)
+
+
+class MetricsQueryPlanner:
+    """Collects metrics by group and runs one statement per group."""
+
+    def __init__(self) -> None:
+        self._groups: dict[str, tuple[tuple, list[Metric]]] = {}
+
+    def add(
+        self, group: str, *metrics: Metric, where: Sequence[Any] = ()
+    ) -> MetricsQueryPlanner:
+        """Add ``metrics`` to ``group``; the first add sets its predicates."""
+        if group not in self._groups:
+            self._groups[group] = (tuple(where), [])
+        elif where:
+            raise ValueError(f"Metric group {group!r} already has its predicates")
+        self._groups[group][1].extend(metrics)
+        return self
+
+    def statements(self) -> dict[str, Any]:
+        """One fused ``SELECT`` per group, in insertion order."""
+        return {
+            group: select(*(metric.column() for metric in metrics)).where(*where)
+            for group, (where, metrics) in self._groups.items()
+        }
+
+    async def run(self, session: AsyncSession) -> dict[str, Any]:
+        """Execute every group on ``session`` and return ``{metric name: value}``.
+
+        Groups that return no row (e.g. a lookup of a missing org)
+        contribute no names.
+        """
+        values: dict[str, Any] = {}
+        for stmt in self.statements().values():
+            values.update(await _fetch(session, stmt))
+        return values
+
+
+async def _fetch(session: AsyncSession, stmt: Any) -> dict[str, Any]:
+    result = await session.execute(stmt)
+    row = result.mappings().first()
+    return dict(row) if row is not None else {}
@@ -0,0 +1,257 @@
+"""Daily org metrics rollup for enterprise dashboards.
+
+Maintains ``org_daily_metrics``: one row per (org, UTC day) with the
+application, interview, placement and job-review counters the metrics and
+ROI services report, plus the distinct active members of that day. The
+dashboards then answer from range sums over at most one row per day, so
+their latency no longer grows with the history of the raw tables.
+
+Two jobs keep it current:
+
+- ``rebuild_org_daily_metrics`` (nightly): recomputes the whole table in
+  one transaction. It also picks up what the incremental job cannot see --
+  removed members.
+- ``refresh_org_daily_metrics`` (every few minutes): recomputes only the
+  (org, day) buckets touched since a cut-off -- applications updated
+  since then (bucketed by their ``applied_at`` day, so status changes land
+  in the right bucket), the buckets applications moved out of or were
+  deleted from (logged by a trigger in ``application_day_changes``), job
+  reviews logged since then, and every bucket of members who joined since
+  then.
+
+Buckets follow the original queries exactly: applications by
+``applied_at``, current org membership, interviews = interview or offer,
+placements = offer, time to placement = offer ``updated_at`` minus
+enrollment.
+
+Architecture: Called from the ``rebuild_org_daily_metrics`` and
+``refresh_org_daily_metrics`` Celery tasks; read by
+``EnterpriseMetricsService`` and ``ROIReportService`` through
+``add_org_totals``.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import date, datetime, timedelta, timezone
+from uuid import UUID
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import OrganizationMember, OrgDailyMetric
+from app.services.enterprise.metrics_planner import Metric, MetricsQueryPlanner
+
+logger = logging.getLogger(__name__)
+
+# How far back each incremental refresh looks; twice the 15-minute beat
+# interval, so clock skew and late-committing transactions are covered.
+REFRESH_LOOKBACK = timedelta(minutes=30)
+
+# Rollup counters summed over a date range by ``add_org_totals``.
+ROLLUP_COUNTERS = (
+    "applications",
+    "interviews",
+    "placements",
+    "placement_days_sum",
+    "jobs_reviewed",
+)
+
+# Per-(org, day) aggregates. ``{app_scope}`` / ``{review_scope}`` restrict
+# the scans to dirty buckets for the incremental refresh.
+_AGGREGATES = """
+app_days AS (
+    SELECT om.org_id,
+           (a.applied_at AT TIME ZONE 'UTC')::date AS day,
+           COUNT(*) AS applications,
+           COUNT(*) FILTER (WHERE a.status IN ('interview', 'offer')) AS interviews,
+           COUNT(*) FILTER (WHERE a.status = 'offer') AS placements,
+           COALESCE(SUM(
+               EXTRACT(EPOCH FROM a.updated_at) - EXTRACT(EPOCH FROM om.created_at)
+           ) FILTER (WHERE a.status = 'offer'), 0) / 86400.0 AS placement_days_sum,
+           array_agg(DISTINCT a.user_id) AS active_user_ids
+    FROM applications a
+    JOIN organization_members om ON om.user_id = a.user_id
+    {app_scope}
+    GROUP BY 1, 2
+),
+review_days AS (
+    SELECT om.org_id,
+           (aa.created_at AT TIME ZONE 'UTC')::date AS day,
+           COUNT(*) AS jobs_reviewed
+    FROM agent_activities aa
+    JOIN organization_members om ON om.user_id = aa.user_id
+    {review_scope}
+    WHERE aa.event_type = 'job_review'
+    GROUP BY 1, 2
+)
+"""
+
+_COLUMNS = """
+    org_id, day, applications, interviews, placements,
+    placement_days_sum, active_user_ids, jobs_reviewed
+"""
+
+_VALUES = """
+    COALESCE(a.applications, 0), COALESCE(a.interviews, 0),
+    COALESCE(a.placements, 0), COALESCE(a.placement_days_sum, 0),
+    COALESCE(a.active_user_ids, '{}'), COALESCE(r.jobs_reviewed, 0)
+"""
+
+_REBUILD_DELETE = text("DELETE FROM org_daily_metrics")
+
+# Changes older than any refresh window are covered by the rebuild.
+_PRUNE_DAY_CHANGES = text("DELETE FROM application_day_changes WHERE changed_at < :before")
+
+_REBUILD_INSERT = text(
+    f"INSERT INTO org_daily_metrics ({_COLUMNS})\n"
+    "WITH "
+    + _AGGREGATES.format(app_scope="", review_scope="")
+    + f"SELECT org_id, day, {_VALUES}\n"
+    "FROM app_days a\n"
+    "FULL JOIN review_days r USING (org_id, day)"
+)
+
+# A bucket is dirty when an application in it changed, an application left
+# it, a review was logged in it, or one of its members joined (their
+# history now counts).
+_DIRTY = """
+dirty AS (
+    SELECT om.org_id, (a.applied_at AT TIME ZONE 'UTC')::date AS day
+    FROM applications a
+    JOIN organization_members om ON om.user_id = a.user_id
+    WHERE a.updated_at >= :since
+    UNION
+    SELECT om.org_id, c.day
+    FROM application_day_changes c
+    JOIN organization_members om ON om.user_id = c.user_id
+    WHERE c.changed_at >= :since
+    UNION
+    SELECT om.org_id, (a.applied_at AT TIME ZONE 'UTC')::date
+    FROM organization_members om
+    JOIN applications a ON a.user_id = om.user_id
+    WHERE om.created_at >= :since
+    UNION
+    SELECT om.org_id, (aa.created_at AT TIME ZONE 'UTC')::date
+    FROM agent_activities aa
+    JOIN organization_members om ON om.user_id = aa.user_id
+    WHERE aa.event_type = 'job_review' AND aa.created_at >= :since
+    UNION
+    SELECT om.org_id, (aa.created_at AT TIME ZONE 'UTC')::date
+    FROM organization_members om
+    JOIN agent_activities aa ON aa.user_id = om.user_id
+    WHERE aa.event_type = 'job_review' AND om.created_at >= :since
+),
+"""
+
+# Sargable [day, day + 1) range per dirty bucket.
+_DAY_RANGE = (
+    "{col} >= (d.day::timestamp AT TIME ZONE 'UTC') "
+    "AND {col} < ((d.day + 1)::timestamp AT TIME ZONE 'UTC')"
+)
+
+_REFRESH_UPSERT = text(
+    f"INSERT INTO org_daily_metrics ({_COLUMNS})\n"
+    "WITH "
+    + _DIRTY
+    + _AGGREGATES.format(
+        app_scope=(
+            "JOIN dirty d ON d.org_id = om.org_id AND "
+            + _DAY_RANGE.format(col="a.applied_at")
+        ),
+        review_scope=(
+            "JOIN dirty d ON d.org_id = om.org_id AND "
+            + _DAY_RANGE.format(col="aa.created_at")
+        ),
+    )
+    + f"SELECT org_id, day, {_VALUES}\n"
+    "FROM dirty\n"
+    "LEFT JOIN app_days a USING (org_id, day)\n"
+    "LEFT JOIN review_days r USING (org_id, day)\n"
+    "ON CONFLICT (org_id, day) DO UPDATE SET\n"
+    "    applications = EXCLUDED.applications,\n"
+    "    interviews = EXCLUDED.interviews,\n"
+    "    placements = EXCLUDED.placements,\n"
+    "    placement_days_sum = EXCLUDED.placement_days_sum,\n"
+    "    active_user_ids = EXCLUDED.active_user_ids,\n"
+    "    jobs_reviewed = EXCLUDED.jobs_reviewed,\n"
+    "    updated_at = NOW()"
+)
+
+
+async def rebuild_org_daily_metrics(session: AsyncSession) -> int:
+    """Recompute every (org, day) bucket from the raw tables.
+
+    Delete and insert share one transaction, so readers keep seeing the
+    previous rollup until the new one commits. Logged bucket changes older
+    than ``REFRESH_LOOKBACK`` are pruned in the same transaction.
+
+    Returns:
+        Number of buckets written.
+    """
+    await session.execute(_REBUILD_DELETE)
+    result = await session.execute(_REBUILD_INSERT)
+    await session.execute(
+        _PRUNE_DAY_CHANGES, {"before": datetime.now(timezone.utc) - REFRESH_LOOKBACK}
+    )
+    await session.commit()
+    logger.info("Rebuilt org_daily_metrics: %d buckets", result.rowcount)
+    return result.rowcount
+
+
+async def refresh_org_daily_metrics(session: AsyncSession, since: datetime) -> int:
+    """Recompute the buckets touched since ``since`` (upsert).
+
+    Buckets that became empty are written as zeros rather than deleted.
+
+    Returns:
+        Number of buckets written.
+    """
+    result = await session.execute(_REFRESH_UPSERT, {"since": since})
+    await session.commit()
+    logger.info(
+        "Refreshed org_daily_metrics since %s: %d buckets", since.isoformat(), result.rowcount
+    )
+    return result.rowcount
+
+
+def add_org_totals(
+    planner: MetricsQueryPlanner, org_uuid: UUID, start_day: date, end_day: date
+) -> MetricsQueryPlanner:
+    """Plan an org's totals over ``[start_day, end_day]`` (three statements).
+
+    Adds ``enrolled`` (live member count), the ``ROLLUP_COUNTERS`` range
+    sums, and ``active`` (distinct members with applications in range).
+    """
+    in_range = (
+        OrgDailyMetric.org_id == org_uuid,
+        OrgDailyMetric.day >= start_day,
+        OrgDailyMetric.day <= end_day,
+    )
+    planner.add(
+        "members",
+        Metric("enrolled", func.count(OrganizationMember.id)),
+        where=(OrganizationMember.org_id == org_uuid,),
+    )
+    planner.add(
+        "rollup",
+        *(
+            Metric(name, func.coalesce(func.sum(getattr(OrgDailyMetric, name)), 0))
+            for name in ROLLUP_COUNTERS
+        ),
+        where=in_range,
+    )
+    active = (
+        select(func.unnest(OrgDailyMetric.active_user_ids).label("user_id"))
+        .where(*in_range)
+        .subquery()
+    )
+    planner.add("active", Metric("active", func.count(func.distinct(active.c.user_id))))
+    return planner
+
+
+def avg_time_to_placement(placement_days_sum: float, placements: int) -> float | None:
+    """Average days from enrollment to placement, or None without placements."""
+    if not placements:
+        return None
+    return round(float(placement_days_sum) / placements, 1)
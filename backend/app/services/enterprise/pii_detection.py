@@ -5,6 +5,12 @@ Provides regex-based detection of potential company PII (project names,
 internal URLs, email domains, proprietary terms) in resume and cover letter
 content before finalization.
 
+Each organization's default + custom patterns and whitelist are compiled
+once into a :class:`PIIScanner` (with a required-literal prefilter per
+pattern) and cached in process, so a scan costs no database queries.
+``PUT /admin/pii-config`` invalidates the org's scanner; other worker
+processes pick the change up within ``SCANNER_TTL_SECONDS``.
+
 Detection results are anonymized -- matched text is never stored in alerts.
 Admin alerting uses SHA-256 hashed user_id to protect employee privacy.
 """
@@ -13,9 +19,10 @@ from __future__ import annotations
 
 import hashlib
 import re
+import time
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import uuid4
 
 from sqlalchemy import select
@@ -84,6 +91,179 @@ DEFAULT_PATTERNS: List[Dict[str, Any]] = [
 ]
 
 
+# ---------------------------------------------------------------------------
+# Compiled scanner
+# ---------------------------------------------------------------------------
+
+# Seconds a cached scanner is trusted; bounds staleness in processes other
+# than the one that handled the config update.
+SCANNER_TTL_SECONDS = 300
+
+# org_id -> (loaded_at monotonic seconds, scanner)
+_SCANNER_CACHE: Dict[str, Tuple[float, "PIIScanner"]] = {}
+
+
+_QUANTIFIER = re.compile(r"\{(\d*)(?:,\d*)?\}")
+_ZERO_MIN_QUANTIFIERS = frozenset("?*")
+# One escape token, consuming numeric/hex/named arguments whole.
+_ESCAPE = re.compile(r"\\(?:x[0-9a-fA-F]{2}|u[0-9a-fA-F]{4}|U[0-9a-fA-F]{8}|N\{[^}]*\}|\d{1,3}|.)", re.S)
+_LITERAL_ESCAPES = frozenset(".^$*+?{}[]()|\\/-@#&~%:!=<>'\" ,")
+
+
+def _skip_class(pattern: str, i: int) -> int:
+    """Index just past the character class starting at ``pattern[i] == "["``."""
+    i += 1
+    if i < len(pattern) and pattern[i] == "^":
+        i += 1
+    if i < len(pattern) and pattern[i] == "]":
+        i += 1
+    while i < len(pattern) and pattern[i] != "]":
+        i += 2 if pattern[i] == "\\" else 1
+    return i + 1
+
+
+def _skip_group(pattern: str, i: int) -> int:
+    """Index just past the group starting at ``pattern[i] == "("``."""
+    depth = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            i += 2
+            continue
+        if char == "[":
+            i = _skip_class(pattern, i)
+            continue
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    return i
+
+
+def required_literal(regex: re.Pattern) -> str:
+    """Longest literal every match of *regex* must contain ("" if unknown).
+
+    Only top-level literal runs count: groups, classes, escapes other than
+    escaped punctuation, and characters under an optional quantifier end a
+    run, and a top-level ``|`` or a case-insensitive/verbose pattern yields
+    no literal. The result is a necessary condition, so skipping the regex
+    when the literal is absent from the text never loses a match.
+    """
+    if regex.flags & (re.IGNORECASE | re.VERBOSE):
+        return ""
+    pattern = regex.pattern
+    runs: List[str] = []
+    run: List[str] = []
+
+    def end_run() -> None:
+        if run:
+            runs.append("".join(run))
+            run.clear()
+
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "|":
+            return ""
+        if char in _ZERO_MIN_QUANTIFIERS or char == "+":
+            if char in _ZERO_MIN_QUANTIFIERS and run:
+                run.pop()
+            end_run()
+            i += 1
+        elif char == "{" and _QUANTIFIER.match(pattern, i):
+            quantifier = _QUANTIFIER.match(pattern, i)
+            if run and not int(quantifier.group(1) or 0):
+                run.pop()
+            end_run()
+            i = quantifier.end()
+        elif char == "\\":
+            escape = _ESCAPE.match(pattern, i)
+            if escape is None:
+                return ""
+            if escape.group()[1:] in _LITERAL_ESCAPES:
+                run.append(escape.group()[1:])
+            else:
+                end_run()
+            i = escape.end()
+        elif char == "[":
+            end_run()
+            i = _skip_class(pattern, i)
+        elif char == "(":
+            end_run()
+            i = _skip_group(pattern, i)
+        elif char in ".^$)":
+            end_run()
+            i += 1
+        else:
+            run.append(char)
+            i += 1
+    end_run()
+    return max(runs, key=len, default="")
+
+
+class PIIScanner:
+    """An organization's enabled patterns and whitelist, compiled once.
+
+    Each pattern carries its :func:`required_literal`; a plain substring
+    check skips every pattern whose literal is absent, so for typical
+    resume text only the few patterns without a usable literal run a full
+    regex pass. Detections are exactly those of running every pattern.
+    """
+
+    def __init__(
+        self,
+        patterns: List[Dict[str, Any]],
+        whitelist: Optional[List[str]] = None,
+    ) -> None:
+        # (regex, required literal, category, pattern id)
+        self.patterns: List[Tuple[re.Pattern, str, str, str]] = []
+        for pat in patterns:
+            if not pat.get("enabled", True):
+                continue
+            try:
+                regex = re.compile(pat["pattern"])
+            except (re.error, KeyError, TypeError):
+                continue  # skip invalid patterns silently at scan time
+            self.patterns.append((
+                regex,
+                required_literal(regex),
+                pat.get("category", "unknown"),
+                pat.get("id", "custom"),
+            ))
+        self.whitelist = frozenset(term.lower() for term in whitelist or [])
+
+    def scan(self, text: str) -> List[PIIDetection]:
+        """Detections in *text*, in pattern order, whitelist applied."""
+        detections: List[PIIDetection] = []
+        for regex, literal, category, pattern_id in self.patterns:
+            if literal not in text:
+                continue
+            for match in regex.finditer(text):
+                term = match.group()
+                if term.lower() in self.whitelist:
+                    continue
+                detections.append(
+                    PIIDetection(
+                        matched_term=term,
+                        category=category,
+                        position=match.start(),
+                        pattern_id=pattern_id,
+                    )
+                )
+        return detections
+
+
+def invalidate_scanner(org_id: Optional[str] = None) -> None:
+    """Drop the cached scanner for *org_id* (or every org when ``None``)."""
+    if org_id is None:
+        _SCANNER_CACHE.clear()
+    else:
+        _SCANNER_CACHE.pop(str(org_id), None)
+
+
 # ---------------------------------------------------------------------------
 # Service
 # ---------------------------------------------------------------------------
@@ -96,9 +276,6 @@ class PIIDetectionService:
     patterns, applies whitelist exclusions, and returns anonymized results.
     """
 
-    def __init__(self) -> None:
-        self._compiled_cache: Dict[str, re.Pattern] = {}
-
     # -- public API ---------------------------------------------------------
 
     async def scan_text(
@@ -110,29 +287,23 @@ class PIIDetectionService:
         """Scan *text* for PII patterns configured for *org_id*.
 
         Returns a list of :class:`PIIDetection` objects (may be empty).
-        Whitelist filtering is applied before returning.
+        Whitelist filtering is applied before returning. *session* is only
+        used when the org's scanner is not cached.
         """
-        patterns = await self._load_patterns(org_id, session)
-        detections: List[PIIDetection] = []
+        scanner = await self.get_scanner(org_id, session)
+        return scanner.scan(text)
 
-        for pat in patterns:
-            if not pat.get("enabled", True):
-                continue
-            regex = self._compile(pat["pattern"])
-            if regex is None:
-                continue  # skip invalid patterns silently at scan time
-            for match in regex.finditer(text):
-                detections.append(
-                    PIIDetection(
-                        matched_term=match.group(),
-                        category=pat.get("category", "unknown"),
-                        position=match.start(),
-                        pattern_id=pat.get("id", "custom"),
-                    )
-                )
+    async def get_scanner(self, org_id: str, session: AsyncSession) -> PIIScanner:
+        """The org's compiled scanner, loading it on a cache miss."""
+        key = str(org_id)
+        cached = _SCANNER_CACHE.get(key)
+        now = time.monotonic()
+        if cached is not None and now - cached[0] < SCANNER_TTL_SECONDS:
+            return cached[1]
 
-        detections = await self._apply_whitelist(detections, org_id, session)
-        return detections
+        scanner = await self._load_scanner(org_id, session)
+        _SCANNER_CACHE[key] = (now, scanner)
+        return scanner
 
     async def check_pii(
         self,
@@ -190,52 +361,25 @@ class PIIDetectionService:
 
     # -- internal helpers ---------------------------------------------------
 
-    async def _load_patterns(
+    async def _load_scanner(
         self,
         org_id: str,
         session: AsyncSession,
-    ) -> List[Dict[str, Any]]:
-        """Merge default patterns with org-custom patterns."""
+    ) -> PIIScanner:
+        """Compile default + org-custom patterns and the org whitelist."""
         result = await session.execute(
             select(Organization.settings).where(Organization.id == org_id)
         )
         row = result.scalar()
         settings: Dict[str, Any] = row if isinstance(row, dict) else {}
 
-        custom: List[Dict[str, Any]] = settings.get("pii_patterns", [])
-
         # Default patterns first, then org-custom patterns
         merged = list(DEFAULT_PATTERNS)
-        for pat in custom:
+        for pat in settings.get("pii_patterns", []):
             # Assign an id if missing
-            if "id" not in pat:
-                pat["id"] = f"custom_{len(merged)}"
-            merged.append(pat)
+            merged.append({"id": f"custom_{len(merged)}", **pat})
 
-        return merged
-
-    async def _apply_whitelist(
-        self,
-        detections: List[PIIDetection],
-        org_id: str,
-        session: AsyncSession,
-    ) -> List[PIIDetection]:
-        """Remove detections whose matched_term is in the org whitelist."""
-        result = await session.execute(
-            select(Organization.settings).where(Organization.id == org_id)
-        )
-        row = result.scalar()
-        settings: Dict[str, Any] = row if isinstance(row, dict) else {}
-
-        whitelist: List[str] = settings.get("pii_whitelist", [])
-        if not whitelist:
-            return detections
-
-        # Case-insensitive whitelist matching
-        lower_whitelist = {term.lower() for term in whitelist}
-        return [
-            d for d in detections if d.matched_term.lower() not in lower_whitelist
-        ]
+        return PIIScanner(merged, settings.get("pii_whitelist", []))
 
     async def _create_alert(
         self,
@@ -273,14 +417,3 @@ class PIIDetectionService:
             },
         )
         session.add(activity)
-
-    def _compile(self, pattern: str) -> Optional[re.Pattern]:
-        """Compile and cache a regex pattern. Returns None on error."""
-        if pattern in self._compiled_cache:
-            return self._compiled_cache[pattern]
-        try:
-            compiled = re.compile(pattern)
-            self._compiled_cache[pattern] = compiled
-            return compiled
-        except re.error:
-            return None
@@ -2,7 +2,8 @@
 
 Computes cost-per-placement, time-to-placement, engagement rate, and
 satisfaction score using privacy-safe aggregate queries (COUNT, AVG, SUM
-only). Provides benchmark comparisons against configurable industry defaults.
+only) over the ``org_daily_metrics`` rollup. Provides benchmark comparisons
+against configurable industry defaults.
 
 Privacy invariant: no method returns individual user data.
 """
@@ -13,15 +14,12 @@ from datetime import date, datetime, timedelta, timezone
 from typing import Any
 from uuid import UUID
 
-from sqlalchemy import func, select
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.models import (
-    Application,
-    ApplicationStatus,
-    Organization,
-    OrganizationMember,
-)
+from app.db.models import Organization
+from app.services.enterprise.metrics_planner import Metric, MetricsQueryPlanner
+from app.services.enterprise.metrics_rollup import add_org_totals, avg_time_to_placement
 
 
 class ROIReportService:
@@ -48,6 +46,7 @@ class ROIReportService:
 
         Defaults to current calendar month if no dates provided.
         Returns a dict with metric values and benchmark comparisons.
+        Every input comes from four fused statements.
         """
         today = date.today()
         if start_date is None:
@@ -59,23 +58,22 @@ class ROIReportService:
         end_dt = datetime(end_date.year, end_date.month, end_date.day, 23, 59, 59, tzinfo=timezone.utc)
         org_uuid = UUID(org_id) if isinstance(org_id, str) else org_id
 
-        cost_per_placement = await self._compute_cost_per_placement(
-            session, org_uuid, start_dt, end_dt
-        )
-        time_to_placement = await self._compute_time_to_placement(
-            session, org_uuid, start_dt, end_dt
-        )
-        engagement_rate = await self._compute_engagement_rate(
-            session, org_uuid, start_dt, end_dt
-        )
+        totals = await self._query_totals(session, org_uuid, start_dt, end_dt)
+        org_settings = totals.get("settings") or {}
         satisfaction_score = await self._compute_satisfaction_score(
             session, org_uuid, start_dt, end_dt
         )
 
         metrics = {
-            "cost_per_placement": cost_per_placement,
-            "time_to_placement_days": time_to_placement,
-            "engagement_rate": engagement_rate,
+            "cost_per_placement": self._compute_cost_per_placement(
+                totals["placements"], totals["enrolled"], org_settings
+            ),
+            "time_to_placement_days": avg_time_to_placement(
+                totals["placement_days_sum"], totals["placements"]
+            ),
+            "engagement_rate": self._compute_engagement_rate(
+                totals["active"], totals["enrolled"]
+            ),
             "satisfaction_score": satisfaction_score,
             "period": {
                 "start_date": start_date.isoformat(),
@@ -83,143 +81,58 @@ class ROIReportService:
             },
         }
 
-        # Load org-specific benchmark overrides
-        benchmarks = await self._load_org_benchmarks(session, org_uuid)
+        # Org-specific benchmark overrides
+        benchmarks = self._org_benchmarks(org_settings)
         metrics["benchmarks"] = self.add_benchmarks(metrics, benchmarks)
 
         return metrics
 
-    async def _compute_cost_per_placement(
+    async def _query_totals(
         self,
         session: AsyncSession,
         org_uuid: UUID,
         start_dt: datetime,
         end_dt: datetime,
+    ) -> dict[str, Any]:
+        """Org totals for the period plus ``settings`` (four fused statements)."""
+        planner = add_org_totals(
+            MetricsQueryPlanner(), org_uuid, start_dt.date(), end_dt.date()
+        )
+        planner.add(
+            "organization",
+            Metric("settings", Organization.settings),
+            where=(Organization.id == org_uuid,),
+        )
+        totals = await planner.run(session)
+        return {
+            name: (value if name == "settings" else value or 0)
+            for name, value in totals.items()
+        }
+
+    @staticmethod
+    def _compute_cost_per_placement(
+        placements: int, enrolled: int, org_settings: dict[str, Any]
     ) -> float | None:
         """Total program cost / number of placements in period.
 
         Uses COUNT(members) * assumed seat cost from Organization.settings.
         Falls back to enrolled member count * default seat cost if not configured.
         """
-        # Count placements in period
-        member_subq = (
-            select(OrganizationMember.user_id)
-            .where(OrganizationMember.org_id == org_uuid)
-        )
-
-        placement_stmt = (
-            select(func.count(Application.id))
-            .where(
-                Application.user_id.in_(member_subq),
-                Application.status == ApplicationStatus.OFFER,
-                Application.applied_at >= start_dt,
-                Application.applied_at <= end_dt,
-            )
-        )
-        result = await session.execute(placement_stmt)
-        placements = result.scalar() or 0
-
         if placements == 0:
             return None
-
-        # Count enrolled members for cost calculation
-        enrolled_stmt = (
-            select(func.count(OrganizationMember.id))
-            .where(OrganizationMember.org_id == org_uuid)
-        )
-        result = await session.execute(enrolled_stmt)
-        enrolled = result.scalar() or 0
-
-        # Load seat cost from org settings or use default
-        org_stmt = select(Organization.settings).where(Organization.id == org_uuid)
-        result = await session.execute(org_stmt)
-        settings = result.scalar() or {}
-        seat_cost = (settings.get("seat_cost_monthly") or 500.0)
-
+        seat_cost = org_settings.get("seat_cost_monthly") or 500.0
         total_cost = enrolled * seat_cost
         return round(total_cost / placements, 2)
 
-    async def _compute_time_to_placement(
-        self,
-        session: AsyncSession,
-        org_uuid: UUID,
-        start_dt: datetime,
-        end_dt: datetime,
-    ) -> float | None:
-        """AVG days from enrollment to placement for placed users in period.
-
-        Uses the difference between Application.updated_at (when status changed
-        to OFFER) and OrganizationMember.created_at (enrollment date).
-        Returns None if no placements exist.
-        """
-        member_subq = (
-            select(
-                OrganizationMember.user_id,
-                OrganizationMember.created_at.label("enrolled_at"),
-            )
-            .where(OrganizationMember.org_id == org_uuid)
-            .subquery()
-        )
-
-        days_expr = func.avg(
-            func.extract("epoch", Application.updated_at)
-            - func.extract("epoch", member_subq.c.enrolled_at)
-        ) / 86400.0
-
-        stmt = (
-            select(days_expr.label("avg_days"))
-            .select_from(Application)
-            .join(member_subq, Application.user_id == member_subq.c.user_id)
-            .where(
-                Application.status == ApplicationStatus.OFFER,
-                Application.applied_at >= start_dt,
-                Application.applied_at <= end_dt,
-            )
-        )
-        result = await session.execute(stmt)
-        avg_days = result.scalar()
-        return round(float(avg_days), 1) if avg_days is not None else None
-
-    async def _compute_engagement_rate(
-        self,
-        session: AsyncSession,
-        org_uuid: UUID,
-        start_dt: datetime,
-        end_dt: datetime,
-    ) -> float:
+    @staticmethod
+    def _compute_engagement_rate(active: int, enrolled: int) -> float:
         """Active users / enrolled users in period.
 
         Active = users with at least one application in the date range.
         Returns 0.0 if no enrolled users.
         """
-        # Total enrolled
-        enrolled_stmt = (
-            select(func.count(OrganizationMember.id))
-            .where(OrganizationMember.org_id == org_uuid)
-        )
-        result = await session.execute(enrolled_stmt)
-        enrolled = result.scalar() or 0
-
         if enrolled == 0:
             return 0.0
-
-        # Active (distinct users with applications in period)
-        member_subq = (
-            select(OrganizationMember.user_id)
-            .where(OrganizationMember.org_id == org_uuid)
-        )
-
-        active_stmt = (
-            select(func.count(func.distinct(Application.user_id)))
-            .where(
-                Application.user_id.in_(member_subq),
-                Application.applied_at >= start_dt,
-                Application.applied_at <= end_dt,
-            )
-        )
-        result = await session.execute(active_stmt)
-        active = result.scalar() or 0
-
         return round(active / enrolled, 4)
 
     async def _compute_satisfaction_score(
@@ -237,10 +150,8 @@ class ROIReportService:
         # No feedback table exists yet -- return None as placeholder
         return None
 
-    async def _load_org_benchmarks(
-        self, session: AsyncSession, org_uuid: UUID
-    ) -> dict[str, float]:
-        """Load org-specific benchmark overrides from Organization.settings.
+    def _org_benchmarks(self, org_settings: dict[str, Any]) -> dict[str, float]:
+        """Merge org-specific benchmark overrides from Organization.settings.
 
         Returns merged dict of defaults + overrides.
         """
@@ -250,14 +161,8 @@ class ROIReportService:
             "cost_per_placement": self.COST_PER_PLACEMENT_BENCHMARK,
             "satisfaction_score": self.SATISFACTION_SCORE_BENCHMARK,
         }
-
-        stmt = select(Organization.settings).where(Organization.id == org_uuid)
-        result = await session.execute(stmt)
-        settings = result.scalar() or {}
-
-        org_benchmarks = settings.get("benchmarks") or {}
-        merged = {**defaults, **org_benchmarks}
-        return merged
+        org_benchmarks = org_settings.get("benchmarks") or {}
+        return {**defaults, **org_benchmarks}
 
     def add_benchmarks(
         self,
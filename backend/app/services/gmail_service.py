@@ -4,13 +4,25 @@ Gmail OAuth and email fetching service for JobPilot.
 Handles OAuth 2.0 flow (authorization URL generation, token exchange),
 token storage in the email_connections table, and fetching job-related
 emails via the Gmail API.
+
+Scans sync incrementally: the mailbox ``historyId`` is stored per
+connection (``email_connections.sync_cursor``) and later scans read only
+the messages added since then via ``users.history.list``. Message details
+are fetched with bounded concurrency on a pooled client shared by every
+connection in a scan. Any failed Gmail call (a 429 or 5xx, say) raises
+``GmailSyncError`` so the caller keeps the old cursor and the next scan
+reads the same messages again.
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import re
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Optional
 from urllib.parse import urlencode
 
 logger = logging.getLogger(__name__)
@@ -30,6 +42,27 @@ JOB_EMAIL_QUERY = (
     "OR screening OR recruiter OR hiring OR position OR candidate)"
 )
 
+# The same subject terms, matched locally: history deltas cannot be
+# filtered with a search query.
+_JOB_SUBJECT_RE = re.compile(
+    r"\b(interview|offer|application|applied|rejected|screening|recruiter"
+    r"|hiring|position|candidate)\b",
+    re.IGNORECASE,
+)
+
+# Concurrent message-detail requests per connection.
+GMAIL_FETCH_CONCURRENCY = 8
+
+# Upper bound on messages read from one history delta.
+MAX_DELTA_MESSAGES = 200
+
+# Added messages with these labels are never job emails for the user.
+_SKIP_LABELS = frozenset({"DRAFT", "SPAM", "TRASH"})
+
+
+class GmailSyncError(Exception):
+    """A Gmail API call failed; the sync must not advance its cursor."""
+
 
 def build_auth_url(state: str | None = None) -> str:
     """Generate the Google OAuth authorization URL.
@@ -171,6 +204,7 @@ async def store_connection(
                     "refresh_token_encrypted = :refresh, "
                     "token_expires_at = :expires, "
                     "email_address = :email, "
+                    "sync_cursor = NULL, "
                     "status = 'active', "
                     "connected_at = :now "
                     "WHERE id = :id"
@@ -277,57 +311,227 @@ async def disconnect(user_id: str) -> bool:
         return result.rowcount > 0
 
 
+# ---------------------------------------------------------------------------
+# Email fetching
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class GmailSync:
+    """Result of one incremental sync of a Gmail mailbox."""
+
+    emails: list[dict[str, str]] = field(default_factory=list)
+    history_id: str | None = None  # Cursor to store for the next sync
+    full_sync: bool = False
+
+
+def is_job_subject(subject: str) -> bool:
+    """Whether ``subject`` matches the ``JOB_EMAIL_QUERY`` terms."""
+    return bool(_JOB_SUBJECT_RE.search(subject or ""))
+
+
+def gmail_client(**kwargs: Any):
+    """Pooled Gmail API client, meant to be shared across a whole scan.
+
+    Extra keyword arguments go to ``httpx.AsyncClient`` (tests pass a
+    ``transport`` pointing at a fake Gmail API).
+    """
+    import httpx
+
+    kwargs.setdefault("timeout", 30.0)
+    return httpx.AsyncClient(
+        base_url=GMAIL_API_BASE,
+        limits=httpx.Limits(
+            max_connections=GMAIL_FETCH_CONCURRENCY * 4,
+            max_keepalive_connections=GMAIL_FETCH_CONCURRENCY,
+        ),
+        **kwargs,
+    )
+
+
+@asynccontextmanager
+async def _client_scope(client=None) -> AsyncIterator[Any]:
+    """Yield ``client``, or a fresh pooled client closed on exit."""
+    if client is not None:
+        yield client
+        return
+    async with gmail_client() as owned:
+        yield owned
+
+
+def _auth(access_token: str) -> dict[str, str]:
+    return {"Authorization": f"Bearer {access_token}"}
+
+
+async def fetch_message_details(
+    client,
+    access_token: str,
+    message_ids: list[str],
+) -> list[dict[str, str]]:
+    """Fetch Subject/From/snippet for messages, at most
+    ``GMAIL_FETCH_CONCURRENCY`` requests at a time.
+
+    Returns emails in ``message_ids`` order, skipping messages deleted
+    since they were listed (404).
+
+    Raises:
+        GmailSyncError: Any other non-200 response (rate limit, server
+            error), so the message is not silently dropped.
+    """
+    semaphore = asyncio.Semaphore(GMAIL_FETCH_CONCURRENCY)
+    headers = _auth(access_token)
+
+    async def _one(message_id: str) -> dict[str, str] | None:
+        async with semaphore:
+            response = await client.get(
+                f"/users/me/messages/{message_id}",
+                headers=headers,
+                params={"format": "metadata", "metadataHeaders": ["Subject", "From"]},
+            )
+        if response.status_code == 404:
+            return None
+        if response.status_code != 200:
+            raise GmailSyncError(
+                f"Gmail message {message_id} fetch failed: {response.status_code}"
+            )
+
+        detail = response.json()
+        message_headers = {
+            h["name"]: h["value"]
+            for h in detail.get("payload", {}).get("headers", [])
+        }
+        return {
+            "id": message_id,
+            "subject": message_headers.get("Subject", ""),
+            "from_address": message_headers.get("From", ""),
+            "snippet": detail.get("snippet", ""),
+        }
+
+    results = await asyncio.gather(*(_one(mid) for mid in message_ids))
+    return [email for email in results if email is not None]
+
+
 async def fetch_job_emails(
-    access_token: str, max_results: int = 20
+    access_token: str, max_results: int = 20, client=None
 ) -> list[dict[str, str]]:
     """Fetch recent job-related emails from Gmail API.
 
     Args:
         access_token: Valid Google access token.
         max_results: Maximum number of emails to fetch.
+        client: Optional pooled client from ``gmail_client()``.
 
     Returns:
         List of dicts with id, subject, from_address, snippet.
+
+    Raises:
+        GmailSyncError: The list or a message fetch failed.
     """
-    import httpx
+    async with _client_scope(client) as c:
+        message_ids = await _list_job_message_ids(c, access_token, max_results)
+        if not message_ids:
+            return []
+        return await fetch_message_details(c, access_token, message_ids)
 
-    async with httpx.AsyncClient() as client:
-        # List messages matching job-related query
-        list_response = await client.get(
-            f"{GMAIL_API_BASE}/users/me/messages",
-            headers={"Authorization": f"Bearer {access_token}"},
-            params={"q": JOB_EMAIL_QUERY, "maxResults": max_results},
-        )
 
-        if list_response.status_code != 200:
-            logger.error("Gmail list failed: %s", list_response.text)
-            return []
+async def _list_job_message_ids(client, access_token: str, max_results: int) -> list[str]:
+    response = await client.get(
+        "/users/me/messages",
+        headers=_auth(access_token),
+        params={"q": JOB_EMAIL_QUERY, "maxResults": max_results},
+    )
+    if response.status_code != 200:
+        raise GmailSyncError(f"Gmail list failed: {response.status_code}")
+    return [m["id"] for m in response.json().get("messages", [])[:max_results]]
 
-        messages = list_response.json().get("messages", [])
-        if not messages:
-            return []
 
-        # Fetch details for each message
-        emails = []
-        for msg in messages[:max_results]:
-            detail_response = await client.get(
-                f"{GMAIL_API_BASE}/users/me/messages/{msg['id']}",
-                headers={"Authorization": f"Bearer {access_token}"},
-                params={"format": "metadata", "metadataHeaders": ["Subject", "From"]},
-            )
-            if detail_response.status_code != 200:
-                continue
-
-            detail = detail_response.json()
-            headers = {
-                h["name"]: h["value"]
-                for h in detail.get("payload", {}).get("headers", [])
-            }
-            emails.append({
-                "id": msg["id"],
-                "subject": headers.get("Subject", ""),
-                "from_address": headers.get("From", ""),
-                "snippet": detail.get("snippet", ""),
-            })
-
-        return emails
+async def _history_delta(
+    client, access_token: str, start_history_id: str
+) -> tuple[list[str], str | None] | None:
+    """Message ids added since ``start_history_id`` and the cursor to resume from.
+
+    Reads at most ``MAX_DELTA_MESSAGES`` messages. When the cap stops it
+    before the last page, the cursor is the id of the last history record
+    read, so the next sync picks up the remaining records; otherwise it
+    is the mailbox's latest historyId.
+
+    Returns None when the start id is too old for Gmail to serve (404), in
+    which case the caller falls back to a full sync.
+    """
+    params: dict[str, Any] = {
+        "startHistoryId": start_history_id,
+        "historyTypes": "messageAdded",
+        "maxResults": 500,
+    }
+    added: dict[str, None] = {}
+    while True:
+        response = await client.get(
+            "/users/me/history", headers=_auth(access_token), params=params
+        )
+        if response.status_code == 404:
+            return None
+        if response.status_code != 200:
+            raise GmailSyncError(f"Gmail history failed: {response.status_code}")
+
+        body = response.json()
+        records = body.get("history", [])
+        for position, record in enumerate(records):
+            for item in record.get("messagesAdded", []):
+                message = item.get("message") or {}
+                if message.get("id") and not _SKIP_LABELS.intersection(
+                    message.get("labelIds") or ()
+                ):
+                    added[message["id"]] = None
+            more = position < len(records) - 1 or body.get("nextPageToken")
+            if len(added) >= MAX_DELTA_MESSAGES and more and record.get("id"):
+                return list(added), str(record["id"])
+
+        page_token = body.get("nextPageToken")
+        if not page_token:
+            latest = body.get("historyId")
+            return list(added), str(latest) if latest else None
+        params["pageToken"] = page_token
+
+
+async def sync_job_emails(
+    access_token: str,
+    history_id: str | None = None,
+    max_results: int = 20,
+    client=None,
+) -> GmailSync:
+    """Fetch job-related emails added since ``history_id``.
+
+    Without a cursor (first scan, or Gmail no longer has the history) this
+    is a full sync of the ``max_results`` most recent job emails, and the
+    mailbox's current historyId becomes the new cursor. The returned
+    ``history_id`` is the cursor to persist.
+
+    Raises:
+        GmailSyncError: A Gmail call failed. Nothing is returned, so the
+            caller keeps its stored cursor and nothing is skipped.
+    """
+    async with _client_scope(client) as c:
+        if history_id:
+            delta = await _history_delta(c, access_token, history_id)
+            if delta is not None:
+                message_ids, latest = delta
+                emails = await fetch_message_details(c, access_token, message_ids)
+                return GmailSync(
+                    emails=[e for e in emails if is_job_subject(e["subject"])],
+                    history_id=latest or history_id,
+                )
+            logger.info("Gmail history %s expired; running a full sync", history_id)
+
+        # Read the cursor before listing so nothing lands in between unseen.
+        profile = await c.get("/users/me/profile", headers=_auth(access_token))
+        latest = None
+        if profile.status_code == 200:
+            latest = profile.json().get("historyId")
+
+        message_ids = await _list_job_message_ids(c, access_token, max_results)
+        emails = await fetch_message_details(c, access_token, message_ids)
+        return GmailSync(
+            emails=emails,
+            history_id=str(latest) if latest else history_id,
+            full_sync=True,
+        )
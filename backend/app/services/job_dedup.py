@@ -2,7 +2,8 @@
 Job deduplication and storage service.
 
 Deduplicates raw jobs by URL first, then by (title + company + location) hash.
-Upserts into the jobs table and returns ORM Job instances.
+Upserts into the jobs table and returns ORM Job instances. Each stored job
+gets its scoring features (``jobs.features``) computed here, once.
 """
 
 from __future__ import annotations
@@ -15,6 +16,7 @@ from uuid import uuid4
 
 from sqlalchemy import select
 
+from app.services.job_features import refresh_job_features
 from app.services.job_sources.base import RawJob
 
 logger = logging.getLogger(__name__)
@@ -43,7 +45,11 @@ def compute_dedup_key(job: RawJob) -> str:
     return hashlib.sha256(composite.encode()).hexdigest()
 
 
-async def upsert_jobs(raw_jobs: list[RawJob], session: Any) -> list[Any]:
+async def upsert_jobs(
+    raw_jobs: list[RawJob],
+    session: Any,
+    new_jobs: list[Any] | None = None,
+) -> list[Any]:
     """Deduplicate and upsert raw jobs into the jobs table.
 
     Checks existing jobs by URL first, then by dedup key (title+company+location).
@@ -52,6 +58,8 @@ async def upsert_jobs(raw_jobs: list[RawJob], session: Any) -> list[Any]:
     Args:
         raw_jobs: List of RawJob instances from aggregator.
         session: AsyncSession for database operations.
+        new_jobs: If given, the newly inserted jobs are appended to it
+            (e.g. for reverse matching to other users).
 
     Returns:
         List of Job ORM instances (both new and existing).
@@ -142,6 +150,7 @@ async def upsert_jobs(raw_jobs: list[RawJob], session: Any) -> list[Any]:
         if existing:
             # Update existing job with fresh data
             _update_job(existing, rj)
+            refresh_job_features(existing)
             result_jobs.append(existing)
             logger.debug("Updated existing job: %s at %s", rj.title, rj.company)
         else:
@@ -162,8 +171,11 @@ async def upsert_jobs(raw_jobs: list[RawJob], session: Any) -> list[Any]:
                 raw_data=rj.raw_data,
                 posted_at=rj.posted_at,
             )
+            refresh_job_features(new_job)
             session.add(new_job)
             result_jobs.append(new_job)
+            if new_jobs is not None:
+                new_jobs.append(new_job)
             logger.debug("Inserted new job: %s at %s", rj.title, rj.company)
 
     await session.flush()
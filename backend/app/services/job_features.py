@@ -0,0 +1,228 @@
+"""
+Per-job feature store for scoring.
+
+Everything the scorers derive from a job's text -- lowercased title and
+text, title tokens, detected seniority levels, top description keywords,
+the skill terms, the best salary figure and the remote flag -- is computed
+once when the job is upserted and persisted in ``jobs.features`` (JSONB).
+Scorers call ``job_features(job)`` instead of lowercasing and re-scanning
+the raw description for every user and every scout run.
+
+The lowercased text itself is not persisted (it would duplicate the
+description); it is rebuilt once per loaded job and memoised alongside the
+parsed features. Rows written before the column existed, or under an older
+FEATURES_VERSION, are filled in by ``backfill_job_features``.
+
+Architecture: Pure computation, plus the batched backfill over ``jobs``.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any
+
+# Bump when the feature definitions change; stale rows are recomputed.
+FEATURES_VERSION = 2
+
+# Characters of the original description sent in LLM scoring prompts.
+DESCRIPTION_EXCERPT_CHARS = 500
+
+# Keywords kept for resume tailoring.
+MAX_KEYWORDS = 30
+
+# Longest skill phrase, in words, kept in the skill terms ("machine
+# learning", "google cloud platform"). Longer skills fall back to a
+# substring check against the text.
+MAX_SKILL_WORDS = 3
+
+# Jobs recomputed per transaction by backfill_job_features.
+BACKFILL_BATCH_SIZE = 500
+
+SENIORITY_KEYWORDS: dict[str, list[str]] = {
+    "junior": ["junior", "entry level", "entry-level", "associate", "jr."],
+    "mid": ["mid-level", "mid level", "intermediate"],
+    "senior": ["senior", "sr.", "lead", "principal"],
+    "staff": ["staff", "principal", "distinguished"],
+    "manager": ["manager", "director", "head of", "vp"],
+}
+
+STOP_WORDS = frozenset({
+    "the", "a", "an", "and", "or", "but", "in", "on", "at", "to",
+    "for", "of", "with", "by", "from", "is", "are", "was", "were",
+    "be", "been", "being", "have", "has", "had", "do", "does", "did",
+    "will", "would", "could", "should", "may", "might", "must",
+    "shall", "can", "need", "we", "you", "they", "it", "he", "she",
+    "this", "that", "these", "those", "our", "your", "their", "its",
+    "not", "no", "as", "if", "so", "up", "out", "about", "into",
+    "through", "during", "before", "after", "above", "below",
+    "between", "under", "over", "all", "each", "every", "both",
+    "few", "more", "most", "other", "some", "such", "than", "too",
+    "very", "just", "also", "now", "here", "there", "when", "where",
+    "how", "what", "which", "who", "whom", "why", "while",
+})
+
+_MEMO_ATTR = "_job_features_memo"
+
+# Separators between skill words; "+", "#" and inner dots are kept so
+# "c++", "c#" and "node.js" stay whole.
+_TERM_SPLIT = re.compile(r"[\s,;/|()\[\]{}]+")
+_TERM_STRIP = ".:!?\"'"
+
+
+@dataclass(frozen=True)
+class JobFeatures:
+    """Scoring features derived from one job."""
+
+    title: str  # lowercased title
+    text: str  # lowercased "title description"
+    company: str  # lowercased company
+    location: str  # lowercased location
+    title_tokens: frozenset[str] = frozenset()
+    seniority: frozenset[str] = frozenset()  # SENIORITY_KEYWORDS levels present
+    keywords: tuple[str, ...] = ()  # most frequent description terms
+    skill_terms: frozenset[str] = frozenset()  # 1..MAX_SKILL_WORDS word phrases
+    salary: int | None = None  # best available figure (max, else min)
+    remote: bool = False
+    description_excerpt: str = ""
+    version: int = field(default=FEATURES_VERSION, compare=False)
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON form persisted in ``jobs.features`` (without the text)."""
+        return {
+            "version": self.version,
+            "seniority": sorted(self.seniority),
+            "keywords": list(self.keywords),
+            "skill_terms": sorted(self.skill_terms),
+            "salary": self.salary,
+            "remote": self.remote,
+        }
+
+
+def _description_keywords(description: str) -> tuple[str, ...]:
+    """Most frequent non-stop-word terms, as the resume agent ranks them."""
+    words = (w.strip(".,;:!?()[]{}\"'") for w in description.lower().split() if len(w) > 2)
+    counts = Counter(w for w in words if w and w not in STOP_WORDS)
+    return tuple(kw for kw, _ in counts.most_common(MAX_KEYWORDS))
+
+
+def skill_words(text: str) -> list[str]:
+    """Lowercased words of ``text`` as skills are matched against."""
+    words = (w.strip(_TERM_STRIP) for w in _TERM_SPLIT.split(text.lower()))
+    return [w for w in words if w]
+
+
+def _skill_terms(text: str) -> frozenset[str]:
+    """Every phrase of up to MAX_SKILL_WORDS words in ``text``.
+
+    Phrases that begin or end with a stop word are dropped; no skill does.
+    """
+    words = skill_words(text)
+    terms = set()
+    for size in range(1, MAX_SKILL_WORDS + 1):
+        for i in range(len(words) - size + 1):
+            if words[i] in STOP_WORDS or words[i + size - 1] in STOP_WORDS:
+                continue
+            terms.add(" ".join(words[i:i + size]))
+    return frozenset(terms)
+
+
+def _base_features(job: Any) -> dict[str, Any]:
+    """The fields rebuilt from the row itself (cheap, never persisted)."""
+    title = (getattr(job, "title", "") or "").lower()
+    description = getattr(job, "description", "") or ""
+    return {
+        "title": title,
+        "text": f"{title} {description.lower()}",
+        "company": (getattr(job, "company", "") or "").lower(),
+        "location": (getattr(job, "location", "") or "").lower(),
+        "title_tokens": frozenset(title.split()),
+        "description_excerpt": description[:DESCRIPTION_EXCERPT_CHARS],
+    }
+
+
+def compute_job_features(job: Any) -> JobFeatures:
+    """Derive every feature from a job's raw fields."""
+    base = _base_features(job)
+    text = base["text"]
+    return JobFeatures(
+        **base,
+        seniority=frozenset(
+            level
+            for level, keywords in SENIORITY_KEYWORDS.items()
+            if level in text or any(kw in text for kw in keywords)
+        ),
+        keywords=_description_keywords(getattr(job, "description", "") or ""),
+        skill_terms=_skill_terms(text),
+        salary=getattr(job, "salary_max", None) or getattr(job, "salary_min", None),
+        remote=bool(getattr(job, "remote", False)),
+    )
+
+
+def refresh_job_features(job: Any) -> JobFeatures:
+    """Recompute and store ``job.features`` (call after changing its fields)."""
+    features = compute_job_features(job)
+    job.features = features.to_dict()
+    setattr(job, _MEMO_ATTR, (job.features, features))
+    return features
+
+
+def job_features(job: Any) -> JobFeatures:
+    """Features for ``job``, from ``job.features`` when it is current.
+
+    The result is memoised on the object for as long as its ``features``
+    value is unchanged. Jobs without current stored features (rows not yet
+    backfilled, ad-hoc objects) are computed from their fields once.
+    """
+    stored = getattr(job, "features", None)
+    memo = getattr(job, _MEMO_ATTR, None)
+    if memo is not None and memo[0] is stored:
+        return memo[1]
+
+    if not isinstance(stored, dict) or stored.get("version") != FEATURES_VERSION:
+        features = compute_job_features(job)
+    else:
+        features = JobFeatures(
+            **_base_features(job),
+            seniority=frozenset(stored.get("seniority") or ()),
+            keywords=tuple(stored.get("keywords") or ()),
+            skill_terms=frozenset(stored.get("skill_terms") or ()),
+            salary=stored.get("salary"),
+            remote=bool(stored.get("remote")),
+        )
+    try:
+        setattr(job, _MEMO_ATTR, (stored, features))
+    except AttributeError:
+        pass
+    return features
+
+
+async def backfill_job_features(session: Any, batch_size: int = BACKFILL_BATCH_SIZE) -> int:
+    """Store current features on every job that lacks them.
+
+    Walks the missing and stale rows in id order, committing each batch,
+    and returns how many jobs were updated.
+    """
+    from sqlalchemy import or_, select
+
+    from app.db.models import Job
+
+    stale = or_(
+        Job.features.is_(None),
+        Job.features["version"].as_integer().is_distinct_from(FEATURES_VERSION),
+    )
+    updated = 0
+    last_id = None
+    while True:
+        query = select(Job).where(stale).order_by(Job.id).limit(batch_size)
+        if last_id is not None:
+            query = query.where(Job.id > last_id)
+        jobs = (await session.execute(query)).scalars().all()
+        if not jobs:
+            return updated
+        for job in jobs:
+            refresh_job_features(job)
+        last_id = jobs[-1].id
+        await session.commit()
+        updated += len(jobs)
@@ -77,7 +77,9 @@ def _derive_confidence(score: int) -> str:
 
 def _build_prompt(job: Any, preferences: dict, profile: dict) -> str:
     """Build the scoring prompt from job data and user context."""
-    description = (getattr(job, "description", "") or "")[:500]
+    from app.services.job_features import job_features
+
+    description = job_features(job).description_excerpt
     salary_min = getattr(job, "salary_min", None)
     salary_max = getattr(job, "salary_max", None)
     if salary_min is not None and salary_max is not None:
@@ -0,0 +1,180 @@
+"""
+Per-user match feed cache for the swipe UI.
+
+The swipe UI polls ``GET /matches/top-pick`` and ``GET /matches?status=new``
+continuously. Instead of re-running the join and ``parse_rationale`` for
+every call, the first ``FEED_WINDOW_SIZE`` rows of a (user, status) feed are
+stored in Redis as pre-rendered ``MatchResponse`` dicts (full description;
+trimming happens on read). Top-pick is simply the head of the ``new``
+window.
+
+Invalidation uses a per-user version counter:
+
+- ``match_feed_version:{user_id}`` is ``INCR``-ed whenever the user's matches
+  change (the job scout after committing new matches, ``PATCH
+  /matches/{id}``, ``POST /matches/swipes``).
+- Each window records the version it was built at and is ignored once the
+  counter moves on, so no key scanning is needed to invalidate.
+- A swipe removes the swiped rows from the ``new`` window in place and
+  re-stamps it with the new version, so swiping through the feed keeps
+  serving from cache.
+
+Every function uses the shared pool from ``app.cache.redis_client`` and
+is best-effort: Redis errors are logged and callers fall back to the
+database.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Rows cached per (user, status) -- the first three default-size pages.
+FEED_WINDOW_SIZE = 60
+
+# Windows are also bounded in time so a missed bump cannot pin stale data.
+_FEED_TTL_SECONDS = 300
+
+_STATUSES = ("new", "saved", "dismissed", "applied")
+
+
+def _version_key(user_id) -> str:
+    return f"match_feed_version:{user_id}"
+
+
+def _window_key(user_id, status: str) -> str:
+    return f"match_feed:{user_id}:{status}"
+
+
+def total_key(user_id, status: str) -> str:
+    """Redis key for the cached per-(user, status) match total."""
+    return f"matches_total:{user_id}:{status}"
+
+
+@dataclass
+class FeedWindow:
+    """The cached head of one (user, status) feed.
+
+    ``items`` are ``{"sort_score": str | None, "match": MatchResponse dict}``
+    in feed order. ``complete`` means the window holds every row, so pages
+    past its end are known to be empty.
+    """
+
+    version: int
+    total: int
+    items: List[Dict[str, Any]] = field(default_factory=list)
+    complete: bool = False
+
+    def covers(self, offset: int, limit: int) -> bool:
+        """Whether rows ``[offset, offset + limit)`` can be served from here."""
+        return self.complete or offset + limit <= len(self.items)
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "version": self.version,
+            "total": self.total,
+            "items": self.items,
+            "complete": self.complete,
+        })
+
+    @classmethod
+    def from_json(cls, raw: str) -> "FeedWindow":
+        data = json.loads(raw)
+        return cls(
+            version=int(data["version"]),
+            total=int(data["total"]),
+            items=list(data.get("items") or []),
+            complete=bool(data.get("complete")),
+        )
+
+
+async def _client():
+    from app.cache.redis_client import get_redis_client
+
+    return await get_redis_client()
+
+
+async def get_window(
+    user_id, status: str
+) -> Tuple[Optional[FeedWindow], Optional[int]]:
+    """Return ``(window, current_version)`` with one ``MGET``.
+
+    ``window`` is None when missing or stale. ``current_version`` is None
+    only if Redis is unavailable, in which case callers should not try to
+    fill the cache.
+    """
+    try:
+        r = await _client()
+        raw_version, raw_window = await r.mget(
+            _version_key(user_id), _window_key(user_id, status)
+        )
+    except Exception as exc:
+        logger.debug("Match feed cache read failed for user=%s: %s", user_id, exc)
+        return None, None
+
+    version = int(raw_version or 0)
+    if not raw_window:
+        return None, version
+    try:
+        window = FeedWindow.from_json(raw_window)
+    except (ValueError, KeyError, TypeError):
+        return None, version
+    return (window if window.version == version else None), version
+
+
+async def store_window(user_id, status: str, window: FeedWindow) -> None:
+    """Cache a freshly built window."""
+    try:
+        r = await _client()
+        await r.set(_window_key(user_id, status), window.to_json(), ex=_FEED_TTL_SECONDS)
+    except Exception as exc:
+        logger.debug("Match feed cache write failed for user=%s: %s", user_id, exc)
+
+
+async def bump_match_version(user_id) -> Optional[int]:
+    """Invalidate every cached feed window and total for ``user_id``.
+
+    Returns the new version, or None if Redis is unavailable.
+    """
+    try:
+        r = await _client()
+        pipe = r.pipeline(transaction=True)
+        pipe.incr(_version_key(user_id))
+        pipe.delete(*(total_key(user_id, s) for s in _STATUSES))
+        version, _ = await pipe.execute()
+        return int(version)
+    except Exception as exc:
+        logger.warning("Failed to bump match feed version for user=%s: %s", user_id, exc)
+        return None
+
+
+async def remove_from_window(user_id, *match_ids, status: str = "new") -> None:
+    """Bump the version after swipes and drop the rows from the old window.
+
+    ``match_ids`` must be rows that actually left ``status``. The window is
+    patched only if it was current right before this bump, so concurrent
+    invalidations still force a rebuild.
+    """
+    version = await bump_match_version(user_id)
+    if version is None:
+        return
+    try:
+        r = await _client()
+        raw = await r.get(_window_key(user_id, status))
+        if not raw:
+            return
+        window = FeedWindow.from_json(raw)
+        if window.version != version - 1:
+            return
+        removed = {str(match_id) for match_id in match_ids}
+        kept = [item for item in window.items if item["match"]["id"] not in removed]
+        window.total = max(0, window.total - len(removed))
+        window.items = kept
+        window.version = version
+        await r.set(_window_key(user_id, status), window.to_json(), ex=_FEED_TTL_SECONDS)
+    except Exception as exc:
+        logger.debug("Match feed cache patch failed for user=%s: %s", user_id, exc)
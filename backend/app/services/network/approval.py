@@ -68,6 +68,10 @@ class NetworkApprovalService:
             session.add(item)
             await session.commit()
 
+        from app.agents.briefing.digest import refresh_pending_approvals
+
+        await refresh_pending_approvals(user_id)
+
         logger.info(
             "Queued outreach for approval: user=%s item=%s",
             user_id,
@@ -0,0 +1,385 @@
+"""
+Connection Graph — the user's imported network as an indexed adjacency graph.
+
+Nodes are people (keyed by an explicit ``id``/``profile_url`` or their
+normalised name), edges are known connections, and the user is the
+``ROOT`` node. Company and school indexes map a normalised company or
+school to the nodes there, so finding warm paths into a company is an
+index lookup plus one shared breadth-first search instead of an LLM call.
+
+Connection data format (as imported)::
+
+    {
+        "schools": ["MIT"],                      # the user's own schools
+        "contacts": [                            # 1st-degree connections
+            {
+                "name": "Alice Smith",
+                "company": "Acme Corp",
+                "school": "MIT",                 # or "schools": [...]
+                "relationship_context": "Worked together at TechCo",
+                "connections": [                 # their connections
+                    "Bob Jones",
+                    {"name": "Carol Lee", "company": "Globex"},
+                ],
+            },
+        ],
+    }
+
+The graph is persisted per user in ``network_graphs`` and merged in place
+on each import (``update_connection_graph``); the indexes are derived and
+rebuilt on load.
+
+Architecture: Pure computation plus one persistence helper; no LLM calls.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# The user's own node.
+ROOT = "__self__"
+
+# Breadth-first search depth: 1st- and 2nd-degree connections.
+MAX_DEGREE = 2
+
+_GRAPH_FORMAT_VERSION = 1
+
+_COMPANY_SUFFIXES = frozenset({
+    "inc", "incorporated", "llc", "ltd", "limited", "corp", "corporation",
+    "co", "company", "gmbh", "plc",
+})
+_NON_WORD = re.compile(r"[^\w\s]")
+
+
+def normalize_name(value: Any) -> str:
+    """Case- and whitespace-insensitive key for people and schools."""
+    return " ".join(str(value or "").casefold().split())
+
+
+def normalize_company(value: Any) -> str:
+    """Company key ignoring punctuation and legal suffixes ("Acme Corp." == "acme")."""
+    words = _NON_WORD.sub(" ", str(value or "").casefold()).split()
+    while len(words) > 1 and words[-1] in _COMPANY_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+def _as_list(value: Any) -> list[str]:
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [value]
+    return [str(v) for v in value if v]
+
+
+# ---------------------------------------------------------------------------
+# Data structures
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class GraphPath:
+    """A deterministic warm path candidate found in the graph."""
+
+    contact_name: str
+    company: str
+    path_type: str  # "1st_degree", "2nd_degree", "alumni"
+    relationship_context: str = ""
+    mutual_connections: list[str] = field(default_factory=list)
+    shared_schools: list[str] = field(default_factory=list)
+
+    def to_path_data(self) -> dict[str, Any]:
+        """The dict shape ``WarmPathService`` scores and phrases."""
+        return {
+            "contact_name": self.contact_name,
+            "path_type": self.path_type,
+            "relationship_context": self.relationship_context,
+            "mutual_connections": list(self.mutual_connections),
+        }
+
+
+class ConnectionGraph:
+    """Adjacency graph of the user's network with company and school indexes."""
+
+    def __init__(self) -> None:
+        # node id -> {"name", "company", "schools", "context"}
+        self.nodes: dict[str, dict[str, Any]] = {}
+        # node id -> neighbour ids (undirected; ROOT edges are 1st degree)
+        self.adjacency: dict[str, set[str]] = {ROOT: set()}
+        self.user_schools: list[str] = []
+        self._company_index: dict[str, set[str]] = {}
+        self._school_index: dict[str, set[str]] = {}
+        self._name_index: dict[str, str] = {}
+        self._distances: dict[str, int] | None = None
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    # ------------------------------------------------------------------
+    # Construction and incremental import
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_connection_data(cls, connection_data: dict[str, Any]) -> "ConnectionGraph":
+        """Build an in-memory graph from a single import payload."""
+        graph = cls()
+        graph.add_connections(connection_data)
+        return graph
+
+    def add_connections(self, connection_data: dict[str, Any]) -> int:
+        """Merge an import payload into the graph.
+
+        Existing people are updated in place (latest company wins, schools
+        accumulate); only touched index entries change.
+
+        Returns:
+            Number of nodes added.
+        """
+        before = len(self.nodes)
+        for school in _as_list(connection_data.get("schools")):
+            if normalize_name(school) not in {normalize_name(s) for s in self.user_schools}:
+                self.user_schools.append(school)
+
+        for contact in connection_data.get("contacts") or []:
+            node_id = self._upsert_person(contact)
+            if node_id is None:
+                continue
+            self._link(ROOT, node_id)
+            if isinstance(contact, dict):
+                for other in contact.get("connections") or []:
+                    other_id = self._upsert_person(other)
+                    if other_id is not None and other_id != node_id:
+                        self._link(node_id, other_id)
+
+        self._distances = None
+        return len(self.nodes) - before
+
+    def _upsert_person(self, person: Any) -> str | None:
+        if isinstance(person, str):
+            person = {"name": person}
+        if not isinstance(person, dict):
+            return None
+        name = str(person.get("name") or "").strip()
+        name_key = normalize_name(name)
+        explicit_id = person.get("id") or person.get("profile_url")
+        if not name_key and not explicit_id:
+            return None
+
+        node_id = str(explicit_id) if explicit_id else self._name_index.get(name_key, name_key)
+        node = self.nodes.get(node_id)
+        if node is None:
+            node = {"name": name or str(explicit_id), "company": "", "schools": [], "context": ""}
+            self.nodes[node_id] = node
+            self.adjacency.setdefault(node_id, set())
+        if name_key:
+            self._name_index.setdefault(name_key, node_id)
+
+        company = str(person.get("company") or "").strip()
+        if company and company != node["company"]:
+            self._unindex(self._company_index, normalize_company(node["company"]), node_id)
+            node["company"] = company
+            self._index(self._company_index, normalize_company(company), node_id)
+
+        for school in _as_list(person.get("schools")) + _as_list(person.get("school")):
+            if normalize_name(school) not in {normalize_name(s) for s in node["schools"]}:
+                node["schools"].append(school)
+                self._index(self._school_index, normalize_name(school), node_id)
+
+        context = person.get("relationship_context") or person.get("context")
+        if context:
+            node["context"] = str(context)
+        return node_id
+
+    def _link(self, a: str, b: str) -> None:
+        self.adjacency.setdefault(a, set()).add(b)
+        self.adjacency.setdefault(b, set()).add(a)
+
+    @staticmethod
+    def _index(index: dict[str, set[str]], key: str, node_id: str) -> None:
+        if key:
+            index.setdefault(key, set()).add(node_id)
+
+    @staticmethod
+    def _unindex(index: dict[str, set[str]], key: str, node_id: str) -> None:
+        members = index.get(key)
+        if members is not None:
+            members.discard(node_id)
+            if not members:
+                del index[key]
+
+    # ------------------------------------------------------------------
+    # Path finding
+    # ------------------------------------------------------------------
+
+    def distances(self) -> dict[str, int]:
+        """Degree of every node within ``MAX_DEGREE`` of the user (BFS, cached)."""
+        if self._distances is None:
+            dist = {ROOT: 0}
+            queue = deque([ROOT])
+            while queue:
+                node = queue.popleft()
+                if dist[node] == MAX_DEGREE:
+                    continue
+                for neighbour in self.adjacency.get(node, ()):
+                    if neighbour not in dist:
+                        dist[neighbour] = dist[node] + 1
+                        queue.append(neighbour)
+            self._distances = dist
+        return self._distances
+
+    def find_paths(self, company: str) -> list[GraphPath]:
+        """All warm path candidates into ``company``.
+
+        People at the company are 1st-degree if directly connected, alumni
+        if they share one of the user's schools, otherwise 2nd-degree when
+        reachable through a 1st-degree connection. Others are skipped.
+        """
+        candidates = self._company_index.get(normalize_company(company), set())
+        if not candidates:
+            return []
+
+        dist = self.distances()
+        first_degree = self.adjacency[ROOT]
+        user_schools = {normalize_name(s): s for s in self.user_schools}
+        alumni: set[str] = set()
+        for key in user_schools:
+            alumni |= candidates & self._school_index.get(key, set())
+
+        paths: list[GraphPath] = []
+        for node_id in candidates:
+            node = self.nodes[node_id]
+            degree = dist.get(node_id)
+            shared = [
+                user_schools[key]
+                for key in dict.fromkeys(normalize_name(s) for s in node["schools"])
+                if key in user_schools
+            ] if node_id in alumni else []
+            mutuals = sorted(
+                self.nodes[m]["name"]
+                for m in self.adjacency.get(node_id, set()) & first_degree
+            )
+
+            if degree == 1:
+                path_type = "1st_degree"
+                context = node["context"] or f"Direct connection at {node['company']}"
+            elif shared:
+                path_type = "alumni"
+                context = f"Fellow {shared[0]} alum"
+            elif degree == 2:
+                path_type = "2nd_degree"
+                context = f"Connected to you through {', '.join(mutuals[:3])}"
+            else:
+                continue
+            if shared and path_type != "alumni":
+                context += f"; you both attended {shared[0]}"
+
+            paths.append(GraphPath(
+                contact_name=node["name"],
+                company=node["company"],
+                path_type=path_type,
+                relationship_context=context,
+                mutual_connections=mutuals,
+                shared_schools=shared,
+            ))
+        return paths
+
+    # ------------------------------------------------------------------
+    # Serialization
+    # ------------------------------------------------------------------
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON form for persistence; each edge is stored once."""
+        edges: dict[str, list[str]] = {}
+        for node_id, neighbours in self.adjacency.items():
+            later = sorted(n for n in neighbours if n > node_id)
+            if later:
+                edges[node_id] = later
+        return {
+            "version": _GRAPH_FORMAT_VERSION,
+            "schools": list(self.user_schools),
+            "nodes": self.nodes,
+            "edges": edges,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any] | None) -> "ConnectionGraph":
+        """Rebuild a graph (and its indexes) from ``to_dict`` output."""
+        graph = cls()
+        if not data:
+            return graph
+        graph.user_schools = list(data.get("schools") or [])
+        for node_id, node in (data.get("nodes") or {}).items():
+            node = {
+                "name": node.get("name", ""),
+                "company": node.get("company", ""),
+                "schools": list(node.get("schools") or []),
+                "context": node.get("context", ""),
+            }
+            graph.nodes[node_id] = node
+            graph.adjacency.setdefault(node_id, set())
+            graph._name_index.setdefault(normalize_name(node["name"]), node_id)
+            graph._index(graph._company_index, normalize_company(node["company"]), node_id)
+            for school in node["schools"]:
+                graph._index(graph._school_index, normalize_name(school), node_id)
+        for node_id, neighbours in (data.get("edges") or {}).items():
+            for neighbour in neighbours:
+                graph._link(node_id, neighbour)
+        return graph
+
+
+# ---------------------------------------------------------------------------
+# Persistence
+# ---------------------------------------------------------------------------
+
+
+async def update_connection_graph(
+    user_id: str,
+    connection_data: dict[str, Any],
+) -> ConnectionGraph:
+    """Load the user's persisted graph, merge ``connection_data`` into it.
+
+    The row is created on first use and locked for the read-modify-write so
+    concurrent imports for the same user serialise. Nothing is written when
+    the payload carries no contacts or schools.
+    """
+    from sqlalchemy import select
+    from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+    from app.db.engine import AsyncSessionLocal
+    from app.db.models import NetworkGraph
+
+    has_import = bool(connection_data.get("contacts") or connection_data.get("schools"))
+    async with AsyncSessionLocal() as session:
+        if not has_import:
+            result = await session.execute(
+                select(NetworkGraph.graph).where(NetworkGraph.user_id == user_id)
+            )
+            return ConnectionGraph.from_dict(result.scalar_one_or_none())
+
+        await session.execute(
+            pg_insert(NetworkGraph)
+            .values(user_id=user_id, graph={}, node_count=0)
+            .on_conflict_do_nothing(index_elements=["user_id"])
+        )
+        result = await session.execute(
+            select(NetworkGraph)
+            .where(NetworkGraph.user_id == user_id)
+            .with_for_update()
+        )
+        row = result.scalar_one()
+        graph = ConnectionGraph.from_dict(row.graph)
+        added = graph.add_connections(connection_data)
+        row.graph = graph.to_dict()
+        row.node_count = len(graph)
+        await session.commit()
+
+    logger.info(
+        "Connection graph for user=%s: %d nodes (+%d)", user_id, len(graph), added
+    )
+    return graph
@@ -6,17 +6,45 @@ Pure computation service (no LLM needed). Scores contacts based on
 recency of interaction, frequency of engagement, and depth of interaction.
 
 Temperature levels: cold (0-0.25), warming (0.25-0.5), warm (0.5-0.75), hot (0.75-1.0).
+
+Large engagement histories (imported LinkedIn networks) are scored with a
+columnar NumPy path: records are encoded once into contact-index, timestamp
+and depth-weight arrays and the per-contact factors come from grouped
+reductions. Results are identical to the per-contact path, which is used
+for small inputs or when NumPy is unavailable.
 """
 
 from __future__ import annotations
 
 import logging
+import warnings
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Any
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
 logger = logging.getLogger(__name__)
 
+# Histories at least this long use the columnar path (when NumPy is present).
+COLUMNAR_MIN_RECORDS = 1000
+
+# Depth weight per engagement type; unknown types count as a like.
+_DEPTH_WEIGHTS = {
+    "conversation": 1.0,
+    "comment": 0.7,
+    "share": 0.5,
+    "like": 0.3,
+}
+_DEFAULT_DEPTH_WEIGHT = 0.3
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+_DAY_MICROSECONDS = 86_400_000_000
+
 
 # ---------------------------------------------------------------------------
 # Data structures
@@ -50,6 +78,62 @@ class TemperatureScore:
         }
 
 
+# ---------------------------------------------------------------------------
+# Columnar helpers
+# ---------------------------------------------------------------------------
+
+
+def _utc_micros(values: list[Any]) -> tuple[Any, Any]:
+    """Parse ISO timestamps to UTC microseconds plus a "has timestamp" mask.
+
+    UTC and naive extended ISO strings (the common case) are parsed by
+    NumPy in one call. Values NumPy does not take -- other offsets, basic
+    ("20261001") and week ("2026-W40") forms, non-strings -- go through
+    ``datetime.fromisoformat`` per record. Unparseable values count as
+    missing, as in the per-contact path.
+    """
+    try:
+        with warnings.catch_warnings():
+            # NumPy only warns (rather than fails) on non-UTC offsets.
+            warnings.simplefilter("error")
+            parsed = np.array(
+                [
+                    v.replace("+00:00", "").removesuffix("Z")
+                    if isinstance(v, str) and v[:4].isdigit() and v[4:5] == v[7:8] == "-"
+                    else "NaT"
+                    for v in values
+                ],
+                dtype="datetime64[us]",
+            )
+    except (ValueError, Warning):
+        return _utc_micros_slow(values)
+    has_ts = ~np.isnat(parsed)
+    micros = np.where(has_ts, parsed.astype(np.int64), 0)
+    # NumPy would misread "20261001" as a year, so only the extended
+    # calendar form is sent to it; everything else it skipped is retried.
+    retry = [i for i, v in enumerate(values) if v and not has_ts[i]]
+    if retry:
+        micros[retry], has_ts[retry] = _utc_micros_slow([values[i] for i in retry])
+    return micros, has_ts
+
+
+def _utc_micros_slow(values: list[Any]) -> tuple[Any, Any]:
+    micros = np.zeros(len(values), dtype=np.int64)
+    has_ts = np.zeros(len(values), dtype=bool)
+    for i, value in enumerate(values):
+        if not value:
+            continue
+        try:
+            ts = datetime.fromisoformat(value)
+        except (ValueError, TypeError):
+            continue
+        if ts.tzinfo is None:
+            ts = ts.replace(tzinfo=timezone.utc)
+        micros[i] = (ts - _EPOCH) // _MICROSECOND
+        has_ts[i] = True
+    return micros, has_ts
+
+
 # ---------------------------------------------------------------------------
 # Service
 # ---------------------------------------------------------------------------
@@ -77,6 +161,9 @@ class RelationshipTemperatureService:
         if not engagement_history:
             return []
 
+        if np is not None and len(engagement_history) >= COLUMNAR_MIN_RECORDS:
+            return self._score_contacts_columnar(engagement_history)
+
         # Group by contact
         by_contact: dict[str, list[dict[str, Any]]] = {}
         for record in engagement_history:
@@ -111,12 +198,99 @@ class RelationshipTemperatureService:
             interaction_types.append(r.get("engagement_type", ""))
 
         # Compute factor scores
-        recency = self._compute_recency_score(
-            max(timestamps) if timestamps else None
-        )
+        latest = max(timestamps) if timestamps else None
+        recency = self._compute_recency_score(latest)
         frequency = self._compute_frequency_score(len(records))
         depth = self._compute_depth_score(interaction_types)
 
+        return self._build_score(
+            contact_name,
+            recency,
+            frequency,
+            depth,
+            latest.isoformat() if latest else "",
+            len(records),
+        )
+
+    def _score_contacts_columnar(
+        self,
+        engagement_history: list[dict[str, Any]],
+    ) -> list[TemperatureScore]:
+        """Vectorized ``score_contacts`` for large histories.
+
+        Records are encoded into contact-index, depth-weight and UTC
+        microsecond arrays; counts, depth sums and the latest interaction
+        per contact are grouped reductions. Contacts are returned in
+        first-seen order, like the per-contact path.
+        """
+        contact_ids: dict[str, int] = {}
+        contacts = np.fromiter(
+            (
+                contact_ids.setdefault(name, len(contact_ids))
+                for name in (r.get("contact_name", "Unknown") for r in engagement_history)
+            ),
+            dtype=np.int64,
+            count=len(engagement_history),
+        )
+        types = [r.get("engagement_type", "") for r in engagement_history]
+        type_weights = {
+            itype: _DEPTH_WEIGHTS.get(itype.lower(), _DEFAULT_DEPTH_WEIGHT)
+            for itype in set(types)
+        }
+        weights = np.fromiter(
+            (type_weights[itype] for itype in types), dtype=np.float64, count=len(types)
+        )
+        raw_timestamps = [r.get("timestamp", "") for r in engagement_history]
+        micros, has_ts = _utc_micros(raw_timestamps)
+        n_contacts = len(contact_ids)
+
+        counts = np.bincount(contacts, minlength=n_contacts)
+        depth_sums = np.bincount(contacts, weights=weights, minlength=n_contacts)
+
+        # Latest timestamped record per contact: sort by contact, then
+        # has-timestamp, newest first. lexsort is stable, so ties keep the
+        # earliest record, as max() does.
+        order = np.lexsort((-micros, ~has_ts, contacts))
+        latest = order[np.searchsorted(contacts[order], np.arange(n_contacts))]
+
+        now_micros = (datetime.now(timezone.utc) - _EPOCH) // _MICROSECOND
+        days_ago = ((now_micros - micros[latest]) // _DAY_MICROSECONDS).tolist()
+        latest_has_ts = has_ts[latest].tolist()
+        latest = latest.tolist()
+        counts = counts.tolist()
+        depth_sums = depth_sums.tolist()
+
+        scores: list[TemperatureScore] = []
+        for idx, contact_name in enumerate(contact_ids):
+            count = counts[idx]
+            if latest_has_ts[idx]:
+                recency = self._recency_from_days(days_ago[idx])
+                last_interaction = datetime.fromisoformat(
+                    raw_timestamps[latest[idx]]
+                ).isoformat()
+            else:
+                recency = 0.0
+                last_interaction = ""
+            scores.append(self._build_score(
+                contact_name,
+                recency,
+                self._compute_frequency_score(count),
+                min(1.0, depth_sums[idx] / count),
+                last_interaction,
+                count,
+            ))
+        return scores
+
+    def _build_score(
+        self,
+        contact_name: str,
+        recency: float,
+        frequency: float,
+        depth: float,
+        last_interaction: str,
+        interaction_count: int,
+    ) -> TemperatureScore:
+        """Combine factor scores into a TemperatureScore."""
         # Weighted average
         numeric = round(
             0.4 * recency + 0.3 * frequency + 0.3 * depth, 2
@@ -126,10 +300,6 @@ class RelationshipTemperatureService:
         label = self._classify_temperature(numeric)
         ready = label in ("warm", "hot")
 
-        last_interaction = ""
-        if timestamps:
-            last_interaction = max(timestamps).isoformat()
-
         return TemperatureScore(
             contact_name=contact_name,
             score=label,
@@ -141,7 +311,7 @@ class RelationshipTemperatureService:
             },
             ready_for_outreach=ready,
             last_interaction=last_interaction,
-            interaction_count=len(records),
+            interaction_count=interaction_count,
             data_quality="complete",
         )
 
@@ -162,7 +332,10 @@ class RelationshipTemperatureService:
         if last_interaction.tzinfo is None:
             last_interaction = last_interaction.replace(tzinfo=timezone.utc)
 
-        days_ago = (now - last_interaction).days
+        return self._recency_from_days((now - last_interaction).days)
+
+    def _recency_from_days(self, days_ago: int) -> float:
+        """Map whole days since the last interaction onto the 90-day decay."""
         if days_ago <= 0:
             return 1.0
         if days_ago >= 90:
@@ -204,16 +377,9 @@ class RelationshipTemperatureService:
             return 0.0
 
         # Weight by interaction type
-        weights = {
-            "conversation": 1.0,
-            "comment": 0.7,
-            "share": 0.5,
-            "like": 0.3,
-        }
-
         total = 0.0
         for itype in interaction_types:
-            total += weights.get(itype.lower(), 0.3)
+            total += _DEPTH_WEIGHTS.get(itype.lower(), _DEFAULT_DEPTH_WEIGHT)
 
         avg = total / len(interaction_types)
         return min(1.0, avg)
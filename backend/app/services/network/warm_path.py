@@ -2,21 +2,32 @@
 Warm Path Finder Service — discovers connections who can introduce users
 to target companies.
 
-Analyzes connection data to find 1st-degree, 2nd-degree, and alumni paths,
-scores path strength, and generates suggested actions.
+Finds 1st-degree, 2nd-degree, and alumni paths deterministically from the
+user's connection graph (``connection_graph.ConnectionGraph``: BFS plus
+company/school indexes), scores path strength, and generates suggested
+actions. The LLM is only used, optionally, to phrase the suggested action
+for the top-k paths across all target companies in a single call.
 
 Architecture: Follows the research service pattern (like company_research.py).
 """
 
 from __future__ import annotations
 
-import asyncio
 import logging
 from dataclasses import dataclass, field
 from typing import Any
 
+from app.services.network.connection_graph import ConnectionGraph
+
 logger = logging.getLogger(__name__)
 
+# Paths returned per target company.
+MAX_PATHS_PER_COMPANY = 3
+
+# Paths (strongest first, across companies) whose suggested action is
+# phrased by the LLM; 0 keeps the templated actions.
+DEFAULT_PHRASE_TOP_K = 5
+
 
 # ---------------------------------------------------------------------------
 # Data structures
@@ -58,21 +69,27 @@ class WarmPath:
 class WarmPathService:
     """Discovers warm paths to target companies via user connections.
 
-    Uses LLM synthesis to reason about connection data and identify
-    potential introduction paths. Connection data is simulated (real
+    Paths come from the user's connection graph, so cost is independent of
+    the number of target companies. Connection data is imported (real
     LinkedIn API integration is deferred).
     """
 
+    def __init__(self, phrase_top_k: int = DEFAULT_PHRASE_TOP_K) -> None:
+        self.phrase_top_k = phrase_top_k
+
     async def analyze(
         self,
         target_companies: list[str],
         connection_data: dict[str, Any],
+        graph: ConnectionGraph | None = None,
     ) -> list[WarmPath]:
         """Analyze warm paths for target companies.
 
         Args:
             target_companies: Companies to find paths to.
-            connection_data: User's imported connection info.
+            connection_data: User's imported connection info, used to build
+                an in-memory graph when ``graph`` is not given.
+            graph: The user's persisted connection graph, if loaded.
 
         Returns:
             List of WarmPath objects for all target companies.
@@ -84,122 +101,118 @@ class WarmPathService:
             "Analyzing warm paths for %d companies", len(target_companies)
         )
 
-        async def _analyze_one(company: str) -> list[WarmPath]:
-            try:
-                return await self._analyze_company(company, connection_data)
-            except Exception as exc:
-                logger.warning(
-                    "Warm path analysis failed for %s: %s", company, exc
-                )
-                return [
-                    WarmPath(
-                        contact_name=f"Connection at {company}",
-                        company=company,
-                        path_type="2nd_degree",
-                        strength="weak",
-                        relationship_context="Unable to analyze — limited data",
-                        suggested_action=f"Research connections at {company} manually",
-                        data_quality="partial",
-                    )
-                ]
-
-        results = await asyncio.gather(
-            *[_analyze_one(company) for company in target_companies]
-        )
-        # Flatten list of lists
+        if graph is None:
+            graph = ConnectionGraph.from_connection_data(connection_data)
+
         paths: list[WarmPath] = []
-        for company_paths in results:
-            paths.extend(company_paths)
+        for company in target_companies:
+            paths.extend(self._paths_for_company(graph, company))
+
+        if self.phrase_top_k > 0:
+            await self._phrase_top_actions(paths)
         return paths
 
-    async def _analyze_company(
+    def _paths_for_company(
         self,
+        graph: ConnectionGraph,
         company: str,
-        connection_data: dict[str, Any],
     ) -> list[WarmPath]:
-        """Analyze warm paths for a single company using LLM."""
-        from app.core.llm_clients import LLMClient
-
-        client = LLMClient()
-
-        contacts = connection_data.get("contacts") or []
-        contact_context = ""
-        if contacts:
-            for c in contacts[:20]:
-                if isinstance(c, dict):
-                    contact_context += (
-                        f"- {c.get('name', 'Unknown')} at "
-                        f"{c.get('company', 'Unknown')}\n"
-                    )
-        else:
-            contact_context = "No connection data available."
-
-        prompt = (
-            f"You are a professional networking analyst.\n"
-            f"Target company: {company}\n\n"
-            f"User's connections:\n{contact_context}\n\n"
-            f"Identify warm paths to {company}. For each path provide a JSON "
-            f"object with these keys:\n"
-            f"- contact_name: string (name of the connection)\n"
-            f"- path_type: string (1st_degree, 2nd_degree, or alumni)\n"
-            f"- strength: string (strong, medium, or weak)\n"
-            f"- relationship_context: string (how they're connected)\n"
-            f"- suggested_action: string (what user should do)\n"
-            f"- mutual_connections: array of strings (shared connections)\n\n"
-            f"Return a JSON object with key 'paths' containing an array of "
-            f"path objects. Return 1-3 paths."
-        )
-
-        data = await client.generate_json(prompt, temperature=0.4, max_tokens=1500)
-
-        if not data or not data.get("paths"):
-            return [
-                WarmPath(
-                    contact_name=f"Connection at {company}",
-                    company=company,
-                    path_type="2nd_degree",
-                    strength="weak",
-                    relationship_context="No specific paths identified",
-                    suggested_action=f"Research your network for connections at {company}",
-                    data_quality="partial",
-                )
-            ]
-
-        paths: list[WarmPath] = []
-        for item in data["paths"][:3]:
-            if isinstance(item, dict):
-                path = WarmPath(
-                    contact_name=str(item.get("contact_name", "")),
-                    company=company,
-                    path_type=str(item.get("path_type", "2nd_degree")),
-                    strength=self._score_path_strength(item),
-                    relationship_context=str(
-                        item.get("relationship_context", "")
-                    ),
-                    suggested_action=self._generate_suggested_action(
-                        item, company
-                    ),
-                    mutual_connections=[
-                        str(mc)
-                        for mc in (item.get("mutual_connections") or [])
-                    ],
-                    data_quality="complete",
-                )
-                paths.append(path)
-
-        return paths if paths else [
+        """The strongest graph paths into ``company``, or a partial stub."""
+        candidates = [(c, c.to_path_data()) for c in graph.find_paths(company)]
+        candidates.sort(key=lambda item: (
+            -self._path_strength_points(item[1]),
+            -len(item[0].mutual_connections),
+            item[0].contact_name,
+        ))
+
+        paths = [
+            WarmPath(
+                contact_name=candidate.contact_name,
+                company=company,
+                path_type=candidate.path_type,
+                strength=self._score_path_strength(path_data),
+                relationship_context=candidate.relationship_context,
+                suggested_action=self._generate_suggested_action(path_data, company),
+                mutual_connections=candidate.mutual_connections,
+                data_quality="complete",
+            )
+            for candidate, path_data in candidates[:MAX_PATHS_PER_COMPANY]
+        ]
+        return paths or [
             WarmPath(
                 contact_name=f"Connection at {company}",
                 company=company,
+                path_type="2nd_degree",
+                strength="weak",
+                relationship_context="No specific paths identified",
+                suggested_action=f"Research your network for connections at {company}",
                 data_quality="partial",
             )
         ]
 
+    async def _phrase_top_actions(self, paths: list[WarmPath]) -> None:
+        """Rewrite suggested actions for the top-k paths with one LLM call.
+
+        Best-effort: on any failure the templated actions are kept.
+        """
+        strength_rank = {"strong": 0, "medium": 1, "weak": 2}
+        top = sorted(
+            (p for p in paths if p.data_quality == "complete"),
+            key=lambda p: (strength_rank.get(p.strength, 3), -len(p.mutual_connections)),
+        )[: self.phrase_top_k]
+        if not top:
+            return
+
+        listing = "\n".join(
+            f"{i}. {p.contact_name} at {p.company} ({p.path_type}); "
+            f"{p.relationship_context}; mutual connections: "
+            f"{', '.join(p.mutual_connections[:3]) or 'none'}"
+            for i, p in enumerate(top)
+        )
+        prompt = (
+            f"You are a professional networking coach.\n"
+            f"For each warm introduction path below, write one short, "
+            f"specific suggested next step for the user.\n\n"
+            f"{listing}\n\n"
+            f"Return a JSON object with key 'actions' containing an array of "
+            f"objects with keys 'index' (integer) and 'suggested_action' (string)."
+        )
+
+        try:
+            from app.core.llm_clients import LLMClient
+
+            data = await LLMClient().generate_json(prompt, temperature=0.4, max_tokens=800)
+        except Exception as exc:
+            logger.warning("Suggested action phrasing failed: %s", exc)
+            return
+
+        for item in (data or {}).get("actions") or []:
+            if not isinstance(item, dict):
+                continue
+            index = item.get("index")
+            action = item.get("suggested_action")
+            if (
+                isinstance(index, int)
+                and 0 <= index < len(top)
+                and isinstance(action, str)
+                and action.strip()
+            ):
+                top[index].suggested_action = action.strip()
+
     def _score_path_strength(self, path_data: dict[str, Any]) -> str:
         """Score path strength based on relationship indicators.
 
         Considers path type, mutual connections, and relationship context.
         """
+        score = self._path_strength_points(path_data)
+        if score >= 5:
+            return "strong"
+        elif score >= 3:
+            return "medium"
+        return "weak"
+
+    def _path_strength_points(self, path_data: dict[str, Any]) -> int:
+        """Raw strength points behind ``_score_path_strength`` (used for ranking)."""
         path_type = str(path_data.get("path_type", ""))
         mutuals = path_data.get("mutual_connections") or []
         context = str(path_data.get("relationship_context", ""))
@@ -225,11 +238,7 @@ class WarmPathService:
         if any(ind in context.lower() for ind in depth_indicators):
             score += 1
 
-        if score >= 5:
-            return "strong"
-        elif score >= 3:
-            return "medium"
-        return "weak"
+        return score
 
     def _generate_suggested_action(
         self, path_data: dict[str, Any], company: str
@@ -1,8 +1,8 @@
 """
 Preference learning service.
 
-Analyzes swipe events to detect user preference patterns and provides
-score adjustment for learned preferences.
+Maintains per-user swipe counters by job attribute, detects preference
+patterns from them, and provides score adjustment for learned preferences.
 
 Architecture: Standalone module with pure functions that take a db session
 parameter, following the same pattern as job_scoring.py.
@@ -12,16 +12,17 @@ from __future__ import annotations
 
 import logging
 from collections import defaultdict
-from typing import Any
-from uuid import UUID
+from typing import Any, Iterable
+from uuid import UUID, uuid4
 
-from sqlalchemy import select
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.models import (
     LearnedPreference,
     LearnedPreferenceStatus,
-    SwipeEvent,
+    SwipePatternStat,
 )
 
 logger = logging.getLogger(__name__)
@@ -38,6 +39,88 @@ MAX_CONFIDENCE = 0.95
 NEGATIVE_PENALTY = -15  # Per high-confidence dismissed pattern
 POSITIVE_BOOST = 10     # Per high-confidence saved pattern
 
+# Swipes within this window share one background detect_patterns run.
+DETECTION_DEBOUNCE_SECONDS = 60
+
+
+# ---------------------------------------------------------------------------
+# Swipe statistics
+# ---------------------------------------------------------------------------
+
+
+def swipe_pattern_keys(
+    company: str | None,
+    location: str | None,
+    remote: bool | None,
+    employment_type: str | None,
+) -> list[tuple[str, str]]:
+    """Return the (pattern_type, pattern_value) pairs a swipe counts toward."""
+    keys: list[tuple[str, str]] = []
+    if company:
+        keys.append(("company", company))
+    if location:
+        keys.append(("location", location))
+    if remote is not None:
+        keys.append(("remote", str(remote).lower()))
+    if employment_type:
+        keys.append(("employment_type", employment_type))
+    return keys
+
+
+def aggregate_swipes(swipes: Iterable[dict[str, Any]]) -> dict[tuple[str, str], list[int]]:
+    """Fold swipe dicts into ``{(pattern_type, pattern_value): [total, dismissed]}``.
+
+    Each dict carries ``action`` and the denormalized ``job_*`` fields of a
+    ``SwipeEvent``.
+    """
+    counts: dict[tuple[str, str], list[int]] = defaultdict(lambda: [0, 0])
+    for swipe in swipes:
+        dismissed = 1 if swipe.get("action") == "dismissed" else 0
+        for key in swipe_pattern_keys(
+            swipe.get("job_company"),
+            swipe.get("job_location"),
+            swipe.get("job_remote"),
+            swipe.get("job_employment_type"),
+        ):
+            counts[key][0] += 1
+            counts[key][1] += dismissed
+    return counts
+
+
+async def record_swipe_stats(
+    user_id: UUID, swipes: Iterable[dict[str, Any]], db: AsyncSession
+) -> None:
+    """Add swipes to the user's pattern counters with one upsert.
+
+    Runs in the caller's transaction, alongside the ``SwipeEvent`` insert,
+    so counters and the event log stay consistent.
+    """
+    counts = aggregate_swipes(swipes)
+    if not counts:
+        return
+
+    stmt = pg_insert(SwipePatternStat).values([
+        {
+            "id": uuid4(),
+            "user_id": user_id,
+            "pattern_type": pattern_type,
+            "pattern_value": pattern_value,
+            "total": total,
+            "dismissed": dismissed,
+        }
+        for (pattern_type, pattern_value), (total, dismissed) in counts.items()
+    ])
+    await db.execute(
+        stmt.on_conflict_do_update(
+            constraint="uq_swipe_pattern_stat",
+            set_={
+                "total": SwipePatternStat.total + stmt.excluded.total,
+                "dismissed": SwipePatternStat.dismissed + stmt.excluded.dismissed,
+                "updated_at": func.now(),
+            },
+        )
+    )
+
 
 # ---------------------------------------------------------------------------
 # Pattern detection
@@ -45,21 +128,26 @@ POSITIVE_BOOST = 10     # Per high-confidence saved pattern
 
 
 async def detect_patterns(user_id: UUID, db: AsyncSession) -> list[LearnedPreference]:
-    """Analyze swipe events and detect preference patterns.
+    """Detect preference patterns from the user's swipe counters.
 
-    Scans all swipe events for the given user, groups by attribute
-    (company, location, remote, employment_type), and creates
-    LearnedPreference records for patterns above threshold.
+    Selects the ``swipe_pattern_stats`` rows that meet the dismissal
+    thresholds (company, location, remote, employment_type) and creates
+    LearnedPreference records for those not already learned. Cost depends
+    on the number of distinct attribute values, not on swipe history.
 
     Returns newly created LearnedPreference records.
     """
-    # 1. Query all swipe events for user
+    # 1. Counters above threshold
     result = await db.execute(
-        select(SwipeEvent).where(SwipeEvent.user_id == user_id)
+        select(SwipePatternStat).where(
+            SwipePatternStat.user_id == user_id,
+            SwipePatternStat.dismissed >= MIN_OCCURRENCES,
+            SwipePatternStat.dismissed >= SwipePatternStat.total * MIN_DISMISS_RATE,
+        )
     )
-    events = result.scalars().all()
+    candidates = result.scalars().all()
 
-    if not events:
+    if not candidates:
         return []
 
     # 2. Query existing learned preferences (to avoid duplicates)
@@ -74,82 +162,43 @@ async def detect_patterns(user_id: UUID, db: AsyncSession) -> list[LearnedPrefer
         (p.pattern_type, p.pattern_value) for p in existing_prefs
     }
 
-    # 3. Group events by attribute
-    attribute_counts: dict[str, dict[str, dict[str, int]]] = defaultdict(
-        lambda: defaultdict(lambda: {"total": 0, "dismissed": 0})
-    )
-
-    for event in events:
-        action = event.action
-
-        # Company pattern
-        if event.job_company:
-            counts = attribute_counts["company"][event.job_company]
-            counts["total"] += 1
-            if action == "dismissed":
-                counts["dismissed"] += 1
-
-        # Location pattern
-        if event.job_location:
-            counts = attribute_counts["location"][event.job_location]
-            counts["total"] += 1
-            if action == "dismissed":
-                counts["dismissed"] += 1
-
-        # Remote pattern
-        if event.job_remote is not None:
-            remote_val = str(event.job_remote).lower()
-            counts = attribute_counts["remote"][remote_val]
-            counts["total"] += 1
-            if action == "dismissed":
-                counts["dismissed"] += 1
-
-        # Employment type pattern
-        if event.job_employment_type:
-            counts = attribute_counts["employment_type"][event.job_employment_type]
-            counts["total"] += 1
-            if action == "dismissed":
-                counts["dismissed"] += 1
-
-    # 4. Create LearnedPreference for patterns above threshold
+    # 3. Create LearnedPreference for new patterns
     new_preferences: list[LearnedPreference] = []
 
-    for pattern_type, values in attribute_counts.items():
-        for pattern_value, counts in values.items():
-            total = counts["total"]
-            dismissed = counts["dismissed"]
-
-            if dismissed < MIN_OCCURRENCES:
-                continue
+    for stat in candidates:
+        total = stat.total
+        dismissed = stat.dismissed
+        if not total or dismissed < MIN_OCCURRENCES:
+            continue
 
-            dismiss_rate = dismissed / total
-            if dismiss_rate < MIN_DISMISS_RATE:
-                continue
+        dismiss_rate = dismissed / total
+        if dismiss_rate < MIN_DISMISS_RATE:
+            continue
 
-            # Skip if already exists
-            if (pattern_type, pattern_value) in existing_keys:
-                continue
+        # Skip if already exists
+        if (stat.pattern_type, stat.pattern_value) in existing_keys:
+            continue
 
-            confidence = min(dismiss_rate, MAX_CONFIDENCE)
+        confidence = min(dismiss_rate, MAX_CONFIDENCE)
 
-            pref = LearnedPreference(
-                user_id=user_id,
-                pattern_type=pattern_type,
-                pattern_value=pattern_value,
-                confidence=confidence,
-                occurrences=total,
-                status=LearnedPreferenceStatus.PENDING,
-            )
-            db.add(pref)
-            new_preferences.append(pref)
-
-            logger.info(
-                "Detected preference pattern: %s=%s (confidence=%.2f, occurrences=%d)",
-                pattern_type,
-                pattern_value,
-                confidence,
-                total,
-            )
+        pref = LearnedPreference(
+            user_id=user_id,
+            pattern_type=stat.pattern_type,
+            pattern_value=stat.pattern_value,
+            confidence=confidence,
+            occurrences=total,
+            status=LearnedPreferenceStatus.PENDING,
+        )
+        db.add(pref)
+        new_preferences.append(pref)
+
+        logger.info(
+            "Detected preference pattern: %s=%s (confidence=%.2f, occurrences=%d)",
+            stat.pattern_type,
+            stat.pattern_value,
+            confidence,
+            total,
+        )
 
     if new_preferences:
         await db.flush()
@@ -157,11 +206,124 @@ async def detect_patterns(user_id: UUID, db: AsyncSession) -> list[LearnedPrefer
     return new_preferences
 
 
+def _detection_pending_key(user_id: UUID | str) -> str:
+    return f"swipe_learning_pending:{user_id}"
+
+
+async def schedule_pattern_detection(user_id: UUID | str) -> bool:
+    """Queue a debounced background ``detect_patterns`` run for the user.
+
+    The first swipe in a quiet period sets a Redis marker and schedules the
+    Celery task ``DETECTION_DEBOUNCE_SECONDS`` later; swipes that land while
+    the marker exists ride along with that run. The marker outlives the
+    countdown so a lost task cannot block detection for long.
+
+    Returns True if a task was queued.
+    """
+    try:
+        from app.cache.redis_client import get_redis_client
+
+        client = await get_redis_client()
+        first = await client.set(
+            _detection_pending_key(user_id),
+            "1",
+            nx=True,
+            ex=DETECTION_DEBOUNCE_SECONDS * 5,
+        )
+        if not first:
+            return False
+
+        from app.worker.tasks import learn_swipe_preferences
+
+        learn_swipe_preferences.apply_async(
+            args=[str(user_id)], countdown=DETECTION_DEBOUNCE_SECONDS
+        )
+        return True
+    except Exception as exc:
+        logger.warning("Could not schedule pattern detection for user=%s: %s", user_id, exc)
+        return False
+
+
+async def clear_pattern_detection_pending(user_id: UUID | str) -> None:
+    """Clear the debounce marker so later swipes schedule a new run."""
+    try:
+        from app.cache.redis_client import get_redis_client
+
+        client = await get_redis_client()
+        await client.delete(_detection_pending_key(user_id))
+    except Exception as exc:
+        logger.warning("Could not clear pattern detection marker for user=%s: %s", user_id, exc)
+
+
 # ---------------------------------------------------------------------------
 # Score adjustment
 # ---------------------------------------------------------------------------
 
 
+def _preference_delta(confidence: float) -> int:
+    """Score delta contributed by one matching learned preference."""
+    if confidence >= MIN_DISMISS_RATE:
+        return int(NEGATIVE_PENALTY * confidence)
+    return int(POSITIVE_BOOST * (1 - confidence))
+
+
+class PreferenceAdjuster:
+    """A user's active learned preferences compiled for bulk scoring.
+
+    Preferences are folded into ``{pattern_type: {lowered_value: delta}}``
+    once, so adjusting a job is one dict lookup per attribute instead of a
+    query plus a scan over every preference.
+    """
+
+    def __init__(self, preferences: Iterable[Any] = ()):
+        self._deltas: dict[str, dict[str, int]] = defaultdict(dict)
+        for pref in preferences:
+            table = self._deltas[pref.pattern_type]
+            value = pref.pattern_value.lower()
+            table[value] = table.get(value, 0) + _preference_delta(float(pref.confidence))
+
+    @classmethod
+    async def load(cls, user_id: UUID, db: AsyncSession) -> PreferenceAdjuster:
+        """Compile the user's pending/acknowledged preferences (one query)."""
+        result = await db.execute(
+            select(LearnedPreference).where(
+                LearnedPreference.user_id == user_id,
+                LearnedPreference.status.in_([
+                    LearnedPreferenceStatus.PENDING,
+                    LearnedPreferenceStatus.ACKNOWLEDGED,
+                ]),
+                LearnedPreference.deleted_at.is_(None),
+            )
+        )
+        return cls(result.scalars().all())
+
+    def __bool__(self) -> bool:
+        return any(self._deltas.values())
+
+    def adjustment(self, job: Any) -> int:
+        """Sum of deltas for the job's matching attribute values."""
+        total = 0
+        for pattern_type, table in self._deltas.items():
+            job_value = _get_job_attribute(job, pattern_type)
+            if job_value is not None:
+                total += table.get(job_value, 0)
+        return total
+
+    def adjust(self, job: Any, score: int) -> int:
+        """Return ``score`` adjusted for ``job`` and clamped to 0-100."""
+        if not self:
+            return score
+        return max(0, min(100, score + self.adjustment(job)))
+
+    def apply(
+        self, scored_jobs: Iterable[tuple[Any, int, str]]
+    ) -> list[tuple[Any, int, str]]:
+        """Adjust a list of ``(job, score, rationale)`` tuples in one pass."""
+        if not self:
+            return list(scored_jobs)
+        return [(job, self.adjust(job, score), rationale) for job, score, rationale in scored_jobs]
+
+
 async def apply_learned_preferences(
     user_id: UUID,
     base_score: int,
@@ -172,7 +334,8 @@ async def apply_learned_preferences(
 
     Applies negative penalties for dismissed patterns and positive boosts
     for saved patterns (patterns where dismiss rate is low, i.e., the
-    user tends to save jobs with that attribute).
+    user tends to save jobs with that attribute). For more than one job,
+    load a ``PreferenceAdjuster`` once and use ``apply`` instead.
 
     Args:
         user_id: The user's UUID.
@@ -183,48 +346,21 @@ async def apply_learned_preferences(
     Returns:
         Adjusted score clamped to 0-100.
     """
-    result = await db.execute(
-        select(LearnedPreference).where(
-            LearnedPreference.user_id == user_id,
-            LearnedPreference.status.in_([
-                LearnedPreferenceStatus.PENDING,
-                LearnedPreferenceStatus.ACKNOWLEDGED,
-            ]),
-            LearnedPreference.deleted_at.is_(None),
-        )
-    )
-    preferences = result.scalars().all()
+    adjuster = await PreferenceAdjuster.load(user_id, db)
+    return adjuster.adjust(job, base_score)
 
-    if not preferences:
-        return base_score
 
-    adjustment = 0
-
-    for pref in preferences:
-        job_value = _get_job_attribute(job, pref.pattern_type)
-        if job_value is None:
-            continue
-
-        if str(job_value).lower() == pref.pattern_value.lower():
-            # High dismiss rate = negative pattern
-            confidence = float(pref.confidence)
-            if confidence >= MIN_DISMISS_RATE:
-                adjustment += int(NEGATIVE_PENALTY * confidence)
-            else:
-                adjustment += int(POSITIVE_BOOST * (1 - confidence))
-
-    return max(0, min(100, base_score + adjustment))
+_JOB_ATTRIBUTES = {
+    "company": "company",
+    "location": "location",
+    "remote": "remote",
+    "employment_type": "employment_type",
+}
 
 
 def _get_job_attribute(job: Any, pattern_type: str) -> str | None:
     """Extract the relevant attribute from a job object based on pattern type."""
-    mapping = {
-        "company": "company",
-        "location": "location",
-        "remote": "remote",
-        "employment_type": "employment_type",
-    }
-    attr_name = mapping.get(pattern_type)
+    attr_name = _JOB_ATTRIBUTES.get(pattern_type)
     if attr_name is None:
         return None
     value = getattr(job, attr_name, None)
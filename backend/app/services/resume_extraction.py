@@ -0,0 +1,181 @@
+"""
+Resume text extraction off the event loop, with a content-hash cache.
+
+PyPDF2 and python-docx are pure-Python and CPU-bound: parsing a large PDF
+inside an async handler stalls every other request on the worker for
+hundreds of milliseconds, and a thread would still hold the GIL. Parsing
+therefore runs in a small ``ProcessPoolExecutor`` (``EXTRACTION_WORKERS``
+processes, created on first use).
+
+Results are cached in Redis by the SHA-256 of the file content:
+
+- ``resume_text:{digest}`` -- the extracted text (``extract_text``);
+- ``resume_profile:v{N}:{digest}`` -- the ``ExtractedProfile`` JSON, so a
+  re-upload of the same file also skips the GPT-4o-mini call. Bump
+  ``_PROFILE_CACHE_VERSION`` when the prompt or the model changes.
+
+Entries expire after ``_CACHE_TTL_SECONDS``; resumes hold personal data,
+so they are not kept longer than a re-upload window needs. Cache access
+is best-effort: Redis errors are logged and the work is simply redone.
+
+Usage::
+
+    from app.services.resume_extraction import extract_text
+
+    text = await extract_text(file_bytes, "resume.pdf")
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+if TYPE_CHECKING:
+    from app.services.resume_parser import ExtractedProfile
+
+logger = logging.getLogger(__name__)
+
+# Parsing processes per API worker; uploads are bursty, not sustained.
+EXTRACTION_WORKERS = 2
+
+_CACHE_TTL_SECONDS = 24 * 60 * 60
+
+_PROFILE_CACHE_VERSION = 1
+
+_executor: ProcessPoolExecutor | None = None
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """Return the shared extraction pool, creating it on first use."""
+    global _executor
+    if _executor is None:
+        # spawn: never fork a process that is running an event loop and threads.
+        _executor = ProcessPoolExecutor(
+            max_workers=EXTRACTION_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+def shutdown_executor() -> None:
+    """Shut the pool down (tests, worker shutdown); the next call recreates it."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+
+
+async def run_extraction(fn: Callable[[bytes], Any], file_bytes: bytes) -> Any:
+    """Run a module-level parser ``fn(file_bytes)`` in the extraction pool.
+
+    Exceptions raised by ``fn`` (e.g. ``ValueError`` for image-based
+    files) propagate unchanged. A pool whose worker died is discarded so
+    the next call starts a fresh one.
+    """
+    global _executor
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(get_executor(), fn, file_bytes)
+    except BrokenProcessPool:
+        logger.error("Resume extraction pool broke; recreating on next use")
+        _executor = None
+        raise
+
+
+def content_digest(file_bytes: bytes) -> str:
+    """SHA-256 hex digest identifying a file's content."""
+    return hashlib.sha256(file_bytes).hexdigest()
+
+
+def _text_key(digest: str) -> str:
+    return f"resume_text:{digest}"
+
+
+def _profile_key(digest: str) -> str:
+    return f"resume_profile:v{_PROFILE_CACHE_VERSION}:{digest}"
+
+
+async def _cache_read(key: str) -> Optional[str]:
+    from app.cache.redis_client import cache_get
+
+    try:
+        return await cache_get(key)
+    except Exception as exc:
+        logger.debug("Resume cache read failed for %s: %s", key, exc)
+        return None
+
+
+async def _cache_write(key: str, value: str) -> None:
+    from app.cache.redis_client import cache_set
+
+    try:
+        await cache_set(key, value, ttl=_CACHE_TTL_SECONDS)
+    except Exception as exc:
+        logger.debug("Resume cache write failed for %s: %s", key, exc)
+
+
+def parser_for(filename: str) -> Callable[[bytes], str]:
+    """Return the text extractor for a filename's extension.
+
+    Raises:
+        ValueError: If the file type is unsupported.
+    """
+    from app.services.resume_parser import extract_text_from_docx, extract_text_from_pdf
+
+    ext = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    if ext == "pdf":
+        return extract_text_from_pdf
+    if ext == "docx":
+        return extract_text_from_docx
+    raise ValueError(
+        f"Unsupported file type '.{ext}'. Please upload a PDF or DOCX file."
+    )
+
+
+async def extract_text(
+    file_bytes: bytes, filename: str, digest: Optional[str] = None
+) -> str:
+    """Extract resume text in the pool, or return it from the cache.
+
+    Args:
+        file_bytes: Raw file content (PDF or DOCX).
+        filename: Original filename, used for extension detection.
+        digest: ``content_digest(file_bytes)`` if the caller has it.
+
+    Raises:
+        ValueError: If the file type is unsupported or the file is image-based.
+    """
+    parser = parser_for(filename)
+    key = _text_key(digest or content_digest(file_bytes))
+
+    cached = await _cache_read(key)
+    if cached is not None:
+        return cached
+
+    text = await run_extraction(parser, file_bytes)
+    await _cache_write(key, text)
+    return text
+
+
+async def get_cached_profile(digest: str) -> Optional[ExtractedProfile]:
+    """Return the cached ``ExtractedProfile`` for a file digest, if any."""
+    from app.services.resume_parser import ExtractedProfile
+
+    cached = await _cache_read(_profile_key(digest))
+    if cached is None:
+        return None
+    try:
+        return ExtractedProfile.model_validate_json(cached)
+    except ValueError:
+        logger.warning("Discarding malformed cached resume profile %s", digest)
+        return None
+
+
+async def cache_profile(digest: str, profile: ExtractedProfile) -> None:
+    """Cache an ``ExtractedProfile`` under a file digest."""
+    await _cache_write(_profile_key(digest), profile.model_dump_json())
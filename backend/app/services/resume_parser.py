@@ -144,9 +144,11 @@ async def extract_profile_from_resume(
 ) -> ExtractedProfile:
     """Extract structured profile data from a resume file.
 
-    Determines file type from the filename extension, extracts raw text,
-    then calls OpenAI structured outputs (GPT-4o-mini) to parse the
-    resume into an ``ExtractedProfile``.
+    Extracts raw text in the extraction process pool, then calls OpenAI
+    structured outputs (GPT-4o-mini) to parse the resume into an
+    ``ExtractedProfile``. Both the text and the profile are cached by
+    file content hash (see ``resume_extraction``), so re-uploading the
+    same file skips parsing and the LLM call.
 
     Args:
         file_bytes: Raw file content (PDF or DOCX).
@@ -158,17 +160,22 @@ async def extract_profile_from_resume(
     Raises:
         ValueError: If the file type is unsupported or the file is image-based.
     """
-    # Determine file type and extract text
-    ext = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
-
-    if ext == "pdf":
-        raw_text = extract_text_from_pdf(file_bytes)
-    elif ext == "docx":
-        raw_text = extract_text_from_docx(file_bytes)
-    else:
-        raise ValueError(
-            f"Unsupported file type '.{ext}'. Please upload a PDF or DOCX file."
-        )
+    from app.services.resume_extraction import (
+        cache_profile,
+        content_digest,
+        extract_text,
+        get_cached_profile,
+        parser_for,
+    )
+
+    parser_for(filename)  # reject unsupported types before any cache lookup
+    digest = content_digest(file_bytes)
+    cached = await get_cached_profile(digest)
+    if cached is not None:
+        logger.info("Resume profile cache hit for %s", filename)
+        return cached
+
+    raw_text = await extract_text(file_bytes, filename, digest=digest)
 
     # Truncate to stay within token limits
     truncated_text = raw_text[:_MAX_TEXT_CHARS]
@@ -195,4 +202,5 @@ async def extract_profile_from_resume(
             "Please try again or upload a different file."
         )
 
+    await cache_profile(digest, parsed)
     return parsed
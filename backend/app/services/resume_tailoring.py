@@ -0,0 +1,329 @@
+"""
+Section-level incremental resume tailoring.
+
+Users tailor the same master resume for dozens of near-identical roles,
+and ``ResumeAgent`` used to send the whole resume and job description to
+the LLM every time. This module lets it regenerate only what a new job
+actually changes:
+
+- ``split_master_resume`` cuts the profile into sections (summary,
+  skills, experience, education), each identified by a digest of its
+  master content;
+- ``job_fingerprint`` reduces a job to its requirement set: title tokens
+  plus the top description keywords from ``jobs.features``, and the
+  company the summary is addressed to;
+- every tailoring run is remembered per user (``remember_tailoring``):
+  the job's fingerprint and, per section, the master digest, the job
+  requirements that section touches and the tailored result;
+- ``plan_tailoring`` picks the most similar remembered job (Jaccard
+  overlap of fingerprints, at least ``REUSE_THRESHOLD``) and reuses each
+  of its sections whose master content *and* section requirements are
+  unchanged. Everything else goes to the LLM.
+
+The cache is a Redis hash ``resume_tailoring:v{N}:{user_id}`` with one
+field per job, so concurrent runs for the same user each write their own
+field instead of overwriting a shared list. Reads keep the
+``MAX_CACHED_JOBS`` most recent runs and drop the rest; the hash expires
+``_CACHE_TTL_SECONDS`` after the last write. Bump
+``TAILORING_CACHE_VERSION`` when the tailoring prompt, model or cache
+layout changes. Access is best-effort: Redis errors are logged and the
+resume is tailored in full.
+
+Architecture: Pure planning functions plus best-effort Redis I/O.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+TAILORING_CACHE_VERSION = 2
+
+# Minimum Jaccard overlap of requirement fingerprints to reuse a prior run.
+REUSE_THRESHOLD = 0.7
+
+# Prior runs remembered per user.
+MAX_CACHED_JOBS = 20
+
+_CACHE_TTL_SECONDS = 14 * 24 * 60 * 60
+
+
+@dataclass(frozen=True)
+class ResumeSection:
+    """One section of the master resume as sent to the LLM."""
+
+    name: str
+    content: str
+
+    @property
+    def digest(self) -> str:
+        return hashlib.sha256(self.content.encode()).hexdigest()[:16]
+
+
+@dataclass(frozen=True)
+class JobFingerprint:
+    """Requirement set of one job."""
+
+    title_tokens: frozenset[str] = frozenset()
+    keywords: frozenset[str] = frozenset()
+    company: str = ""
+
+    @property
+    def terms(self) -> frozenset[str]:
+        return self.title_tokens | self.keywords
+
+
+@dataclass
+class TailoringPlan:
+    """Which sections to reuse from a prior run and which to regenerate."""
+
+    regenerate: list[ResumeSection]
+    reused: dict[str, dict[str, Any]] = field(default_factory=dict)
+    source_job_id: Optional[str] = None
+    similarity: float = 0.0
+    # Usage of a full tailoring run, carried forward from the source run.
+    baseline: Optional[dict[str, float]] = None
+
+    @property
+    def mode(self) -> str:
+        if not self.reused:
+            return "full"
+        return "incremental" if self.regenerate else "reused"
+
+
+def split_master_resume(profile: dict[str, Any]) -> list[ResumeSection]:
+    """Split a profile into the sections the tailoring prompt sends."""
+    sections = []
+
+    if profile.get("headline"):
+        sections.append(ResumeSection("summary", f"Headline: {profile['headline']}"))
+
+    if profile.get("skills"):
+        skills = profile["skills"]
+        if isinstance(skills, list):
+            sections.append(ResumeSection("skills", f"Skills: {', '.join(skills)}"))
+        else:
+            sections.append(ResumeSection("skills", f"Skills: {skills}"))
+
+    if profile.get("experience"):
+        lines = []
+        exp = profile["experience"]
+        if isinstance(exp, list):
+            for item in exp:
+                if isinstance(item, dict):
+                    lines.append(
+                        f"- {item.get('title', '')} at {item.get('company', '')} "
+                        f"({item.get('start_date', '')} - {item.get('end_date', 'Present')})"
+                    )
+                    if item.get("description"):
+                        lines.append(f"  {item['description']}")
+                else:
+                    lines.append(f"- {item}")
+        else:
+            lines.append(str(exp))
+        sections.append(ResumeSection("experience", "\n".join(lines)))
+
+    if profile.get("education"):
+        lines = []
+        edu = profile["education"]
+        if isinstance(edu, list):
+            for item in edu:
+                if isinstance(item, dict):
+                    lines.append(
+                        f"- {item.get('degree', '')} in {item.get('field', '')} "
+                        f"from {item.get('institution', '')} ({item.get('graduation_year', '')})"
+                    )
+                else:
+                    lines.append(f"- {item}")
+        else:
+            lines.append(str(edu))
+        sections.append(ResumeSection("education", "\n".join(lines)))
+
+    return sections
+
+
+def normalize_section_name(name: str) -> str:
+    """Canonical section name for an LLM-reported ``section_name``.
+
+    The model is asked to echo the bracketed headings but sometimes keeps
+    the brackets or changes case and spacing (``"[Summary]"``,
+    ``" Experience "``).
+    """
+    return " ".join(name.strip().strip("[]").split()).lower()
+
+
+def job_fingerprint(job_analysis: dict[str, Any]) -> JobFingerprint:
+    """Fingerprint a job from ``ResumeAgent._analyze_job`` output."""
+    title = (job_analysis.get("title") or "").lower()
+    return JobFingerprint(
+        title_tokens=frozenset(t for t in title.split() if len(t) > 1),
+        keywords=frozenset(k.lower() for k in job_analysis.get("keywords", [])),
+        company=" ".join((job_analysis.get("company") or "").split()).lower(),
+    )
+
+
+def jaccard(a: frozenset[str], b: frozenset[str]) -> float:
+    """Jaccard overlap of two term sets (0.0 when both are empty)."""
+    union = a | b
+    return len(a & b) / len(union) if union else 0.0
+
+
+def section_requirements(
+    section: ResumeSection,
+    fingerprint: JobFingerprint,
+    sections: list[ResumeSection],
+) -> list[str]:
+    """Job requirements a section's tailoring depends on.
+
+    A section is rewritten around the job keywords its master content
+    mentions; the summary is aligned to the role title, the company and
+    every keyword the resume covers anywhere.
+    """
+    if section.name == "summary":
+        resume_text = " ".join(s.content.lower() for s in sections)
+        terms = set(fingerprint.title_tokens)
+        terms.update(k for k in fingerprint.keywords if k in resume_text)
+        if fingerprint.company:
+            terms.add(f"company:{fingerprint.company}")
+        return sorted(terms)
+    text = section.content.lower()
+    return sorted(k for k in fingerprint.keywords if k in text)
+
+
+def plan_tailoring(
+    sections: list[ResumeSection],
+    fingerprint: JobFingerprint,
+    entries: list[dict[str, Any]],
+) -> TailoringPlan:
+    """Decide which sections a new job can reuse from remembered runs."""
+    best: Optional[dict[str, Any]] = None
+    best_similarity = 0.0
+    for entry in entries:
+        similarity = jaccard(fingerprint.terms, frozenset(entry.get("terms", ())))
+        if similarity > best_similarity:
+            best, best_similarity = entry, similarity
+
+    if best is None or best_similarity < REUSE_THRESHOLD:
+        return TailoringPlan(regenerate=list(sections))
+
+    cached_sections = best.get("sections", {})
+    reused: dict[str, dict[str, Any]] = {}
+    regenerate = []
+    for section in sections:
+        cached = cached_sections.get(section.name)
+        if (
+            cached
+            and cached.get("digest") == section.digest
+            and cached.get("requirements") == section_requirements(section, fingerprint, sections)
+        ):
+            reused[section.name] = cached["tailored"]
+        else:
+            regenerate.append(section)
+
+    return TailoringPlan(
+        regenerate=regenerate,
+        reused=reused,
+        source_job_id=best.get("job_id"),
+        similarity=round(best_similarity, 3),
+        baseline=best.get("baseline"),
+    )
+
+
+def _cache_key(user_id: str) -> str:
+    return f"resume_tailoring:v{TAILORING_CACHE_VERSION}:{user_id}"
+
+
+async def load_tailoring_history(user_id: str) -> list[dict[str, Any]]:
+    """Remembered tailoring runs for a user, most recent first.
+
+    Runs beyond the ``MAX_CACHED_JOBS`` most recent, and malformed
+    entries, are deleted from the hash.
+    """
+    from app.cache.redis_client import get_redis_client
+
+    key = _cache_key(user_id)
+    try:
+        client = await get_redis_client()
+        fields = await client.hgetall(key)
+    except Exception as exc:
+        logger.debug("Tailoring cache read failed for user=%s: %s", user_id, exc)
+        return []
+
+    entries = []
+    stale = []
+    for job_id, value in fields.items():
+        try:
+            entry = json.loads(value)
+        except ValueError:
+            entry = None
+        if isinstance(entry, dict):
+            entries.append(entry)
+        else:
+            logger.warning(
+                "Discarding malformed tailoring cache entry user=%s job=%s", user_id, job_id
+            )
+            stale.append(job_id)
+
+    entries.sort(key=lambda e: e.get("remembered_at", 0), reverse=True)
+    stale.extend(e.get("job_id") for e in entries[MAX_CACHED_JOBS:])
+    if stale:
+        try:
+            await client.hdel(key, *stale)
+        except Exception as exc:
+            logger.debug("Tailoring cache trim failed for user=%s: %s", user_id, exc)
+    return entries[:MAX_CACHED_JOBS]
+
+
+async def remember_tailoring(
+    user_id: str,
+    job_id: str,
+    sections: list[ResumeSection],
+    fingerprint: JobFingerprint,
+    tailored_sections: dict[str, dict[str, Any]],
+    baseline: dict[str, float],
+) -> None:
+    """Record a tailoring run so similar jobs can reuse its sections.
+
+    Writes only this job's field of the user's hash, so runs finishing
+    at the same time do not drop each other's entries.
+
+    Args:
+        user_id: Clerk user ID.
+        job_id: Target job of this run.
+        sections: Master resume sections the run was planned from.
+        fingerprint: The job's requirement fingerprint.
+        tailored_sections: ``TailoredSection`` dumps by normalized section name.
+        baseline: Usage of a full tailoring run (tokens, latency).
+    """
+    from app.cache.redis_client import get_redis_client
+
+    entry = {
+        "job_id": job_id,
+        "remembered_at": time.time(),
+        "terms": sorted(fingerprint.terms),
+        "baseline": baseline,
+        "sections": {
+            section.name: {
+                "digest": section.digest,
+                "requirements": section_requirements(section, fingerprint, sections),
+                "tailored": tailored_sections[section.name],
+            }
+            for section in sections
+            if section.name in tailored_sections
+        },
+    }
+    key = _cache_key(user_id)
+    try:
+        client = await get_redis_client()
+        async with client.pipeline(transaction=True) as pipe:
+            pipe.hset(key, job_id, json.dumps(entry))
+            pipe.expire(key, _CACHE_TTL_SECONDS)
+            await pipe.execute()
+    except Exception as exc:
+        logger.debug("Tailoring cache write failed for user=%s: %s", user_id, exc)
@@ -0,0 +1,431 @@
+"""
+Reverse matching -- fan newly ingested jobs out to every interested user.
+
+Scout runs are pull-based: a job fetched for one user is otherwise never
+considered for another user with the same target title. Here every
+user's preferences are kept in a ``ReverseMatchIndex``:
+
+- target-title words -> users (inverted index; a job is only considered
+  for users with a target-title word inside one of its title words, or
+  one of its title words inside a target-title word, so "engineer" and
+  "engineering" meet as they do in the scout's title scorer),
+- salary floors, sorted (users whose floor is above the job's known
+  salary are cut with one bisect),
+- excluded companies -> users (deal-breaker, matched as in the scout).
+
+The index is cached per worker process and patched with the preferences
+and profiles updated since the last run (``subscriber_index``), with a
+full rebuild every ``INDEX_REBUILD_SECONDS``.
+
+The surviving candidates are scored with the scout's heuristic and their
+learned preferences (loaded for all candidates in one query). Users with
+the emergency brake on are skipped, and every match above
+``MATCH_SCORE_THRESHOLD`` is inserted with bulk statements of
+``INSERT_BATCH_ROWS`` rows, in one transaction, that leave existing
+``(user, job)`` matches alone. Locations are a scoring
+dimension, not a filter, so they are handled by the heuristic rather
+than an index.
+
+Architecture: Called from the ``fan_out_new_jobs`` Celery task, which
+``JobScoutAgent`` queues for the jobs ``upsert_jobs`` inserted.
+"""
+
+from __future__ import annotations
+
+import bisect
+import itertools
+import json
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable, Optional, Sequence
+from uuid import UUID, uuid4
+
+logger = logging.getLogger(__name__)
+
+# Seconds between full rebuilds of the cached index; in between it is
+# patched with the rows updated since the last sync.
+INDEX_REBUILD_SECONDS = 60 * 60
+
+# Each sync re-reads this far behind the previous one, so rows committed
+# after that sync with an earlier ``updated_at`` are not missed.
+_SYNC_OVERLAP = timedelta(minutes=5)
+
+# Shortest target-title fragment a job title word is looked up by.
+_MIN_FRAGMENT = 3
+
+# Match rows per INSERT statement. Each row binds 6 parameters, and one
+# statement may bind at most 32767 (asyncpg), so a fan-out of thousands
+# of job x user pairs is split into several statements.
+INSERT_BATCH_ROWS = 1000
+
+# Sorts after every user at the same salary floor.
+_MAX_UUID = UUID(int=(1 << 128) - 1)
+
+
+@dataclass
+class Subscriber:
+    """One user's matching inputs, as the scout's scorers expect them."""
+
+    user_id: UUID
+    preferences: dict[str, Any]
+    profile: dict[str, Any] = field(default_factory=dict)
+
+
+def _title_tokens(preferences: dict[str, Any]) -> set[str]:
+    return {
+        token
+        for title in preferences.get("target_titles") or []
+        for token in title.lower().split()
+    }
+
+
+def _fragments(token: str) -> set[str]:
+    """Substrings of ``token`` at least ``_MIN_FRAGMENT`` characters long."""
+    return {
+        token[start:end]
+        for start in range(len(token))
+        for end in range(start + _MIN_FRAGMENT, len(token) + 1)
+    }
+
+
+def _discard(index: dict[str, set[UUID]], key: str, user_id: UUID) -> None:
+    members = index.get(key)
+    if members is not None:
+        members.discard(user_id)
+        if not members:
+            del index[key]
+
+
+class ReverseMatchIndex:
+    """Inverted indexes over every subscriber's preferences.
+
+    Subscribers are added, replaced and removed in place with ``upsert``
+    and ``remove``.
+    """
+
+    def __init__(self, subscribers: Iterable[Subscriber] = ()) -> None:
+        self.subscribers: dict[UUID, Subscriber] = {}
+        self._order: dict[UUID, int] = {}
+        self._sequence = itertools.count()
+        self._title_index: dict[str, set[UUID]] = defaultdict(set)
+        self._fragment_index: dict[str, set[UUID]] = defaultdict(set)
+        self._excluded_companies: dict[str, set[UUID]] = defaultdict(set)
+        self._floors: list[tuple[int, UUID]] = []  # sorted (floor, user)
+
+        for subscriber in subscribers:
+            self.upsert(subscriber)
+
+    def __len__(self) -> int:
+        return len(self.subscribers)
+
+    def upsert(self, subscriber: Subscriber) -> None:
+        """Index ``subscriber``, replacing any previous entry for the user."""
+        user_id = subscriber.user_id
+        self.remove(user_id)
+        prefs = subscriber.preferences
+        tokens = _title_tokens(prefs)
+        if not tokens:
+            return  # nothing to match on, as for scout runs
+
+        self.subscribers[user_id] = subscriber
+        self._order[user_id] = next(self._sequence)
+        for token in tokens:
+            self._title_index[token].add(user_id)
+            for fragment in _fragments(token):
+                self._fragment_index[fragment].add(user_id)
+        for company in prefs.get("excluded_companies") or []:
+            if company:
+                self._excluded_companies[company.lower()].add(user_id)
+        if prefs.get("salary_minimum"):
+            bisect.insort(self._floors, (prefs["salary_minimum"], user_id))
+
+    def remove(self, user_id: UUID) -> None:
+        """Drop the user from every index (no-op if not indexed)."""
+        subscriber = self.subscribers.pop(user_id, None)
+        if subscriber is None:
+            return
+        del self._order[user_id]
+        prefs = subscriber.preferences
+        for token in _title_tokens(prefs):
+            _discard(self._title_index, token, user_id)
+            for fragment in _fragments(token):
+                _discard(self._fragment_index, fragment, user_id)
+        for company in prefs.get("excluded_companies") or []:
+            if company:
+                _discard(self._excluded_companies, company.lower(), user_id)
+        if prefs.get("salary_minimum"):
+            entry = (prefs["salary_minimum"], user_id)
+            pos = bisect.bisect_left(self._floors, entry)
+            if pos < len(self._floors) and self._floors[pos] == entry:
+                del self._floors[pos]
+
+    def candidates(self, job: Any) -> list[Subscriber]:
+        """Subscribers the job could match, after index-level deal-breakers."""
+        from app.services.job_features import job_features
+
+        features = job_features(job)
+        users: set[UUID] = set()
+        for token in features.title_tokens:
+            # Target-title words inside this word ("engineer" in "engineering")
+            for start in range(len(token)):
+                for end in range(start + 1, len(token) + 1):
+                    users.update(self._title_index.get(token[start:end], ()))
+            # This word inside a target-title word
+            users.update(self._fragment_index.get(token, ()))
+        if not users:
+            return []
+
+        if features.salary:
+            above = bisect.bisect_right(self._floors, (features.salary, _MAX_UUID))
+            users.difference_update(user_id for _, user_id in self._floors[above:])
+
+        for company, members in self._excluded_companies.items():
+            if company in features.company:
+                users -= members
+
+        return [
+            self.subscribers[user_id]
+            for user_id in sorted(users, key=self._order.__getitem__)
+            if not any(
+                industry.lower() in features.text
+                for industry in self.subscribers[user_id].preferences.get("excluded_industries") or []
+            )
+        ]
+
+
+def _subscriber(pref: Any, skills: Any, headline: Any) -> Subscriber:
+    return Subscriber(
+        user_id=pref.user_id,
+        preferences={
+            "target_titles": pref.target_titles or [],
+            "target_locations": pref.target_locations or [],
+            "work_arrangement": pref.work_arrangement,
+            "salary_minimum": pref.salary_minimum,
+            "salary_target": pref.salary_target,
+            "seniority_levels": pref.seniority_levels or [],
+            "min_company_size": pref.min_company_size,
+            "excluded_companies": pref.excluded_companies or [],
+            "excluded_industries": pref.excluded_industries or [],
+        },
+        profile={"skills": skills or [], "headline": headline},
+    )
+
+
+async def load_subscribers(session: Any) -> list[Subscriber]:
+    """Every user with target titles, with their scoring preferences (one query)."""
+    from sqlalchemy import func, select
+
+    from app.db.models import Profile, UserPreference
+
+    result = await session.execute(
+        select(UserPreference, Profile.skills, Profile.headline)
+        .outerjoin(Profile, Profile.user_id == UserPreference.user_id)
+        .where(
+            UserPreference.deleted_at.is_(None),
+            func.cardinality(UserPreference.target_titles) > 0,
+        )
+    )
+    return [_subscriber(*row) for row in result.all()]
+
+
+async def load_subscriber_changes(
+    session: Any, since: datetime
+) -> list[tuple[UUID, Optional[Subscriber]]]:
+    """``(user_id, subscriber)`` for preferences or profiles updated since
+    ``since``; the subscriber is None when the preferences were deleted."""
+    from sqlalchemy import or_, select
+
+    from app.db.models import Profile, UserPreference
+
+    result = await session.execute(
+        select(UserPreference, Profile.skills, Profile.headline)
+        .outerjoin(Profile, Profile.user_id == UserPreference.user_id)
+        .where(or_(UserPreference.updated_at >= since, Profile.updated_at >= since))
+    )
+    return [
+        (pref.user_id, None if pref.deleted_at else _subscriber(pref, *rest))
+        for pref, *rest in result.all()
+    ]
+
+
+_index_cache: Optional[tuple[ReverseMatchIndex, datetime, datetime]] = None
+
+
+async def subscriber_index(session: Any) -> ReverseMatchIndex:
+    """This process's ``ReverseMatchIndex``, brought up to date.
+
+    Built from every subscriber on first use and every
+    ``INDEX_REBUILD_SECONDS`` (which also drops users deleted outright);
+    otherwise only the rows updated since the previous call are re-read
+    and upserted or removed.
+    """
+    global _index_cache
+
+    now = datetime.now(timezone.utc)
+    rebuild_due = now - timedelta(seconds=INDEX_REBUILD_SECONDS)
+    if _index_cache is None or _index_cache[1] < rebuild_due:
+        index = ReverseMatchIndex(await load_subscribers(session))
+        _index_cache = (index, now, now)
+        return index
+
+    index, built_at, synced_at = _index_cache
+    for user_id, subscriber in await load_subscriber_changes(
+        session, synced_at - _SYNC_OVERLAP
+    ):
+        if subscriber is None:
+            index.remove(user_id)
+        else:
+            index.upsert(subscriber)
+    _index_cache = (index, built_at, now)
+    return index
+
+
+async def _load_adjusters(user_ids: Sequence[UUID], session: Any) -> dict[UUID, Any]:
+    """Learned-preference adjusters for many users in one query."""
+    from sqlalchemy import select
+
+    from app.db.models import LearnedPreference, LearnedPreferenceStatus
+    from app.services.preference_learning import PreferenceAdjuster
+
+    result = await session.execute(
+        select(LearnedPreference).where(
+            LearnedPreference.user_id.in_(user_ids),
+            LearnedPreference.status.in_([
+                LearnedPreferenceStatus.PENDING,
+                LearnedPreferenceStatus.ACKNOWLEDGED,
+            ]),
+            LearnedPreference.deleted_at.is_(None),
+        )
+    )
+    by_user: dict[UUID, list[Any]] = defaultdict(list)
+    for pref in result.scalars().all():
+        by_user[pref.user_id].append(pref)
+    return {user_id: PreferenceAdjuster(prefs) for user_id, prefs in by_user.items()}
+
+
+async def _writable_users(user_ids: Sequence[UUID], session: Any) -> set[UUID]:
+    """Users that still exist and do not have the emergency brake on.
+
+    Agents are braked by either their ``users.id`` or their Clerk ID,
+    depending on the caller, so both flags are checked.
+    """
+    from sqlalchemy import select
+
+    from app.agents.brake import paused_users
+    from app.db.models import User
+
+    result = await session.execute(
+        select(User.id, User.clerk_id).where(User.id.in_(user_ids))
+    )
+    users = {user_id: clerk_id for user_id, clerk_id in result.all()}
+    paused = await paused_users(
+        [*(str(user_id) for user_id in users), *filter(None, users.values())]
+    )
+    return {
+        user_id
+        for user_id, clerk_id in users.items()
+        if str(user_id) not in paused and clerk_id not in paused
+    }
+
+
+def match_jobs(
+    index: ReverseMatchIndex,
+    jobs: Iterable[Any],
+    skip_user_ids: Iterable[Any] = (),
+) -> list[tuple[Subscriber, Any, int, str]]:
+    """Heuristic ``(subscriber, job, score, rationale)`` for every candidate pair."""
+    from app.agents.core.job_scout import JobScoutAgent
+
+    scorer = JobScoutAgent()
+    skip = {str(u) for u in skip_user_ids}
+    pairs = []
+    for job in jobs:
+        for subscriber in index.candidates(job):
+            if str(subscriber.user_id) in skip:
+                continue
+            score, rationale = scorer._score_job(job, subscriber.preferences, subscriber.profile)
+            pairs.append((subscriber, job, score, rationale))
+    return pairs
+
+
+async def fan_out_jobs(
+    jobs: Sequence[Any],
+    session: Any,
+    skip_user_ids: Iterable[Any] = (),
+) -> dict[str, int]:
+    """Create matches for ``jobs`` for every interested user.
+
+    Existing ``(user, job)`` matches are left alone and users with the
+    emergency brake on get nothing. Commits, then invalidates each
+    affected user's cached match feed.
+
+    Returns:
+        ``{user_id: matches_created}`` for users that got matches.
+    """
+    from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+    from app.config import settings
+    from app.db.models import Match
+    from app.services.job_scoring import _derive_confidence, parse_rationale
+    from app.services.preference_learning import PreferenceAdjuster
+
+    if not jobs:
+        return {}
+    index = await subscriber_index(session)
+    pairs = match_jobs(index, jobs, skip_user_ids)
+    if not pairs:
+        return {}
+
+    writable = await _writable_users(
+        list({subscriber.user_id for subscriber, _, _, _ in pairs}), session
+    )
+    pairs = [pair for pair in pairs if pair[0].user_id in writable]
+    if not pairs:
+        return {}
+    adjusters = await _load_adjusters(list(writable), session)
+
+    rows = []
+    for subscriber, job, score, rationale in pairs:
+        adjuster = adjusters.get(subscriber.user_id) or PreferenceAdjuster()
+        score = adjuster.adjust(job, score)
+        if score < settings.MATCH_SCORE_THRESHOLD:
+            continue
+        parsed = parse_rationale(rationale)
+        parsed["confidence"] = _derive_confidence(score)
+        rows.append({
+            "id": uuid4(),
+            "user_id": subscriber.user_id,
+            "job_id": job.id,
+            "score": score,
+            "rationale": json.dumps(parsed),
+            "status": "new",
+        })
+
+    if not rows:
+        return {}
+    inserted = []
+    for start in range(0, len(rows), INSERT_BATCH_ROWS):
+        result = await session.execute(
+            pg_insert(Match)
+            .values(rows[start:start + INSERT_BATCH_ROWS])
+            .on_conflict_do_nothing(index_elements=["user_id", "job_id"])
+            .returning(Match.user_id)
+        )
+        inserted.extend(result.scalars().all())
+    await session.commit()
+
+    created: dict[str, int] = defaultdict(int)
+    for user_id in inserted:
+        created[str(user_id)] += 1
+
+    from app.services.match_feed_cache import bump_match_version
+
+    for user_id in created:
+        await bump_match_version(user_id)
+    logger.info(
+        "Fanned out %d jobs: %d matches for %d users (%d subscribers indexed)",
+        len(jobs), len(inserted), len(created), len(index),
+    )
+    return dict(created)
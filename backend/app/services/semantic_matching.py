@@ -0,0 +1,302 @@
+"""
+Embedding pre-ranking of scored jobs before LLM refinement.
+
+Embeds the user's target profile and every job that passed the heuristic
+pre-filter, ranks the jobs by cosine similarity to the profile, and
+returns the top-k for ``score_job_with_llm``. The remaining jobs keep
+their heuristic score, exactly as when LLM scoring fails, so LLM calls
+are spent only where the profile fits best.
+
+Embedders are pluggable:
+
+- ``OpenAIEmbedder``: provider embeddings (``text-embedding-3-small``),
+  batched, on one shared client. This is the semantic ranking.
+- ``HashingEmbedder`` (default, no API key needed): signed feature
+  hashing of word unigrams and bigrams. A lexical fallback -- it ranks by
+  shared terms, not meaning -- that needs no model download or network.
+
+Job vectors are stored in ``job_embeddings`` (pgvector), keyed by job id
+and model with a hash of the embedded text, so a job is embedded once
+until its title or keywords change. Ranking is a nearest-neighbour query
+against that table's per-model HNSW index. When the store cannot be used
+(no session, no pgvector), everything is embedded in memory and ranked by
+the exact ``VectorIndex``.
+
+Architecture: Called from ``JobScoutAgent.execute()`` between the heuristic
+pre-filter and LLM refinement. NumPy is optional at import time; without it
+the stage passes every job through.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import re
+from typing import Any, Protocol, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+# Dimensions of the hashing embedder.
+HASHING_DIM = 512
+
+# Texts per provider embeddings request.
+EMBEDDING_BATCH_SIZE = 256
+
+# Output dimensions of the supported provider models.
+_PROVIDER_DIMS = {"text-embedding-3-small": 1536}
+
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+
+
+class Embedder(Protocol):
+    """Anything that maps texts to an ``(n, dim)`` float array."""
+
+    name: str
+    dim: int
+
+    async def embed(self, texts: Sequence[str]) -> Any: ...
+
+
+def _normalize_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class HashingEmbedder:
+    """Lexical fallback embedder: signed hashing of unigrams and bigrams."""
+
+    def __init__(self, dim: int = HASHING_DIM) -> None:
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def _features(self, text: str) -> list[str]:
+        tokens = _TOKEN_RE.findall(text.lower())
+        return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+    async def embed(self, texts: Sequence[str]):
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                digest = int.from_bytes(
+                    hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little"
+                )
+                matrix[row, digest % self.dim] += 1.0 if digest >> 63 else -1.0
+        return _normalize_rows(matrix)
+
+
+class OpenAIEmbedder:
+    """Provider embeddings over one shared ``AsyncOpenAI`` client."""
+
+    def __init__(self, model: str = "text-embedding-3-small") -> None:
+        self.name = model
+        self.dim = _PROVIDER_DIMS[model]
+        self._client = None
+
+    async def embed(self, texts: Sequence[str]):
+        if self._client is None:
+            from openai import AsyncOpenAI
+
+            from app.config import settings
+
+            self._client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        rows: list[list[float]] = []
+        for start in range(0, len(texts), EMBEDDING_BATCH_SIZE):
+            response = await self._client.embeddings.create(
+                model=self.name,
+                input=[t or " " for t in texts[start:start + EMBEDDING_BATCH_SIZE]],
+            )
+            rows.extend(item.embedding for item in response.data)
+        return _normalize_rows(np.asarray(rows, dtype=np.float32))
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.close()
+
+
+def get_embedder() -> Embedder:
+    """The embedder configured by ``SEMANTIC_EMBEDDING_PROVIDER``."""
+    from app.config import settings
+
+    if settings.SEMANTIC_EMBEDDING_PROVIDER == "openai" and settings.OPENAI_API_KEY:
+        return OpenAIEmbedder()
+    return HashingEmbedder()
+
+
+class VectorIndex:
+    """Exact cosine-similarity index over L2-normalised vectors."""
+
+    def __init__(self, vectors) -> None:
+        self._vectors = _normalize_rows(np.asarray(vectors, dtype=np.float32))
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+    def search(self, query, k: int) -> list[tuple[int, float]]:
+        """``(row, similarity)`` of the ``k`` nearest rows, best first."""
+        if not len(self._vectors) or k <= 0:
+            return []
+        query = np.asarray(query, dtype=np.float32).reshape(-1)
+        norm = np.linalg.norm(query)
+        sims = self._vectors @ (query / norm if norm else query)
+        k = min(k, len(sims))
+        top = np.argpartition(-sims, k - 1)[:k]
+        # Stable on ties so equal similarities keep input order.
+        top = top[np.lexsort((top, -sims[top]))]
+        return [(int(i), float(sims[i])) for i in top]
+
+
+def profile_text(preferences: dict, profile: dict) -> str:
+    """What the user is looking for, as one text to embed."""
+    parts = [
+        *(preferences.get("target_titles") or []),
+        *(preferences.get("seniority_levels") or []),
+        profile.get("headline") or "",
+        *(profile.get("skills") or []),
+    ]
+    return " ".join(str(p) for p in parts if p)
+
+
+def job_text(job: Any) -> str:
+    """Title (weighted twice) plus the job's top description keywords."""
+    from app.services.job_features import job_features
+
+    features = job_features(job)
+    return " ".join([features.title, features.title, *features.keywords])
+
+
+def content_hash(text: str) -> str:
+    """Cache key for an embedded text."""
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+def _vector_literal(vector) -> str:
+    return "[" + ",".join(f"{x:.6g}" for x in vector) + "]"
+
+
+async def _rank_in_store(
+    session: Any,
+    embedder: Embedder,
+    query: str,
+    jobs: Sequence[Any],
+    top_k: int,
+) -> list[int]:
+    """Top-k job indexes from the ``job_embeddings`` HNSW index.
+
+    Only jobs with no stored vector for this model, or whose text hash
+    changed, are embedded (together with the profile, in one call) and
+    upserted. Runs in a savepoint so a missing table or extension leaves
+    the caller's transaction usable.
+    """
+    from sqlalchemy import bindparam, text
+
+    texts = {str(job.id): job_text(job) for job in jobs}
+    hashes = {job_id: content_hash(t) for job_id, t in texts.items()}
+    # The model and dimension are inlined so the planner can match the
+    # per-model partial index; both come from the embedder, not users.
+    model = embedder.name.replace("'", "''")
+    column = f"embedding::vector({int(embedder.dim)})"
+
+    async with session.begin_nested():
+        result = await session.execute(
+            text(
+                "SELECT job_id, content_hash FROM job_embeddings "
+                f"WHERE model = '{model}' AND job_id IN :ids"
+            ).bindparams(bindparam("ids", expanding=True)),
+            {"ids": list(texts)},
+        )
+        cached = {str(job_id): h for job_id, h in result.all()}
+        stale = [job_id for job_id in texts if cached.get(job_id) != hashes[job_id]]
+
+        vectors = await embedder.embed([query, *(texts[j] for j in stale)])
+        if stale:
+            await session.execute(
+                text(
+                    "INSERT INTO job_embeddings "
+                    "(job_id, model, content_hash, embedding) "
+                    f"VALUES (:job_id, '{model}', :hash, CAST(:vec AS vector)) "
+                    "ON CONFLICT (job_id, model) DO UPDATE SET "
+                    "content_hash = EXCLUDED.content_hash, "
+                    "embedding = EXCLUDED.embedding, updated_at = NOW()"
+                ),
+                [
+                    {"job_id": j, "hash": hashes[j], "vec": _vector_literal(v)}
+                    for j, v in zip(stale, vectors[1:])
+                ],
+            )
+
+        # Keep walking the HNSW graph until k rows pass the job filter
+        # (pgvector >= 0.8; a no-op setting on older versions).
+        await session.execute(
+            text("SELECT set_config('hnsw.iterative_scan', 'relaxed_order', true)")
+        )
+        result = await session.execute(
+            text(
+                "SELECT job_id FROM job_embeddings "
+                f"WHERE model = '{model}' AND job_id IN :ids "
+                f"ORDER BY {column} <=> CAST(:query AS vector({int(embedder.dim)})) "
+                "LIMIT :k"
+            ).bindparams(bindparam("ids", expanding=True)),
+            {"ids": list(texts), "query": _vector_literal(vectors[0]), "k": top_k},
+        )
+        ranked = [str(job_id) for job_id in result.scalars().all()]
+
+    position = {job_id: i for i, job_id in enumerate(texts)}
+    return [position[job_id] for job_id in ranked]
+
+
+async def _rank_in_memory(
+    embedder: Embedder, query: str, jobs: Sequence[Any], top_k: int
+) -> list[int]:
+    vectors = await embedder.embed([query, *(job_text(job) for job in jobs)])
+    return [i for i, _ in VectorIndex(vectors[1:]).search(vectors[0], top_k)]
+
+
+async def select_for_refinement(
+    jobs: Sequence[Any],
+    preferences: dict,
+    profile: dict,
+    top_k: int,
+    embedder: Embedder | None = None,
+    session: Any = None,
+) -> list[int]:
+    """Indexes of the ``top_k`` jobs most similar to the user's profile.
+
+    With a ``session`` and stored jobs, vectors are cached in and ranked
+    by ``job_embeddings``; otherwise (or if that fails) ranking happens in
+    memory. Every index is returned (in order) when there are no more
+    than ``top_k`` jobs, when ``top_k`` is not positive, when the profile
+    is empty, or when embedding fails -- i.e. the stage never drops a job
+    from LLM refinement unless it could actually rank it.
+    """
+    everything = list(range(len(jobs)))
+    query = profile_text(preferences, profile)
+    if np is None or not query or not 0 < top_k < len(jobs):
+        return everything
+
+    owned = embedder is None
+    embedder = embedder or get_embedder()
+    try:
+        hits = None
+        if session is not None and all(getattr(job, "id", None) for job in jobs):
+            try:
+                hits = await _rank_in_store(session, embedder, query, jobs, top_k)
+            except Exception as exc:
+                logger.warning(
+                    "Embedding store unavailable, ranking in memory: %s", exc
+                )
+        if hits is None:
+            hits = await _rank_in_memory(embedder, query, jobs, top_k)
+    except Exception as exc:
+        logger.warning("Semantic ranking failed, refining every job: %s", exc)
+        return everything
+    finally:
+        if owned and hasattr(embedder, "aclose"):
+            await embedder.aclose()
+    return sorted(hits)
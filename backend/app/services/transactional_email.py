@@ -21,13 +21,22 @@ Usage::
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_FROM = "JobPilot <noreply@jobpilot.ai>"
+
+# Resend's batch endpoint accepts at most 100 messages per request.
+EMAIL_BATCH_SIZE = 100
+
+# Batch requests in flight at once when dispatching many messages.
+EMAIL_BATCH_CONCURRENCY = 4
+
 # ---------------------------------------------------------------------------
 # Templates
 # ---------------------------------------------------------------------------
@@ -138,7 +147,7 @@ async def send_email(
     to: str,
     subject: str,
     html: str,
-    from_email: str = "JobPilot <noreply@jobpilot.ai>",
+    from_email: str = DEFAULT_FROM,
     reply_to: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
@@ -247,7 +256,7 @@ async def send_account_deletion_notice(
     )
 
 
-async def send_invitation_email(
+def build_invitation_email(
     to: str,
     admin_name: str,
     company_name: str,
@@ -256,19 +265,10 @@ async def send_invitation_email(
     recipient_first_name: Optional[str] = None,
     logo_url: Optional[str] = None,
 ) -> Dict[str, Any]:
-    """Send a branded employee invitation email.
+    """Render a branded employee invitation into Resend send params.
 
-    Args:
-        to: Invitee email address.
-        admin_name: Display name of the admin who sent the invite.
-        company_name: Organization name for branding.
-        accept_url: Full URL for the Accept action.
-        decline_url: Full URL for the Decline action.
-        recipient_first_name: Optional first name for personalisation.
-        logo_url: Optional company logo URL.
-
-    Returns:
-        Resend API response dict.
+    Used directly for batch dispatch (``send_email_batches``) and by
+    ``send_invitation_email`` for single sends.
     """
     recipient_name = f" {recipient_first_name}" if recipient_first_name else ""
     logo_html = (
@@ -286,11 +286,47 @@ async def send_invitation_email(
         accept_url=accept_url,
         decline_url=decline_url,
     )
-    return await send_email(
+    return {
+        "from": DEFAULT_FROM,
+        "to": [to],
+        "subject": f"You have been invited to join {company_name} on JobPilot",
+        "html": html,
+    }
+
+
+async def send_invitation_email(
+    to: str,
+    admin_name: str,
+    company_name: str,
+    accept_url: str,
+    decline_url: str,
+    recipient_first_name: Optional[str] = None,
+    logo_url: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Send a branded employee invitation email.
+
+    Args:
+        to: Invitee email address.
+        admin_name: Display name of the admin who sent the invite.
+        company_name: Organization name for branding.
+        accept_url: Full URL for the Accept action.
+        decline_url: Full URL for the Decline action.
+        recipient_first_name: Optional first name for personalisation.
+        logo_url: Optional company logo URL.
+
+    Returns:
+        Resend API response dict.
+    """
+    message = build_invitation_email(
         to=to,
-        subject=f"You have been invited to join {company_name} on JobPilot",
-        html=html,
+        admin_name=admin_name,
+        company_name=company_name,
+        accept_url=accept_url,
+        decline_url=decline_url,
+        recipient_first_name=recipient_first_name,
+        logo_url=logo_url,
     )
+    return await send_email(to=to, subject=message["subject"], html=message["html"])
 
 
 async def send_nudge_email(
@@ -320,3 +356,83 @@ async def send_nudge_email(
         subject="Your career tools are waiting -- JobPilot",
         html=html,
     )
+
+
+async def send_email_batch(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Send up to ``EMAIL_BATCH_SIZE`` messages in one Resend batch request.
+
+    Args:
+        messages: Resend send params (``from``, ``to``, ``subject``, ``html``).
+
+    Returns:
+        One response dict per message, in order.
+
+    Raises:
+        ValueError: If more than ``EMAIL_BATCH_SIZE`` messages are given.
+        Exception: On Resend API errors (the whole batch failed).
+    """
+    if len(messages) > EMAIL_BATCH_SIZE:
+        raise ValueError(
+            f"Batch of {len(messages)} exceeds the limit of {EMAIL_BATCH_SIZE} messages"
+        )
+    if not settings.RESEND_API_KEY:
+        logger.warning(
+            "RESEND_API_KEY not configured -- batch of %d emails suppressed", len(messages)
+        )
+        return [{"id": None, "suppressed": True} for _ in messages]
+
+    import resend
+
+    resend.api_key = settings.RESEND_API_KEY
+    # The SDK call is blocking; keep it off the event loop so batches overlap.
+    response = await asyncio.to_thread(resend.Batch.send, messages)
+    data = response.get("data") or []
+    logger.info("Email batch sent -- %d messages", len(data))
+    return list(data)
+
+
+async def send_email_batches(
+    messages: List[Dict[str, Any]],
+    batch_size: int = EMAIL_BATCH_SIZE,
+    concurrency: int = EMAIL_BATCH_CONCURRENCY,
+    on_progress: Optional[Callable[[int, int], Awaitable[None]]] = None,
+) -> Dict[str, Any]:
+    """Dispatch many messages as Resend batches, a few requests at a time.
+
+    A failed batch is recorded against each of its recipients and does not
+    stop the others.
+
+    Args:
+        messages: Resend send params, one per recipient.
+        batch_size: Messages per batch request (at most ``EMAIL_BATCH_SIZE``).
+        concurrency: Batch requests in flight at once.
+        on_progress: Awaited with ``(sent, failed)`` after each batch.
+
+    Returns:
+        Dict with ``sent`` count and ``failed`` list of ``{"email", "error"}``.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    sent = 0
+    failed: List[Dict[str, str]] = []
+
+    async def _send(chunk: List[Dict[str, Any]]) -> None:
+        nonlocal sent
+        async with semaphore:
+            try:
+                await send_email_batch(chunk)
+                sent += len(chunk)
+            except Exception as exc:
+                logger.error("Email batch of %d failed: %s", len(chunk), exc)
+                failed.extend(
+                    {"email": message["to"][0], "error": str(exc)} for message in chunk
+                )
+            if on_progress is not None:
+                await on_progress(sent, len(failed))
+
+    await asyncio.gather(
+        *(
+            _send(messages[i : i + batch_size])
+            for i in range(0, len(messages), batch_size)
+        )
+    )
+    return {"sent": sent, "failed": failed}
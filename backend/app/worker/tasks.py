@@ -25,7 +25,7 @@ from __future__ import annotations
 import asyncio
 import logging
 from datetime import datetime, timezone
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 from app.worker.celery_app import celery_app
 
@@ -463,6 +463,93 @@ def cleanup_expired_approvals() -> Dict[str, Any]:
     return _run_async(_execute())
 
 
+# ---------------------------------------------------------------------------
+# Preference learning (default queue)
+# ---------------------------------------------------------------------------
+
+
+@celery_app.task(
+    name="app.worker.tasks.learn_swipe_preferences",
+    queue="default",
+    max_retries=0,
+)
+def learn_swipe_preferences(user_id: str) -> Dict[str, Any]:
+    """Detect learned-preference patterns from a user's swipe events.
+
+    Queued (debounced) by ``schedule_pattern_detection`` after swipes,
+    so a burst of swipes triggers one detection pass rather than one
+    per swipe.
+    """
+    logger.info("learn_swipe_preferences started for user=%s", user_id)
+
+    async def _execute():
+        from uuid import UUID
+
+        from app.db.engine import AsyncSessionLocal
+        from app.services.preference_learning import (
+            clear_pattern_detection_pending,
+            detect_patterns,
+        )
+
+        # Clear first: swipes that land during this run schedule another.
+        await clear_pattern_detection_pending(user_id)
+
+        async with AsyncSessionLocal() as session:
+            new_prefs = await detect_patterns(UUID(user_id), session)
+            await session.commit()
+
+        return {"user_id": user_id, "new_patterns": len(new_prefs)}
+
+    return _run_async(_execute())
+
+
+# ---------------------------------------------------------------------------
+# Reverse matching (default queue)
+# ---------------------------------------------------------------------------
+
+
+@celery_app.task(
+    name="app.worker.tasks.fan_out_new_jobs",
+    queue="default",
+    max_retries=0,
+)
+def fan_out_new_jobs(job_ids: list, source_user_id: str | None = None) -> Dict[str, Any]:
+    """Match newly ingested jobs against every user's preferences.
+
+    Queued by ``JobScoutAgent`` for the jobs its run inserted; the user
+    whose scout fetched them is skipped (their run already scored them).
+    """
+    logger.info("fan_out_new_jobs started for %d jobs", len(job_ids))
+
+    async def _execute():
+        from uuid import UUID
+
+        from sqlalchemy import select
+
+        from app.db.engine import AsyncSessionLocal
+        from app.db.models import Job
+        from app.services.reverse_matching import fan_out_jobs
+
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(Job).where(Job.id.in_([UUID(j) for j in job_ids]))
+            )
+            jobs = result.scalars().all()
+            created = await fan_out_jobs(
+                jobs, session, skip_user_ids=[source_user_id] if source_user_id else []
+            )
+
+        summary = {
+            "jobs": len(jobs),
+            "users_matched": len(created),
+            "matches_created": sum(created.values()),
+        }
+        logger.info("fan_out_new_jobs completed: %s", summary)
+        return summary
+
+    return _run_async(_execute())
+
+
 # ---------------------------------------------------------------------------
 # Zombie task cleanup (default queue)
 # ---------------------------------------------------------------------------
@@ -577,6 +664,22 @@ celery_app.conf.beat_schedule = {
         "task": "app.worker.tasks.detect_at_risk_employees",
         "schedule": 24 * 60 * 60,  # Daily (in seconds)
     },
+    "rebuild-org-daily-metrics": {
+        "task": "app.worker.tasks.rebuild_org_daily_metrics",
+        "schedule": 24 * 60 * 60,  # Daily (in seconds)
+    },
+    "refresh-org-daily-metrics": {
+        "task": "app.worker.tasks.refresh_org_daily_metrics",
+        "schedule": 15 * 60,  # Every 15 minutes (in seconds)
+    },
+    "rebuild-ats-idf-table": {
+        "task": "app.worker.tasks.rebuild_ats_idf_table",
+        "schedule": 24 * 60 * 60,  # Daily (in seconds)
+    },
+    "backfill-job-features": {
+        "task": "app.worker.tasks.backfill_job_features",
+        "schedule": 24 * 60 * 60,  # Daily (in seconds)
+    },
 }
 
 
@@ -730,8 +833,11 @@ def health_check_task() -> Dict[str, str]:
 def detect_at_risk_employees(self) -> Dict[str, Any]:
     """Run daily at-risk employee detection for all organizations.
 
-    Iterates all organizations and evaluates member engagement status
-    using AtRiskDetectionService.update_engagement_statuses().
+    Evaluates every member of every organization in one set-based
+    statement, streamed in batches, via
+    AtRiskDetectionService.update_all_engagement_statuses(). If that
+    statement fails, falls back to one session per organization so a
+    single bad org does not block detection for the rest.
     """
     logger.info("detect_at_risk_employees started")
 
@@ -750,28 +856,34 @@ def detect_at_risk_employees(self) -> Dict[str, Any]:
         )
         try:
             service = AtRiskDetectionService()
-            results = []
-            errors = []
-
-            async with AsyncSessionLocal() as session:
-                orgs_result = await session.execute(select(Organization.id))
-                org_ids = [str(row[0]) for row in orgs_result.all()]
-
-            # Process each org in its own session to isolate failures
-            for org_id in org_ids:
-                try:
-                    async with AsyncSessionLocal() as session:
-                        result = await service.update_engagement_statuses(
-                            session=session,
-                            org_id=org_id,
+            errors: List[Dict[str, str]] = []
+
+            try:
+                async with AsyncSessionLocal() as session:
+                    results = await service.update_all_engagement_statuses(session)
+            except Exception as exc:
+                logger.warning(
+                    "Set-based at-risk detection failed, retrying per org: %s", exc
+                )
+                async with AsyncSessionLocal() as session:
+                    org_result = await session.execute(select(Organization.id))
+                    org_ids = [str(row[0]) for row in org_result.all()]
+
+                # Isolate each org so one failure doesn't block the rest
+                results = []
+                for org_id in org_ids:
+                    try:
+                        async with AsyncSessionLocal() as session:
+                            results.append(
+                                await service.update_engagement_statuses(
+                                    session=session, org_id=org_id
+                                )
+                            )
+                    except Exception as org_exc:
+                        logger.error(
+                            "At-risk detection failed for org %s: %s", org_id, org_exc
                         )
-                        results.append(result)
-                except Exception as org_exc:
-                    logger.warning(
-                        "detect_at_risk_employees: failed for org %s: %s",
-                        org_id, org_exc,
-                    )
-                    errors.append({"org_id": org_id, "error": str(org_exc)})
+                        errors.append({"org_id": org_id, "error": str(org_exc)})
 
             summary = {
                 "organizations_processed": len(results),
@@ -795,6 +907,125 @@ def detect_at_risk_employees(self) -> Dict[str, Any]:
         raise self.retry(exc=exc)
 
 
+@celery_app.task(
+    bind=True,
+    name="app.worker.tasks.rebuild_org_daily_metrics",
+    queue="default",
+    max_retries=2,
+    default_retry_delay=300,
+)
+def rebuild_org_daily_metrics(self) -> Dict[str, Any]:
+    """Nightly full rebuild of the org_daily_metrics rollup.
+
+    Also removes what the incremental refresh cannot see (members who
+    left, deleted applications).
+    """
+    logger.info("rebuild_org_daily_metrics started")
+
+    async def _execute():
+        from app.db.engine import AsyncSessionLocal
+        from app.services.enterprise.metrics_rollup import rebuild_org_daily_metrics
+
+        async with AsyncSessionLocal() as session:
+            buckets = await rebuild_org_daily_metrics(session)
+        return {"buckets": buckets}
+
+    try:
+        return _run_async(_execute())
+    except Exception as exc:
+        logger.exception("rebuild_org_daily_metrics failed")
+        raise self.retry(exc=exc)
+
+
+@celery_app.task(
+    name="app.worker.tasks.refresh_org_daily_metrics",
+    queue="default",
+    max_retries=0,
+)
+def refresh_org_daily_metrics() -> Dict[str, Any]:
+    """Recompute the org_daily_metrics buckets touched since the last run.
+
+    Looks back REFRESH_LOOKBACK (longer than the beat interval), so a
+    missed run is covered by the next one.
+    """
+
+    async def _execute():
+        from datetime import datetime, timezone
+
+        from app.db.engine import AsyncSessionLocal
+        from app.services.enterprise.metrics_rollup import (
+            REFRESH_LOOKBACK,
+            refresh_org_daily_metrics,
+        )
+
+        since = datetime.now(timezone.utc) - REFRESH_LOOKBACK
+        async with AsyncSessionLocal() as session:
+            buckets = await refresh_org_daily_metrics(session, since)
+        return {"since": since.isoformat(), "buckets": buckets}
+
+    return _run_async(_execute())
+
+
+@celery_app.task(
+    bind=True,
+    name="app.worker.tasks.rebuild_ats_idf_table",
+    queue="default",
+    max_retries=2,
+    default_retry_delay=300,
+)
+def rebuild_ats_idf_table(self) -> Dict[str, Any]:
+    """Nightly recount of term document frequencies over the jobs corpus.
+
+    The snapshot weights the keywords of the local ATS scorer; cached
+    document analyses keep the weights they were scored with.
+    """
+    logger.info("rebuild_ats_idf_table started")
+
+    async def _execute():
+        from app.db.engine import AsyncSessionLocal
+        from app.services.ats_scoring import build_idf_table
+
+        async with AsyncSessionLocal() as session:
+            table = await build_idf_table(session)
+        return {"corpus_size": table.corpus_size, "terms": len(table.doc_freq)}
+
+    try:
+        return _run_async(_execute())
+    except Exception as exc:
+        logger.exception("rebuild_ats_idf_table failed")
+        raise self.retry(exc=exc)
+
+
+@celery_app.task(
+    bind=True,
+    name="app.worker.tasks.backfill_job_features",
+    queue="default",
+    max_retries=2,
+    default_retry_delay=300,
+)
+def backfill_job_features(self) -> Dict[str, Any]:
+    """Store scoring features on jobs that have none or an old version.
+
+    Fills the rows that predate ``jobs.features`` and re-derives every job
+    after a FEATURES_VERSION bump; a no-op once all rows are current.
+    """
+    logger.info("backfill_job_features started")
+
+    async def _execute():
+        from app.db.engine import AsyncSessionLocal
+        from app.services.job_features import backfill_job_features as backfill
+
+        async with AsyncSessionLocal() as session:
+            updated = await backfill(session)
+        return {"updated": updated}
+
+    try:
+        return _run_async(_execute())
+    except Exception as exc:
+        logger.exception("backfill_job_features failed")
+        raise self.retry(exc=exc)
+
+
 @celery_app.task(
     bind=True,
     name="app.worker.tasks.bulk_onboard_employees",
@@ -802,24 +1033,45 @@ def detect_at_risk_employees(self) -> Dict[str, Any]:
     max_retries=2,
     default_retry_delay=120,
 )
-def bulk_onboard_employees(self, org_id: str, valid_rows: list) -> Dict[str, Any]:
+def bulk_onboard_employees(
+    self,
+    org_id: str,
+    valid_rows: list,
+    invited_by: str | None = None,
+    org_name: str | None = None,
+    upload_id: str | None = None,
+) -> Dict[str, Any]:
     """Process bulk employee onboarding from a validated CSV upload.
 
-    Creates invitation records for each valid employee row. Delegates
-    to InvitationService when available (story 10-3); until then,
-    logs each row as a placeholder.
+    Writes every invitation in one transaction, then sends the invitation
+    emails as concurrent Resend batches. Progress is published to the
+    inviting admin's ``agent:status`` channel as
+    ``system.onboarding.progress`` events, followed by
+    ``system.onboarding.completed`` -- once per upload when the upload was
+    split into chunks under ``upload_id``.
 
     Args:
         org_id: Organization UUID string.
         valid_rows: List of validated row dicts with at least ``email``.
+        invited_by: Admin user UUID string; defaults to the org's first admin.
+        org_name: Organization name for the emails; loaded when omitted.
+        upload_id: Upload this chunk belongs to (see
+            ``bulk_onboarding.track_upload_chunk``).
 
     Returns:
         Dict with processing summary.
     """
 
     async def _execute():
+        import redis.asyncio as aioredis
+
+        from app.config import settings
         from app.db.engine import AsyncSessionLocal
-        from app.services.enterprise.invitation import InvitationService
+        from app.services.enterprise.bulk_onboarding import (
+            finish_upload_chunk,
+            onboard_employees,
+            publish_onboarding_event,
+        )
 
         logger.info(
             "bulk_onboard_employees: processing %d rows for org %s",
@@ -827,38 +1079,60 @@ def bulk_onboard_employees(self, org_id: str, valid_rows: list) -> Dict[str, Any
             org_id,
         )
 
-        service = InvitationService()
-        processed = 0
-        errors = []
+        r = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
 
-        async with AsyncSessionLocal() as session:
-            for row in valid_rows:
-                email = row.get("email", "")
-                try:
-                    async with session.begin():
-                        await service.create_invitation(
-                            session=session,
-                            org_id=org_id,
-                            email=email,
-                            invited_by=row.get("invited_by", org_id),
-                            first_name=row.get("first_name"),
-                            last_name=row.get("last_name"),
-                        )
-                    processed += 1
-                except Exception as exc:
-                    logger.warning(
-                        "bulk_onboard_employees: failed for %s: %s", email, exc
+        async def _on_progress(stage: str, data: dict) -> None:
+            if invited_by:
+                await publish_onboarding_event(
+                    r,
+                    invited_by,
+                    "system.onboarding.progress",
+                    "Onboarding employees",
+                    {"org_id": org_id, "stage": stage, **data},
+                )
+
+        try:
+            try:
+                async with AsyncSessionLocal() as session:
+                    outcome = await onboard_employees(
+                        session,
+                        org_id,
+                        valid_rows,
+                        invited_by=invited_by,
+                        org_name=org_name,
+                        on_progress=_on_progress,
                     )
-                    errors.append({"email": email, "error": str(exc)})
-
-        return {
-            "status": "completed",
-            "org_id": org_id,
-            "processed": processed,
-            "failed": len(errors),
-            "total": len(valid_rows),
-            "errors": errors,
-        }
+            except Exception:
+                if upload_id and invited_by and self.request.retries >= self.max_retries:
+                    # Last attempt: count the chunk as failed so the upload completes
+                    await finish_upload_chunk(
+                        r, upload_id, invited_by, org_id,
+                        {"failed": len(valid_rows), "total": len(valid_rows)},
+                    )
+                raise
+
+            summary = {
+                "status": "completed",
+                "org_id": org_id,
+                "processed": outcome["invited"],
+                "emails_sent": outcome["emails_sent"],
+                "failed": len(outcome["errors"]),
+                "total": len(valid_rows),
+                "errors": outcome["errors"],
+            }
+            if invited_by and upload_id:
+                await finish_upload_chunk(r, upload_id, invited_by, org_id, summary)
+            elif invited_by:
+                await publish_onboarding_event(
+                    r,
+                    invited_by,
+                    "system.onboarding.completed",
+                    f"{outcome['invited']} employees invited",
+                    {k: v for k, v in summary.items() if k != "errors"},
+                )
+            return summary
+        finally:
+            await r.aclose()
 
     try:
         return _run_async(_execute())
@@ -0,0 +1,102 @@
+"""
+Shared helpers for the backend micro-benchmarks in ``scripts/bench``.
+
+Benchmarks are run by hand from the ``backend`` directory, e.g.::
+
+    python -m scripts.bench.briefing_gather --iterations 200
+
+Database benchmarks expect ``DATABASE_URL`` to point at a migrated
+PostgreSQL instance (never production). They seed throwaway rows under a
+fresh user and delete them on exit.
+"""
+
+from __future__ import annotations
+
+import math
+import statistics
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Return the ``pct`` percentile (0-100) of ``samples`` (nearest-rank)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+@dataclass
+class Timings:
+    """Collects wall-clock samples in milliseconds."""
+
+    samples: List[float] = field(default_factory=list)
+
+    @contextmanager
+    def measure(self) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.samples.append((time.perf_counter() - start) * 1000)
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "n": len(self.samples),
+            "p50_ms": round(percentile(self.samples, 50), 2),
+            "p95_ms": round(percentile(self.samples, 95), 2),
+            "mean_ms": round(statistics.fmean(self.samples), 2) if self.samples else 0.0,
+        }
+
+
+class PoolHoldTracker:
+    """Track connection checkout hold time and peak concurrency on an engine.
+
+    Attaches to SQLAlchemy pool ``checkout``/``checkin`` events of the
+    engine's sync core so it works for async engines too.
+    """
+
+    def __init__(self, engine) -> None:
+        from sqlalchemy import event
+
+        self._pool = engine.sync_engine.pool
+        self._started: Dict[int, float] = {}
+        self.holds_ms: List[float] = []
+        self.checked_out = 0
+        self.peak_checked_out = 0
+        event.listen(self._pool, "checkout", self._on_checkout)
+        event.listen(self._pool, "checkin", self._on_checkin)
+
+    def _on_checkout(self, dbapi_conn, record, proxy) -> None:
+        self._started[id(record)] = time.perf_counter()
+        self.checked_out += 1
+        self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+
+    def _on_checkin(self, dbapi_conn, record) -> None:
+        started = self._started.pop(id(record), None)
+        if started is not None:
+            self.holds_ms.append((time.perf_counter() - started) * 1000)
+            self.checked_out -= 1
+
+    def reset(self) -> None:
+        self.holds_ms.clear()
+        self.peak_checked_out = self.checked_out
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "checkouts": len(self.holds_ms),
+            "hold_total_ms": round(sum(self.holds_ms), 2),
+            "hold_p95_ms": round(percentile(self.holds_ms, 95), 2),
+            "peak_connections": self.peak_checked_out,
+        }
+
+
+def print_table(title: str, rows: Dict[str, Dict[str, float]]) -> None:
+    """Print benchmark results as a small aligned table."""
+    print(f"\n=== {title} ===")
+    for name, stats in rows.items():
+        cells = "  ".join(f"{k}={v}" for k, v in stats.items())
+        print(f"{name:<24} {cells}")
@@ -0,0 +1,193 @@
+"""
+Benchmark: daily at-risk detection, per-org IN-list queries vs one set-based pass.
+
+Seeds ``--orgs`` organizations (default 100) with ``--members`` members each
+(default 10k), half of them with a few applications at random ages, and
+randomised ``users.updated_at``. Then times the legacy daily job -- per
+organization, a members query followed by four ``IN (...)`` queries over
+the full member list and the set logic in Python -- against
+``AtRiskDetectionService.update_all_engagement_statuses`` (one CTE /
+LEFT JOIN statement over every org, streamed in batches). Per-org counts
+are checked for equality first.
+
+Seeding 1M members takes a while; use ``--orgs``/``--members`` for a
+quicker run.
+
+Usage (from ``backend/``)::
+
+    DATABASE_URL=postgresql+asyncpg://... python -m scripts.bench.at_risk_detection
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from scripts.bench._common import Timings, print_table
+
+_SEED_BATCH = 5000
+
+
+async def _legacy_counts(session, org_ids) -> dict:
+    """The pre-set-based strategy: five queries per org, IN-lists of members."""
+    from sqlalchemy import select
+
+    from app.db.models import Application, OrganizationMember, User
+    from app.services.enterprise.at_risk import (
+        APPLICATION_INACTIVE_DAYS,
+        LOGIN_INACTIVE_DAYS,
+        PIPELINE_STALLED_DAYS,
+    )
+
+    now = datetime.now(timezone.utc)
+    counts = {}
+    for org_id in org_ids:
+        members = [
+            row[0] for row in (await session.execute(
+                select(OrganizationMember.user_id).where(OrganizationMember.org_id == org_id)
+            )).all()
+        ]
+        if not members:
+            counts[str(org_id)] = (0, 0)
+            continue
+        at_risk = {
+            row[0] for row in (await session.execute(
+                select(User.id).where(
+                    User.id.in_(members),
+                    User.updated_at < now - timedelta(days=LOGIN_INACTIVE_DAYS),
+                )
+            )).all()
+        }
+        recent_apps = {
+            row[0] for row in (await session.execute(
+                select(Application.user_id).where(
+                    Application.user_id.in_(members),
+                    Application.applied_at >= now - timedelta(days=APPLICATION_INACTIVE_DAYS),
+                ).distinct()
+            )).all()
+        }
+        at_risk.update(uid for uid in members if uid not in recent_apps)
+        recent_pipeline = {
+            row[0] for row in (await session.execute(
+                select(Application.user_id).where(
+                    Application.user_id.in_(members),
+                    Application.updated_at >= now - timedelta(days=PIPELINE_STALLED_DAYS),
+                ).distinct()
+            )).all()
+        }
+        with_apps = {
+            row[0] for row in (await session.execute(
+                select(Application.user_id).where(Application.user_id.in_(members)).distinct()
+            )).all()
+        }
+        at_risk.update(with_apps - recent_pipeline)
+        counts[str(org_id)] = (len(members), len(at_risk))
+    return counts
+
+
+async def _seed(tag: str, n_orgs: int, n_members: int) -> list:
+    from sqlalchemy import insert
+
+    from app.db.engine import AsyncSessionLocal
+    from app.db.models import Application, Job, Organization, OrganizationMember, User
+
+    rng = random.Random(13)
+    now = datetime.now(timezone.utc)
+    org_ids = [uuid4() for _ in range(n_orgs)]
+    job_id = uuid4()
+    async with AsyncSessionLocal() as session:
+        session.add(Job(id=job_id, source="bench", title="Engineer", company=tag))
+        await session.execute(
+            insert(Organization), [{"id": o, "name": f"{tag}-{i}"} for i, o in enumerate(org_ids)]
+        )
+        for org_id in org_ids:
+            for start in range(0, n_members, _SEED_BATCH):
+                users, members, apps = [], [], []
+                for _ in range(min(_SEED_BATCH, n_members - start)):
+                    user_id = uuid4()
+                    users.append({
+                        "id": user_id,
+                        "email": f"{user_id}@bench.example.com",
+                        "clerk_id": f"{tag}_{user_id}",
+                        "updated_at": now - timedelta(days=rng.randint(0, 40)),
+                    })
+                    members.append({"org_id": org_id, "user_id": user_id})
+                    if rng.random() < 0.5:
+                        for _ in range(rng.randint(1, 4)):
+                            applied = now - timedelta(days=rng.randint(0, 90))
+                            apps.append({
+                                "user_id": user_id,
+                                "job_id": job_id,
+                                "applied_at": applied,
+                                "updated_at": applied + timedelta(days=rng.randint(0, 30)),
+                            })
+                await session.execute(insert(User), users)
+                await session.execute(insert(OrganizationMember), members)
+                if apps:
+                    await session.execute(insert(Application), apps)
+        await session.commit()
+    return org_ids
+
+
+async def _cleanup(tag: str, org_ids) -> None:
+    from sqlalchemy import delete
+
+    from app.db.engine import AsyncSessionLocal
+    from app.db.models import Job, Organization, User
+
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(User).where(User.clerk_id.like(f"{tag}_%")))
+        await session.execute(delete(Organization).where(Organization.id.in_(org_ids)))
+        await session.execute(delete(Job).where(Job.source == "bench", Job.company == tag))
+        await session.commit()
+
+
+async def main(n_orgs: int, n_members: int, batch_size: int, repeats: int) -> None:
+    from app.db.engine import AsyncSessionLocal, engine
+    from app.services.enterprise.at_risk import AtRiskDetectionService
+
+    tag = f"bench_at_risk_{uuid4().hex[:8]}"
+    org_ids = await _seed(tag, n_orgs, n_members)
+    service = AtRiskDetectionService()
+    legacy_t, set_t = Timings(), Timings()
+    try:
+        async with AsyncSessionLocal() as session:
+            legacy = await _legacy_counts(session, org_ids)
+            current = {
+                r["org_id"]: (r["total_members"], r["at_risk_count"])
+                for r in await service.update_all_engagement_statuses(session, batch_size)
+            }
+        if any(current.get(org_id) != counts for org_id, counts in legacy.items()):
+            raise SystemExit("set-based and legacy at-risk counts differ")
+
+        for _ in range(repeats):
+            async with AsyncSessionLocal() as session:
+                with legacy_t.measure():
+                    await _legacy_counts(session, org_ids)
+            async with AsyncSessionLocal() as session:
+                with set_t.measure():
+                    await service.update_all_engagement_statuses(session, batch_size)
+
+        print_table(
+            f"at-risk detection ({n_orgs} orgs x {n_members} members, {repeats} runs)",
+            {
+                "per-org IN-list queries": legacy_t.summary(),
+                f"set-based, streamed ({batch_size}/batch)": set_t.summary(),
+            },
+        )
+    finally:
+        await _cleanup(tag, org_ids)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--orgs", type=int, default=100)
+    parser.add_argument("--members", type=int, default=10_000)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.orgs, args.members, args.batch_size, args.repeats))
@@ -0,0 +1,109 @@
+"""
+Benchmark: local ATS analysis, IDF table build and per-document scoring time.
+
+Generates a synthetic corpus of ``--jobs`` postings (default 5000) drawn
+from a shared boilerplate vocabulary plus a few role-specific skills
+each, then measures:
+
+- IDF build: ``count_document_frequencies`` over the corpus (the CPU part
+  of the nightly ``build_idf_table``; the DB stream is not included);
+- per document: ``analyze_resume`` (keyword extraction plus scoring) for
+  ``--docs`` tailored resumes (default 500) against random postings;
+- bulk: the same documents scored with keywords extracted once per job,
+  as ``analyze_user_documents`` does for a user's versions of one job.
+
+Usage (from ``backend/``)::
+
+    python -m scripts.bench.ats_scoring --jobs 5000 --docs 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+
+from scripts.bench._common import Timings, print_table
+
+_BOILERPLATE = (
+    "we are looking for a motivated engineer to join our growing team you will "
+    "collaborate with product and design to deliver high quality software the "
+    "ideal candidate has strong communication skills and experience working in "
+    "a fast paced environment we offer competitive salary and benefits"
+).split()
+_SKILLS = [
+    "python", "fastapi", "django", "postgresql", "kafka", "kubernetes", "docker",
+    "terraform", "aws", "gcp", "react", "typescript", "node.js", "graphql", "redis",
+    "spark", "airflow", "ci/cd", "rust", "go", "java", "spring", "c++", "pytorch",
+]
+_PHRASES = ["distributed systems", "machine learning", "data pipelines", "event sourcing"]
+
+
+def _posting(rng: random.Random) -> tuple[str, str]:
+    skills = rng.sample(_SKILLS, 6)
+    words = rng.choices(_BOILERPLATE, k=180) + skills * 3 + rng.sample(_PHRASES, 2) * 2
+    rng.shuffle(words)
+    return f"{skills[0].title()} Engineer", " ".join(words)
+
+
+def _resume(rng: random.Random) -> dict:
+    return {
+        "sections": [
+            {"tailored_content": f"Senior engineer skilled in {', '.join(rng.sample(_SKILLS, 8))}"},
+            {"tailored_content": " ".join(rng.choices(_BOILERPLATE + _SKILLS, k=250))},
+        ]
+    }
+
+
+def main(n_jobs: int, n_docs: int, seed: int) -> None:
+    from app.services.ats_scoring import (
+        MIN_DOC_FREQ,
+        IdfTable,
+        analyze_resume,
+        count_document_frequencies,
+        extract_keywords,
+        resume_text,
+        score_resume,
+    )
+
+    rng = random.Random(seed)
+    corpus = [_posting(rng) for _ in range(n_jobs)]
+
+    build = Timings()
+    with build.measure():
+        corpus_size, doc_freq = count_document_frequencies(f"{t}\n{d}" for t, d in corpus)
+    idf = IdfTable(corpus_size, {t: n for t, n in doc_freq.items() if n >= MIN_DOC_FREQ})
+
+    targets = [rng.randrange(n_jobs) for _ in range(n_docs)]
+    resumes = [_resume(rng) for _ in range(n_docs)]
+
+    per_doc = Timings()
+    for job_index, resume in zip(targets, resumes):
+        title, description = corpus[job_index]
+        with per_doc.measure():
+            analyze_resume(title, description, resume, idf)
+
+    bulk = Timings()
+    with bulk.measure():
+        keywords_by_job: dict[int, list] = {}
+        for job_index, resume in zip(targets, resumes):
+            if job_index not in keywords_by_job:
+                keywords_by_job[job_index] = extract_keywords(*corpus[job_index], idf)
+            score_resume(resume_text(resume), keywords_by_job[job_index])
+
+    print_table(
+        f"ATS analysis ({n_jobs} jobs, {len(idf.doc_freq)} IDF terms, {n_docs} documents)",
+        {
+            "IDF build (CPU)": build.summary(),
+            "analyze_resume per document": per_doc.summary(),
+            f"bulk, {n_docs} documents": bulk.summary(),
+        },
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--jobs", type=int, default=5000)
+    parser.add_argument("--docs", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    main(args.jobs, args.docs, args.seed)
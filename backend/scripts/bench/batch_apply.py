@@ -0,0 +1,149 @@
+"""
+Benchmark: bulk approval with cover letters, per item vs the batch pipeline.
+
+Approves ``--items`` pending queue items (default 30), each for a
+different job with no cover letter yet, two ways:
+
+- per item: ``CoverLetterAgent.execute`` then ``approve_item`` for each
+  item in turn (profile, job, version and insert queries, then the
+  approval select/update, each with its own commit);
+- pipeline: ``approve_batch`` (item and job prefetch queries, letters
+  generated ``COVER_LETTER_CONCURRENCY`` at a time after a brake check
+  each, one write transaction).
+
+The database is a fake session whose statements and commits each wait
+``--db-ms`` (default 2), as does the Redis brake check; the LLM call
+waits ``--llm-ms`` (default 1500) and apply dispatch is a no-op, so this
+measures round trips and concurrency rather than PostgreSQL or the
+model.
+
+Usage (from ``backend/``)::
+
+    python -m scripts.bench.batch_apply --items 30 --llm-ms 1500
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+from scripts.bench._common import Timings, print_table
+
+_PROFILE = {"skills": ["Python", "FastAPI"], "headline": "Engineer", "experience": [], "education": []}
+
+
+class _FakeSession:
+    """Async session stand-in: every statement and commit is one round trip."""
+
+    def __init__(self, rows, delay_s: float, stats: dict):
+        self._rows = rows
+        self._delay_s = delay_s
+        self._stats = stats
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def _round_trip(self) -> None:
+        self._stats["round_trips"] += 1
+        await asyncio.sleep(self._delay_s)
+
+    async def execute(self, stmt, params=None):
+        await self._round_trip()
+        result = MagicMock()
+        result.mappings.return_value.all.return_value = self._rows
+        result.mappings.return_value.first.return_value = self._rows[0]
+        result.scalar.return_value = 1
+        if isinstance(params, dict):
+            result.scalars.return_value.all.return_value = params.get("ids", [])
+        return result
+
+    async def commit(self):
+        await self._round_trip()
+
+
+def _rows(n_items: int) -> list[dict]:
+    rows = []
+    for _ in range(n_items):
+        job_id = uuid4()
+        rows.append({
+            "id": uuid4(), "status": "pending", "payload": {"job_id": str(job_id)},
+            "user_pk": uuid4(), "job_id": job_id, "title": "Backend Engineer",
+            "company": "BigTech", "description": "Python " * 200, "location": "Remote",
+            "salary_min": None, "salary_max": None, "employment_type": "full_time",
+            "remote": True, "cover_letter_id": None, "cover_letter_version": 0,
+            **_PROFILE,
+        })
+    return rows
+
+
+async def main(n_items: int, db_ms: float, llm_ms: float) -> None:
+    from app.agents.pro.cover_letter_agent import CoverLetterAgent, CoverLetterContent
+    from app.api.v1.applications import approve_item
+    from app.services.batch_apply import COVER_LETTER_CONCURRENCY, approve_batch
+
+    letter = CoverLetterContent(
+        opening="Hello", body_paragraphs=["Body"], closing="Thanks",
+        word_count=300, personalization_sources=[],
+    )
+
+    async def _llm(self, profile, job):
+        await asyncio.sleep(llm_ms / 1000)
+        return letter
+
+    rows = _rows(n_items)
+    results = {}
+    for name in ("per item", "pipeline"):
+        stats = {"round_trips": 0}
+
+        async def _round_trip(result, stats=stats):
+            await asyncio.sleep(db_ms / 1000)
+            stats["round_trips"] += 1
+            return result
+
+        async def _context(user_id, _round_trip=_round_trip):
+            return await _round_trip({"profile": _PROFILE})
+
+        async def _brake(user_id, _round_trip=_round_trip):
+            return await _round_trip(False)
+
+        timings = Timings()
+        with (
+            patch(
+                "app.db.engine.AsyncSessionLocal",
+                side_effect=lambda stats=stats: _FakeSession(rows, db_ms / 1000, stats),
+            ),
+            patch.object(CoverLetterAgent, "_generate_cover_letter", _llm),
+            patch("app.agents.orchestrator.get_user_context", _context),
+            patch("app.agents.brake.check_brake", _brake),
+            patch("app.agents.orchestrator.dispatch_task", AsyncMock()),
+            timings.measure(),
+        ):
+            if name == "per item":
+                for row in rows:
+                    await CoverLetterAgent().execute("bench_user", {"job_id": str(row["job_id"])})
+                    await approve_item(item_id=str(row["id"]), user_id="bench_user")
+            else:
+                ids = [str(row["id"]) for row in rows]
+                async for _ in approve_batch("bench_user", ids):
+                    pass
+        results[name] = {**timings.summary(), **stats}
+
+    print_table(
+        f"bulk approve ({n_items} items, {COVER_LETTER_CONCURRENCY} concurrent letters, "
+        f"{db_ms:g} ms/statement, {llm_ms:g} ms/letter)",
+        results,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=30)
+    parser.add_argument("--db-ms", type=float, default=2.0)
+    parser.add_argument("--llm-ms", type=float, default=1500.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.items, args.db_ms, args.llm_ms))
@@ -0,0 +1,157 @@
+"""
+Benchmark: briefing data gathering, five-session fan-out vs single statement.
+
+Seeds one user with realistic 24h activity, then runs ``--iterations``
+gathers at ``--concurrency`` (simulating the scheduler's briefing burst)
+with both strategies and reports p50/p95 latency, total connection-hold
+time and peak checked-out connections.
+
+Usage (from ``backend/``)::
+
+    DATABASE_URL=postgresql+asyncpg://... python -m scripts.bench.briefing_gather
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from scripts.bench._common import PoolHoldTracker, Timings, print_table
+
+
+async def _legacy_fanout(user_id: str) -> None:
+    """The pre-consolidation strategy: one session per section, in parallel."""
+    from sqlalchemy import func, select
+
+    from app.db.engine import AsyncSessionLocal
+    from app.db.models import AgentActivity, AgentOutput, ApprovalQueueItem
+
+    since = datetime.now(timezone.utc) - timedelta(hours=24)
+    statements = [
+        select(AgentOutput).where(
+            AgentOutput.user_id == user_id,
+            AgentOutput.agent_type == "job_scout",
+            AgentOutput.created_at >= since,
+        ).order_by(AgentOutput.created_at.desc()).limit(20),
+        select(AgentOutput).where(
+            AgentOutput.user_id == user_id,
+            AgentOutput.agent_type.in_(["apply", "pipeline"]),
+            AgentOutput.created_at >= since,
+        ).order_by(AgentOutput.created_at.desc()).limit(20),
+        select(func.count(ApprovalQueueItem.id)).where(
+            ApprovalQueueItem.user_id == user_id,
+            ApprovalQueueItem.status == "pending",
+        ),
+        select(AgentActivity).where(
+            AgentActivity.user_id == user_id,
+            AgentActivity.severity == "warning",
+            AgentActivity.created_at >= since,
+        ).order_by(AgentActivity.created_at.desc()).limit(10),
+        select(ApprovalQueueItem).where(
+            ApprovalQueueItem.user_id == user_id,
+            ApprovalQueueItem.status == "pending",
+        ).order_by(ApprovalQueueItem.created_at.desc()).limit(10),
+    ]
+
+    async def _run(stmt):
+        async with AsyncSessionLocal() as session:
+            return (await session.execute(stmt)).all()
+
+    await asyncio.gather(*(_run(stmt) for stmt in statements))
+
+
+async def _seed(user_id) -> None:
+    from app.db.engine import AsyncSessionLocal
+    from app.db.models import AgentActivity, AgentOutput, ApprovalQueueItem, User
+
+    now = datetime.now(timezone.utc)
+    async with AsyncSessionLocal() as session:
+        session.add(User(id=user_id, email=f"bench-{user_id}@example.com", clerk_id=f"bench_{user_id}"))
+        await session.flush()
+        for i in range(200):
+            session.add(AgentOutput(
+                user_id=user_id,
+                agent_type=["job_scout", "apply", "pipeline"][i % 3],
+                output={"action": "job_match", "rationale": "seed", "i": i},
+                created_at=now - timedelta(minutes=i * 10),
+            ))
+        for i in range(40):
+            session.add(ApprovalQueueItem(
+                user_id=user_id,
+                agent_type="apply",
+                action_name="submit_application",
+                payload={"job_title": f"Engineer {i}", "company": "BenchCo"},
+                status="pending",
+                expires_at=now + timedelta(days=2),
+            ))
+        for i in range(50):
+            session.add(AgentActivity(
+                user_id=user_id,
+                event_type="agent.warning",
+                title=f"Warning {i}",
+                severity="warning",
+                data={"i": i},
+                created_at=now - timedelta(minutes=i * 20),
+            ))
+        await session.commit()
+
+
+async def _cleanup(user_id) -> None:
+    from sqlalchemy import delete
+
+    from app.db.engine import AsyncSessionLocal
+    from app.db.models import User
+
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(User).where(User.id == user_id))
+        await session.commit()
+
+
+async def _bench(strategy, user_id: str, iterations: int, concurrency: int, tracker) -> dict:
+    timings = Timings()
+    sem = asyncio.Semaphore(concurrency)
+
+    async def _one():
+        async with sem:
+            with timings.measure():
+                await strategy(user_id)
+
+    tracker.reset()
+    await asyncio.gather(*(_one() for _ in range(iterations)))
+    return {**timings.summary(), **tracker.summary()}
+
+
+async def main(iterations: int, concurrency: int) -> None:
+    from app.agents.briefing.generator import _gather_briefing_data
+    from app.db.engine import engine
+
+    user_id = uuid4()
+    tracker = PoolHoldTracker(engine)
+    await _seed(user_id)
+    try:
+        # Warm the pool so first-connect cost does not skew either side.
+        await _gather_briefing_data(str(user_id))
+        results = {
+            "five-session fan-out": await _bench(
+                _legacy_fanout, str(user_id), iterations, concurrency, tracker
+            ),
+            "single statement": await _bench(
+                _gather_briefing_data, str(user_id), iterations, concurrency, tracker
+            ),
+        }
+        print_table(
+            f"briefing gather ({iterations} runs, concurrency={concurrency})", results
+        )
+    finally:
+        await _cleanup(user_id)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations, args.concurrency))
@@ -0,0 +1,213 @@
+"""
+Benchmark: bulk CSV onboarding, per-row invitations and serial emails vs set-based and batched.
+
+Seeds one organization with an admin and ``--existing`` users already in
+other orgs, then times the phases of a ``--rows``-row upload (default
+1000, the CSV ``MAX_BATCH_SIZE``):
+
+- invitations: the legacy task body (one transaction per row through
+  ``create_invitation``) vs ``create_invitations`` (revoke UPDATE plus
+  multi-row inserts in one transaction);
+- emails: one ``send_invitation_email`` awaited per row vs
+  ``send_email_batches``. Resend is replaced by a fake SDK whose calls
+  block for ``--email-latency-ms`` (default 150), so this measures the
+  dispatch strategy rather than the provider.
+
+Usage (from ``backend/``)::
+
+    DATABASE_URL=postgresql+asyncpg://... python -m scripts.bench.bulk_onboarding
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+import types
+from unittest.mock import patch
+from uuid import uuid4
+
+from scripts.bench._common import Timings, print_table
+
+
+def _fake_resend(latency_s: float) -> types.ModuleType:
+    """A stand-in ``resend`` module whose blocking calls sleep like a round trip."""
+
+    def _send(params):
+        time.sleep(latency_s)
+        return {"id": str(uuid4())}
+
+    def _batch_send(params):
+        time.sleep(latency_s)
+        return {"data": [{"id": str(uuid4())} for _ in params]}
+
+    module = types.ModuleType("resend")
+    module.Emails = types.SimpleNamespace(send=_send)
+    module.Batch = types.SimpleNamespace(send=_batch_send)
+    return module
+
+
+async def _seed(tag: str, n_existing: int):
+    from sqlalchemy import insert
+
+    from app.db.engine import AsyncSessionLocal
+    from app.db.models import Organization, OrganizationMember, OrgRole, User
+
+    org_id, other_org_id, admin_id = uuid4(), uuid4(), uuid4()
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            insert(Organization),
+            [{"id": org_id, "name": tag}, {"id": other_org_id, "name": f"{tag}-other"}],
+        )
+        users = [{"id": admin_id, "email": f"admin@{tag}.example.com", "clerk_id": f"{tag}_admin"}]
+        users += [
+            {"id": uuid4(), "email": f"user{i}@{tag}.example.com", "clerk_id": f"{tag}_{i}"}
+            for i in range(n_existing)
+        ]
+        await session.execute(insert(User), users)
+        await session.execute(
+            insert(OrganizationMember),
+            [{"org_id": org_id, "user_id": admin_id, "role": OrgRole.ADMIN}]
+            + [{"org_id": other_org_id, "user_id": u["id"]} for u in users[1:]],
+        )
+        await session.commit()
+    return org_id, other_org_id, admin_id
+
+
+async def _cleanup(tag: str, org_ids) -> None:
+    from sqlalchemy import delete
+
+    from app.db.engine import AsyncSessionLocal
+    from app.db.models import Organization, User
+
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(Organization).where(Organization.id.in_(org_ids)))
+        await session.execute(delete(User).where(User.clerk_id.like(f"{tag}_%")))
+        await session.commit()
+
+
+async def _legacy_invitations(org_id, admin_id, rows) -> list:
+    from app.db.engine import AsyncSessionLocal
+    from app.services.enterprise.invitation import InvitationService
+
+    service = InvitationService()
+    tokens = []
+    async with AsyncSessionLocal() as session:
+        for row in rows:
+            async with session.begin():
+                invitation = await service.create_invitation(
+                    session=session,
+                    org_id=str(org_id),
+                    email=row["email"],
+                    invited_by=str(admin_id),
+                )
+                tokens.append((invitation.email, invitation.token))
+    return tokens
+
+
+async def _bulk_invitations(org_id, admin_id, rows) -> list:
+    from app.db.engine import AsyncSessionLocal
+    from app.services.enterprise.invitation import InvitationService
+
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            created = await InvitationService().create_invitations(
+                session, str(org_id), rows, str(admin_id)
+            )
+    return [(inv["email"], inv["token"]) for inv in created]
+
+
+async def _serial_emails(invitations) -> None:
+    from app.services.transactional_email import send_invitation_email
+
+    for email, token in invitations:
+        await send_invitation_email(
+            to=email,
+            admin_name="Bench",
+            company_name="Bench",
+            accept_url=f"https://app/invitations/{token}/accept",
+            decline_url=f"https://app/invitations/{token}/decline",
+        )
+
+
+async def _batched_emails(invitations) -> None:
+    from app.services.transactional_email import build_invitation_email, send_email_batches
+
+    await send_email_batches([
+        build_invitation_email(
+            to=email,
+            admin_name="Bench",
+            company_name="Bench",
+            accept_url=f"https://app/invitations/{token}/accept",
+            decline_url=f"https://app/invitations/{token}/decline",
+        )
+        for email, token in invitations
+    ])
+
+
+async def main(n_rows: int, n_existing: int, latency_ms: float, repeats: int) -> None:
+    from app.db.engine import AsyncSessionLocal, engine
+    from app.services.enterprise.csv_onboarding import CSVOnboardingService
+
+    # Also the email domain, so no underscores (the CSV validator rejects them).
+    tag = f"bench-onboard-{uuid4().hex[:8]}"
+    org_id, other_org_id, admin_id = await _seed(tag, n_existing)
+    csv_rows = [{"email": f"user{i}@{tag}.example.com"} for i in range(n_rows)]
+    timings = {
+        name: Timings()
+        for name in (
+            "validate_rows (one lookup)",
+            "invitations: per-row transactions",
+            "invitations: set-based, one transaction",
+        )
+    }
+    try:
+        for _ in range(repeats):
+            async with AsyncSessionLocal() as session:
+                with timings["validate_rows (one lookup)"].measure():
+                    validation = await CSVOnboardingService().validate_rows(
+                        csv_rows, str(org_id), session
+                    )
+            rows = validation.valid_rows
+            if not rows:
+                raise SystemExit("no CSV rows passed validation")
+            # Each run re-invites the same emails, so both paths also revoke.
+            with timings["invitations: per-row transactions"].measure():
+                await _legacy_invitations(org_id, admin_id, rows)
+            with timings["invitations: set-based, one transaction"].measure():
+                invitations = await _bulk_invitations(org_id, admin_id, rows)
+        print_table(
+            f"bulk onboarding DB phases ({n_rows} rows, {len(rows)} new, {repeats} runs)",
+            {name: t.summary() for name, t in timings.items()},
+        )
+
+        serial, batched = Timings(), Timings()
+        with patch.dict(sys.modules, {"resend": _fake_resend(latency_ms / 1000)}), patch(
+            "app.services.transactional_email.settings.RESEND_API_KEY", "re_bench"
+        ):
+            with serial.measure():
+                await _serial_emails(invitations)
+            for _ in range(repeats):
+                with batched.measure():
+                    await _batched_emails(invitations)
+        print_table(
+            f"invitation emails ({len(invitations)} messages, {latency_ms:g} ms per request)",
+            {
+                "one request per email, serial (1 run)": serial.summary(),
+                "batched, bounded concurrency": batched.summary(),
+            },
+        )
+    finally:
+        await _cleanup(tag, [org_id, other_org_id])
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--existing", type=int, default=100)
+    parser.add_argument("--email-latency-ms", type=float, default=150.0)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.existing, args.email_latency_ms, args.repeats))
@@ -0,0 +1,109 @@
+"""
+Benchmark: email status classification, full pattern scan vs prefiltered.
+
+CPU only. Generates ``--emails`` synthetic inbox emails (default 5k), most
+of them unrelated to applications, with realistic body lengths, and times
+running every status pattern over each email against
+``EmailStatusDetector.detect`` (keyword-prefiltered classifier). Both
+results are checked for equality before timing; throughput is reported in
+emails per second.
+
+Usage (from ``backend/``)::
+
+    python -m scripts.bench.email_classifier
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+
+from scripts.bench._common import Timings, print_table
+
+_STATUS_LINES = [
+    "We have decided to move forward with other candidates.",
+    "We'd love to schedule an interview with you next week.",
+    "We are pleased to offer you the position of Senior Engineer.",
+    "Thank you for applying to the Backend Engineer role.",
+    "Our team is reviewing your application and will be in touch.",
+    "Unfortunately, you were not selected for this role.",
+]
+_FILLER = (
+    "Hi there, hope your week is going well. Here is an update on the project "
+    "timeline, the quarterly roadmap, and a few notes from yesterday's sync. "
+)
+
+
+def _emails(n: int, status_share: float) -> list[tuple[str, str]]:
+    rng = random.Random(3)
+    emails = []
+    for i in range(n):
+        body = _FILLER * rng.randint(2, 12)
+        subject = f"Weekly update #{i}"
+        if rng.random() < status_share:
+            line = rng.choice(_STATUS_LINES)
+            body = f"{body}\n{line}\n{_FILLER}"
+            subject = "Your application"
+        emails.append((subject, body))
+    return emails
+
+
+def _full_scan(subject: str, body: str):
+    from app.services.email_parser import (
+        _ALL_PATTERNS,
+        CONFIDENCE_THRESHOLD,
+        EmailStatusDetector,
+        StatusDetection,
+    )
+
+    text = f"{subject}\n{body}"
+    best = None
+    for pattern, status, base_confidence, _ in _ALL_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            confidence = base_confidence
+            if pattern.search(subject):
+                confidence = min(confidence + 0.05, 1.0)
+            if best is None or confidence > best.confidence:
+                best = StatusDetection(
+                    detected_status=status,
+                    confidence=confidence,
+                    evidence_snippet=EmailStatusDetector._extract_snippet(text, match),
+                    is_ambiguous=confidence < CONFIDENCE_THRESHOLD,
+                )
+    return best or StatusDetection(None, 0.0, "", True)
+
+
+def main(n: int, status_share: float, repeats: int) -> None:
+    from app.services.email_parser import EmailStatusDetector
+
+    detector = EmailStatusDetector()
+    emails = _emails(n, status_share)
+    for subject, body in emails:
+        if detector.detect(subject, body) != _full_scan(subject, body):
+            raise SystemExit("prefiltered and full-scan results differ")
+
+    legacy_t, compiled_t = Timings(), Timings()
+    for _ in range(repeats):
+        with legacy_t.measure():
+            for subject, body in emails:
+                _full_scan(subject, body)
+        with compiled_t.measure():
+            for subject, body in emails:
+                detector.detect(subject, body)
+
+    rows = {}
+    for name, timings in (("full scan", legacy_t), ("prefiltered", compiled_t)):
+        stats = timings.summary()
+        stats["emails_per_s"] = round(n / (stats["p50_ms"] / 1000))
+        rows[name] = stats
+    print_table(f"email classifier ({n} emails, {status_share:.0%} status emails)", rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--emails", type=int, default=5_000)
+    parser.add_argument("--status-share", type=float, default=0.2)
+    parser.add_argument("--repeats", type=int, default=10)
+    args = parser.parse_args()
+    main(args.emails, args.status_share, args.repeats)
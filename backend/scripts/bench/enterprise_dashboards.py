@@ -0,0 +1,263 @@
+"""
+Benchmark: /admin/metrics and /reports/roi, per-metric queries vs fused statements.
+
+Seeds one organization with ``--members`` members (default 2k), each with
+``--apps`` applications (default 25) spread over the last year and a few
+job reviews, rebuilds ``org_daily_metrics``, then reports p50/p95 of what
+each endpoint awaits:
+
+- ``/admin/metrics``: the legacy path (eight sequential aggregate queries
+  plus the daily breakdown against the raw tables) vs the planner's fused
+  statements over the rollup, both on one session as the endpoint runs
+  them.
+- ``/reports/roi``: the fused statements alone (no legacy equivalent is
+  kept).
+
+Results are checked for equality with the legacy path first.
+
+Usage (from ``backend/``)::
+
+    DATABASE_URL=postgresql+asyncpg://... python -m scripts.bench.enterprise_dashboards
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+from datetime import date, datetime, timedelta, timezone
+from uuid import uuid4
+
+from scripts.bench._common import PoolHoldTracker, Timings, print_table
+
+_SEED_BATCH = 5000
+
+# The pre-rollup queries: one round trip per metric on a single session.
+_LEGACY_QUERIES = {
+    "enrolled": "SELECT COUNT(*) FROM organization_members WHERE org_id = :org",
+    "active": (
+        "SELECT COUNT(DISTINCT a.user_id) FROM applications a"
+        " WHERE a.user_id IN (SELECT user_id FROM organization_members WHERE org_id = :org)"
+        " AND a.applied_at >= :start AND a.applied_at <= :end"
+    ),
+    "jobs_reviewed": (
+        "SELECT COUNT(*) FROM agent_activities aa"
+        " WHERE aa.user_id IN (SELECT user_id FROM organization_members WHERE org_id = :org)"
+        " AND aa.event_type = 'job_review'"
+        " AND aa.created_at >= :start AND aa.created_at <= :end"
+    ),
+    "applications": (
+        "SELECT COUNT(*) FROM applications a"
+        " WHERE a.user_id IN (SELECT user_id FROM organization_members WHERE org_id = :org)"
+        " AND a.applied_at >= :start AND a.applied_at <= :end"
+    ),
+    "interviews": (
+        "SELECT COUNT(*) FROM applications a"
+        " WHERE a.user_id IN (SELECT user_id FROM organization_members WHERE org_id = :org)"
+        " AND a.status IN ('interview', 'offer')"
+        " AND a.applied_at >= :start AND a.applied_at <= :end"
+    ),
+    "placements": (
+        "SELECT COUNT(*) FROM applications a"
+        " WHERE a.user_id IN (SELECT user_id FROM organization_members WHERE org_id = :org)"
+        " AND a.status = 'offer'"
+        " AND a.applied_at >= :start AND a.applied_at <= :end"
+    ),
+    "avg_days": (
+        "SELECT AVG(EXTRACT(EPOCH FROM a.updated_at) - EXTRACT(EPOCH FROM om.created_at))"
+        " / 86400.0 FROM applications a"
+        " JOIN organization_members om ON om.user_id = a.user_id AND om.org_id = :org"
+        " WHERE a.status = 'offer' AND a.applied_at >= :start AND a.applied_at <= :end"
+    ),
+    "daily": (
+        "SELECT date_trunc('day', a.applied_at), COUNT(*),"
+        " COUNT(*) FILTER (WHERE a.status IN ('interview', 'offer')),"
+        " COUNT(*) FILTER (WHERE a.status = 'offer') FROM applications a"
+        " WHERE a.user_id IN (SELECT user_id FROM organization_members WHERE org_id = :org)"
+        " AND a.applied_at >= :start AND a.applied_at <= :end GROUP BY 1 ORDER BY 1"
+    ),
+}
+
+
+async def _legacy_metrics(org_id, start: date, end: date) -> dict:
+    from sqlalchemy import text
+
+    from app.db.engine import AsyncSessionLocal
+
+    params = {
+        "org": org_id,
+        "start": datetime(start.year, start.month, start.day, tzinfo=timezone.utc),
+        "end": datetime(end.year, end.month, end.day, 23, 59, 59, tzinfo=timezone.utc),
+    }
+    values = {}
+    async with AsyncSessionLocal() as session:
+        for name, sql in _LEGACY_QUERIES.items():
+            result = await session.execute(text(sql), params)
+            values[name] = result.all() if name == "daily" else result.scalar()
+    return values
+
+
+async def _metrics_endpoint(org_id, start: date, end: date):
+    """What ``GET /admin/metrics`` awaits."""
+    from app.db.engine import AsyncSessionLocal
+    from app.services.enterprise.metrics import EnterpriseMetricsService
+
+    service = EnterpriseMetricsService()
+    async with AsyncSessionLocal() as session:
+        return (
+            await service.get_aggregate_metrics(session, org_id, start, end),
+            await service.get_daily_breakdown(session, org_id, start, end),
+        )
+
+
+async def _roi_endpoint(org_id, start: date, end: date):
+    """What ``GET /reports/roi`` awaits."""
+    from app.db.engine import AsyncSessionLocal
+    from app.services.enterprise.roi_report import ROIReportService
+
+    async with AsyncSessionLocal() as session:
+        return await ROIReportService().compute_metrics(session, str(org_id), start, end)
+
+
+# Plain inserts: the ORM enum columns bind member names, the schema's
+# enums hold the lowercase values.
+_SEED_SQL = {
+    "users": "INSERT INTO users (id, email, clerk_id) VALUES (:id, :email, :clerk_id)",
+    "members": (
+        "INSERT INTO organization_members (org_id, user_id, created_at)"
+        " VALUES (:org_id, :user_id, :created_at)"
+    ),
+    "apps": (
+        "INSERT INTO applications (user_id, job_id, status, applied_at, updated_at)"
+        " VALUES (:user_id, :job_id, CAST(:status AS application_status),"
+        " :applied_at, :updated_at)"
+    ),
+    "reviews": (
+        "INSERT INTO agent_activities (user_id, event_type, title, created_at)"
+        " VALUES (:user_id, 'job_review', 'Reviewed a job', :created_at)"
+    ),
+}
+
+
+async def _seed(tag: str, n_members: int, n_apps: int):
+    from sqlalchemy import text
+
+    from app.db.engine import AsyncSessionLocal
+    from app.services.enterprise.metrics_rollup import rebuild_org_daily_metrics
+
+    rng = random.Random(17)
+    now = datetime.now(timezone.utc)
+    org_id, job_id = uuid4(), uuid4()
+    statuses = ["applied"] * 6 + ["screening", "interview", "interview", "offer", "rejected"]
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            text("INSERT INTO jobs (id, source, title, company) VALUES (:id, 'bench', 'Engineer', :tag)"),
+            {"id": job_id, "tag": tag},
+        )
+        await session.execute(
+            text("INSERT INTO organizations (id, name) VALUES (:id, :tag)"),
+            {"id": org_id, "tag": tag},
+        )
+        for start in range(0, n_members, _SEED_BATCH):
+            rows = {"users": [], "members": [], "apps": [], "reviews": []}
+            for _ in range(min(_SEED_BATCH, n_members - start)):
+                user_id = uuid4()
+                enrolled = now - timedelta(days=rng.randint(200, 400))
+                rows["users"].append({
+                    "id": user_id,
+                    "email": f"{user_id}@bench.example.com",
+                    "clerk_id": f"{tag}_{user_id}",
+                })
+                rows["members"].append({"org_id": org_id, "user_id": user_id, "created_at": enrolled})
+                for _ in range(n_apps):
+                    applied = now - timedelta(days=rng.randint(0, 365), minutes=rng.randint(0, 1440))
+                    rows["apps"].append({
+                        "user_id": user_id,
+                        "job_id": job_id,
+                        "status": rng.choice(statuses),
+                        "applied_at": applied,
+                        "updated_at": applied + timedelta(days=rng.randint(0, 30)),
+                    })
+                for _ in range(rng.randint(0, 5)):
+                    rows["reviews"].append({
+                        "user_id": user_id,
+                        "created_at": now - timedelta(days=rng.randint(0, 365)),
+                    })
+            for name, batch in rows.items():
+                if batch:
+                    await session.execute(text(_SEED_SQL[name]), batch)
+        await session.commit()
+        await rebuild_org_daily_metrics(session)
+    return org_id
+
+
+async def _cleanup(tag: str, org_id) -> None:
+    from sqlalchemy import delete
+
+    from app.db.engine import AsyncSessionLocal
+    from app.db.models import Job, Organization, User
+
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(User).where(User.clerk_id.like(f"{tag}_%")))
+        await session.execute(delete(Organization).where(Organization.id == org_id))
+        await session.execute(delete(Job).where(Job.source == "bench", Job.company == tag))
+        await session.commit()
+
+
+async def main(n_members: int, n_apps: int, days: int, repeats: int) -> None:
+    from app.db.engine import engine
+
+    tag = f"bench_dash_{uuid4().hex[:8]}"
+    end = date.today()
+    start = end - timedelta(days=days)
+    tracker = PoolHoldTracker(engine)
+    org_id = await _seed(tag, n_members, n_apps)
+    try:
+        legacy = await _legacy_metrics(org_id, start, end)
+        summary, daily = await _metrics_endpoint(org_id, start, end)
+        if (
+            summary.enrolled_count != legacy["enrolled"]
+            or summary.active_count != legacy["active"]
+            or summary.applications_submitted_count != legacy["applications"]
+            or summary.placements_count != legacy["placements"]
+            or summary.jobs_reviewed_count != legacy["jobs_reviewed"]
+            or len(daily) != len(legacy["daily"])
+        ):
+            raise SystemExit("rollup metrics and legacy metrics differ")
+
+        paths = {
+            "/admin/metrics": {
+                "legacy per-metric": lambda: _legacy_metrics(org_id, start, end),
+                "fused rollup": lambda: _metrics_endpoint(org_id, start, end),
+            },
+            "/reports/roi": {
+                "fused rollup": lambda: _roi_endpoint(org_id, start, end),
+            },
+        }
+        for endpoint, strategies in paths.items():
+            rows = {}
+            for name, run in strategies.items():
+                timings = Timings()
+                tracker.reset()
+                for _ in range(repeats):
+                    with timings.measure():
+                        await run()
+                rows[name] = {**timings.summary(), **tracker.summary()}
+            print_table(
+                f"{endpoint} ({n_members} members x {n_apps} applications, "
+                f"{days}-day range, {repeats} runs)",
+                rows,
+            )
+    finally:
+        await _cleanup(tag, org_id)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--members", type=int, default=2000)
+    parser.add_argument("--apps", type=int, default=25)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.members, args.apps, args.days, args.repeats))
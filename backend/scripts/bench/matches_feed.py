@@ -0,0 +1,143 @@
+"""
+Benchmark: matches feed pagination, OFFSET vs keyset, COUNT vs cached total.
+
+Seeds one user with ``--matches`` matches (default 50k, one job each) and
+times page fetches at several depths with ``OFFSET n LIMIT k`` and with the
+keyset predicate used by ``GET /matches?cursor=...``, plus the per-request
+``COUNT(*)``. Apply ``00006_matches_feed_index.sql`` first to measure the
+indexed plan.
+
+Usage (from ``backend/``)::
+
+    DATABASE_URL=postgresql+asyncpg://... python -m scripts.bench.matches_feed
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+from uuid import uuid4
+
+from scripts.bench._common import Timings, print_table
+
+
+async def _seed(user_id, n: int) -> None:
+    from sqlalchemy import insert
+
+    from app.db.engine import AsyncSessionLocal
+    from app.db.models import Job, Match, User
+
+    rng = random.Random(42)
+    async with AsyncSessionLocal() as session:
+        session.add(User(id=user_id, email=f"bench-{user_id}@example.com", clerk_id=f"bench_{user_id}"))
+        await session.flush()
+        for start in range(0, n, 5000):
+            batch = range(start, min(n, start + 5000))
+            jobs = [
+                {
+                    "id": uuid4(),
+                    "source": "bench",
+                    "title": f"Engineer {i}",
+                    "company": f"Company {i % 500}",
+                    "description": "Lorem ipsum dolor sit amet. " * 80,
+                }
+                for i in batch
+            ]
+            await session.execute(insert(Job), jobs)
+            await session.execute(insert(Match), [
+                {
+                    "id": uuid4(),
+                    "user_id": user_id,
+                    "job_id": job["id"],
+                    "score": round(rng.uniform(40, 100), 2),
+                    "rationale": "{}",
+                    "status": "new",
+                }
+                for job in jobs
+            ])
+        await session.commit()
+
+
+async def _cleanup(user_id) -> None:
+    from sqlalchemy import delete, select
+
+    from app.db.engine import AsyncSessionLocal
+    from app.db.models import Job, Match, User
+
+    async with AsyncSessionLocal() as session:
+        job_ids = select(Match.job_id).where(Match.user_id == user_id)
+        await session.execute(delete(Job).where(Job.id.in_(job_ids)))
+        await session.execute(delete(User).where(User.id == user_id))
+        await session.commit()
+
+
+async def main(n: int, per_page: int, repeats: int) -> None:
+    from sqlalchemy import func, select
+    from sqlalchemy.orm import selectinload
+
+    from app.api.v1.matches import _after_cursor
+    from app.db.engine import AsyncSessionLocal, engine
+    from app.db.models import Job, Match, MatchStatus
+
+    user_id = uuid4()
+    await _seed(user_id, n)
+    base = (
+        select(Match)
+        .where(Match.user_id == user_id, Match.status == MatchStatus.NEW)
+        .order_by(Match.score.desc(), Match.id)
+    )
+    results = {}
+    try:
+        async with AsyncSessionLocal() as session:
+            count_t = Timings()
+            for _ in range(repeats):
+                with count_t.measure():
+                    await session.execute(
+                        select(func.count()).select_from(Match).where(
+                            Match.user_id == user_id, Match.status == MatchStatus.NEW
+                        )
+                    )
+            results["COUNT(*) per request"] = count_t.summary()
+
+            for depth in (0, n // 10, n // 2, n - per_page):
+                anchor = None
+                if depth:
+                    anchor = (
+                        await session.execute(base.offset(depth - 1).limit(1))
+                    ).scalar_one()
+
+                offset_t, keyset_t, lean_t = Timings(), Timings(), Timings()
+                for _ in range(repeats):
+                    with offset_t.measure():
+                        await session.execute(
+                            base.options(selectinload(Match.job))
+                            .offset(depth).limit(per_page + 1)
+                        )
+                    keyset = base.limit(per_page + 1)
+                    if anchor is not None:
+                        keyset = keyset.where(_after_cursor(anchor.score, str(anchor.id)))
+                    with keyset_t.measure():
+                        await session.execute(keyset.options(selectinload(Match.job)))
+                    with lean_t.measure():
+                        await session.execute(
+                            keyset.options(selectinload(Match.job).defer(Job.description))
+                        )
+                    session.expunge_all()
+                results[f"offset @ {depth}"] = offset_t.summary()
+                results[f"keyset @ {depth}"] = keyset_t.summary()
+                results[f"keyset+no desc @ {depth}"] = lean_t.summary()
+
+        print_table(f"matches feed ({n} matches, per_page={per_page})", results)
+    finally:
+        await _cleanup(user_id)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--matches", type=int, default=50_000)
+    parser.add_argument("--per-page", type=int, default=20)
+    parser.add_argument("--repeats", type=int, default=30)
+    args = parser.parse_args()
+    asyncio.run(main(args.matches, args.per_page, args.repeats))
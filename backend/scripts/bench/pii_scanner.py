@@ -0,0 +1,117 @@
+"""
+Benchmark: enterprise PII scanning, per-call pattern loading vs compiled scanner.
+
+CPU only. Generates ``--docs`` resume-sized documents (default 2k, ~4-6 KB
+each, 5% containing an internal URL or code name) and times the legacy
+scan -- re-merging default and org-custom patterns, running each regex
+separately, then filtering the whitelist -- against a cached
+``PIIScanner`` (joined prefilter, frozen whitelist). Both results are
+checked for equality before timing. The legacy path's two settings
+queries per scan are not included, so the gap in production is larger.
+
+Usage (from ``backend/``)::
+
+    python -m scripts.bench.pii_scanner
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+
+from scripts.bench._common import Timings, print_table
+
+_CUSTOM_PATTERNS = [
+    {"pattern": rf"\b{name}\b", "category": "proprietary_term", "enabled": True}
+    for name in ("Nimbus", "Starfleet", "Quasar", "Helios", "Orion Core", "Bluebird")
+] + [
+    {"pattern": r"\b[A-Z]{2,5}-\d{3,6}\b", "category": "ticket_id", "enabled": True},
+    {"pattern": r"\b10\.\d{1,3}\.\d{1,3}\.\d{1,3}\b", "category": "internal_ip", "enabled": True},
+]
+_WHITELIST = ["Project Management", "Operation Excellence"]
+
+_SENTENCES = [
+    "Led a team of six engineers delivering a payments platform on AWS.",
+    "Reduced p95 API latency by 40% by introducing read replicas and caching.",
+    "Designed event-driven ingestion pipelines in Python, Kafka and PostgreSQL.",
+    "Mentored junior developers and ran weekly architecture reviews.",
+    "Owned the migration of 120 services from VMs to Kubernetes.",
+    "Partnered with product and design to ship the new onboarding flow.",
+]
+_LEAKS = [
+    "Documented runbooks at https://wiki.acme.internal/ops/oncall.",
+    "Shipped Project Falcon ahead of schedule.",
+    "Tracked delivery in https://jira.acme.com/browse/PAY-1234.",
+]
+
+
+def _documents(n: int, leak_share: float) -> list[str]:
+    rng = random.Random(5)
+    docs = []
+    for _ in range(n):
+        lines = [rng.choice(_SENTENCES) for _ in range(rng.randint(60, 90))]
+        if rng.random() < leak_share:
+            lines.insert(rng.randrange(len(lines)), rng.choice(_LEAKS))
+        docs.append("\n".join(lines))
+    return docs
+
+
+def _legacy_scan(text: str):
+    """The pre-compiled strategy, minus its two settings queries."""
+    from app.services.enterprise.pii_detection import DEFAULT_PATTERNS, PIIDetection
+
+    merged = list(DEFAULT_PATTERNS)
+    for pat in _CUSTOM_PATTERNS:
+        merged.append({"id": f"custom_{len(merged)}", **pat})
+    detections = []
+    for pat in merged:
+        if not pat.get("enabled", True):
+            continue
+        for match in re.compile(pat["pattern"]).finditer(text):
+            detections.append(
+                PIIDetection(match.group(), pat["category"], match.start(), pat["id"])
+            )
+    lower_whitelist = {term.lower() for term in _WHITELIST}
+    return [d for d in detections if d.matched_term.lower() not in lower_whitelist]
+
+
+def main(n: int, leak_share: float, repeats: int) -> None:
+    from app.services.enterprise.pii_detection import DEFAULT_PATTERNS, PIIScanner
+
+    merged = list(DEFAULT_PATTERNS)
+    for pat in _CUSTOM_PATTERNS:
+        merged.append({"id": f"custom_{len(merged)}", **pat})
+    scanner = PIIScanner(merged, _WHITELIST)
+    docs = _documents(n, leak_share)
+    for doc in docs:
+        if scanner.scan(doc) != _legacy_scan(doc):
+            raise SystemExit("compiled and legacy scans differ")
+
+    legacy_t, compiled_t = Timings(), Timings()
+    for _ in range(repeats):
+        with legacy_t.measure():
+            for doc in docs:
+                _legacy_scan(doc)
+        with compiled_t.measure():
+            for doc in docs:
+                scanner.scan(doc)
+
+    size_kb = sum(len(d) for d in docs) / n / 1024
+    rows = {}
+    for name, timings in (("per-pattern scan", legacy_t), ("compiled scanner", compiled_t)):
+        stats = timings.summary()
+        stats["docs_per_s"] = round(n / (stats["p50_ms"] / 1000))
+        rows[name] = stats
+    print_table(
+        f"PII scan ({n} docs, ~{size_kb:.1f} KB each, {leak_share:.0%} with PII)", rows
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--docs", type=int, default=2_000)
+    parser.add_argument("--leak-share", type=float, default=0.05)
+    parser.add_argument("--repeats", type=int, default=10)
+    args = parser.parse_args()
+    main(args.docs, args.leak_share, args.repeats)
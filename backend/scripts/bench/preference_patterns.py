@@ -0,0 +1,138 @@
+"""
+Benchmark: preference pattern detection, swipe-log rescan vs counter table.
+
+Seeds one user with ``--swipes`` swipe events (default 100k) spread over a
+few hundred companies/locations, maintaining ``swipe_pattern_stats`` with
+``record_swipe_stats`` as it goes. Then times the legacy full rescan of
+``swipe_events`` against the threshold query in ``detect_patterns``, plus
+the per-swipe counter upsert that the swipe endpoints now pay. Apply
+``00007_swipe_pattern_stats.sql`` first.
+
+Usage (from ``backend/``)::
+
+    DATABASE_URL=postgresql+asyncpg://... python -m scripts.bench.preference_patterns
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+from collections import defaultdict
+from uuid import uuid4
+
+from scripts.bench._common import Timings, print_table
+
+
+def _swipe(rng: random.Random, user_id, match_id) -> dict:
+    return {
+        "id": uuid4(),
+        "user_id": user_id,
+        "match_id": match_id,
+        "action": "dismissed" if rng.random() < 0.55 else "saved",
+        "job_company": f"Company {rng.randrange(400)}",
+        "job_location": f"City {rng.randrange(60)}",
+        "job_remote": rng.random() < 0.4,
+        "job_employment_type": rng.choice(["Full-time", "Contract", "Part-time"]),
+    }
+
+
+async def _legacy_detect(user_id, session) -> int:
+    """The pre-counter strategy: load every swipe event and count in Python."""
+    from sqlalchemy import select
+
+    from app.db.models import SwipeEvent
+
+    events = (
+        await session.execute(select(SwipeEvent).where(SwipeEvent.user_id == user_id))
+    ).scalars().all()
+    counts = defaultdict(lambda: defaultdict(lambda: {"total": 0, "dismissed": 0}))
+    for event in events:
+        for ptype, value in (
+            ("company", event.job_company),
+            ("location", event.job_location),
+            ("remote", None if event.job_remote is None else str(event.job_remote).lower()),
+            ("employment_type", event.job_employment_type),
+        ):
+            if value:
+                c = counts[ptype][value]
+                c["total"] += 1
+                c["dismissed"] += event.action == "dismissed"
+    return sum(len(v) for v in counts.values())
+
+
+async def _seed(user_id, n: int) -> None:
+    from sqlalchemy import insert
+
+    from app.db.engine import AsyncSessionLocal
+    from app.db.models import Job, Match, SwipeEvent, User
+    from app.services.preference_learning import record_swipe_stats
+
+    rng = random.Random(7)
+    job_id, match_id = uuid4(), uuid4()
+    async with AsyncSessionLocal() as session:
+        session.add(User(id=user_id, email=f"bench-{user_id}@example.com", clerk_id=f"bench_{user_id}"))
+        session.add(Job(id=job_id, source="bench", title="Engineer", company="BenchCo"))
+        await session.flush()
+        session.add(Match(id=match_id, user_id=user_id, job_id=job_id, score=80, status="dismissed"))
+        await session.flush()
+        for start in range(0, n, 5000):
+            batch = [_swipe(rng, user_id, match_id) for _ in range(min(5000, n - start))]
+            await session.execute(insert(SwipeEvent), batch)
+            await record_swipe_stats(user_id, batch, session)
+        await session.commit()
+
+
+async def _cleanup(user_id) -> None:
+    from sqlalchemy import delete
+
+    from app.db.engine import AsyncSessionLocal
+    from app.db.models import Job, User
+
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(User).where(User.id == user_id))
+        await session.execute(delete(Job).where(Job.source == "bench", Job.company == "BenchCo"))
+        await session.commit()
+
+
+async def main(n: int, repeats: int) -> None:
+    from app.db.engine import AsyncSessionLocal, engine
+    from app.services.preference_learning import detect_patterns, record_swipe_stats
+
+    user_id = uuid4()
+    await _seed(user_id, n)
+    rng = random.Random(11)
+    legacy_t, counters_t, upsert_t = Timings(), Timings(), Timings()
+    try:
+        for _ in range(repeats):
+            async with AsyncSessionLocal() as session:
+                with legacy_t.measure():
+                    await _legacy_detect(user_id, session)
+            async with AsyncSessionLocal() as session:
+                with counters_t.measure():
+                    await detect_patterns(user_id, session)
+                await session.rollback()
+            async with AsyncSessionLocal() as session:
+                with upsert_t.measure():
+                    await record_swipe_stats(user_id, [_swipe(rng, user_id, None)], session)
+                await session.rollback()
+
+        print_table(
+            f"preference patterns ({n} swipes, {repeats} runs)",
+            {
+                "rescan swipe_events": legacy_t.summary(),
+                "threshold query": counters_t.summary(),
+                "per-swipe counter upsert": upsert_t.summary(),
+            },
+        )
+    finally:
+        await _cleanup(user_id)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--swipes", type=int, default=100_000)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.swipes, args.repeats))
@@ -0,0 +1,110 @@
+"""
+Benchmark: resume text extraction, inline in the event loop vs the process pool.
+
+Parses a large resume ``--concurrent`` times at once (default 4 uploads)
+while a ticker coroutine measures event-loop lag, i.e. how long every
+other request on the worker would have waited:
+
+- inline: ``extract_text_from_docx``/``_pdf`` called in the handler, as
+  the upload endpoints did;
+- pool: ``run_extraction`` on the ``EXTRACTION_WORKERS`` process pool
+  (first, pool warm-up run excluded).
+
+The document is a generated DOCX with ``--paragraphs`` paragraphs
+(default 3000) unless ``--file`` points at a real PDF or DOCX. Cache hits
+skip parsing entirely and are not measured here.
+
+Usage (from ``backend/``)::
+
+    python -m scripts.bench.resume_extraction --concurrent 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import time
+
+from scripts.bench._common import Timings, print_table
+
+_TICK_S = 0.005
+
+
+def _generated_docx(n_paragraphs: int) -> bytes:
+    from docx import Document
+
+    doc = Document()
+    for i in range(n_paragraphs):
+        doc.add_paragraph(
+            f"{i}. Led migration of the billing platform to event sourcing, "
+            "cutting reconciliation time by 40% across 12 services."
+        )
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+async def _measure(run, file_bytes: bytes, concurrent: int) -> dict:
+    """Wall time of ``concurrent`` parses and the worst event-loop stall."""
+    stop = asyncio.Event()
+    lags = []
+
+    async def _ticker():
+        while not stop.is_set():
+            before = time.perf_counter()
+            await asyncio.sleep(_TICK_S)
+            lags.append((time.perf_counter() - before - _TICK_S) * 1000)
+
+    ticker = asyncio.create_task(_ticker())
+    await asyncio.sleep(0)
+    wall = Timings()
+    with wall.measure():
+        await asyncio.gather(*(run(file_bytes) for _ in range(concurrent)))
+    stop.set()
+    await ticker
+    return {
+        "wall_ms": round(wall.samples[0], 1),
+        "max_loop_lag_ms": round(max(lags, default=0.0), 1),
+    }
+
+
+async def main(path: str | None, n_paragraphs: int, concurrent: int) -> None:
+    from app.services.resume_extraction import run_extraction, shutdown_executor
+    from app.services.resume_parser import extract_text_from_docx, extract_text_from_pdf
+
+    if path:
+        with open(path, "rb") as fh:
+            file_bytes = fh.read()
+        parser = extract_text_from_pdf if path.lower().endswith(".pdf") else extract_text_from_docx
+    else:
+        file_bytes = _generated_docx(n_paragraphs)
+        parser = extract_text_from_docx
+
+    async def _inline(data: bytes) -> str:
+        return parser(data)
+
+    async def _pool(data: bytes) -> str:
+        return await run_extraction(parser, data)
+
+    try:
+        await _pool(file_bytes)  # warm-up: spawn the workers
+        rows = {
+            "inline in handler": await _measure(_inline, file_bytes, concurrent),
+            "process pool": await _measure(_pool, file_bytes, concurrent),
+        }
+    finally:
+        shutdown_executor()
+    print_table(
+        f"resume extraction ({len(file_bytes) // 1024} KiB file, {concurrent} concurrent uploads)",
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--file", default=None)
+    parser.add_argument("--paragraphs", type=int, default=3000)
+    parser.add_argument("--concurrent", type=int, default=4)
+    args = parser.parse_args()
+    asyncio.run(main(args.file, args.paragraphs, args.concurrent))
@@ -0,0 +1,185 @@
+"""
+Benchmark: resume tailoring prompt volume, full resume per job vs section reuse.
+
+Simulates one user tailoring a sample master resume for ``--jobs``
+similar postings (default 30). Each posting keeps the base role's
+keywords except for ``--drift`` (default 2) swapped for terms drawn from a
+pool of adjacent skills, with a fixed ``--seed``. For each job it runs
+the real planner (``plan_tailoring``) against the remembered history and
+builds the prompt ``ResumeAgent`` would send:
+
+- full: every job sends every section (the previous behaviour);
+- incremental: only the sections the planner could not reuse.
+
+Prompt size is reported in characters and estimated tokens (chars / 4)
+for the user message; the LLM is not called, Redis is an in-memory hash
+store, and the fixed system prompt is sent only for jobs that call the
+LLM. Every posting is at a different company, so the summary is always
+regenerated.
+
+Usage (from ``backend/``)::
+
+    python -m scripts.bench.resume_tailoring_reuse --jobs 30 --drift 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+from unittest.mock import AsyncMock, patch
+
+from scripts.bench._common import print_table
+
+_PROFILE = {
+    "headline": "Senior Software Engineer",
+    "skills": ["Python", "FastAPI", "PostgreSQL", "Docker", "Kubernetes", "AWS", "Redis"],
+    "experience": [
+        {
+            "title": "Senior Software Engineer",
+            "company": "TechCorp",
+            "start_date": "2021-01",
+            "description": "Built Python microservices on AWS serving scalable APIs",
+        },
+        {
+            "title": "Software Engineer",
+            "company": "StartupInc",
+            "start_date": "2018-06",
+            "end_date": "2020-12",
+            "description": "Full-stack development with React and PostgreSQL",
+        },
+    ],
+    "education": [
+        {"degree": "BS", "field": "Computer Science", "institution": "MIT", "graduation_year": "2018"}
+    ],
+}
+
+_BASE_KEYWORDS = [
+    "python", "fastapi", "postgresql", "apis", "scalable", "microservices",
+    "backend", "distributed", "systems", "experience", "cloud", "testing",
+    "design", "ownership", "collaborate", "production", "services", "data",
+]
+_ADJACENT = [
+    "redis", "docker", "kafka", "grpc", "terraform", "aws", "kubernetes",
+    "observability", "graphql", "celery", "mentoring", "security",
+]
+
+
+def _job(rng: random.Random, drift: int, index: int) -> dict:
+    keywords = list(_BASE_KEYWORDS)
+    for slot in rng.sample(range(len(keywords)), drift):
+        keywords[slot] = rng.choice(_ADJACENT)
+    return {
+        "title": "Backend Engineer",
+        "company": f"Company {index}",
+        "description": "We are hiring a backend engineer. " * 40,
+        "keywords": keywords,
+    }
+
+
+class _HashStore:
+    """In-memory stand-in for the Redis hash commands the cache uses."""
+
+    def __init__(self):
+        self.hashes: dict[str, dict[str, str]] = {}
+
+    async def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    async def hset(self, key, field, value):
+        self.hashes.setdefault(key, {})[field] = value
+
+    async def hdel(self, key, *fields):
+        for f in fields:
+            self.hashes.get(key, {}).pop(f, None)
+
+    async def expire(self, key, seconds):
+        return True
+
+    def pipeline(self, transaction=True):
+        return _Pipeline(self)
+
+
+class _Pipeline:
+    def __init__(self, store: _HashStore):
+        self._store = store
+        self._calls = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        return lambda *args: self._calls.append((name, args))
+
+    async def execute(self):
+        return [await getattr(self._store, name)(*args) for name, args in self._calls]
+
+
+def _tailored(sections) -> dict:
+    return {
+        s.name: {
+            "section_name": s.name,
+            "original_content": s.content,
+            "tailored_content": s.content,
+            "changes_made": [],
+        }
+        for s in sections
+    }
+
+
+async def main(n_jobs: int, drift: int, seed: int) -> None:
+    from app.agents.pro.resume_agent import _SYSTEM_PROMPT, ResumeAgent
+    from app.services.resume_tailoring import (
+        job_fingerprint,
+        load_tailoring_history,
+        plan_tailoring,
+        remember_tailoring,
+        split_master_resume,
+    )
+
+    agent = ResumeAgent()
+    rng = random.Random(seed)
+    sections = split_master_resume(_PROFILE)
+    totals = {
+        name: {"llm_calls": 0, "sections_sent": 0, "prompt_chars": 0}
+        for name in ("full resume per job", "section reuse")
+    }
+    usage = {"prompt_tokens": 0, "completion_tokens": 0, "latency_ms": 0.0}
+
+    with patch("app.cache.redis_client.get_redis_client", AsyncMock(return_value=_HashStore())):
+        for index in range(n_jobs):
+            job = _job(rng, drift, index)
+            fingerprint = job_fingerprint(job)
+            history = await load_tailoring_history("bench_user")
+            plan = plan_tailoring(sections, fingerprint, history)
+            for name, sent in (
+                ("full resume per job", sections),
+                ("section reuse", plan.regenerate),
+            ):
+                if sent:
+                    row = totals[name]
+                    row["llm_calls"] += 1
+                    row["sections_sent"] += len(sent)
+                    row["prompt_chars"] += len(_SYSTEM_PROMPT) + len(
+                        agent._build_tailoring_prompt(sent, job)
+                    )
+            await remember_tailoring(
+                "bench_user", f"job-{index}", sections, fingerprint,
+                _tailored(sections), usage,
+            )
+
+    for row in totals.values():
+        row["est_tokens"] = row["prompt_chars"] // 4
+    print_table(f"resume tailoring prompts ({n_jobs} jobs, {drift} keywords drift)", totals)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--jobs", type=int, default=30)
+    parser.add_argument("--drift", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    asyncio.run(main(args.jobs, args.drift, args.seed))
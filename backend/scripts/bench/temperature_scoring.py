@@ -0,0 +1,85 @@
+"""
+Benchmark: relationship temperature scoring, per-contact vs columnar path.
+
+CPU only. Generates ``--records`` engagement records (default 100k) over
+``--contacts`` contacts with UTC timestamps, as produced by LinkedIn
+imports, and times the per-contact path against the NumPy columnar path of
+``RelationshipTemperatureService.score_contacts``. Both results are checked
+for equality before timing. ``--offsets`` adds non-UTC offsets, which take
+the per-record timestamp fallback.
+
+Usage (from ``backend/``)::
+
+    python -m scripts.bench.temperature_scoring
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+from datetime import datetime, timedelta, timezone
+
+from scripts.bench._common import Timings, print_table
+
+_TYPES = ["conversation", "comment", "share", "like", "connection"]
+
+
+def _history(n: int, contacts: int, offsets: bool) -> list[dict]:
+    rng = random.Random(5)
+    now = datetime.now(timezone.utc)
+    zones = [timezone.utc, timezone(timedelta(hours=-5)), timezone(timedelta(hours=2))]
+    history = []
+    for _ in range(n):
+        # Stay clear of whole-day boundaries so both paths agree on days_ago.
+        moment = now - timedelta(days=rng.randrange(180), seconds=rng.randrange(60, 86_340))
+        if offsets:
+            moment = moment.astimezone(rng.choice(zones))
+        history.append({
+            "contact_name": f"Contact {rng.randrange(contacts)}",
+            "engagement_type": rng.choice(_TYPES),
+            "timestamp": moment.isoformat(),
+            "temperature_impact": 0.1,
+        })
+    return history
+
+
+def _per_contact(service, history: list[dict]) -> list:
+    by_contact: dict[str, list[dict]] = {}
+    for record in history:
+        by_contact.setdefault(record.get("contact_name", "Unknown"), []).append(record)
+    return [service._score_contact(name, records) for name, records in by_contact.items()]
+
+
+def main(n: int, contacts: int, repeats: int, offsets: bool) -> None:
+    from app.services.network.temperature_scoring import RelationshipTemperatureService
+
+    service = RelationshipTemperatureService()
+    history = _history(n, contacts, offsets)
+    if service._score_contacts_columnar(history) != _per_contact(service, history):
+        raise SystemExit("columnar and per-contact results differ")
+
+    legacy_t, columnar_t = Timings(), Timings()
+    for _ in range(repeats):
+        with legacy_t.measure():
+            _per_contact(service, history)
+        with columnar_t.measure():
+            service._score_contacts_columnar(history)
+
+    label = "mixed offsets" if offsets else "UTC"
+    print_table(
+        f"temperature scoring ({n} records, {contacts} contacts, {label})",
+        {
+            "per-contact": legacy_t.summary(),
+            "columnar": columnar_t.summary(),
+        },
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--contacts", type=int, default=5_000)
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--offsets", action="store_true")
+    args = parser.parse_args()
+    main(args.records, args.contacts, args.repeats, args.offsets)
@@ -140,13 +140,15 @@ async def test_parse_resume_pdf(email_service):
     # Create mock PDF content
     mock_pdf_content = b"mock pdf content"
     
-    with patch.object(email_service, '_parse_pdf') as mock_parse:
-        mock_parse.return_value = "Extracted text from PDF"
+    with patch('app.services.resume_extraction.run_extraction', new_callable=AsyncMock) as mock_run:
+        mock_run.return_value = "Extracted text from PDF"
         
         result = await email_service.parse_resume(mock_pdf_content, "resume.pdf")
         
         assert result.success
         assert result.text_content == "Extracted text from PDF"
+        # Parsed in the extraction pool, not on the event loop
+        mock_run.assert_awaited_once_with(EmailService._parse_pdf, mock_pdf_content)
 
 
 @pytest.mark.asyncio
@@ -26,6 +26,7 @@ from app.agents.brake import (
     check_brake,
     check_brake_or_raise,
     get_brake_state,
+    paused_users,
     resume_agents,
     verify_brake_completion,
 )
@@ -156,6 +157,18 @@ class TestCheckBrake:
 
         assert result is None
 
+    @pytest.mark.asyncio
+    async def test_paused_users_checks_many_with_one_mget(self, mock_redis):
+        """paused_users returns the braked subset using a single MGET."""
+        mock_redis.mget = AsyncMock(return_value=[None, "1"])
+
+        with patch("app.agents.brake._get_redis", return_value=mock_redis):
+            result = await paused_users(["a", "b", "a"])
+
+        assert result == {"b"}
+        mock_redis.mget.assert_awaited_once_with(["paused:a", "paused:b"])
+        mock_redis.aclose.assert_awaited_once()
+
 
 # ---------------------------------------------------------------------------
 # resume_agents tests
@@ -27,15 +27,16 @@ _USER_ID = "test-user-briefing-00000000-0000-0000-0000-000000000001"
 
 
 def _mock_gather_data(
-    matches=None, updates=None, approvals=0, warnings=None
+    matches=None, updates=None, approvals=0, warnings=None, cards=None
 ):
-    """Return a tuple mimicking asyncio.gather results for the 4 data queries."""
-    return (
-        matches or [],
-        updates or [],
-        approvals,
-        warnings or [],
-    )
+    """Return a dict mimicking _gather_briefing_data() section output."""
+    return {
+        "recent_matches": matches or [],
+        "application_updates": updates or [],
+        "pending_approvals": approvals,
+        "agent_warnings": warnings or [],
+        "pending_approval_cards": cards or [],
+    }
 
 
 # ---------------------------------------------------------------------------
@@ -65,49 +66,37 @@ class TestGenerateFullBriefing:
         mock_session.__aexit__ = AsyncMock(return_value=False)
 
         with patch(
-            "app.agents.briefing.generator._get_recent_matches",
+            "app.agents.briefing.generator._gather_briefing_data",
             new_callable=AsyncMock,
-            return_value=[{"id": "m1", "output": {"action": "job_match"}, "created_at": "2026-01-31T10:00:00"}],
+            return_value=_mock_gather_data(
+                matches=[{"id": "m1", "output": {"action": "job_match"}, "created_at": "2026-01-31T10:00:00"}],
+                approvals=2,
+            ),
         ):
             with patch(
-                "app.agents.briefing.generator._get_application_updates",
+                "app.agents.briefing.generator._llm_summarise",
                 new_callable=AsyncMock,
-                return_value=[],
+                return_value={
+                    "summary": "You have 1 new match and 2 pending approvals.",
+                    "actions_needed": ["Review 2 pending approvals"],
+                    "new_matches": [{"title": "ML Engineer", "company": "Acme", "reason": "Skills match"}],
+                    "activity_log": [],
+                    "metrics": {"total_matches": 1, "pending_approvals": 2, "applications_sent": 0},
+                },
             ):
                 with patch(
-                    "app.agents.briefing.generator._get_pending_approval_count",
-                    new_callable=AsyncMock,
-                    return_value=2,
+                    "app.db.engine.AsyncSessionLocal",
+                    return_value=mock_session,
                 ):
                     with patch(
-                        "app.agents.briefing.generator._get_agent_warnings",
-                        new_callable=AsyncMock,
-                        return_value=[],
+                        "redis.asyncio.from_url",
+                        return_value=mock_redis,
                     ):
-                        with patch(
-                            "app.agents.briefing.generator._llm_summarise",
-                            new_callable=AsyncMock,
-                            return_value={
-                                "summary": "You have 1 new match and 2 pending approvals.",
-                                "actions_needed": ["Review 2 pending approvals"],
-                                "new_matches": [{"title": "ML Engineer", "company": "Acme", "reason": "Skills match"}],
-                                "activity_log": [],
-                                "metrics": {"total_matches": 1, "pending_approvals": 2, "applications_sent": 0},
-                            },
-                        ):
-                            with patch(
-                                "app.db.engine.AsyncSessionLocal",
-                                return_value=mock_session,
-                            ):
-                                with patch(
-                                    "redis.asyncio.from_url",
-                                    return_value=mock_redis,
-                                ):
-                                    from app.agents.briefing.generator import (
-                                        generate_full_briefing,
-                                    )
-
-                                    briefing = await generate_full_briefing(_USER_ID)
+                        from app.agents.briefing.generator import (
+                            generate_full_briefing,
+                        )
+
+                        briefing = await generate_full_briefing(_USER_ID)
 
         # Verify briefing content
         assert briefing["briefing_type"] == "full"
@@ -136,40 +125,25 @@ class TestGenerateFullBriefing:
         mock_redis.set = AsyncMock(return_value=True)
         mock_redis.aclose = AsyncMock()
 
-        # All data queries return empty results
+        # All data sections are empty
         with patch(
-            "app.agents.briefing.generator._get_recent_matches",
+            "app.agents.briefing.generator._gather_briefing_data",
             new_callable=AsyncMock,
-            return_value=[],
+            return_value=_mock_gather_data(),
         ):
             with patch(
-                "app.agents.briefing.generator._get_application_updates",
-                new_callable=AsyncMock,
-                return_value=[],
+                "app.db.engine.AsyncSessionLocal",
+                return_value=mock_session,
             ):
                 with patch(
-                    "app.agents.briefing.generator._get_pending_approval_count",
-                    new_callable=AsyncMock,
-                    return_value=0,
+                    "redis.asyncio.from_url",
+                    return_value=mock_redis,
                 ):
-                    with patch(
-                        "app.agents.briefing.generator._get_agent_warnings",
-                        new_callable=AsyncMock,
-                        return_value=[],
-                    ):
-                        with patch(
-                            "app.db.engine.AsyncSessionLocal",
-                            return_value=mock_session,
-                        ):
-                            with patch(
-                                "redis.asyncio.from_url",
-                                return_value=mock_redis,
-                            ):
-                                from app.agents.briefing.generator import (
-                                    generate_full_briefing,
-                                )
-
-                                briefing = await generate_full_briefing(_USER_ID)
+                    from app.agents.briefing.generator import (
+                        generate_full_briefing,
+                    )
+
+                    briefing = await generate_full_briefing(_USER_ID)
 
         # Verify empty state content
         assert "still learning your preferences" in briefing["summary"]
@@ -178,6 +152,78 @@ class TestGenerateFullBriefing:
         assert len(briefing["tips"]) > 0
 
 
+# ---------------------------------------------------------------------------
+# Data gathering tests
+# ---------------------------------------------------------------------------
+
+
+def _tagged_row(section, **fields):
+    """Build a mock row shaped like the combined briefing query output."""
+    row = MagicMock()
+    row.section = section
+    row.id = fields.get("id", "row-1")
+    row.kind = fields.get("kind")
+    row.title = fields.get("title")
+    row.rationale = fields.get("rationale")
+    row.payload = fields.get("payload", {})
+    row.created_at = fields.get("created_at", datetime(2026, 1, 31, 10, 0, tzinfo=timezone.utc))
+    row.total = fields.get("total")
+    return row
+
+
+class TestGatherBriefingData:
+    """Tests for _gather_briefing_data() single-session gathering."""
+
+    @pytest.mark.asyncio
+    async def test_uses_one_session_and_one_statement(self):
+        """All sections come from a single execute() on a single session."""
+        rows = [
+            _tagged_row("recent_matches", id="m1", kind="job_scout", payload={"action": "job_match"}),
+            _tagged_row("application_updates", id="u1", kind="apply", payload={"status": "applied"}),
+            _tagged_row("pending_approvals", id="a1", payload={"job_title": "SWE"}, total=3),
+            _tagged_row("agent_warnings", id="w1", kind="rate_limit", title="Slow down"),
+        ]
+        mock_session = AsyncMock()
+        mock_result = MagicMock()
+        mock_result.all.return_value = rows
+        mock_session.execute = AsyncMock(return_value=mock_result)
+        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
+        mock_session.__aexit__ = AsyncMock(return_value=False)
+
+        with patch(
+            "app.db.engine.AsyncSessionLocal",
+            return_value=mock_session,
+        ) as mock_factory:
+            from app.agents.briefing.generator import _gather_briefing_data
+
+            data = await _gather_briefing_data(_USER_ID)
+
+        assert mock_factory.call_count == 1
+        mock_session.execute.assert_awaited_once()
+        assert data["recent_matches"][0]["output"] == {"action": "job_match"}
+        assert data["application_updates"][0]["agent_type"] == "apply"
+        assert data["pending_approvals"] == 3
+        assert data["pending_approval_cards"][0]["job_title"] == "SWE"
+        assert data["agent_warnings"][0]["title"] == "Slow down"
+        assert data["agent_warnings"][0]["event_type"] == "rate_limit"
+
+    def test_query_is_single_union(self):
+        """The gathering statement is one UNION ALL across all sections."""
+        from sqlalchemy.dialects import postgresql
+
+        from app.agents.briefing.generator import _build_briefing_data_query
+
+        stmt = _build_briefing_data_query(_USER_ID, datetime.now(timezone.utc))
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+        assert sql.count("UNION ALL") == 4
+        assert "count(*) OVER ()" in sql
+        for table in ("briefing_digests", "agent_outputs", "approval_queue", "agent_activities"):
+            assert table in sql
+        # Raw activity scans only run when the user has no running digest
+        assert sql.count("NOT (EXISTS") == 3
+
+
 # ---------------------------------------------------------------------------
 # Fallback / lite briefing tests
 # ---------------------------------------------------------------------------
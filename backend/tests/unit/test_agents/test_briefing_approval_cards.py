@@ -16,10 +16,13 @@ import pytest
 # ---------------------------------------------------------------------------
 
 
-def _mock_approval_row(item_id=None, job_title="Backend Engineer", company="BigTech"):
-    """Create a mock ApprovalQueueItem row."""
+def _mock_approval_row(item_id=None, job_title="Backend Engineer", company="BigTech", total=2):
+    """Create a mock tagged row from the combined briefing query."""
     row = MagicMock()
-    row.id = item_id or uuid4()
+    row.section = "pending_approvals"
+    row.id = str(item_id or uuid4())
+    row.kind = "apply"
+    row.title = None
     row.payload = {
         "job_id": "job-uuid-123",
         "job_title": job_title,
@@ -28,75 +31,92 @@ def _mock_approval_row(item_id=None, job_title="Backend Engineer", company="BigT
     }
     row.rationale = "High match score"
     row.created_at = datetime(2026, 2, 1, 10, 0, tzinfo=timezone.utc)
+    row.total = total
     return row
 
 
+def _mock_session_cm(rows):
+    """Wrap rows in a mocked AsyncSessionLocal() context manager."""
+    mock_sess = AsyncMock()
+    mock_result = MagicMock()
+    mock_result.all.return_value = rows
+    mock_sess.execute = AsyncMock(return_value=mock_result)
+
+    mock_cm = AsyncMock()
+    mock_cm.__aenter__ = AsyncMock(return_value=mock_sess)
+    mock_cm.__aexit__ = AsyncMock(return_value=False)
+    return mock_cm, mock_sess
+
+
 # ---------------------------------------------------------------------------
-# Test: _get_pending_approval_cards
+# Test: approval cards from _gather_briefing_data
 # ---------------------------------------------------------------------------
 
 
-class TestGetPendingApprovalCards:
-    """Tests for the approval cards data-gathering function."""
+class TestGatherApprovalCards:
+    """Tests for approval cards produced by the combined data gatherer."""
 
     @pytest.mark.asyncio
     async def test_returns_structured_card_data(self):
         """Returns cards with item_id, job_title, company, method, rationale."""
-        mock_sess = AsyncMock()
-        mock_result = MagicMock()
-        mock_result.scalars.return_value.all.return_value = [
+        mock_cm, _ = _mock_session_cm([
             _mock_approval_row(job_title="Frontend Dev", company="StartupCo"),
             _mock_approval_row(job_title="Backend Engineer", company="BigTech"),
-        ]
-        mock_sess.execute = AsyncMock(return_value=mock_result)
-
-        mock_cm = AsyncMock()
-        mock_cm.__aenter__ = AsyncMock(return_value=mock_sess)
-        mock_cm.__aexit__ = AsyncMock(return_value=False)
+        ])
 
         with patch("app.db.engine.AsyncSessionLocal", return_value=mock_cm):
-            from app.agents.briefing.generator import _get_pending_approval_cards
+            from app.agents.briefing.generator import _gather_briefing_data
 
-            cards = await _get_pending_approval_cards("user123")
+            data = await _gather_briefing_data("user123")
 
+        cards = data["pending_approval_cards"]
         assert len(cards) == 2
         assert cards[0]["job_title"] == "Frontend Dev"
         assert cards[0]["company"] == "StartupCo"
         assert cards[0]["submission_method"] == "api"
         assert cards[0]["rationale"] == "High match score"
         assert "item_id" in cards[0]
+        assert data["pending_approvals"] == 2
 
     @pytest.mark.asyncio
-    async def test_returns_empty_list_when_no_pending(self):
-        """Returns empty list when no pending approval items."""
-        mock_sess = AsyncMock()
-        mock_result = MagicMock()
-        mock_result.scalars.return_value.all.return_value = []
-        mock_sess.execute = AsyncMock(return_value=mock_result)
+    async def test_pending_count_exceeds_card_limit(self):
+        """The pending count comes from the window total, not the card count."""
+        mock_cm, _ = _mock_session_cm([_mock_approval_row(total=37)])
 
-        mock_cm = AsyncMock()
-        mock_cm.__aenter__ = AsyncMock(return_value=mock_sess)
-        mock_cm.__aexit__ = AsyncMock(return_value=False)
+        with patch("app.db.engine.AsyncSessionLocal", return_value=mock_cm):
+            from app.agents.briefing.generator import _gather_briefing_data
+
+            data = await _gather_briefing_data("user123")
+
+        assert len(data["pending_approval_cards"]) == 1
+        assert data["pending_approvals"] == 37
+
+    @pytest.mark.asyncio
+    async def test_returns_empty_list_when_no_pending(self):
+        """Returns empty cards and zero count when no pending approval items."""
+        mock_cm, _ = _mock_session_cm([])
 
         with patch("app.db.engine.AsyncSessionLocal", return_value=mock_cm):
-            from app.agents.briefing.generator import _get_pending_approval_cards
+            from app.agents.briefing.generator import _gather_briefing_data
 
-            cards = await _get_pending_approval_cards("user123")
+            data = await _gather_briefing_data("user123")
 
-        assert cards == []
+        assert data["pending_approval_cards"] == []
+        assert data["pending_approvals"] == 0
 
     @pytest.mark.asyncio
     async def test_graceful_fallback_on_error(self):
-        """Returns empty list when database query fails."""
+        """Returns empty sections when the database query fails."""
         with patch(
             "app.db.engine.AsyncSessionLocal",
             side_effect=Exception("DB connection failed"),
         ):
-            from app.agents.briefing.generator import _get_pending_approval_cards
+            from app.agents.briefing.generator import _gather_briefing_data
 
-            cards = await _get_pending_approval_cards("user123")
+            data = await _gather_briefing_data("user123")
 
-        assert cards == []
+        assert data["pending_approval_cards"] == []
+        assert data["recent_matches"] == []
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,424 @@
+"""
+Tests for the running briefing digest.
+
+Covers: folding agent outputs into the digest, consuming a briefing's
+snapshot and advancing its window, the BaseAgent.run hook, the generator
+reading a digest row while still scanning actions the digest does not
+summarise, the pending-approval count kept on the row, and the lite
+fallback rendering the Redis mirror without touching the database.
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.agents.briefing.digest import (
+    BRIEFING_LOOKBACK,
+    DIGEST_ACTIONS,
+    consume_digest,
+    _update_digest_row,
+    digest_to_sections,
+    empty_digest,
+    has_activity,
+    is_digest_relevant,
+    merge_agent_output,
+    refresh_pending_approvals,
+    subtract_consumed,
+)
+
+_USER_ID = "test-user-digest-00000000-0000-0000-0000-000000000001"
+_AT = datetime(2026, 2, 1, 9, 0, tzinfo=timezone.utc)
+
+
+def _scout_output(matches_created=2, top=None):
+    return {
+        "action": "job_scout_complete",
+        "rationale": "Found jobs",
+        "data": {
+            "matches_created": matches_created,
+            "top_matches": top if top is not None else [
+                {"job_id": "j1", "title": "Backend Dev", "company": "Acme", "score": 82, "reason": "Python"},
+                {"job_id": "j2", "title": "ML Eng", "company": "DataCo", "score": 91, "reason": "ML"},
+            ],
+        },
+    }
+
+
+# ---------------------------------------------------------------------------
+# Pure digest merging
+# ---------------------------------------------------------------------------
+
+
+class TestMergeAgentOutput:
+    """Tests for merge_agent_output()."""
+
+    def test_scout_adds_matches_sorted_by_score(self):
+        digest = merge_agent_output(empty_digest(), "job_scout", _scout_output(), _AT)
+
+        assert digest["match_count"] == 2
+        assert [m["job_id"] for m in digest["top_matches"]] == ["j2", "j1"]
+        assert digest["top_matches"][0]["at"] == _AT.isoformat()
+
+    def test_top_matches_are_capped(self):
+        top = [
+            {"job_id": f"j{i}", "title": "T", "company": "C", "score": i, "reason": ""}
+            for i in range(30)
+        ]
+        digest = merge_agent_output(
+            empty_digest(), "job_scout", _scout_output(matches_created=30, top=top), _AT
+        )
+
+        assert digest["match_count"] == 30
+        assert len(digest["top_matches"]) == 10
+        assert digest["top_matches"][0]["score"] == 29
+
+    def test_application_submitted_counts_and_logs(self):
+        output = {
+            "action": "application_submitted",
+            "rationale": "Application recorded for SWE at BigCo via api",
+            "data": {"application_id": "a1", "job_id": "j1"},
+        }
+        digest = merge_agent_output(empty_digest(), "apply", output, _AT)
+
+        assert digest["applications_sent"] == 1
+        assert digest["status_changes"][0]["application_id"] == "a1"
+        assert digest["warnings"] == []
+
+    def test_pipeline_transition_recorded(self):
+        output = {
+            "action": "pipeline_status_updated",
+            "rationale": "Detected 'interview'",
+            "data": {"application_id": "a1", "old_status": "applied", "new_status": "interview"},
+        }
+        digest = merge_agent_output(empty_digest(), "pipeline", output, _AT)
+
+        change = digest["status_changes"][0]
+        assert change["old_status"] == "applied"
+        assert change["new_status"] == "interview"
+
+    def test_failures_become_warnings(self):
+        output = {
+            "action": "application_failed",
+            "rationale": "No tailored resume found for this job",
+            "data": {"error": "missing_materials"},
+        }
+        digest = merge_agent_output(empty_digest(), "apply", output, _AT)
+
+        assert digest["applications_sent"] == 0
+        assert digest["warnings"][0]["event_type"] == "agent.apply.application_failed"
+
+    def test_does_not_mutate_input(self):
+        original = empty_digest()
+        merge_agent_output(original, "job_scout", _scout_output(), _AT)
+
+        assert original == empty_digest()
+
+
+class TestDigestRelevance:
+    """Tests for is_digest_relevant() and has_activity()."""
+
+    def test_scout_without_matches_is_ignored(self):
+        assert not is_digest_relevant("job_scout", _scout_output(matches_created=0))
+
+    def test_unrelated_agent_is_ignored(self):
+        assert not is_digest_relevant("resume", {"action": "resume_tailored", "data": {}})
+
+    def test_status_change_is_relevant(self):
+        assert is_digest_relevant("apply", {"action": "application_submitted", "data": {}})
+
+    def test_has_activity(self):
+        assert not has_activity(None)
+        assert not has_activity(empty_digest())
+        assert has_activity({**empty_digest(), "match_count": 1})
+
+
+class TestSubtractConsumed:
+    """Tests for subtract_consumed()."""
+
+    def test_keeps_entries_recorded_after_snapshot(self):
+        snapshot = merge_agent_output(empty_digest(), "job_scout", _scout_output(), _AT)
+        later = datetime(2026, 2, 1, 10, 0, tzinfo=timezone.utc)
+        current = merge_agent_output(
+            snapshot,
+            "apply",
+            {"action": "application_submitted", "rationale": "sent", "data": {"application_id": "a9"}},
+            later,
+        )
+
+        remaining = subtract_consumed(current, snapshot)
+
+        assert remaining["match_count"] == 0
+        assert remaining["top_matches"] == []
+        assert remaining["applications_sent"] == 1
+        assert remaining["status_changes"][0]["application_id"] == "a9"
+
+
+class TestDigestToSections:
+    """Tests for digest_to_sections()."""
+
+    def test_projects_matches_with_titles(self):
+        digest = merge_agent_output(empty_digest(), "job_scout", _scout_output(), _AT)
+        sections = digest_to_sections(digest)
+
+        assert sections["match_count"] == 2
+        assert sections["recent_matches"][0]["output"]["title"] == "ML Eng"
+        assert sections["recent_matches"][0]["output"]["company"] == "DataCo"
+
+
+# ---------------------------------------------------------------------------
+# Integration with BaseAgent, generator and fallback
+# ---------------------------------------------------------------------------
+
+
+class TestBaseAgentHook:
+    """BaseAgent.run() folds every output into the digest."""
+
+    @pytest.mark.asyncio
+    async def test_run_updates_digest(self):
+        from app.agents.base import AgentOutput, BaseAgent
+
+        class _Agent(BaseAgent):
+            agent_type = "apply"
+
+            async def execute(self, user_id, task_data):
+                return AgentOutput(action="application_submitted", rationale="sent")
+
+        agent = _Agent()
+        with patch("app.agents.brake.check_brake", new_callable=AsyncMock, return_value=False), \
+                patch.object(agent, "_record_output", new_callable=AsyncMock), \
+                patch.object(agent, "_record_activity", new_callable=AsyncMock), \
+                patch.object(agent, "_publish_event", new_callable=AsyncMock), \
+                patch(
+                    "app.agents.briefing.digest.record_agent_output",
+                    new_callable=AsyncMock,
+                ) as mock_record:
+            await agent.run(_USER_ID, {})
+
+        mock_record.assert_awaited_once()
+        args = mock_record.await_args.args
+        assert args[0] == _USER_ID
+        assert args[1] == "apply"
+        assert args[2]["action"] == "application_submitted"
+
+    @pytest.mark.asyncio
+    async def test_digest_failure_does_not_break_run(self):
+        from app.agents.base import AgentOutput, BaseAgent
+
+        class _Agent(BaseAgent):
+            agent_type = "apply"
+
+            async def execute(self, user_id, task_data):
+                return AgentOutput(action="application_submitted", rationale="sent")
+
+        agent = _Agent()
+        with patch("app.agents.brake.check_brake", new_callable=AsyncMock, return_value=False), \
+                patch.object(agent, "_record_output", new_callable=AsyncMock), \
+                patch.object(agent, "_record_activity", new_callable=AsyncMock), \
+                patch.object(agent, "_publish_event", new_callable=AsyncMock) as mock_publish, \
+                patch(
+                    "app.agents.briefing.digest.record_agent_output",
+                    new_callable=AsyncMock,
+                    side_effect=RuntimeError("db down"),
+                ):
+            output = await agent.run(_USER_ID, {})
+
+        assert output.action == "application_submitted"
+        mock_publish.assert_awaited_once()
+
+
+class TestGeneratorReadsDigest:
+    """The generator uses a digest row instead of raw activity rows."""
+
+    @pytest.mark.asyncio
+    async def test_digest_row_populates_sections(self):
+        digest = merge_agent_output(empty_digest(), "job_scout", _scout_output(), _AT)
+        row = MagicMock()
+        row.section = "digest"
+        row.payload = digest
+
+        mock_session = AsyncMock()
+        mock_result = MagicMock()
+        mock_result.all.return_value = [row]
+        mock_session.execute = AsyncMock(return_value=mock_result)
+        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
+        mock_session.__aexit__ = AsyncMock(return_value=False)
+
+        with patch("app.db.engine.AsyncSessionLocal", return_value=mock_session):
+            from app.agents.briefing.generator import _gather_briefing_data
+
+            data = await _gather_briefing_data(_USER_ID)
+
+        assert data["digest"] == digest
+        assert data["match_count"] == 2
+        assert len(data["recent_matches"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_full_briefing_consumes_digest(self):
+        digest = merge_agent_output(empty_digest(), "job_scout", _scout_output(), _AT)
+        gathered = {
+            **digest_to_sections(digest),
+            "pending_approvals": 0,
+            "pending_approval_cards": [],
+            "digest": digest,
+            "gathered_at": _AT,
+        }
+
+        with patch(
+            "app.agents.briefing.generator._gather_briefing_data",
+            new_callable=AsyncMock,
+            return_value=gathered,
+        ), patch(
+            "app.agents.briefing.generator._llm_summarise",
+            new_callable=AsyncMock,
+            return_value={"summary": "ok", "metrics": {}},
+        ) as mock_llm, patch(
+            "app.agents.briefing.generator._store_briefing",
+            new_callable=AsyncMock,
+            return_value="b1",
+        ), patch(
+            "app.agents.briefing.generator._cache_briefing",
+            new_callable=AsyncMock,
+        ), patch(
+            "app.agents.briefing.digest.consume_digest",
+            new_callable=AsyncMock,
+        ) as mock_consume:
+            from app.agents.briefing.generator import generate_full_briefing
+
+            await generate_full_briefing(_USER_ID)
+
+        assert mock_llm.await_args.args[0]["match_count"] == 2
+        mock_consume.assert_awaited_once_with(_USER_ID, digest, _AT)
+
+    def test_query_only_skips_what_the_digest_covers(self):
+        from sqlalchemy.dialects import postgresql
+
+        from app.agents.briefing.generator import _build_briefing_data_query
+
+        stmt = _build_briefing_data_query(_USER_ID, _AT - BRIEFING_LOOKBACK)
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+        # Updates and warnings outside the digest are still scanned, from
+        # the digest's window onwards.
+        assert sql.count("briefing_digests.window_start") >= 3
+        assert "agent_outputs.output ->>" in sql
+        assert "agent_activities.event_type NOT IN" in sql
+        assert {"application_submitted", "application_failed"} <= DIGEST_ACTIONS
+
+    @pytest.mark.asyncio
+    async def test_consume_advances_window(self):
+        consumed = merge_agent_output(empty_digest(), "job_scout", _scout_output(), _AT)
+        later = merge_agent_output(consumed, "apply", {"action": "application_submitted"}, _AT)
+
+        with patch(
+            "app.agents.briefing.digest._update_digest_row",
+            new_callable=AsyncMock,
+            return_value={},
+        ) as mock_update, patch(
+            "app.agents.briefing.digest._mirror_to_cache", new_callable=AsyncMock
+        ):
+            await consume_digest(_USER_ID, consumed, _AT)
+
+        update = mock_update.await_args.args[1]
+        assert update(later)["applications_sent"] == 1
+        assert update(later)["match_count"] == 0
+        assert mock_update.await_args.kwargs["window_start"] == _AT
+
+
+class TestPendingApprovals:
+    """Every digest write recounts the user's pending approvals."""
+
+    @staticmethod
+    def _session(content, pending):
+        row = MagicMock(content=content)
+        locked = MagicMock()
+        locked.scalar_one.return_value = row
+        counted = MagicMock()
+        counted.scalar.return_value = pending
+        session = AsyncMock()
+        session.execute = AsyncMock(side_effect=[MagicMock(), locked, counted])
+        session.__aenter__ = AsyncMock(return_value=session)
+        session.__aexit__ = AsyncMock(return_value=False)
+        return session, row
+
+    @pytest.mark.asyncio
+    async def test_write_stores_pending_count(self):
+        session, row = self._session({"match_count": 1}, pending=2)
+
+        with patch("app.db.engine.AsyncSessionLocal", return_value=session):
+            content = await _update_digest_row(_USER_ID, lambda current: current)
+
+        assert content == {"match_count": 1, "pending_approvals": 2}
+        assert row.content == content
+        session.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_refresh_mirrors_the_new_count(self):
+        with patch(
+            "app.agents.briefing.digest._update_digest_row",
+            new_callable=AsyncMock,
+            return_value={"pending_approvals": 5},
+        ), patch(
+            "app.agents.briefing.digest._mirror_to_cache", new_callable=AsyncMock
+        ) as mock_mirror:
+            await refresh_pending_approvals(_USER_ID)
+
+        mock_mirror.assert_awaited_once_with(_USER_ID, {"pending_approvals": 5})
+
+    @pytest.mark.asyncio
+    async def test_refresh_failure_is_logged_not_raised(self):
+        with patch(
+            "app.agents.briefing.digest._update_digest_row",
+            new_callable=AsyncMock,
+            side_effect=ConnectionError("db down"),
+        ):
+            await refresh_pending_approvals(_USER_ID)
+
+
+class TestLiteBriefingFromDigest:
+    """The lite fallback renders the Redis digest mirror."""
+
+    @pytest.mark.asyncio
+    async def test_lite_briefing_uses_digest_without_db(self):
+        digest = merge_agent_output(empty_digest(), "job_scout", _scout_output(), _AT)
+        digest["pending_approvals"] = 3
+        mock_redis = AsyncMock()
+        mock_redis.get = AsyncMock(
+            side_effect=lambda key: json.dumps(digest) if key.startswith("briefing_digest:") else None
+        )
+        mock_redis.aclose = AsyncMock()
+
+        with patch("redis.asyncio.from_url", return_value=mock_redis), patch(
+            "app.db.engine.AsyncSessionLocal", side_effect=AssertionError("no DB access"),
+        ):
+            from app.agents.briefing.fallback import generate_lite_briefing
+
+            briefing = await generate_lite_briefing(_USER_ID)
+
+        assert briefing["briefing_type"] == "lite"
+        assert briefing["cached_from"] == "digest"
+        assert briefing["metrics"]["total_matches"] == 2
+        assert briefing["metrics"]["pending_approvals"] == 3
+        assert briefing["actions_needed"] == ["Review 3 pending approval(s)"]
+        assert briefing["new_matches"][0]["title"] == "ML Eng"
+
+    @pytest.mark.asyncio
+    async def test_lite_count_without_digest_comes_from_cached_briefing(self):
+        cached = {"metrics": {"total_matches": 1, "pending_approvals": 4, "applications_sent": 0}}
+        mock_redis = AsyncMock()
+        mock_redis.get = AsyncMock(
+            side_effect=lambda key: json.dumps(cached) if key.startswith("briefing_cache:") else None
+        )
+        mock_redis.aclose = AsyncMock()
+
+        with patch("redis.asyncio.from_url", return_value=mock_redis), patch(
+            "app.db.engine.AsyncSessionLocal", side_effect=AssertionError("no DB access"),
+        ):
+            from app.agents.briefing.fallback import generate_lite_briefing
+
+            briefing = await generate_lite_briefing(_USER_ID)
+
+        assert briefing["metrics"]["pending_approvals"] == 4
@@ -8,11 +8,14 @@ from __future__ import annotations
 
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
 
 import json
 
 import pytest
+from sqlalchemy.dialects import postgresql
 
+import app.db.models  # noqa: F401  (loaded before tests patch sys.modules)
 from app.agents.base import AgentOutput
 from app.agents.core.job_scout import JobScoutAgent
 
@@ -255,10 +258,9 @@ class TestExecute:
         mock_session.__aexit__ = AsyncMock(return_value=False)
         mock_session.flush = AsyncMock()
         mock_session.commit = AsyncMock()
-        mock_session.add = MagicMock()
-        # _create_matches queries existing matches; return empty result
+        # _create_matches inserts on conflict do nothing; one row is new.
         mock_execute_result = MagicMock()
-        mock_execute_result.all.return_value = []
+        mock_execute_result.scalars.return_value.all.return_value = [uuid4()]
         mock_session.execute = AsyncMock(return_value=mock_execute_result)
 
         # Create a mock module for app.db.engine since it can't be imported in test env
@@ -284,6 +286,10 @@ class TestExecute:
             new_callable=AsyncMock,
             return_value=raw_jobs,
         ), patch(
+            "app.services.match_feed_cache.bump_match_version",
+            new_callable=AsyncMock,
+            side_effect=lambda user_id: mock_session.commit.assert_awaited_once(),
+        ) as mock_bump, patch(
             "app.config.settings",
         ) as mock_settings:
             mock_settings.LLM_SCORING_ENABLED = False
@@ -293,7 +299,12 @@ class TestExecute:
         assert isinstance(result, AgentOutput)
         assert result.action == "job_scout_complete"
         assert result.data["jobs_found"] == 1
-        assert result.data["matches_created"] >= 0
+        assert result.data["matches_created"] == 1
+        # execute commits the insert once, then bumps the feed.
+        insert = str(mock_session.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT (user_id, job_id) DO NOTHING" in insert
+        mock_session.commit.assert_awaited_once()
+        mock_bump.assert_awaited_once_with("user-1")
 
     @pytest.mark.asyncio
     async def test_empty_preferences(self):
@@ -367,6 +378,165 @@ class TestExecute:
 # ---------------------------------------------------------------------------
 
 
+class TestCreateMatches:
+    """_create_matches inserts conflict-safely and counts only new rows."""
+
+    @pytest.mark.asyncio
+    async def test_counts_only_inserted_rows(self):
+        agent = JobScoutAgent()
+        session = MagicMock()
+        result = MagicMock()
+        # The second pair already exists (e.g. inserted by the fan-out).
+        result.scalars.return_value.all.return_value = [uuid4()]
+        session.execute = AsyncMock(return_value=result)
+        jobs = [_make_job(id="job-1"), _make_job(id="job-2")]
+
+        created = await agent._create_matches(
+            "user-1", [(job, 80, "{}") for job in jobs], session
+        )
+
+        assert created == 1
+        stmt = session.execute.await_args.args[0]
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT (user_id, job_id) DO NOTHING" in sql
+        assert "RETURNING matches.id" in sql
+        params = stmt.compile().params
+        assert [params["job_id_m0"], params["job_id_m1"]] == ["job-1", "job-2"]
+
+    @pytest.mark.asyncio
+    async def test_no_jobs_skips_the_insert(self):
+        session = MagicMock()
+        session.execute = AsyncMock()
+
+        assert await JobScoutAgent()._create_matches("user-1", [], session) == 0
+        session.execute.assert_not_awaited()
+
+
+class TestLearnedPreferencePruning:
+    """Learned preferences are applied in bulk before LLM refinement."""
+
+    def setup_method(self):
+        self.agent = JobScoutAgent()
+
+    @pytest.mark.asyncio
+    async def test_learned_negative_prunes_before_llm(self):
+        import sys
+
+        from app.services.preference_learning import PreferenceAdjuster
+
+        bad_job = _make_job(id="job-bad", company="BadCo")
+        good_job = _make_job(id="job-good", company="GoodCo")
+        base_score, _ = self.agent._score_job(good_job, FULL_PREFERENCES, FULL_PROFILE)
+        adjuster = PreferenceAdjuster([
+            SimpleNamespace(pattern_type="company", pattern_value="badco", confidence=0.95),
+        ])
+
+        mock_session = AsyncMock()
+        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
+        mock_session.__aexit__ = AsyncMock(return_value=False)
+        mock_execute_result = MagicMock()
+        mock_execute_result.scalars.return_value.all.return_value = []
+        mock_session.execute = AsyncMock(return_value=mock_execute_result)
+        mock_engine_module = MagicMock()
+        mock_engine_module.AsyncSessionLocal = MagicMock(return_value=mock_session)
+
+        llm_result = SimpleNamespace(
+            used_llm=False, score=base_score, rationale="", top_reasons=[],
+            concerns=[], confidence=None,
+        )
+
+        with patch(
+            "app.agents.orchestrator.get_user_context",
+            new_callable=AsyncMock,
+            return_value={"preferences": FULL_PREFERENCES, "profile": FULL_PROFILE},
+        ), patch.dict(sys.modules, {"app.db.engine": mock_engine_module}), patch(
+            "app.services.job_dedup.upsert_jobs",
+            new_callable=AsyncMock,
+            return_value=[bad_job, good_job],
+        ), patch.object(
+            self.agent, "_fetch_jobs", new_callable=AsyncMock, return_value=[MagicMock()],
+        ), patch.object(
+            self.agent, "_load_preference_adjuster", new_callable=AsyncMock, return_value=adjuster,
+        ), patch(
+            "app.services.job_scoring.score_job_with_llm",
+            new_callable=AsyncMock,
+            return_value=llm_result,
+        ) as mock_llm, patch(
+            "app.services.match_feed_cache.bump_match_version", new_callable=AsyncMock,
+        ), patch("app.config.settings") as mock_settings:
+            mock_settings.LLM_SCORING_ENABLED = True
+            mock_settings.SEMANTIC_TOP_K = 25
+            # Heuristic pre-filter sits just below the unadjusted score.
+            mock_settings.MATCH_SCORE_THRESHOLD = (base_score - 5) * 2
+            result = await self.agent.execute("user-1", {})
+
+        scored_ids = [call.args[0].id for call in mock_llm.await_args_list]
+        assert scored_ids == ["job-good"]
+        assert result.action == "job_scout_complete"
+
+
+class TestSemanticTopK:
+    """Only the semantically closest jobs are refined by the LLM."""
+
+    def setup_method(self):
+        self.agent = JobScoutAgent()
+
+    @pytest.mark.asyncio
+    async def test_llm_refines_only_top_k(self):
+        import sys
+
+        from app.services.preference_learning import PreferenceAdjuster
+
+        jobs = [_make_job(id=f"job-{i}") for i in range(6)]
+        base_score, _ = self.agent._score_job(jobs[0], FULL_PREFERENCES, FULL_PROFILE)
+
+        mock_session = AsyncMock()
+        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
+        mock_session.__aexit__ = AsyncMock(return_value=False)
+        mock_session.add = MagicMock()
+        mock_engine_module = MagicMock()
+        mock_engine_module.AsyncSessionLocal = MagicMock(return_value=mock_session)
+        llm_result = SimpleNamespace(
+            used_llm=False, score=base_score, rationale="", top_reasons=[],
+            concerns=[], confidence=None,
+        )
+
+        with patch(
+            "app.agents.orchestrator.get_user_context",
+            new_callable=AsyncMock,
+            return_value={"preferences": FULL_PREFERENCES, "profile": FULL_PROFILE},
+        ), patch.dict(sys.modules, {"app.db.engine": mock_engine_module}), patch(
+            "app.services.job_dedup.upsert_jobs", new_callable=AsyncMock, return_value=jobs,
+        ), patch.object(
+            self.agent, "_fetch_jobs", new_callable=AsyncMock, return_value=[MagicMock()],
+        ), patch.object(
+            self.agent, "_load_preference_adjuster", new_callable=AsyncMock,
+            return_value=PreferenceAdjuster(),
+        ), patch.object(
+            self.agent, "_create_matches", new_callable=AsyncMock, return_value=6,
+        ) as mock_create, patch(
+            "app.services.semantic_matching.select_for_refinement",
+            new_callable=AsyncMock,
+            return_value=[1, 4],
+        ) as mock_select, patch(
+            "app.services.job_scoring.score_job_with_llm",
+            new_callable=AsyncMock,
+            return_value=llm_result,
+        ) as mock_llm, patch(
+            "app.services.match_feed_cache.bump_match_version", new_callable=AsyncMock,
+        ), patch("app.config.settings") as mock_settings:
+            mock_settings.LLM_SCORING_ENABLED = True
+            mock_settings.SEMANTIC_TOP_K = 2
+            mock_settings.MATCH_SCORE_THRESHOLD = 40
+            await self.agent.execute("user-1", {})
+
+        assert mock_select.await_args.kwargs["top_k"] == 2
+        assert mock_select.await_args.kwargs["session"] is not None
+        assert [call.args[0].id for call in mock_llm.await_args_list] == ["job-1", "job-4"]
+        scored = mock_create.await_args.args[1]
+        assert [job.id for job, _, _ in scored] == [f"job-{i}" for i in range(6)]
+
+
 class TestCompanySizeScoring:
     """Tests for _score_company_size method."""
 
@@ -540,12 +710,8 @@ class TestStructuredRationaleInMatches:
         mock_session.flush = AsyncMock()
         mock_session.commit = AsyncMock()
 
-        # Track Match objects added to session
-        added_objects = []
-        mock_session.add = MagicMock(side_effect=lambda obj: added_objects.append(obj))
-
         mock_execute_result = MagicMock()
-        mock_execute_result.all.return_value = []
+        mock_execute_result.scalars.return_value.all.return_value = [uuid4()]
         mock_session.execute = AsyncMock(return_value=mock_execute_result)
 
         mock_engine_module = MagicMock()
@@ -577,13 +743,11 @@ class TestStructuredRationaleInMatches:
             result = await self.agent.execute("user-1", {})
 
         assert isinstance(result, AgentOutput)
-        # Verify at least one Match was added
-        if added_objects:
-            match_obj = added_objects[0]
-            rationale_str = match_obj.rationale
-            # Rationale should be valid JSON
-            parsed = json.loads(rationale_str)
-            assert "summary" in parsed
-            assert "top_reasons" in parsed
-            assert "concerns" in parsed
-            assert "confidence" in parsed
+        # The inserted match's rationale should be valid JSON
+        insert = mock_session.execute.await_args.args[0]
+        rationale_str = insert.compile().params["rationale_m0"]
+        parsed = json.loads(rationale_str)
+        assert "summary" in parsed
+        assert "top_reasons" in parsed
+        assert "concerns" in parsed
+        assert "confidence" in parsed
@@ -21,6 +21,17 @@ from app.services.network.engagement_tracking import EngagementOpportunity
 # ---------------------------------------------------------------------------
 
 
+@pytest.fixture(autouse=True)
+def _no_connection_graph():
+    """Keep execute() off the database; services get the request payload."""
+    with patch(
+        "app.services.network.connection_graph.update_connection_graph",
+        new_callable=AsyncMock,
+        return_value=None,
+    ):
+        yield
+
+
 @pytest.fixture
 def agent():
     return NetworkAgent()
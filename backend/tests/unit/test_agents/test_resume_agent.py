@@ -1,8 +1,10 @@
 """Tests for the Resume Agent (Story 5-1).
 
 Covers: LLM tailoring, document storage, AgentOutput structure,
-job analysis, keyword gap calculation, brake integration, error handling,
-and anti-hallucination system prompt verification.
+job analysis, local ATS scoring, brake integration, error handling,
+anti-hallucination system prompt verification, and incremental tailoring
+(section reuse across similar jobs, another company's summary, LLM
+section name variants and the savings it reports).
 """
 
 import json
@@ -10,6 +12,8 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from app.services.ats_scoring import IdfTable
+
 
 # ---------------------------------------------------------------------------
 # Fixtures
@@ -148,6 +152,7 @@ class TestResumeAgentHappyPath:
             patch("app.agents.orchestrator.get_user_context", mock_context),
             patch("openai.AsyncOpenAI", return_value=mock_client),
             patch("app.observability.cost_tracker.track_llm_cost", new_callable=AsyncMock),
+            patch("app.services.ats_scoring.load_idf_table", AsyncMock(return_value=IdfTable())),
         ):
             from app.agents.pro.resume_agent import ResumeAgent
 
@@ -155,11 +160,216 @@ class TestResumeAgentHappyPath:
             output = await agent.execute(user_id="user_test_123", task_data={"job_id": "job-uuid-123"})
 
         assert output.action == "resume_tailored"
-        assert output.data["ats_score"] == 82
         assert "document_id" in output.data
         assert "sections_modified" in output.data
         assert "keyword_gaps" in output.data
-        assert output.confidence == 0.82
+        # Score comes from the local analysis, cached on the document row.
+        cached = json.loads(mock_sess.execute.call_args_list[2].args[1]["ats"])
+        assert output.data["ats_score"] == cached["score"] != 82
+        assert output.confidence == cached["score"] / 100
+
+
+# ---------------------------------------------------------------------------
+# Test: Incremental tailoring
+# ---------------------------------------------------------------------------
+
+
+def _full_tailored_resume():
+    from app.agents.pro.resume_agent import TailoredSection
+
+    tailored = _sample_tailored_resume()
+    tailored.sections.append(
+        TailoredSection(
+            section_name="education",
+            original_content="BS in Computer Science from MIT (2018)",
+            tailored_content="BS in Computer Science from MIT (2018)",
+            changes_made=[],
+        )
+    )
+    return tailored
+
+
+class _FakeRedis:
+    """In-memory hashes with transactional pipelines."""
+
+    def __init__(self):
+        self.hashes: dict[str, dict[str, str]] = {}
+
+    async def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    async def hset(self, key, field, value):
+        self.hashes.setdefault(key, {})[field] = value
+
+    async def hdel(self, key, *fields):
+        for f in fields:
+            self.hashes.get(key, {}).pop(f, None)
+
+    async def expire(self, key, seconds):
+        return True
+
+    def pipeline(self, transaction=True):
+        calls = []
+
+        async def _execute():
+            return [await getattr(self, name)(*args) for name, args in calls]
+
+        pipe = MagicMock()
+        pipe.__aenter__ = AsyncMock(return_value=pipe)
+        pipe.__aexit__ = AsyncMock(return_value=False)
+        pipe.hset = lambda *args: calls.append(("hset", args))
+        pipe.expire = lambda *args: calls.append(("expire", args))
+        pipe.execute = _execute
+        return pipe
+
+
+class _TailoringRun:
+    """Runs ``execute`` against an in-memory Redis and a stubbed LLM."""
+
+    def __init__(self):
+        self.redis = _FakeRedis()
+
+    async def __call__(self, job_row, parsed, usage=(500, 300)):
+        mock_cm, mock_sess = _mock_session_cm()
+        job_result = MagicMock()
+        job_result.mappings.return_value.first.return_value = job_row
+        version_result = MagicMock()
+        version_result.scalar.return_value = 1
+        mock_sess.execute = AsyncMock(side_effect=[job_result, version_result, None])
+        mock_sess.commit = AsyncMock()
+
+        completion = MagicMock()
+        completion.choices = [MagicMock(message=MagicMock(parsed=parsed))]
+        completion.usage = MagicMock(prompt_tokens=usage[0], completion_tokens=usage[1])
+        self.client = AsyncMock()
+        self.client.beta.chat.completions.parse = AsyncMock(return_value=completion)
+
+        with (
+            patch("app.db.engine.AsyncSessionLocal", return_value=mock_cm),
+            patch(
+                "app.agents.orchestrator.get_user_context",
+                AsyncMock(return_value={"profile": _sample_profile(), "preferences": {}}),
+            ),
+            patch("openai.AsyncOpenAI", return_value=self.client),
+            patch("app.observability.cost_tracker.track_llm_cost", new_callable=AsyncMock),
+            patch("app.cache.redis_client.get_redis_client", AsyncMock(return_value=self.redis)),
+            patch("app.services.ats_scoring.load_idf_table", AsyncMock(return_value=IdfTable())),
+        ):
+            from app.agents.pro.resume_agent import ResumeAgent
+
+            return await ResumeAgent().execute(
+                user_id="user_test_123", task_data={"job_id": job_row["id"]}
+            )
+
+    def prompt(self) -> str:
+        return self.client.beta.chat.completions.parse.await_args.kwargs["messages"][1]["content"]
+
+
+class TestIncrementalTailoring:
+    """Sections are reused across jobs with overlapping requirements."""
+
+    @pytest.mark.asyncio
+    async def test_first_run_is_full_and_remembered(self):
+        run = _TailoringRun()
+
+        output = await run(_sample_job_row(), _full_tailored_resume())
+
+        tailoring = output.data["tailoring"]
+        assert tailoring["mode"] == "full"
+        assert tailoring["sections_regenerated"] == ["summary", "skills", "experience", "education"]
+        assert tailoring["tokens_used"] == 800
+        assert tailoring["tokens_saved"] == 0
+        for heading in ("[summary]", "[skills]", "[experience]", "[education]"):
+            assert heading in run.prompt()
+        assert list(run.redis.hashes) == ["resume_tailoring:v2:user_test_123"]
+        assert list(run.redis.hashes["resume_tailoring:v2:user_test_123"]) == ["job-uuid-123"]
+
+    @pytest.mark.asyncio
+    async def test_similar_job_reuses_all_sections_without_llm(self):
+        run = _TailoringRun()
+        await run(_sample_job_row(), _full_tailored_resume())
+
+        similar = {**_sample_job_row(), "id": "job-uuid-456"}
+        output = await run(similar, _full_tailored_resume())
+
+        run.client.beta.chat.completions.parse.assert_not_awaited()
+        tailoring = output.data["tailoring"]
+        assert tailoring["mode"] == "reused"
+        assert tailoring["source_job_id"] == "job-uuid-123"
+        assert tailoring["similarity"] == 1.0
+        assert tailoring["sections_regenerated"] == []
+        assert tailoring["tokens_used"] == 0
+        assert tailoring["tokens_saved"] == 800
+        assert output.action == "resume_tailored"
+
+    @pytest.mark.asyncio
+    async def test_only_sections_missing_from_prior_run_regenerate(self):
+        from app.agents.pro.resume_agent import TailoringResponse
+
+        run = _TailoringRun()
+        # First run's output has no education section, so nothing to reuse for it.
+        await run(_sample_job_row(), _sample_tailored_resume())
+
+        education_only = TailoringResponse(
+            sections=[_full_tailored_resume().sections[-1]],
+            tailoring_rationale="Kept education as is.",
+        )
+        output = await run(
+            {**_sample_job_row(), "id": "job-uuid-789"}, education_only, usage=(200, 50)
+        )
+
+        prompt = run.prompt()
+        assert "[education]" in prompt
+        assert "[skills]" not in prompt and "[experience]" not in prompt
+        tailoring = output.data["tailoring"]
+        assert tailoring["mode"] == "incremental"
+        assert tailoring["sections_regenerated"] == ["education"]
+        assert tailoring["sections_reused"] == ["experience", "skills", "summary"]
+        assert tailoring["tokens_saved"] == 800 - 250
+        assert "Reused 3 section(s)" in output.rationale
+        assert output.rationale.startswith("Kept education as is.")
+
+
+    @pytest.mark.asyncio
+    async def test_other_company_regenerates_summary(self):
+        from app.agents.pro.resume_agent import TailoringResponse
+
+        run = _TailoringRun()
+        await run(_sample_job_row(), _full_tailored_resume())
+
+        summary = _full_tailored_resume().sections[0].model_copy(
+            update={"tailored_content": "Backend engineer ready to scale OtherCo's APIs"}
+        )
+        output = await run(
+            {**_sample_job_row(), "id": "job-uuid-456", "company": "OtherCo"},
+            TailoringResponse(sections=[summary], tailoring_rationale="Addressed OtherCo."),
+        )
+
+        assert "Company: OtherCo" in run.prompt()
+        tailoring = output.data["tailoring"]
+        assert tailoring["sections_regenerated"] == ["summary"]
+        assert tailoring["sections_reused"] == ["education", "experience", "skills"]
+
+    @pytest.mark.asyncio
+    async def test_llm_section_name_variants_are_matched(self):
+        from app.agents.pro.resume_agent import TailoringResponse
+
+        run = _TailoringRun()
+        await run(_sample_job_row(), _sample_tailored_resume())
+
+        education = _full_tailored_resume().sections[-1].model_copy(
+            update={"section_name": " [Education] "}
+        )
+        await run(
+            {**_sample_job_row(), "id": "job-uuid-789"},
+            TailoringResponse(sections=[education], tailoring_rationale="Kept education."),
+        )
+
+        # Remembered under its heading, so the next run reuses every section.
+        output = await run({**_sample_job_row(), "id": "job-uuid-999"}, None)
+        run.client.beta.chat.completions.parse.assert_not_awaited()
+        assert output.data["tailoring"]["mode"] == "reused"
+        assert output.data["tailoring"]["source_job_id"] == "job-uuid-789"
 
 
 # ---------------------------------------------------------------------------
@@ -194,36 +404,31 @@ class TestJobAnalysis:
 
 
 # ---------------------------------------------------------------------------
-# Test: Keyword gap calculation
+# Test: Local ATS scoring
 # ---------------------------------------------------------------------------
 
 
-class TestKeywordGaps:
-    """Tests for _calculate_keyword_gaps helper."""
+class TestLocalAtsScore:
+    """The ATS score and keyword lists come from ats_scoring, not the LLM."""
 
-    def test_keyword_gaps_identifies_matches_and_missing(self):
-        from app.agents.pro.resume_agent import ResumeAgent
-
-        agent = ResumeAgent()
-        job_analysis = {"keywords": ["python", "fastapi", "kubernetes", "react"]}
-        tailored = _sample_tailored_resume()
+    @pytest.mark.asyncio
+    async def test_llm_reported_score_is_replaced(self):
+        run = _TailoringRun()
 
-        gaps = agent._calculate_keyword_gaps(job_analysis, tailored)
+        output = await run(_sample_job_row(), _full_tailored_resume())
 
+        gaps = output.data["keyword_gaps"]
         assert "python" in gaps["matched"]
         assert "fastapi" in gaps["matched"]
-        assert isinstance(gaps["match_rate"], float)
         assert 0 <= gaps["match_rate"] <= 1
+        assert output.data["keywords_incorporated"] == gaps["matched"]
+        assert output.data["ats_score"] != 82
 
-    def test_keyword_gaps_empty_keywords(self):
-        from app.agents.pro.resume_agent import ResumeAgent
-
-        agent = ResumeAgent()
-        job_analysis = {"keywords": []}
-        tailored = _sample_tailored_resume()
+    def test_system_prompt_no_longer_asks_for_ats_score(self):
+        from app.agents.pro.resume_agent import _SYSTEM_PROMPT, TailoringResponse
 
-        gaps = agent._calculate_keyword_gaps(job_analysis, tailored)
-        assert gaps["match_rate"] == 0  # 0/max(0,1) = 0
+        assert "ATS score" not in _SYSTEM_PROMPT
+        assert set(TailoringResponse.model_fields) == {"sections", "tailoring_rationale"}
 
 
 # ---------------------------------------------------------------------------
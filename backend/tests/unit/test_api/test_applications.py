@@ -268,25 +268,19 @@ class TestBatchApprove:
 
     @pytest.mark.asyncio
     async def test_batch_approve_multiple_items(self):
-        """Batch approves multiple items successfully."""
-        # Each approve call needs its own session
-        sessions = []
-        for _ in range(2):
-            cm, sess = _mock_session_cm()
-            mock_select = MagicMock()
-            mock_select.mappings.return_value.first.return_value = _sample_queue_row()
-            mock_update = MagicMock()
-            sess.execute = AsyncMock(side_effect=[mock_select, mock_update])
-            sess.commit = AsyncMock()
-            sessions.append(cm)
+        """Batch approves through the pipeline, counting settled items only."""
+        results = [
+            {"item_id": "item-1", "status": "cover_letter_generated", "cover_letter_document_id": "cl-1"},
+            {"item_id": "item-2", "status": "failed", "error": "Approval item not found"},
+            {"item_id": "item-1", "status": "approved", "cover_letter_document_id": "cl-1"},
+        ]
 
-        with (
-            patch("app.db.engine.AsyncSessionLocal", side_effect=sessions),
-            patch(
-                "app.agents.orchestrator.dispatch_task",
-                new_callable=AsyncMock,
-            ),
-        ):
+        async def _approve_batch(user_id, item_ids):
+            assert (user_id, item_ids) == ("user123", ["item-1", "item-2"])
+            for result in results:
+                yield result
+
+        with patch("app.services.batch_apply.approve_batch", _approve_batch):
             from app.api.v1.applications import BatchApproveRequest, batch_approve
 
             result = await batch_approve(
@@ -294,8 +288,31 @@ class TestBatchApprove:
                 user_id="user123",
             )
 
-        assert result.approved == 2
-        assert result.failed == 0
+        assert result.approved == 1
+        assert result.failed == 1
+        assert result.details == results[1:]
+
+    @pytest.mark.asyncio
+    async def test_batch_approve_stream_emits_ndjson(self):
+        """Streams one JSON line per result and a closing summary."""
+        import json
+
+        async def _approve_batch(user_id, item_ids):
+            yield {"item_id": "item-1", "status": "cover_letter_generated", "cover_letter_document_id": "cl-1"}
+            yield {"item_id": "item-1", "status": "approved", "cover_letter_document_id": "cl-1"}
+
+        with patch("app.services.batch_apply.approve_batch", _approve_batch):
+            from app.api.v1.applications import BatchApproveRequest, batch_approve_stream
+
+            response = await batch_approve_stream(
+                body=BatchApproveRequest(item_ids=["item-1"]),
+                user_id="user123",
+            )
+            lines = [json.loads(chunk) async for chunk in response.body_iterator]
+
+        assert response.media_type == "application/x-ndjson"
+        assert [line["status"] for line in lines] == ["cover_letter_generated", "approved", "complete"]
+        assert lines[-1] == {"status": "complete", "approved": 1, "failed": 0}
 
     @pytest.mark.asyncio
     async def test_batch_approve_empty_list_returns_400(self):
@@ -766,21 +766,68 @@ class TestDiffATSMetrics:
         assert result["keywords_missing"] == ["kubernetes"]
         assert "tailoring_rationale" in result
 
+    @pytest.mark.asyncio
+    async def test_cached_ats_analysis_preferred_over_content(self):
+        """A current cached analysis replaces the score stored in content."""
+        mock_cm, mock_sess = _mock_session_cm()
+
+        mock_tailored = MagicMock()
+        mock_tailored.mappings.return_value.first.return_value = {
+            "id": uuid4(),
+            "type": "resume",
+            "content": _make_tailored_content(),
+            "job_id": uuid4(),
+            "version": 1,
+            "created_at": datetime(2026, 1, 15, tzinfo=timezone.utc),
+            "ats_analysis": _make_low_score_analysis(),
+        }
+        mock_master = MagicMock()
+        mock_master.mappings.return_value.first.return_value = {
+            "id": uuid4(),
+            "content": _make_master_content(),
+        }
+        mock_job = MagicMock()
+        mock_job.mappings.return_value.first.return_value = {"title": "Eng", "company": "Co"}
+        mock_sess.execute = AsyncMock(side_effect=[mock_tailored, mock_master, mock_job])
+
+        with patch("app.db.engine.AsyncSessionLocal", return_value=mock_cm):
+            from app.api.v1.documents import get_document_diff
+
+            result = await get_document_diff(document_id=str(uuid4()), user_id="user123")
+
+        assert result["ats_score"] == 45
+        assert result["keywords_incorporated"] == ["python"]
+        assert len(result["keywords_missing"]) == 5
+
 
 # ---------------------------------------------------------------------------
 # ATS analysis helpers
 # ---------------------------------------------------------------------------
 
 
-def _make_low_score_content():
-    """Return JSON content with ATS score below 70."""
-    return json.dumps({
-        "sections": [],
-        "keywords_incorporated": ["python"],
-        "keywords_missing": ["kubernetes", "docker", "aws", "terraform", "ci/cd"],
-        "ats_score": 45,
-        "tailoring_rationale": "Limited keyword match",
-    })
+def _make_ats_analysis(score=82, matched=None, missing=None, match_rate=0.75):
+    """Return a cached ``documents.ats_analysis`` value."""
+    from app.services.ats_scoring import ANALYSIS_VERSION
+
+    return {
+        "version": ANALYSIS_VERSION,
+        "score": score,
+        "matched": ["python", "fastapi", "backend"] if matched is None else matched,
+        "missing": ["kubernetes"] if missing is None else missing,
+        "match_rate": match_rate,
+        "keywords": [],
+        "idf_version": None,
+    }
+
+
+def _make_low_score_analysis():
+    """Return a cached analysis with ATS score below 70."""
+    return _make_ats_analysis(
+        score=45,
+        matched=["python"],
+        missing=["kubernetes", "docker", "aws", "terraform", "ci/cd"],
+        match_rate=0.17,
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -800,8 +847,8 @@ class TestATSAnalysisHappyPath:
         mock_result.mappings.return_value.first.return_value = {
             "id": uuid4(),
             "type": "resume",
-            "content": _make_tailored_content(),
             "job_id": uuid4(),
+            "ats_analysis": _make_ats_analysis(),
         }
         mock_sess.execute = AsyncMock(return_value=mock_result)
 
@@ -816,6 +863,37 @@ class TestATSAnalysisHappyPath:
         assert result["match_rate"] == 0.75  # 3/(3+1)
         assert result["warning"] is None  # Score >= 70
         assert len(result["format_recommendations"]) > 0
+        mock_sess.execute.assert_awaited_once()  # served from the cached analysis
+
+    @pytest.mark.asyncio
+    async def test_uncached_analysis_is_computed_and_stored(self):
+        """Documents without a current analysis are scored on first request."""
+        mock_cm, mock_sess = _mock_session_cm()
+        doc_id = uuid4()
+
+        mock_result = MagicMock()
+        mock_result.mappings.return_value.first.return_value = {
+            "id": doc_id,
+            "type": "resume",
+            "job_id": uuid4(),
+            "ats_analysis": None,
+        }
+        mock_sess.execute = AsyncMock(return_value=mock_result)
+        analyze = AsyncMock(return_value=[
+            {"document_id": str(doc_id), "job_id": "j", "analysis": _make_low_score_analysis()}
+        ])
+
+        with (
+            patch("app.db.engine.AsyncSessionLocal", return_value=mock_cm),
+            patch("app.services.ats_scoring.analyze_user_documents", analyze),
+        ):
+            from app.api.v1.documents import get_ats_analysis
+
+            result = await get_ats_analysis(document_id=str(doc_id), user_id="user123")
+
+        analyze.assert_awaited_once_with(mock_sess, "user123", [str(doc_id)])
+        assert result["ats_score"] == 45
+        assert result["match_rate"] == 0.17
 
     @pytest.mark.asyncio
     async def test_format_recommendations_present(self):
@@ -826,8 +904,8 @@ class TestATSAnalysisHappyPath:
         mock_result.mappings.return_value.first.return_value = {
             "id": uuid4(),
             "type": "resume",
-            "content": _make_tailored_content(),
             "job_id": uuid4(),
+            "ats_analysis": _make_ats_analysis(),
         }
         mock_sess.execute = AsyncMock(return_value=mock_result)
 
@@ -859,8 +937,8 @@ class TestATSLowScoreWarning:
         mock_result.mappings.return_value.first.return_value = {
             "id": uuid4(),
             "type": "resume",
-            "content": _make_low_score_content(),
             "job_id": uuid4(),
+            "ats_analysis": _make_low_score_analysis(),
         }
         mock_sess.execute = AsyncMock(return_value=mock_result)
 
@@ -883,8 +961,8 @@ class TestATSLowScoreWarning:
         mock_result.mappings.return_value.first.return_value = {
             "id": uuid4(),
             "type": "resume",
-            "content": _make_tailored_content(),  # ats_score=82
             "job_id": uuid4(),
+            "ats_analysis": _make_ats_analysis(),  # score=82
         }
         mock_sess.execute = AsyncMock(return_value=mock_result)
 
@@ -953,3 +1031,35 @@ class TestATSAnalysisValidation:
 
         assert exc_info.value.status_code == 400
         assert "tailored" in str(exc_info.value.detail).lower()
+
+
+# ---------------------------------------------------------------------------
+# Test: Bulk ATS analysis
+# ---------------------------------------------------------------------------
+
+
+class TestListATSAnalyses:
+    """Tests for GET /ats-analysis."""
+
+    @pytest.mark.asyncio
+    async def test_returns_every_tailored_resume(self):
+        mock_cm, mock_sess = _mock_session_cm()
+        analyze = AsyncMock(return_value=[
+            {"document_id": "d1", "job_id": "j1", "analysis": _make_ats_analysis()},
+            {"document_id": "d2", "job_id": "j2", "analysis": _make_low_score_analysis()},
+        ])
+
+        with (
+            patch("app.db.engine.AsyncSessionLocal", return_value=mock_cm),
+            patch("app.services.ats_scoring.analyze_user_documents", analyze),
+        ):
+            from app.api.v1.documents import list_ats_analyses
+
+            result = await list_ats_analyses(refresh=True, user_id="user123")
+
+        analyze.assert_awaited_once_with(mock_sess, "user123", refresh=True)
+        assert result["total"] == 2
+        assert [d["document_id"] for d in result["documents"]] == ["d1", "d2"]
+        assert result["documents"][0]["job_id"] == "j1"
+        assert result["documents"][0]["warning"] is None
+        assert "kubernetes" in result["documents"][1]["warning"]
@@ -160,6 +160,17 @@ class TestMatchToResponse:
 # Tests: GET /matches via TestClient
 # ---------------------------------------------------------------------------
 
+@pytest.fixture(autouse=True)
+def _no_feed_cache():
+    """Run endpoint tests against the DB path unless a test opts into the cache."""
+    with patch(
+        "app.services.match_feed_cache.get_window",
+        new_callable=AsyncMock,
+        return_value=(None, None),
+    ) as mock_get_window:
+        yield mock_get_window
+
+
 @pytest.fixture
 def test_app():
     """Create a test FastAPI app by importing the matches router.
@@ -397,3 +408,266 @@ class TestUpdateMatchStatus:
 
         response = client.patch(f"/api/v1/matches/{match_id}", json={"status": "dismissed"})
         assert response.status_code == 400
+
+
+# ---------------------------------------------------------------------------
+# Tests: keyset pagination, cached totals and description modes
+# ---------------------------------------------------------------------------
+
+def _mock_page_db(matches, total=None):
+    """Mock DB returning an optional count result followed by a page of matches."""
+    mock_db = AsyncMock()
+    mock_matches_result = MagicMock()
+    mock_matches_result.scalars.return_value.all.return_value = matches
+    results = [mock_matches_result]
+    if total is not None:
+        mock_count_result = MagicMock()
+        mock_count_result.scalar_one.return_value = total
+        results.insert(0, mock_count_result)
+    mock_db.execute = AsyncMock(side_effect=results)
+    return mock_db
+
+
+class TestMatchesKeysetPagination:
+    def test_cursor_round_trip(self):
+        from decimal import Decimal
+
+        from app.api.v1.matches import _decode_cursor, _encode_cursor
+
+        match = _make_match(score=Decimal("87.50"))
+        score, match_id = _decode_cursor(_encode_cursor(match))
+        assert score == Decimal("87.50")
+        assert match_id == str(match.id)
+
+    def test_cursor_round_trip_null_score(self):
+        from app.api.v1.matches import _decode_cursor, _encode_cursor
+
+        match = _make_match(score=None)
+        assert _decode_cursor(_encode_cursor(match)) == (None, str(match.id))
+
+    def test_offset_page_returns_next_cursor_when_more_rows(self, test_app):
+        app, user, client, _, get_db = test_app
+
+        matches = [_make_match(user_id=user.id, score=90 - i) for i in range(3)]
+        mock_db = _mock_page_db(matches, total=3)
+
+        async def override_db():
+            yield mock_db
+
+        app.dependency_overrides[get_db] = override_db
+
+        response = client.get("/api/v1/matches?status=new&per_page=2")
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["data"]) == 2
+        assert data["meta"]["pagination"]["page"] == 1
+        assert data["meta"]["pagination"]["next_cursor"] is not None
+
+    def test_cursor_mode_seeks_after_cursor(self, test_app):
+        from app.api.v1.matches import _encode_cursor
+
+        app, user, client, _, get_db = test_app
+
+        last_seen = _make_match(user_id=user.id, score=80)
+        page = [_make_match(user_id=user.id, score=70)]
+        mock_db = _mock_page_db(page, total=2)
+
+        async def override_db():
+            yield mock_db
+
+        app.dependency_overrides[get_db] = override_db
+
+        response = client.get(
+            f"/api/v1/matches?status=new&per_page=5&cursor={_encode_cursor(last_seen)}"
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["meta"]["pagination"]["page"] is None
+        assert data["meta"]["pagination"]["next_cursor"] is None
+
+        page_query = str(mock_db.execute.await_args_list[-1].args[0])
+        assert "OFFSET" not in page_query
+        assert "matches.score <=" in page_query  # index bound, not just a filter
+        assert "matches.score <" in page_query
+
+    def test_invalid_cursor_returns_400(self, test_app):
+        app, user, client, _, get_db = test_app
+
+        mock_db = _mock_page_db([], total=0)
+
+        async def override_db():
+            yield mock_db
+
+        app.dependency_overrides[get_db] = override_db
+
+        response = client.get("/api/v1/matches?status=new&cursor=not-a-cursor")
+        assert response.status_code == 400
+
+    def test_cursor_with_tampered_match_id_is_rejected(self):
+        import base64
+        import json
+
+        from fastapi import HTTPException
+
+        from app.api.v1.matches import _decode_cursor
+
+        for match_id in ("not-a-uuid", 42, None):
+            cursor = base64.urlsafe_b64encode(json.dumps(["87.5", match_id]).encode()).decode()
+            with pytest.raises(HTTPException) as exc_info:
+                _decode_cursor(cursor.rstrip("="))
+            assert exc_info.value.status_code == 400
+
+    def test_cached_total_skips_count_query(self, test_app):
+        app, user, client, _, get_db = test_app
+
+        mock_db = _mock_page_db([_make_match(user_id=user.id)])
+
+        async def override_db():
+            yield mock_db
+
+        app.dependency_overrides[get_db] = override_db
+
+        with patch("app.cache.redis_client.cache_get", new_callable=AsyncMock, return_value="42"):
+            response = client.get("/api/v1/matches?status=new")
+
+        assert response.status_code == 200
+        assert response.json()["meta"]["pagination"]["total"] == 42
+        assert mock_db.execute.await_count == 1
+
+
+class TestMatchesDescriptionModes:
+    def test_truncated_description(self, test_app):
+        from app.api.v1.matches import DESCRIPTION_PREVIEW_CHARS
+
+        app, user, client, _, get_db = test_app
+
+        job = _make_job()
+        job.description = "x" * (DESCRIPTION_PREVIEW_CHARS + 100)
+        mock_db = _mock_page_db([_make_match(user_id=user.id, job=job)], total=1)
+
+        async def override_db():
+            yield mock_db
+
+        app.dependency_overrides[get_db] = override_db
+
+        response = client.get("/api/v1/matches?status=new&description=truncated")
+        assert response.status_code == 200
+        desc = response.json()["data"][0]["job"]["description"]
+        assert len(desc) == DESCRIPTION_PREVIEW_CHARS + 1
+        assert desc.endswith("…")
+
+    def test_description_none_is_omitted(self, test_app):
+        app, user, client, _, get_db = test_app
+
+        mock_db = _mock_page_db([_make_match(user_id=user.id)], total=1)
+
+        async def override_db():
+            yield mock_db
+
+        app.dependency_overrides[get_db] = override_db
+
+        response = client.get("/api/v1/matches?status=new&description=none")
+        assert response.status_code == 200
+        assert response.json()["data"][0]["job"]["description"] is None
+
+    def test_invalid_description_mode_returns_422(self, test_app):
+        app, user, client, _, get_db = test_app
+
+        mock_db = _mock_page_db([], total=0)
+
+        async def override_db():
+            yield mock_db
+
+        app.dependency_overrides[get_db] = override_db
+
+        response = client.get("/api/v1/matches?status=new&description=everything")
+        assert response.status_code == 422
+
+
+# ---------------------------------------------------------------------------
+# Tests: cached feed window
+# ---------------------------------------------------------------------------
+
+def _feed_window(matches, version=3, total=None, complete=True):
+    from app.api.v1.matches import _match_to_response
+    from app.services.match_feed_cache import FeedWindow
+
+    return FeedWindow(
+        version=version,
+        total=total if total is not None else len(matches),
+        items=[
+            {"sort_score": str(m.score), "match": _match_to_response(m).model_dump()}
+            for m in matches
+        ],
+        complete=complete,
+    )
+
+
+class TestMatchFeedCache:
+    def test_cached_window_serves_page_without_db(self, test_app, _no_feed_cache):
+        app, user, client, _, get_db = test_app
+
+        matches = [_make_match(user_id=user.id, score=90 - i) for i in range(3)]
+        _no_feed_cache.return_value = (_feed_window(matches, total=3), 3)
+        mock_db = AsyncMock()
+        mock_db.execute = AsyncMock(side_effect=AssertionError("feed must be served from cache"))
+
+        async def override_db():
+            yield mock_db
+
+        app.dependency_overrides[get_db] = override_db
+
+        response = client.get("/api/v1/matches?status=new&per_page=2&description=truncated")
+        assert response.status_code == 200
+        body = response.json()
+        assert [m["id"] for m in body["data"]] == [str(m.id) for m in matches[:2]]
+        assert body["meta"]["pagination"]["total"] == 3
+        assert body["meta"]["pagination"]["next_cursor"] is not None
+
+    def test_miss_rebuilds_and_stores_window(self, test_app, _no_feed_cache):
+        app, user, client, _, get_db = test_app
+
+        _no_feed_cache.return_value = (None, 5)
+        mock_db = _mock_page_db([_make_match(user_id=user.id)])
+
+        async def override_db():
+            yield mock_db
+
+        app.dependency_overrides[get_db] = override_db
+
+        with patch(
+            "app.services.match_feed_cache.store_window", new_callable=AsyncMock
+        ) as mock_store:
+            response = client.get("/api/v1/matches?status=new")
+
+        assert response.status_code == 200
+        assert response.json()["meta"]["pagination"]["total"] == 1
+        # Window holds every row, so no COUNT(*) was needed.
+        assert mock_db.execute.await_count == 1
+        stored = mock_store.await_args.args[2]
+        assert stored.version == 5
+        assert stored.complete is True
+
+    def test_update_status_commits_then_patches_window(self, test_app):
+        app, user, client, _, get_db = test_app
+
+        match = _make_match(user_id=user.id)
+        mock_db = AsyncMock()
+        mock_result = MagicMock()
+        mock_result.scalar_one_or_none.return_value = match
+        mock_db.execute = AsyncMock(return_value=mock_result)
+        mock_db.add = MagicMock()
+
+        async def override_db():
+            yield mock_db
+
+        app.dependency_overrides[get_db] = override_db
+
+        with patch(
+            "app.services.match_feed_cache.remove_from_window", new_callable=AsyncMock
+        ) as mock_remove:
+            response = client.patch(f"/api/v1/matches/{match.id}", json={"status": "saved"})
+
+        assert response.status_code == 200
+        mock_db.commit.assert_awaited()
+        mock_remove.assert_awaited_once_with(user.id, match.id)
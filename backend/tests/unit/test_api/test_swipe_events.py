@@ -2,7 +2,9 @@
 Unit tests for swipe event recording on match status update.
 
 Verifies that saving/dismissing a match creates a SwipeEvent with
-correctly denormalized job attributes.
+correctly denormalized job attributes, both for single swipes and for
+POST /matches/swipes, and that pattern detection is queued rather than
+run inline.
 """
 
 from __future__ import annotations
@@ -10,7 +12,7 @@ from __future__ import annotations
 import json
 from datetime import datetime, timezone
 from types import SimpleNamespace
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
 import pytest
@@ -137,11 +139,7 @@ class TestSwipeEventRecording:
         mock_db.execute = AsyncMock(return_value=mock_result)
         mock_db.flush = AsyncMock()
 
-        original_add = mock_db.add
-        def capture_add(obj):
-            added_objects.append(obj)
-            return original_add(obj)
-        mock_db.add = capture_add
+        mock_db.add = MagicMock(side_effect=added_objects.append)
 
         async def mock_refresh(obj):
             obj.status = _FakeMatchStatus("saved")
@@ -182,11 +180,7 @@ class TestSwipeEventRecording:
         mock_db.execute = AsyncMock(return_value=mock_result)
         mock_db.flush = AsyncMock()
 
-        original_add = mock_db.add
-        def capture_add(obj):
-            added_objects.append(obj)
-            return original_add(obj)
-        mock_db.add = capture_add
+        mock_db.add = MagicMock(side_effect=added_objects.append)
 
         async def mock_refresh(obj):
             obj.status = _FakeMatchStatus("dismissed")
@@ -220,11 +214,7 @@ class TestSwipeEventRecording:
         mock_db.execute = AsyncMock(return_value=mock_result)
         mock_db.flush = AsyncMock()
 
-        original_add = mock_db.add
-        def capture_add(obj):
-            added_objects.append(obj)
-            return original_add(obj)
-        mock_db.add = capture_add
+        mock_db.add = MagicMock(side_effect=added_objects.append)
 
         async def mock_refresh(obj):
             obj.status = _FakeMatchStatus("saved")
@@ -243,3 +233,173 @@ class TestSwipeEventRecording:
         assert swipe.job_salary_max is None
         assert swipe.job_remote is None
         assert swipe.job_employment_type is None
+
+
+# ---------------------------------------------------------------------------
+# Tests: POST /matches/swipes
+# ---------------------------------------------------------------------------
+
+def _returned_row(match_id, company="Acme Corp", location="Remote", remote=True,
+                  salary_min=None, salary_max=None, employment_type=None):
+    return SimpleNamespace(
+        id=match_id, company=company, location=location, remote=remote,
+        salary_min=salary_min, salary_max=salary_max, employment_type=employment_type,
+    )
+
+
+def _mock_bulk_db(returned_rows):
+    mock_db = AsyncMock()
+    update_result = MagicMock()
+    update_result.all.return_value = returned_rows
+    mock_db.execute = AsyncMock(side_effect=[update_result, MagicMock(), MagicMock()])
+    return mock_db
+
+
+@pytest.fixture
+def bulk_side_effects():
+    with patch(
+        "app.services.match_feed_cache.remove_from_window", new_callable=AsyncMock
+    ) as mock_remove, patch(
+        "app.api.v1.matches.schedule_pattern_detection", new_callable=AsyncMock
+    ) as mock_schedule:
+        yield mock_remove, mock_schedule
+
+
+class TestBulkSwipe:
+    def test_one_update_and_one_insert(self, test_app, bulk_side_effects):
+        app, user, client, _, get_db = test_app
+        mock_remove, mock_schedule = bulk_side_effects
+
+        saved_id, dismissed_id, stale_id = uuid4(), uuid4(), uuid4()
+        mock_db = _mock_bulk_db([
+            _returned_row(saved_id, company="GoodCo"),
+            _returned_row(dismissed_id, company="BadCo", remote=False),
+        ])
+
+        async def override_db():
+            yield mock_db
+        app.dependency_overrides[get_db] = override_db
+
+        response = client.post("/api/v1/matches/swipes", json={"swipes": [
+            {"match_id": str(saved_id), "status": "saved"},
+            {"match_id": str(dismissed_id), "status": "dismissed"},
+            {"match_id": str(stale_id), "status": "dismissed"},
+        ]})
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "updated": [str(saved_id), str(dismissed_id)],
+            "skipped": [str(stale_id)],
+        }
+        # UPDATE, SwipeEvent insert, pattern-stat upsert
+        assert mock_db.execute.await_count == 3
+        update_sql = str(mock_db.execute.await_args_list[0].args[0])
+        assert update_sql.startswith("UPDATE matches SET status=CASE")
+        assert "FROM jobs" in update_sql
+
+        insert_stmt = mock_db.execute.await_args_list[1].args[0]
+        params = insert_stmt.compile().params
+        assert params["action_m0"] == "saved"
+        assert params["job_company_m1"] == "BadCo"
+        assert params["job_remote_m1"] is False
+
+        upsert_sql = str(mock_db.execute.await_args_list[2].args[0])
+        assert "swipe_pattern_stats" in upsert_sql
+
+        mock_db.commit.assert_awaited_once()
+        mock_remove.assert_awaited_once_with(user.id, saved_id, dismissed_id)
+        mock_schedule.assert_awaited_once_with(user.id)
+
+    def test_nothing_updated_skips_insert(self, test_app, bulk_side_effects):
+        app, user, client, _, get_db = test_app
+        mock_remove, mock_schedule = bulk_side_effects
+
+        mock_db = _mock_bulk_db([])
+
+        async def override_db():
+            yield mock_db
+        app.dependency_overrides[get_db] = override_db
+
+        match_id = str(uuid4())
+        response = client.post("/api/v1/matches/swipes", json={"swipes": [
+            {"match_id": match_id, "status": "saved"},
+        ]})
+
+        assert response.status_code == 200
+        assert response.json() == {"updated": [], "skipped": [match_id]}
+        assert mock_db.execute.await_count == 1
+        mock_remove.assert_not_awaited()
+        mock_schedule.assert_not_awaited()
+
+    def test_invalid_status_returns_422(self, test_app):
+        app, user, client, _, get_db = test_app
+
+        response = client.post("/api/v1/matches/swipes", json={"swipes": [
+            {"match_id": str(uuid4()), "status": "applied"},
+        ]})
+        assert response.status_code == 422
+
+    def test_empty_and_oversized_batches_return_422(self, test_app):
+        from app.api.v1.matches import MAX_BULK_SWIPES
+
+        app, user, client, _, get_db = test_app
+
+        assert client.post("/api/v1/matches/swipes", json={"swipes": []}).status_code == 422
+        too_many = [
+            {"match_id": str(uuid4()), "status": "saved"}
+            for _ in range(MAX_BULK_SWIPES + 1)
+        ]
+        assert client.post("/api/v1/matches/swipes", json={"swipes": too_many}).status_code == 422
+
+
+# ---------------------------------------------------------------------------
+# Tests: debounced pattern detection
+# ---------------------------------------------------------------------------
+
+class TestSchedulePatternDetection:
+    @pytest.mark.asyncio
+    async def test_first_swipe_queues_task_and_later_swipes_ride_along(self):
+        from app.services.preference_learning import (
+            DETECTION_DEBOUNCE_SECONDS,
+            schedule_pattern_detection,
+        )
+
+        mock_redis = AsyncMock()
+        mock_redis.set = AsyncMock(side_effect=[True, None])
+        user_id = uuid4()
+
+        with patch(
+            "app.cache.redis_client.get_redis_client", AsyncMock(return_value=mock_redis)
+        ), patch("app.worker.tasks.learn_swipe_preferences.apply_async") as mock_apply:
+            assert await schedule_pattern_detection(user_id) is True
+            assert await schedule_pattern_detection(user_id) is False
+
+        mock_apply.assert_called_once_with(
+            args=[str(user_id)], countdown=DETECTION_DEBOUNCE_SECONDS
+        )
+        assert mock_redis.set.await_args.kwargs["nx"] is True
+
+    @pytest.mark.asyncio
+    async def test_redis_failure_does_not_raise(self):
+        from app.services.preference_learning import schedule_pattern_detection
+
+        with patch(
+            "app.cache.redis_client.get_redis_client",
+            AsyncMock(side_effect=ConnectionError("down")),
+        ):
+            assert await schedule_pattern_detection(uuid4()) is False
+
+    @pytest.mark.asyncio
+    async def test_clear_deletes_marker_on_the_shared_pool(self):
+        from app.services.preference_learning import clear_pattern_detection_pending
+
+        mock_redis = AsyncMock()
+        user_id = uuid4()
+
+        with patch(
+            "app.cache.redis_client.get_redis_client", AsyncMock(return_value=mock_redis)
+        ):
+            await clear_pattern_detection_pending(user_id)
+
+        mock_redis.delete.assert_awaited_once_with(f"swipe_learning_pending:{user_id}")
+        mock_redis.aclose.assert_not_awaited()
@@ -10,7 +10,7 @@ from __future__ import annotations
 import json
 from datetime import datetime, timezone
 from types import SimpleNamespace
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
 import pytest
@@ -100,6 +100,17 @@ def _make_match(user_id=None, job=None, match_id=None, status=None, score=85.50)
 # ---------------------------------------------------------------------------
 
 
+@pytest.fixture(autouse=True)
+def _no_feed_cache():
+    """Exercise the DB path unless a test opts into the cached feed window."""
+    with patch(
+        "app.services.match_feed_cache.get_window",
+        new_callable=AsyncMock,
+        return_value=(None, None),
+    ) as mock_get_window:
+        yield mock_get_window
+
+
 @pytest.fixture
 def test_app():
     from app.api.v1.matches import ensure_user_exists, router
@@ -191,3 +202,46 @@ class TestGetTopPick:
 
         response = client.get("/api/v1/matches/top-pick")
         assert response.status_code == 204
+
+
+class TestTopPickFromFeedCache:
+    def test_top_pick_served_from_window_head(self, test_app, _no_feed_cache):
+        from app.api.v1.matches import _match_to_response
+        from app.services.match_feed_cache import FeedWindow
+
+        app, user, client, _ensure, get_db = test_app
+        best = _make_match(user_id=user.id, score=97.0)
+        _no_feed_cache.return_value = (
+            FeedWindow(
+                version=1,
+                total=1,
+                items=[{"sort_score": "97.0", "match": _match_to_response(best).model_dump()}],
+                complete=True,
+            ),
+            1,
+        )
+        mock_db = AsyncMock()
+        mock_db.execute = AsyncMock(side_effect=AssertionError("top-pick must be served from cache"))
+
+        async def override_db():
+            yield mock_db
+
+        app.dependency_overrides[get_db] = override_db
+
+        response = client.get("/api/v1/matches/top-pick")
+        assert response.status_code == 200
+        assert response.json()["id"] == str(best.id)
+
+    def test_empty_complete_window_returns_204(self, test_app, _no_feed_cache):
+        from app.services.match_feed_cache import FeedWindow
+
+        app, user, client, _ensure, get_db = test_app
+        _no_feed_cache.return_value = (FeedWindow(version=1, total=0, complete=True), 1)
+
+        async def override_db():
+            yield AsyncMock()
+
+        app.dependency_overrides[get_db] = override_db
+
+        response = client.get("/api/v1/matches/top-pick")
+        assert response.status_code == 204
@@ -23,8 +23,10 @@ from app.cache import redis_client
 def reset_pool():
     """Reset the module-level pool before each test."""
     redis_client._pool = None
+    redis_client._pool_loop = None
     yield
     redis_client._pool = None
+    redis_client._pool_loop = None
 
 
 # ============================================================
@@ -63,6 +65,19 @@ class TestConnectionPooling:
         # from_url should only be called once (pool is reused)
         mock_from_url.assert_called_once()
 
+    @patch("app.cache.redis_client.redis.ConnectionPool.from_url")
+    def test_new_event_loop_gets_a_new_pool(self, mock_from_url):
+        """Celery runs each task in a fresh loop; pools are not shared across loops."""
+        import asyncio
+
+        mock_from_url.side_effect = lambda *a, **kw: MagicMock()
+
+        first = asyncio.run(redis_client.get_redis_pool())
+        second = asyncio.run(redis_client.get_redis_pool())
+
+        assert first is not second
+        assert mock_from_url.call_count == 2
+
 
 # ============================================================
 # AC#2 - Cache Operations with TTL
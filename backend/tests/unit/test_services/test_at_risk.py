@@ -2,12 +2,13 @@
 
 Covers:
 - Detection criteria (login, applications, pipeline)
+- Set-based detection statement and batched streaming across organizations
 - Privacy enforcement (only user_id, name, email, engagement_status)
 - Status filtering
 - Nudge email sending (mocked)
 - Nudge audit logging
 - RBAC enforcement (403 for non-admin)
-- Celery task structure
+- Celery task structure and per-org fallback when set-based detection fails
 """
 
 from __future__ import annotations
@@ -41,13 +42,38 @@ class FakeScalarResult:
         return self._rows[0] if self._rows else None
 
 
+class FakeStreamResult:
+    """Mimics an AsyncResult from ``session.stream`` (``partitions`` only)."""
+
+    def __init__(self, rows: List[Any]):
+        self._rows = rows
+
+    async def partitions(self, size: int):
+        for start in range(0, len(self._rows), size):
+            yield self._rows[start:start + size]
+
+
 class FakeSession:
-    """Minimal async session fake that routes queries to pre-configured results."""
+    """Minimal async session fake that routes queries to pre-configured results.
 
-    def __init__(self, execute_results: List[FakeScalarResult] | None = None):
+    ``stream_rows`` are the rows of the set-based detection statement:
+    ``(org_id, user_id, login_inactive, no_recent_applications, pipeline_stalled)``.
+    """
+
+    def __init__(
+        self,
+        execute_results: List[FakeScalarResult] | None = None,
+        stream_rows: List[Any] | None = None,
+    ):
         self._execute_results = execute_results or []
+        self._stream_rows = stream_rows or []
         self._call_idx = 0
         self._added: list = []
+        self.streamed: list = []
+
+    async def stream(self, stmt, *args, **kwargs):
+        self.streamed.append(stmt)
+        return FakeStreamResult(self._stream_rows)
 
     async def execute(self, stmt, *args, **kwargs):
         if self._call_idx < len(self._execute_results):
@@ -92,102 +118,135 @@ USER_3_ID = uuid4()
 NOW = datetime.now(timezone.utc)
 
 
+ORG_UUID = UUID(ORG_ID)
+
+
+def _risk_row(user_id, login=False, applications=False, pipeline=False, org_id=ORG_UUID):
+    return (org_id, user_id, login, applications, pipeline)
+
+
 # ---------------------------------------------------------------------------
-# Test: Detection — user not logged in 14+ days is flagged at-risk
+# Test: Detection — each criterion flags the member at-risk
 # ---------------------------------------------------------------------------
 
 
 @pytest.mark.asyncio
-async def test_detect_at_risk_login_inactive():
-    """User with updated_at > 14 days ago should be flagged at-risk."""
+@pytest.mark.parametrize("criterion", ["login", "applications", "pipeline"])
+async def test_detect_at_risk_any_criterion(criterion):
+    """A member matching any single criterion is flagged at-risk."""
     from app.services.enterprise.at_risk import AtRiskDetectionService
 
     service = AtRiskDetectionService()
-
-    # Mock session: members query returns USER_1; login check returns USER_1 (inactive);
-    # active applicants returns empty; active pipeline returns empty; users with apps returns empty
-    session = FakeSession([
-        FakeScalarResult([(USER_1_ID,)]),           # members
-        FakeScalarResult([(USER_1_ID,)]),           # inactive login (updated_at < threshold)
-        FakeScalarResult([]),                        # active applicants (none)
-        FakeScalarResult([]),                        # active pipeline (none)
-        FakeScalarResult([]),                        # users with apps (none)
-    ])
+    session = FakeSession(stream_rows=[_risk_row(USER_1_ID, **{criterion: True})])
 
     result = await service.detect_at_risk(session, ORG_ID)
-    assert str(USER_1_ID) in result
-
-
-# ---------------------------------------------------------------------------
-# Test: Detection — user with no applications in 30+ days flagged at-risk
-# ---------------------------------------------------------------------------
+    assert result == [str(USER_1_ID)]
+    assert len(session.streamed) == 1
 
 
 @pytest.mark.asyncio
-async def test_detect_at_risk_no_recent_applications():
-    """User with no applications in 30+ days should be flagged at-risk."""
+async def test_detect_active_user_not_flagged():
+    """User with recent login, applications, and pipeline activity should NOT be flagged."""
     from app.services.enterprise.at_risk import AtRiskDetectionService
 
     service = AtRiskDetectionService()
-
-    session = FakeSession([
-        FakeScalarResult([(USER_1_ID,)]),           # members
-        FakeScalarResult([]),                        # inactive login (none - user is active)
-        FakeScalarResult([]),                        # active applicants (none - no recent apps)
-        FakeScalarResult([]),                        # active pipeline (none)
-        FakeScalarResult([]),                        # users with apps (none)
-    ])
+    session = FakeSession(stream_rows=[_risk_row(USER_1_ID)])
 
     result = await service.detect_at_risk(session, ORG_ID)
-    assert str(USER_1_ID) in result
+    assert str(USER_1_ID) not in result
 
 
 # ---------------------------------------------------------------------------
-# Test: Detection — user with stalled pipeline (21+ days) flagged at-risk
+# Test: Set-based detection statement
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
-async def test_detect_at_risk_stalled_pipeline():
-    """User with applications but no status changes in 21+ days should be flagged."""
-    from app.services.enterprise.at_risk import AtRiskDetectionService
+def _compiled(org_id=None):
+    from sqlalchemy.dialects import postgresql
 
-    service = AtRiskDetectionService()
+    from app.services.enterprise.at_risk import member_risk_statement
 
-    session = FakeSession([
-        FakeScalarResult([(USER_1_ID,)]),           # members
-        FakeScalarResult([]),                        # inactive login (none)
-        FakeScalarResult([(USER_1_ID,)]),           # active applicants (has recent apps)
-        FakeScalarResult([]),                        # active pipeline (no recent updates)
-        FakeScalarResult([(USER_1_ID,)]),           # users with apps (has apps)
-    ])
+    return member_risk_statement(NOW, org_id).compile(dialect=postgresql.dialect())
 
-    result = await service.detect_at_risk(session, ORG_ID)
-    assert str(USER_1_ID) in result
+
+def test_member_risk_statement_is_set_based():
+    """One statement with CTEs and LEFT JOINs; no member IN-list parameters."""
+    compiled = _compiled()
+    sql = str(compiled)
+
+    assert sql.startswith("WITH members AS")
+    assert "application_activity AS" in sql
+    assert sql.count("LEFT OUTER JOIN") == 2
+    assert "IN (SELECT members.user_id" in sql
+    # Only the three thresholds and the COALESCE default are bound
+    assert len(compiled.params) == 4
+
+
+def test_member_risk_statement_thresholds():
+    from app.services.enterprise.at_risk import (
+        APPLICATION_INACTIVE_DAYS,
+        LOGIN_INACTIVE_DAYS,
+        PIPELINE_STALLED_DAYS,
+    )
+
+    params = _compiled().params
+    assert params["updated_at_1"] == NOW - timedelta(days=LOGIN_INACTIVE_DAYS)
+    assert params["last_applied_at_1"] == NOW - timedelta(days=APPLICATION_INACTIVE_DAYS)
+    assert params["last_updated_at_1"] == NOW - timedelta(days=PIPELINE_STALLED_DAYS)
+
+
+def test_member_risk_statement_org_filter():
+    compiled = _compiled(ORG_UUID)
+    assert "organization_members.org_id = " in str(compiled)
+    assert ORG_UUID in compiled.params.values()
+    assert "organization_members.org_id = " not in str(_compiled())
 
 
 # ---------------------------------------------------------------------------
-# Test: Detection — active user is NOT flagged at-risk
+# Test: All organizations in one streamed pass
 # ---------------------------------------------------------------------------
 
 
 @pytest.mark.asyncio
-async def test_detect_active_user_not_flagged():
-    """User with recent login, applications, and pipeline activity should NOT be flagged."""
+async def test_update_all_engagement_statuses_streams_every_org():
+    """Per-org counts come from one stream; orgs without members report zero."""
     from app.services.enterprise.at_risk import AtRiskDetectionService
 
-    service = AtRiskDetectionService()
+    org_a, org_b, org_empty = uuid4(), uuid4(), uuid4()
+    session = FakeSession(
+        execute_results=[FakeScalarResult([(org_a,), (org_b,), (org_empty,)])],
+        stream_rows=[
+            _risk_row(USER_1_ID, login=True, org_id=org_a),
+            _risk_row(USER_2_ID, org_id=org_a),
+            _risk_row(USER_3_ID, pipeline=True, org_id=org_b),
+        ],
+    )
 
-    session = FakeSession([
-        FakeScalarResult([(USER_1_ID,)]),           # members
-        FakeScalarResult([]),                        # inactive login (none - user is active)
-        FakeScalarResult([(USER_1_ID,)]),           # active applicants (has recent apps)
-        FakeScalarResult([(USER_1_ID,)]),           # active pipeline (has recent updates)
-        FakeScalarResult([(USER_1_ID,)]),           # users with apps
+    results = await AtRiskDetectionService().update_all_engagement_statuses(
+        session, batch_size=2
+    )
+
+    assert results == [
+        {"org_id": str(org_a), "total_members": 2, "at_risk_count": 1},
+        {"org_id": str(org_b), "total_members": 1, "at_risk_count": 1},
+        {"org_id": str(org_empty), "total_members": 0, "at_risk_count": 0},
+    ]
+    assert len(session.streamed) == 1
+    assert session.streamed[0].get_execution_options()["yield_per"] == 2
+
+
+@pytest.mark.asyncio
+async def test_update_engagement_statuses_single_org():
+    from app.services.enterprise.at_risk import AtRiskDetectionService
+
+    session = FakeSession(stream_rows=[
+        _risk_row(USER_1_ID, applications=True),
+        _risk_row(USER_2_ID),
     ])
 
-    result = await service.detect_at_risk(session, ORG_ID)
-    assert str(USER_1_ID) not in result
+    result = await AtRiskDetectionService().update_engagement_statuses(session, ORG_ID)
+
+    assert result == {"org_id": ORG_ID, "total_members": 2, "at_risk_count": 1}
 
 
 # ---------------------------------------------------------------------------
@@ -202,21 +261,11 @@ async def test_privacy_enforcement_only_allowed_fields():
 
     service = AtRiskDetectionService()
 
-    # Mock get_employee_summaries: members query + detect_at_risk queries
-    session = FakeSession([
+    session = FakeSession(
         # get_employee_summaries: members with user info
-        FakeScalarResult([(USER_1_ID, "Alice", "alice@example.com")]),
-        # detect_at_risk: members
-        FakeScalarResult([(USER_1_ID,)]),
-        # detect_at_risk: inactive login
-        FakeScalarResult([]),
-        # detect_at_risk: active applicants
-        FakeScalarResult([(USER_1_ID,)]),
-        # detect_at_risk: active pipeline
-        FakeScalarResult([(USER_1_ID,)]),
-        # detect_at_risk: users with apps
-        FakeScalarResult([(USER_1_ID,)]),
-    ])
+        [FakeScalarResult([(USER_1_ID, "Alice", "alice@example.com")])],
+        stream_rows=[_risk_row(USER_1_ID)],
+    )
 
     summaries = await service.get_employee_summaries(session, ORG_ID)
     assert len(summaries) == 1
@@ -241,30 +290,20 @@ async def test_status_filtering():
 
     service = AtRiskDetectionService()
 
-    # Two users: USER_1 is active, USER_2 is at-risk
-    session = FakeSession([
-        # get_employee_summaries: members with user info
-        FakeScalarResult([
+    # Two users: USER_1 is active, USER_2 is at-risk (inactive login)
+    session = FakeSession(
+        [FakeScalarResult([
             (USER_1_ID, "Alice", "alice@example.com"),
             (USER_2_ID, "Bob", "bob@example.com"),
-        ]),
-        # detect_at_risk: members
-        FakeScalarResult([(USER_1_ID,), (USER_2_ID,)]),
-        # detect_at_risk: inactive login - USER_2 is inactive
-        FakeScalarResult([(USER_2_ID,)]),
-        # detect_at_risk: active applicants - USER_1 has recent apps
-        FakeScalarResult([(USER_1_ID,)]),
-        # detect_at_risk: active pipeline - USER_1 has recent updates
-        FakeScalarResult([(USER_1_ID,)]),
-        # detect_at_risk: users with apps - both
-        FakeScalarResult([(USER_1_ID,), (USER_2_ID,)]),
-    ])
+        ])],
+        stream_rows=[_risk_row(USER_1_ID), _risk_row(USER_2_ID, login=True)],
+    )
 
     # Filter for at_risk only
     summaries = await service.get_employee_summaries(session, ORG_ID, status_filter="at_risk")
 
     # Only Bob should appear (at-risk)
-    assert len(summaries) >= 1
+    assert [s["user_id"] for s in summaries] == [str(USER_2_ID)]
     statuses = {s["engagement_status"] for s in summaries}
     assert statuses == {"at_risk"}
 
@@ -377,3 +416,72 @@ def test_celery_beat_schedule_includes_at_risk():
     entry = schedule["detect-at-risk-employees"]
     assert entry["task"] == "app.worker.tasks.detect_at_risk_employees"
     assert entry["schedule"] == 24 * 60 * 60  # Daily
+
+
+def _session_cm(session):
+    cm = AsyncMock()
+    cm.__aenter__ = AsyncMock(return_value=session)
+    cm.__aexit__ = AsyncMock(return_value=False)
+    return cm
+
+
+def _run_detection_task(update_all, update_one, org_ids):
+    from app.worker.tasks import detect_at_risk_employees
+
+    org_session = AsyncMock()
+    org_session.execute = AsyncMock(
+        return_value=FakeScalarResult([(org_id,) for org_id in org_ids])
+    )
+    sessions = [_session_cm(AsyncMock()), _session_cm(org_session)]
+    sessions += [_session_cm(AsyncMock()) for _ in org_ids]
+
+    with (
+        patch("app.db.engine.AsyncSessionLocal", side_effect=sessions),
+        patch("app.observability.langfuse_client.create_agent_trace"),
+        patch("app.observability.langfuse_client.flush_traces"),
+        patch(
+            "app.services.enterprise.at_risk.AtRiskDetectionService.update_all_engagement_statuses",
+            update_all,
+        ),
+        patch(
+            "app.services.enterprise.at_risk.AtRiskDetectionService.update_engagement_statuses",
+            update_one,
+        ),
+    ):
+        return detect_at_risk_employees()
+
+
+def test_celery_task_uses_set_based_detection():
+    """A successful set-based run reports every org and no failures."""
+    results = [{"org_id": "org-1", "total_members": 3, "at_risk_count": 1}]
+    update_one = AsyncMock()
+
+    summary = _run_detection_task(AsyncMock(return_value=results), update_one, [])
+
+    assert summary == {
+        "organizations_processed": 1,
+        "organizations_failed": 0,
+        "results": results,
+        "errors": [],
+    }
+    update_one.assert_not_awaited()
+
+
+def test_celery_task_isolates_org_failures_after_set_based_failure():
+    """If the set-based statement fails, each org runs on its own session."""
+
+    async def _update_one(session, org_id):
+        if org_id == "org-bad":
+            raise RuntimeError("statement timeout")
+        return {"org_id": org_id, "total_members": 2, "at_risk_count": 0}
+
+    summary = _run_detection_task(
+        AsyncMock(side_effect=RuntimeError("statement timeout")),
+        AsyncMock(side_effect=_update_one),
+        ["org-1", "org-bad", "org-2"],
+    )
+
+    assert summary["organizations_processed"] == 2
+    assert summary["organizations_failed"] == 1
+    assert [r["org_id"] for r in summary["results"]] == ["org-1", "org-2"]
+    assert summary["errors"] == [{"org_id": "org-bad", "error": "statement timeout"}]
@@ -0,0 +1,274 @@
+"""
+Tests for the local TF-IDF ATS scorer.
+
+Covers: tokenizing technology terms, word and phrase extraction, IDF
+weighting of job keywords, weighted coverage scores, IDF snapshot
+rebuild and memoised loading, bulk document analysis with the
+``documents.ats_analysis`` cache, and the beat schedule.
+"""
+
+from __future__ import annotations
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.services import ats_scoring
+from app.services.ats_scoring import (
+    ANALYSIS_VERSION,
+    IdfTable,
+    analyze_resume,
+    analyze_user_documents,
+    build_idf_table,
+    count_document_frequencies,
+    extract_keywords,
+    extract_terms,
+    is_current,
+    load_idf_table,
+    score_resume,
+    tokenize,
+)
+
+_JOB_TITLE = "Backend Engineer"
+_JOB_DESCRIPTION = (
+    "Join our team as a backend engineer. You will design distributed systems "
+    "in Python and Kafka, own our distributed systems on Kubernetes, and work "
+    "with the team on CI/CD. Experience with Python required."
+)
+
+# 1000 postings: boilerplate is everywhere, the stack is rare.
+_IDF = IdfTable(
+    corpus_size=1000,
+    doc_freq={
+        "team": 900, "experience": 950, "work": 800, "join": 600, "required": 700,
+        "engineer": 400, "backend": 150, "python": 120, "kafka": 20,
+        "kubernetes": 40, "distributed": 60, "systems": 300,
+        "distributed systems": 50, "backend engineer": 90, "ci/cd": 80,
+    },
+    version="snap-1",
+)
+
+
+@pytest.fixture(autouse=True)
+def _reset_idf_memo():
+    ats_scoring._idf_memo = None
+    yield
+    ats_scoring._idf_memo = None
+
+
+def _content(*texts: str) -> dict:
+    return {"sections": [{"section_name": f"s{i}", "tailored_content": t} for i, t in enumerate(texts)]}
+
+
+class TestTerms:
+    def test_tokenize_keeps_technology_spellings(self):
+        assert tokenize("Node.js, C++ and CI/CD; C#.") == ["node.js", "c++", "and", "ci/cd", "c#"]
+
+    def test_phrases_do_not_span_stop_words(self):
+        terms = extract_terms("Distributed systems and data pipelines")
+
+        assert terms["distributed systems"] == 1
+        assert terms["data pipelines"] == 1
+        assert "systems and" not in terms and "and" not in terms
+
+    def test_document_frequencies_count_each_text_once(self):
+        n, df = count_document_frequencies(["python python", "Python and Go", "rust"])
+
+        assert n == 3
+        assert df["python"] == 2
+        assert df["rust"] == 1
+
+
+class TestKeywords:
+    def test_idf_ranks_distinguishing_terms_above_boilerplate(self):
+        keywords = [term for term, _ in extract_keywords(_JOB_TITLE, _JOB_DESCRIPTION, _IDF)]
+
+        assert keywords.index("kafka") < keywords.index("team")
+        assert keywords.index("distributed systems") < keywords.index("experience")
+
+    def test_known_phrases_replace_their_words(self):
+        keywords = [term for term, _ in extract_keywords(_JOB_TITLE, _JOB_DESCRIPTION, _IDF)]
+
+        assert "distributed systems" in keywords
+        assert "distributed" not in keywords
+        # Unknown phrases are not keywords at all.
+        assert "design distributed" not in keywords
+
+    def test_empty_table_falls_back_to_term_frequency(self):
+        keywords = extract_keywords("", "python python rust", IdfTable())
+
+        assert keywords[0][0] == "python"
+        assert all(" " not in term for term, _ in keywords)
+
+    def test_limit(self):
+        assert len(extract_keywords(_JOB_TITLE, _JOB_DESCRIPTION, _IDF, limit=3)) == 3
+
+
+class TestScore:
+    def test_weighted_coverage(self):
+        keywords = [("kafka", 3.0), ("python", 1.0)]
+
+        analysis = score_resume("Built Kafka consumers", keywords, "snap-1")
+
+        assert analysis.score == 75
+        assert analysis.matched == ["kafka"]
+        assert analysis.missing == ["python"]
+        assert analysis.match_rate == 0.5
+
+    def test_no_keywords_scores_zero(self):
+        assert score_resume("anything", []).score == 0
+
+    def test_analyze_resume_is_deterministic_and_serialisable(self):
+        content = _content("Python backend engineer", "Ran Kafka on Kubernetes; built distributed systems")
+
+        first = analyze_resume(_JOB_TITLE, _JOB_DESCRIPTION, content, _IDF)
+        second = analyze_resume(_JOB_TITLE, _JOB_DESCRIPTION, content, _IDF)
+
+        assert first == second
+        assert {"python", "kafka", "kubernetes", "distributed systems"} <= set(first.matched)
+        cached = json.loads(json.dumps(first.to_dict()))
+        assert is_current(cached)
+        assert cached["idf_version"] == "snap-1"
+        assert not is_current({**cached, "version": ANALYSIS_VERSION - 1})
+        assert not is_current(None)
+
+
+class _Partitions:
+    def __init__(self, *partitions):
+        self._partitions = partitions
+
+    async def partitions(self, size):
+        for partition in self._partitions:
+            yield partition
+
+
+class TestIdfSnapshots:
+    @pytest.mark.asyncio
+    async def test_build_counts_corpus_prunes_and_replaces_snapshot(self):
+        session = MagicMock()
+        session.stream = AsyncMock(return_value=_Partitions(
+            [("Python Engineer", "Kafka"), ("Go Engineer", None)],
+            [("Python Developer", "kafka")],
+        ))
+        session.execute = AsyncMock()
+        session.flush = AsyncMock()
+        session.commit = AsyncMock()
+
+        table = await build_idf_table(session)
+
+        assert table.corpus_size == 3
+        assert table.doc_freq == {"python": 2, "engineer": 2, "kafka": 2}
+        snapshot = session.add.call_args.args[0]
+        assert snapshot.corpus_size == 3
+        delete_stmt = session.execute.await_args.args[0]
+        assert "DELETE FROM ats_idf_snapshots" in str(delete_stmt)
+        session.commit.assert_awaited_once()
+        # The fresh table is served without a reload.
+        assert await load_idf_table(MagicMock()) is table
+
+    @pytest.mark.asyncio
+    async def test_load_memoises_latest_snapshot(self):
+        snap_id = uuid4()
+        result = MagicMock()
+        result.first.return_value = (snap_id, 10, {"python": 3})
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=result)
+
+        first = await load_idf_table(session)
+        second = await load_idf_table(session)
+
+        assert first is second
+        assert first == IdfTable(10, {"python": 3}, str(snap_id))
+        session.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_missing_or_unreadable_snapshot_gives_empty_table(self):
+        session = MagicMock()
+        session.execute = AsyncMock(side_effect=RuntimeError("no table"))
+        assert await load_idf_table(session) == IdfTable()
+
+        result = MagicMock()
+        result.first.return_value = None
+        session.execute = AsyncMock(return_value=result)
+        assert await load_idf_table(session) == IdfTable()
+
+
+class TestAnalyzeUserDocuments:
+    def _session(self, rows) -> MagicMock:
+        result = MagicMock()
+        result.all.return_value = rows
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=result)
+        session.commit = AsyncMock()
+        return session
+
+    @pytest.mark.asyncio
+    async def test_scores_uncached_documents_and_writes_back_in_bulk(self):
+        job_id = uuid4()
+        cached = {"version": ANALYSIS_VERSION, "score": 91, "matched": [], "missing": []}
+        stale = {"version": ANALYSIS_VERSION - 1, "score": 10}
+        doc_cached, doc_new, doc_stale = uuid4(), uuid4(), uuid4()
+        body = json.dumps(_content("Python and Kafka"))
+        session = self._session([
+            (doc_cached, job_id, body, cached, _JOB_TITLE, _JOB_DESCRIPTION),
+            (doc_new, job_id, body, None, _JOB_TITLE, _JOB_DESCRIPTION),
+            (doc_stale, job_id, "not json", stale, _JOB_TITLE, _JOB_DESCRIPTION),
+        ])
+
+        with (
+            patch.object(ats_scoring, "load_idf_table", AsyncMock(return_value=_IDF)),
+            patch.object(ats_scoring, "extract_keywords", wraps=extract_keywords) as extract,
+        ):
+            results = await analyze_user_documents(session, "user_1")
+
+        assert [r["document_id"] for r in results] == [str(doc_cached), str(doc_new), str(doc_stale)]
+        assert results[0]["analysis"] is cached
+        assert "kafka" in results[1]["analysis"]["matched"]
+        assert results[2]["analysis"]["score"] == 0  # unparseable content
+        extract.assert_called_once()  # keywords shared by the job's versions
+
+        update_stmt, updates = session.execute.await_args_list[1].args
+        assert "UPDATE documents" in str(update_stmt)
+        assert [u["id"] for u in updates] == [doc_new, doc_stale]
+        session.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_all_cached_skips_idf_and_writes(self):
+        cached = {"version": ANALYSIS_VERSION, "score": 91}
+        session = self._session([(uuid4(), uuid4(), "{}", cached, "T", "D")])
+
+        with patch.object(ats_scoring, "load_idf_table", AsyncMock()) as load:
+            results = await analyze_user_documents(session, "user_1")
+
+        assert results[0]["analysis"] is cached
+        load.assert_not_awaited()
+        session.execute.assert_awaited_once()
+        session.commit.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_refresh_and_document_filter(self):
+        doc_id = uuid4()
+        cached = {"version": ANALYSIS_VERSION, "score": 91}
+        session = self._session([(doc_id, uuid4(), "{}", cached, "T", "python")])
+
+        with patch.object(ats_scoring, "load_idf_table", AsyncMock(return_value=IdfTable())):
+            results = await analyze_user_documents(
+                session, "user_1", document_ids=[str(doc_id)], refresh=True
+            )
+
+        assert results[0]["analysis"]["score"] == 0
+        select_stmt = session.execute.await_args_list[0].args[0]
+        assert "documents.id IN" in str(select_stmt)
+        session.commit.assert_awaited_once()
+
+
+def test_beat_schedule_includes_idf_rebuild():
+    from app.worker.celery_app import celery_app
+
+    import app.worker.tasks  # noqa: F401
+
+    schedule = celery_app.conf.beat_schedule
+    assert schedule["rebuild-ats-idf-table"]["task"] == "app.worker.tasks.rebuild_ats_idf_table"
+    assert schedule["rebuild-ats-idf-table"]["schedule"] == 24 * 60 * 60
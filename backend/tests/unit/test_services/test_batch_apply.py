@@ -0,0 +1,323 @@
+"""
+Tests for the batch approval pipeline.
+
+Covers: the two-query prefetch, per-item failures (unknown, malformed and
+non-pending items, malformed payload job IDs), reuse of existing cover
+letters, one generated letter per job under the concurrency cap,
+generation failures and the emergency brake leaving items pending, the
+single write transaction, items approved elsewhere in the meantime, and
+apply dispatch.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import UUID, uuid4
+
+import pytest
+
+from app.agents.pro.cover_letter_agent import CoverLetterContent
+from app.services.batch_apply import _JOB_FIELDS, approve_batch
+
+_USER_PK = uuid4()
+
+
+def _mock_session_cm():
+    mock_sess = AsyncMock()
+    mock_cm = AsyncMock()
+    mock_cm.__aenter__ = AsyncMock(return_value=mock_sess)
+    mock_cm.__aexit__ = AsyncMock(return_value=False)
+    return mock_cm, mock_sess
+
+
+def _row(item_id, job_id=None, status="pending", payload=None, cover_letter_id=None, version=0):
+    job_id = job_id or uuid4()
+    return {
+        "id": UUID(item_id),
+        "status": status,
+        "payload": payload if payload is not None else {"job_id": str(job_id)},
+        "user_pk": _USER_PK,
+        "job_id": job_id,
+        "title": "Backend Engineer",
+        "company": "BigTech",
+        "description": "Python and Kafka",
+        "location": "Remote",
+        "salary_min": None,
+        "salary_max": None,
+        "employment_type": "full_time",
+        "remote": True,
+        "headline": "Engineer",
+        "skills": ["Python"],
+        "experience": [],
+        "education": [],
+        "cover_letter_id": cover_letter_id,
+        "cover_letter_version": version,
+    }
+
+
+def _letter() -> CoverLetterContent:
+    return CoverLetterContent(
+        opening="Hello",
+        body_paragraphs=["I build things."],
+        closing="Thanks",
+        word_count=300,
+        personalization_sources=["job description"],
+    )
+
+
+class _Run:
+    """Runs ``approve_batch`` against mocked sessions, LLM and dispatch."""
+
+    def __init__(self, rows, approved_ids=None, generate=None, braked=False):
+        self.prefetch_cm, self.prefetch = _mock_session_cm()
+        job_keys = ("job_id", *_JOB_FIELDS, "cover_letter_id", "cover_letter_version")
+
+        def _prefetch(stmt, params):
+            result = MagicMock()
+            if "FROM jobs" in str(stmt):
+                jobs = {str(r["job_id"]): {k: r[k] for k in job_keys} for r in rows}
+                found = [jobs[j] for j in params["job_ids"] if j in jobs]
+            else:
+                found = [{k: v for k, v in r.items() if k not in job_keys} for r in rows]
+            result.mappings.return_value.all.return_value = found
+            return result
+
+        self.prefetch.execute = AsyncMock(side_effect=_prefetch)
+
+        self.write_cm, self.write = _mock_session_cm()
+        pending = [r["id"] for r in rows if r["status"] == "pending"]
+        returned = MagicMock()
+        returned.scalars.return_value.all.return_value = (
+            pending if approved_ids is None else [UUID(i) for i in approved_ids]
+        )
+        self.write.execute = AsyncMock(
+            side_effect=lambda stmt, params=None: returned if "RETURNING" in str(stmt) else MagicMock()
+        )
+        self.generate = generate or AsyncMock(return_value=_letter())
+        self.dispatch = AsyncMock()
+        self.braked = braked
+
+    async def __call__(self, item_ids, **kwargs):
+        with (
+            patch(
+                "app.db.engine.AsyncSessionLocal",
+                side_effect=[self.prefetch_cm, self.write_cm],
+            ),
+            patch(
+                "app.agents.pro.cover_letter_agent.CoverLetterAgent._generate_cover_letter",
+                self.generate,
+            ),
+            patch("app.agents.orchestrator.dispatch_task", self.dispatch),
+            patch(
+                "app.agents.brake.check_brake",
+                AsyncMock(side_effect=lambda user_id: self.braked),
+            ),
+        ):
+            return [r async for r in approve_batch("user_1", item_ids, **kwargs)]
+
+    def writes(self, sql: str):
+        return [c.args for c in self.write.execute.await_args_list if sql in str(c.args[0])]
+
+
+class TestApproveBatch:
+    @pytest.mark.asyncio
+    async def test_prefetches_once_and_reports_unapprovable_items(self):
+        ok, done, missing = str(uuid4()), str(uuid4()), str(uuid4())
+        job_id = uuid4()
+        payload = {"job_id": str(job_id).upper(), "cover_letter_document_id": "cl-1"}
+        run = _Run([
+            _row(ok, job_id=job_id, payload=payload),
+            _row(done, status="approved"),
+        ])
+
+        results = await run([ok, done, missing, "not-a-uuid", ok])
+
+        (items_stmt, items), (jobs_stmt, jobs) = [
+            c.args for c in run.prefetch.execute.await_args_list
+        ]
+        assert items["ids"] == [ok, done, missing]
+        assert "LEFT JOIN LATERAL" in str(jobs_stmt)
+        assert "CAST" not in str(items_stmt) + str(jobs_stmt)
+        assert str(job_id) in jobs["job_ids"]
+        assert jobs["user_pk"] == _USER_PK
+        by_id = {r["item_id"]: r for r in results}
+        assert len(results) == 4
+        assert by_id[done]["error"] == "Item is already 'approved', cannot approve"
+        assert by_id[missing]["error"] == "Approval item not found"
+        assert by_id["not-a-uuid"]["error"] == "Approval item not found"
+        assert by_id[ok] == {
+            "item_id": ok, "status": "approved", "cover_letter_document_id": "cl-1",
+        }
+        run.generate.assert_not_awaited()
+        run.dispatch.assert_awaited_once_with("apply", "user_1", payload)
+
+    @pytest.mark.asyncio
+    async def test_malformed_job_id_fails_only_its_item(self):
+        bad, good = str(uuid4()), str(uuid4())
+        run = _Run([_row(bad, payload={"job_id": "j"}), _row(good)])
+
+        results = await run([bad, good])
+
+        assert results[0] == {
+            "item_id": bad, "status": "failed", "error": "Item payload has an invalid job_id",
+        }
+        (_, jobs), = [c.args for c in run.prefetch.execute.await_args_list[1:]]
+        assert "j" not in jobs["job_ids"]
+        (_, update), = run.writes("RETURNING")
+        assert update["ids"] == [good]
+        assert results[-1]["item_id"] == good and results[-1]["status"] == "approved"
+
+    @pytest.mark.asyncio
+    async def test_item_without_job_skips_jobs_query(self):
+        item = str(uuid4())
+        run = _Run([{**_row(item, payload={}), "job_id": None}])
+
+        results = await run([item])
+
+        run.prefetch.execute.assert_awaited_once()
+        assert results == [
+            {"item_id": item, "status": "approved", "cover_letter_document_id": None}
+        ]
+
+    @pytest.mark.asyncio
+    async def test_nothing_pending_skips_writes(self):
+        item = str(uuid4())
+        run = _Run([_row(item, status="rejected")])
+
+        results = await run([item])
+
+        assert results[0]["status"] == "failed"
+        run.write.execute.assert_not_awaited()
+        run.dispatch.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_existing_letter_is_attached_to_payload(self):
+        item, letter_id = str(uuid4()), uuid4()
+        run = _Run([_row(item, cover_letter_id=letter_id, version=2)])
+
+        results = await run([item])
+
+        assert results == [
+            {"item_id": item, "status": "approved", "cover_letter_document_id": str(letter_id)}
+        ]
+        run.generate.assert_not_awaited()
+        assert not run.writes("INSERT INTO documents")
+        (_, patches), = run.writes("SET payload")
+        assert json.loads(patches[0]["payload"])["cover_letter_document_id"] == str(letter_id)
+
+    @pytest.mark.asyncio
+    async def test_generates_one_letter_per_job_in_one_transaction(self):
+        shared_job, other_job = uuid4(), uuid4()
+        a, b, c = str(uuid4()), str(uuid4()), str(uuid4())
+        run = _Run([
+            _row(a, job_id=shared_job, version=1),
+            _row(b, job_id=shared_job, version=1),
+            _row(c, job_id=other_job),
+        ])
+
+        results = await run([a, b, c])
+
+        assert run.generate.await_count == 2
+        (_, documents), = run.writes("INSERT INTO documents")
+        assert {d["jid"]: d["ver"] for d in documents} == {str(shared_job): 2, str(other_job): 1}
+        assert all(d["user_pk"] == _USER_PK for d in documents)
+        (_, update), = run.writes("RETURNING")
+        assert update["ids"] == [a, b, c]
+        run.write.commit.assert_awaited_once()
+
+        generated = [r for r in results if r["status"] == "cover_letter_generated"]
+        approved = [r for r in results if r["status"] == "approved"]
+        assert len(generated) == 3 and len(approved) == 3
+        # Progress lines come before the committed approvals.
+        assert results.index(approved[0]) > results.index(generated[-1])
+        letters = {r["item_id"]: r["cover_letter_document_id"] for r in approved}
+        assert letters[a] == letters[b] != letters[c]
+        assert run.dispatch.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_generation_failure_leaves_item_pending(self):
+        good_job, bad_job = uuid4(), uuid4()
+        good, bad = str(uuid4()), str(uuid4())
+
+        async def _generate(profile, job):
+            if job["id"] == str(bad_job):
+                raise RuntimeError("rate limited")
+            return _letter()
+
+        run = _Run(
+            [_row(good, job_id=good_job), _row(bad, job_id=bad_job)],
+            generate=AsyncMock(side_effect=_generate),
+        )
+
+        results = await run([good, bad])
+
+        assert {"item_id": bad, "status": "failed", "error": "Cover letter generation failed"} in results
+        (_, update), = run.writes("RETURNING")
+        assert update["ids"] == [good]
+        assert [r["item_id"] for r in results if r["status"] == "approved"] == [good]
+
+    @pytest.mark.asyncio
+    async def test_brake_stops_generation_and_leaves_items_pending(self):
+        item = str(uuid4())
+        run = _Run([_row(item)], braked=True)
+
+        results = await run([item])
+
+        run.generate.assert_not_awaited()
+        assert results == [{
+            "item_id": item,
+            "status": "failed",
+            "error": "Emergency brake active, cover letter not generated",
+        }]
+        run.write.execute.assert_not_awaited()
+        run.dispatch.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_empty_profile_approves_without_letter(self):
+        item = str(uuid4())
+        row = {**_row(item), "skills": None, "experience": None}
+        run = _Run([row])
+
+        results = await run([item])
+
+        run.generate.assert_not_awaited()
+        assert results[-1]["status"] == "approved"
+        assert results[-1]["cover_letter_document_id"] is None
+
+    @pytest.mark.asyncio
+    async def test_item_decided_elsewhere_is_reported_failed(self):
+        a, b = str(uuid4()), str(uuid4())
+        run = _Run(
+            [{**_row(a), "job_id": None}, {**_row(b), "job_id": None}],
+            approved_ids=[a],
+        )
+
+        results = await run([a, b])
+
+        assert results[-2:] == [
+            {"item_id": a, "status": "approved", "cover_letter_document_id": None},
+            {"item_id": b, "status": "failed", "error": "Item is no longer pending"},
+        ]
+        run.dispatch.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_concurrency_cap(self):
+        items = [str(uuid4()) for _ in range(6)]
+        in_flight = peak = 0
+
+        async def _generate(profile, job):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return _letter()
+
+        run = _Run([_row(i) for i in items], generate=AsyncMock(side_effect=_generate))
+
+        await run(items, concurrency=2)
+
+        assert peak == 2
+        assert run.generate.await_count == 6
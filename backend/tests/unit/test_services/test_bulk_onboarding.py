@@ -0,0 +1,258 @@
+"""
+Tests for the bulk employee onboarding pipeline.
+
+Covers: invitations committed before any email is sent, batched email
+dispatch with accept/decline links, progress stages, org context lookup
+when the inviter is not given, best-effort status events, and one
+completion event per chunked upload.
+"""
+
+from __future__ import annotations
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.services.enterprise.bulk_onboarding import (
+    finish_upload_chunk,
+    onboard_employees,
+    publish_onboarding_event,
+    seal_upload,
+    track_upload_chunk,
+)
+
+_MODULE = "app.services.enterprise.bulk_onboarding"
+
+
+def _invitations(n: int) -> list[dict]:
+    return [
+        {
+            "id": uuid4(),
+            "email": f"user{i}@example.com",
+            "token": uuid4(),
+            "first_name": f"U{i}",
+            "last_name": None,
+        }
+        for i in range(n)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_commits_invitations_then_dispatches_emails():
+    session = MagicMock()
+    calls = []
+    session.commit = AsyncMock(side_effect=lambda: calls.append("commit"))
+    invitations = _invitations(3)
+    progress = []
+
+    async def _on_progress(stage, data):
+        progress.append((stage, data))
+
+    async def _send(messages, on_progress=None):
+        calls.append("send")
+        await on_progress(len(messages), 0)
+        return {"sent": len(messages), "failed": []}
+
+    with patch(f"{_MODULE}.InvitationService") as svc, patch(
+        f"{_MODULE}.send_email_batches", side_effect=_send
+    ) as send:
+        svc.return_value.create_invitations = AsyncMock(return_value=invitations)
+        result = await onboard_employees(
+            session,
+            str(uuid4()),
+            [{"email": inv["email"]} for inv in invitations],
+            invited_by=str(uuid4()),
+            org_name="Acme",
+            on_progress=_on_progress,
+        )
+
+    assert calls == ["commit", "send"]
+    session.execute.assert_not_called()  # no org lookup needed
+    messages = send.call_args.args[0]
+    assert [m["to"] for m in messages] == [[inv["email"]] for inv in invitations]
+    assert f"/invitations/{invitations[0]['token']}/accept" in messages[0]["html"]
+    assert "Acme" in messages[0]["subject"]
+    assert result == {"invited": 3, "emails_sent": 3, "errors": []}
+    assert progress == [
+        ("invitations_created", {"invited": 3, "total": 3}),
+        ("emails", {"sent": 3, "failed": 0, "total": 3}),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_loads_org_name_and_admin_when_missing():
+    admin_id = uuid4()
+    session = MagicMock()
+    session.commit = AsyncMock()
+    lookup = MagicMock()
+    lookup.first.return_value = MagicMock(name_="", admin_id=admin_id)
+    lookup.first.return_value.name = "Acme"
+    session.execute = AsyncMock(return_value=lookup)
+
+    with patch(f"{_MODULE}.InvitationService") as svc, patch(
+        f"{_MODULE}.send_email_batches",
+        new_callable=AsyncMock,
+        return_value={"sent": 0, "failed": []},
+    ):
+        svc.return_value.create_invitations = AsyncMock(return_value=[])
+        await onboard_employees(session, str(uuid4()), [])
+
+    session.execute.assert_awaited_once()
+    assert svc.return_value.create_invitations.call_args.kwargs["invited_by"] == str(admin_id)
+
+
+@pytest.mark.asyncio
+async def test_org_without_admin_raises():
+    session = MagicMock()
+    lookup = MagicMock()
+    lookup.first.return_value = None
+    session.execute = AsyncMock(return_value=lookup)
+
+    with pytest.raises(ValueError, match="no admin"):
+        await onboard_employees(session, str(uuid4()), [{"email": "a@example.com"}])
+
+
+@pytest.mark.asyncio
+async def test_publish_event_on_status_channel():
+    redis = MagicMock()
+    redis.publish = AsyncMock()
+
+    await publish_onboarding_event(
+        redis, "user-1", "system.onboarding.progress", "Onboarding", {"stage": "emails"}
+    )
+
+    channel, payload = redis.publish.call_args.args
+    assert channel == "agent:status:user-1"
+    event = json.loads(payload)
+    assert event["type"] == "system.onboarding.progress"
+    assert event["data"] == {"stage": "emails"}
+
+
+@pytest.mark.asyncio
+async def test_publish_event_swallows_redis_errors():
+    redis = MagicMock()
+    redis.publish = AsyncMock(side_effect=ConnectionError("down"))
+
+    await publish_onboarding_event(redis, "user-1", "system.onboarding.completed", "Done", {})
+
+
+class _FakeRedis:
+    """Hashes, publish and transactional pipelines, as decoded strings."""
+
+    def __init__(self):
+        self.hashes: dict[str, dict[str, str]] = {}
+        self.published: list[dict] = []
+
+    async def hincrby(self, key, field, amount):
+        h = self.hashes.setdefault(key, {})
+        h[field] = str(int(h.get(field, 0)) + amount)
+        return int(h[field])
+
+    async def hset(self, key, field, value):
+        self.hashes.setdefault(key, {})[field] = str(value)
+
+    async def hget(self, key, field):
+        return self.hashes.get(key, {}).get(field)
+
+    async def hsetnx(self, key, field, value):
+        h = self.hashes.setdefault(key, {})
+        if field in h:
+            return False
+        h[field] = str(value)
+        return True
+
+    async def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    async def expire(self, key, seconds):
+        return True
+
+    async def publish(self, channel, payload):
+        self.published.append(json.loads(payload))
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self._redis = redis
+        self._calls = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        return lambda *args: self._calls.append((name, args))
+
+    async def execute(self):
+        return [await getattr(self._redis, name)(*args) for name, args in self._calls]
+
+
+def _chunk(processed, total, emails_sent=None, failed=0):
+    return {
+        "processed": processed,
+        "emails_sent": processed if emails_sent is None else emails_sent,
+        "failed": failed,
+        "total": total,
+    }
+
+
+@pytest.mark.asyncio
+async def test_upload_completes_once_after_last_chunk():
+    redis = _FakeRedis()
+    for _ in range(3):
+        await track_upload_chunk(redis, "up-1")
+
+    await finish_upload_chunk(redis, "up-1", "admin-1", "org-1", _chunk(1000, 1000))
+    await seal_upload(redis, "up-1", "admin-1", "org-1")
+    await finish_upload_chunk(redis, "up-1", "admin-1", "org-1", _chunk(1000, 1000, 990, 10))
+    assert redis.published == []
+
+    await finish_upload_chunk(redis, "up-1", "admin-1", "org-1", _chunk(500, 500))
+
+    (event,) = redis.published
+    assert event["type"] == "system.onboarding.completed"
+    assert event["user_id"] == "admin-1"
+    assert event["data"] == {
+        "status": "completed", "org_id": "org-1",
+        "processed": 2500, "emails_sent": 2490, "failed": 10, "total": 2500,
+    }
+
+
+@pytest.mark.asyncio
+async def test_seal_completes_when_chunks_finished_first():
+    redis = _FakeRedis()
+    await track_upload_chunk(redis, "up-1")
+    await finish_upload_chunk(redis, "up-1", "admin-1", "org-1", _chunk(3, 3))
+    assert redis.published == []
+
+    await seal_upload(redis, "up-1", "admin-1", "org-1")
+    await seal_upload(redis, "up-1", "admin-1", "org-1")
+
+    assert [e["data"]["processed"] for e in redis.published] == [3]
+
+
+@pytest.mark.asyncio
+async def test_upload_without_valid_rows_completes_on_seal():
+    redis = _FakeRedis()
+
+    await seal_upload(redis, "up-1", "admin-1", "org-1")
+
+    (event,) = redis.published
+    assert event["data"]["total"] == 0
+
+
+@pytest.mark.asyncio
+async def test_upload_tracking_swallows_redis_errors():
+    redis = MagicMock()
+    redis.pipeline.side_effect = ConnectionError("down")
+
+    await track_upload_chunk(redis, "up-1")
+    await seal_upload(redis, "up-1", "admin-1", "org-1")
+    await finish_upload_chunk(redis, "up-1", "admin-1", "org-1", _chunk(1, 1))
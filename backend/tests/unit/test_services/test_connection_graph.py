@@ -0,0 +1,168 @@
+"""Tests for the connection graph behind warm path finding.
+
+Covers: incremental imports and index maintenance, BFS degrees,
+company/alumni lookups, serialization round trip, and the persisted
+read-modify-write in update_connection_graph().
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.network.connection_graph import (
+    ROOT,
+    ConnectionGraph,
+    normalize_company,
+    update_connection_graph,
+)
+
+
+def _import():
+    return {
+        "schools": ["MIT"],
+        "contacts": [
+            {
+                "name": "Alice Smith",
+                "company": "Acme Corp",
+                "connections": [
+                    "Bob Jones",
+                    {"name": "Carol Lee", "company": "Acme", "school": "Stanford"},
+                    {"name": "Dan Wu", "company": "Globex", "schools": ["mit"]},
+                ],
+            },
+            {"name": "Bob Jones", "company": "Initech"},
+        ],
+    }
+
+
+class TestNormalization:
+    def test_company_suffixes_and_punctuation(self):
+        assert normalize_company("Acme Corp.") == "acme"
+        assert normalize_company("ACME, Inc") == "acme"
+        assert normalize_company("Company") == "company"
+
+
+class TestImport:
+    def test_first_and_second_degree(self):
+        graph = ConnectionGraph.from_connection_data(_import())
+        dist = graph.distances()
+
+        assert dist["alice smith"] == 1
+        assert dist["bob jones"] == 1
+        assert dist["carol lee"] == 2
+        assert len(graph) == 4
+
+    def test_incremental_import_merges_people(self):
+        graph = ConnectionGraph.from_connection_data(_import())
+
+        added = graph.add_connections({
+            "contacts": [
+                {"name": "carol  LEE", "company": "Globex"},
+                {"name": "Frank Ode", "company": "Acme"},
+            ]
+        })
+
+        assert added == 1
+        assert graph.distances()["carol lee"] == 1
+        assert {p.contact_name for p in graph.find_paths("Globex")} == {"Carol Lee", "Dan Wu"}
+        assert "Carol Lee" not in {p.contact_name for p in graph.find_paths("Acme")}
+
+    def test_explicit_ids_distinguish_namesakes(self):
+        graph = ConnectionGraph.from_connection_data({
+            "contacts": [
+                {"id": "li-1", "name": "Sam Lee", "company": "Acme"},
+                {"id": "li-2", "name": "Sam Lee", "company": "Globex"},
+            ]
+        })
+
+        assert len(graph) == 2
+
+
+class TestFindPaths:
+    def test_path_types(self):
+        graph = ConnectionGraph.from_connection_data(_import())
+
+        acme = {p.contact_name: p for p in graph.find_paths("ACME Inc.")}
+        globex = {p.contact_name: p for p in graph.find_paths("Globex")}
+
+        assert acme["Alice Smith"].path_type == "1st_degree"
+        assert acme["Carol Lee"].path_type == "2nd_degree"
+        assert acme["Carol Lee"].mutual_connections == ["Alice Smith"]
+        assert globex["Dan Wu"].path_type == "alumni"
+        assert globex["Dan Wu"].shared_schools == ["MIT"]
+
+    def test_first_degree_alumni_stays_first_degree(self):
+        graph = ConnectionGraph.from_connection_data({
+            "schools": ["MIT"],
+            "contacts": [{"name": "Alice", "company": "Acme", "school": "MIT"}],
+        })
+
+        (path,) = graph.find_paths("Acme")
+
+        assert path.path_type == "1st_degree"
+        assert "MIT" in path.relationship_context
+
+    def test_unknown_company(self):
+        graph = ConnectionGraph.from_connection_data(_import())
+
+        assert graph.find_paths("Hooli") == []
+
+
+class TestSerialization:
+    def test_round_trip_rebuilds_indexes(self):
+        graph = ConnectionGraph.from_connection_data(_import())
+
+        restored = ConnectionGraph.from_dict(graph.to_dict())
+
+        assert restored.to_dict() == graph.to_dict()
+        assert restored.distances() == graph.distances()
+        assert {p.contact_name for p in restored.find_paths("Acme")} == {"Alice Smith", "Carol Lee"}
+
+    def test_edges_stored_once(self):
+        graph = ConnectionGraph.from_connection_data({"contacts": ["Alice"]})
+
+        assert graph.to_dict()["edges"] == {ROOT: ["alice"]}
+
+    def test_empty(self):
+        assert len(ConnectionGraph.from_dict(None)) == 0
+
+
+class TestUpdateConnectionGraph:
+    def _session(self, row=None, stored=None):
+        session = AsyncMock()
+        result = MagicMock()
+        result.scalar_one.return_value = row
+        result.scalar_one_or_none.return_value = stored
+        session.execute = AsyncMock(return_value=result)
+        session.__aenter__ = AsyncMock(return_value=session)
+        session.__aexit__ = AsyncMock(return_value=False)
+        return session
+
+    @pytest.mark.asyncio
+    async def test_merges_import_into_stored_graph(self):
+        existing = ConnectionGraph.from_connection_data({"contacts": ["Alice"]})
+        row = MagicMock()
+        row.graph = existing.to_dict()
+        session = self._session(row=row)
+
+        with patch("app.db.engine.AsyncSessionLocal", return_value=session):
+            graph = await update_connection_graph(
+                "user-1", {"contacts": [{"name": "Bob", "company": "Acme"}]}
+            )
+
+        assert len(graph) == 2
+        assert row.node_count == 2
+        assert set(row.graph["nodes"]) == {"alice", "bob"}
+        session.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_read_only_without_import(self):
+        stored = ConnectionGraph.from_connection_data({"contacts": ["Alice"]}).to_dict()
+        session = self._session(stored=stored)
+
+        with patch("app.db.engine.AsyncSessionLocal", return_value=session):
+            graph = await update_connection_graph("user-1", {})
+
+        assert len(graph) == 1
+        assert session.execute.await_count == 1
+        session.commit.assert_not_awaited()
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import io
 import uuid
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -9,6 +10,7 @@ import pytest
 
 from app.services.enterprise.csv_onboarding import (
     MAX_BATCH_SIZE,
+    MAX_STREAM_ROWS,
     CSVOnboardingService,
     RowError,
     ValidationResult,
@@ -116,21 +118,14 @@ class TestExistingAccountDetection:
 
         rows = [{"email": "alice@example.com"}]
 
-        # Mock: user exists
+        # Mock: user exists and is in org
         user_row = MagicMock()
         user_row.email = "alice@example.com"
-        user_row.id = user_id
-
-        # Mock: user is in org
-        member_row = MagicMock()
-        member_row.user_id = user_id
+        user_row.member_id = user_id
 
         session = AsyncMock()
         session.execute = AsyncMock(
-            side_effect=[
-                MagicMock(__iter__=lambda self: iter([user_row])),  # user query
-                MagicMock(__iter__=lambda self: iter([member_row])),  # member query
-            ]
+            return_value=MagicMock(__iter__=lambda self: iter([user_row]))
         )
 
         result = await service.validate_rows(rows, org_id, session)
@@ -140,26 +135,40 @@ class TestExistingAccountDetection:
     @pytest.mark.asyncio
     async def test_existing_account_different_org_flagged(self, service):
         org_id = str(uuid.uuid4())
-        user_id = uuid.uuid4()
 
         rows = [{"email": "alice@example.com"}]
 
+        # Mock: user exists, NOT in this org
         user_row = MagicMock()
         user_row.email = "alice@example.com"
-        user_row.id = user_id
+        user_row.member_id = None
 
         session = AsyncMock()
         session.execute = AsyncMock(
-            side_effect=[
-                MagicMock(__iter__=lambda self: iter([user_row])),  # user exists
-                MagicMock(__iter__=lambda self: iter([])),  # NOT in this org
-            ]
+            return_value=MagicMock(__iter__=lambda self: iter([user_row]))
         )
 
         result = await service.validate_rows(rows, org_id, session)
         assert len(result.invalid_rows) == 1
         assert result.invalid_rows[0].error_reason == "existing_account_different_org"
 
+    @pytest.mark.asyncio
+    async def test_single_lookup_for_all_rows(self, service):
+        """Users and org membership come from one query over distinct emails."""
+        rows = [{"email": f"user{i}@example.com"} for i in range(MAX_BATCH_SIZE)]
+        rows.append({"email": "USER0@example.com"})
+        session = AsyncMock()
+        session.execute = AsyncMock(return_value=MagicMock(
+            __iter__=lambda self: iter([])
+        ))
+
+        result = await service.validate_rows(rows, str(uuid.uuid4()), session)
+
+        session.execute.assert_awaited_once()
+        sql = str(session.execute.call_args[0][0])
+        assert "LEFT OUTER JOIN organization_members" in sql
+        assert len(result.valid_rows) == MAX_BATCH_SIZE
+
 
 # ── AC5: Batch size enforcement ──────────────────────────────────────────
 
@@ -180,6 +189,126 @@ class TestBatchSizeLimit:
         assert len(result) == 1000
 
 
+# ── Streaming validation for large uploads ───────────────────────────────
+
+
+def _empty_lookup_session():
+    session = AsyncMock()
+    session.execute = AsyncMock(return_value=MagicMock(
+        __iter__=lambda self: iter([])
+    ))
+    return session
+
+
+async def _collect(aiter):
+    return [item async for item in aiter]
+
+
+class TestStreamingValidation:
+    def test_iter_rows_numbers_and_normalizes(self, service):
+        stream = io.BytesIO(
+            b"\xef\xbb\xbfEmail , First_Name\r\n alice@example.com ,Alice\r\nbob@example.com,\r\n"
+        )
+        rows = list(service.iter_rows(stream))
+        assert rows == [
+            (2, {"email": "alice@example.com", "first_name": "Alice"}),
+            (3, {"email": "bob@example.com", "first_name": ""}),
+        ]
+        assert not stream.closed
+
+    def test_iter_rows_missing_header(self, service):
+        with pytest.raises(ValueError, match="Missing required CSV headers"):
+            list(service.iter_rows(io.BytesIO(b"name\nAlice\n")))
+
+    def test_iter_rows_empty(self, service):
+        with pytest.raises(ValueError, match="empty"):
+            list(service.iter_rows(io.BytesIO(b"")))
+
+    def test_count_rows_rewinds(self, service):
+        stream = io.BytesIO(b"email\na@example.com\nb@example.com\n")
+        assert service.count_rows(stream) == 2
+        assert stream.tell() == 0
+
+    def test_count_rows_enforces_cap_and_rewinds(self, service):
+        stream = io.BytesIO(b"email\n" + b"".join(b"u%d@example.com\n" % i for i in range(6)))
+        with pytest.raises(ValueError, match="maximum batch size of 5"):
+            service.count_rows(stream, max_rows=5)
+        assert stream.tell() == 0
+
+    def test_stream_cap_above_in_memory_cap(self):
+        assert MAX_STREAM_ROWS > MAX_BATCH_SIZE
+
+    @pytest.mark.asyncio
+    async def test_validate_stream_yields_chunks(self, service):
+        content = "email\n" + "".join(f"user{i}@example.com\n" for i in range(25))
+        session = _empty_lookup_session()
+
+        chunks = await _collect(service.validate_stream(
+            io.BytesIO(content.encode()), str(uuid.uuid4()), session, chunk_size=10
+        ))
+
+        assert [len(c.valid_rows) for c in chunks] == [10, 10, 5]
+        assert session.execute.await_count == 3  # one lookup per chunk
+
+    @pytest.mark.asyncio
+    async def test_validate_stream_detects_duplicates_across_chunks(self, service):
+        content = b"email\na@example.com\nb@example.com\nnot-an-email\nA@example.com\n"
+
+        chunks = await _collect(service.validate_stream(
+            io.BytesIO(content), str(uuid.uuid4()), _empty_lookup_session(), chunk_size=2
+        ))
+
+        errors = [e for c in chunks for e in c.invalid_rows]
+        assert [(e.row_number, e.error_reason) for e in errors] == [
+            (4, "invalid_email_format"),
+            (5, "duplicate_in_upload"),
+        ]
+        assert sum(len(c.valid_rows) for c in chunks) == 2
+
+    @pytest.mark.asyncio
+    async def test_validate_stream_flags_existing_accounts(self, service):
+        user_row = MagicMock()
+        user_row.email = "taken@example.com"
+        user_row.member_id = None
+        session = AsyncMock()
+        session.execute = AsyncMock(
+            return_value=MagicMock(__iter__=lambda self: iter([user_row]))
+        )
+
+        chunks = await _collect(service.validate_stream(
+            io.BytesIO(b"email\ntaken@example.com\nfree@example.com\n"),
+            str(uuid.uuid4()),
+            session,
+        ))
+
+        assert len(chunks) == 1
+        assert chunks[0].invalid_rows[0].error_reason == "existing_account_different_org"
+        assert chunks[0].valid_rows == [{"email": "free@example.com"}]
+
+    @pytest.mark.asyncio
+    async def test_validate_stream_parses_off_the_event_loop(self, service):
+        import threading
+
+        loop_thread = threading.get_ident()
+        parsed_on = set()
+        iter_rows = service.iter_rows
+
+        def _tracking_iter_rows(stream, max_rows):
+            for numbered_row in iter_rows(stream, max_rows):
+                parsed_on.add(threading.get_ident())
+                yield numbered_row
+
+        content = "email\n" + "".join(f"user{i}@example.com\n" for i in range(5))
+        with patch.object(service, "iter_rows", _tracking_iter_rows):
+            chunks = await _collect(service.validate_stream(
+                io.BytesIO(content.encode()), str(uuid.uuid4()),
+                _empty_lookup_session(), chunk_size=2,
+            ))
+
+        assert [len(c.valid_rows) for c in chunks] == [2, 2, 1]
+        assert parsed_on and loop_thread not in parsed_on
+
+
 # ── AC6: Valid rows queued + AC7: Error report ───────────────────────────
 
 
@@ -206,6 +335,86 @@ class TestAPIEndpoint:
         assert len(response.errors) == 2
         assert response.errors[0].error_reason == "invalid_email_format"
 
+    @pytest.mark.asyncio
+    async def test_bulk_upload_queues_chunks_of_one_upload(self):
+        """Chunks share an upload id; the only transaction is the audit write."""
+        from app.api.v1.admin import bulk_upload_employees
+        from app.auth.admin import AdminContext
+
+        content = "email\n" + "".join(f"user{i}@example.com\n" for i in range(5)) + "bad\n"
+        upload = MagicMock()
+        upload.file = io.BytesIO(content.encode())
+        admin = AdminContext(
+            user_id=str(uuid.uuid4()), org_id=str(uuid.uuid4()), org_name="Acme"
+        )
+        session = _empty_lookup_session()
+        session.add = MagicMock()
+        session.begin = MagicMock(return_value=AsyncMock())
+        session_cm = AsyncMock()
+        session_cm.__aenter__ = AsyncMock(return_value=session)
+        session_cm.__aexit__ = AsyncMock(return_value=False)
+        redis = AsyncMock()
+        calls = []
+        tracked = AsyncMock(side_effect=lambda r, upload_id: calls.append(("track", upload_id)))
+        sealed = AsyncMock(side_effect=lambda r, upload_id, *a: calls.append(("seal", upload_id)))
+        delay = MagicMock(side_effect=lambda **kw: calls.append(("queue", kw["upload_id"])))
+
+        with (
+            patch.object(
+                CSVOnboardingService.validate_stream, "__defaults__", (2, MAX_STREAM_ROWS)
+            ),
+            patch("app.db.engine.AsyncSessionLocal", return_value=session_cm),
+            patch("redis.asyncio.from_url", return_value=redis),
+            patch("app.services.enterprise.bulk_onboarding.track_upload_chunk", tracked),
+            patch("app.services.enterprise.bulk_onboarding.seal_upload", sealed),
+            patch("app.worker.tasks.bulk_onboard_employees.delay", delay),
+        ):
+            response = await bulk_upload_employees(file=upload, admin_ctx=admin)
+
+        assert (response.total, response.queued, response.invalid) == (6, 5, 1)
+        assert response.errors_truncated is False
+        upload_id = calls[0][1]
+        assert calls == [("track", upload_id), ("queue", upload_id)] * 3 + [("seal", upload_id)]
+        assert session.commit.await_count == 3  # each lookup's read transaction ends
+        session.begin.assert_called_once()
+        redis.aclose.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_bulk_upload_caps_reported_errors(self):
+        """Every invalid row is counted; only the first few are returned."""
+        from app.api.v1.admin import bulk_upload_employees
+        from app.auth.admin import AdminContext
+
+        content = "email\nuser@example.com\n" + "".join(f"bad{i}\n" for i in range(5))
+        upload = MagicMock()
+        upload.file = io.BytesIO(content.encode())
+        admin = AdminContext(
+            user_id=str(uuid.uuid4()), org_id=str(uuid.uuid4()), org_name="Acme"
+        )
+        session = _empty_lookup_session()
+        session.add = MagicMock()
+        session.begin = MagicMock(return_value=AsyncMock())
+        session_cm = AsyncMock()
+        session_cm.__aenter__ = AsyncMock(return_value=session)
+        session_cm.__aexit__ = AsyncMock(return_value=False)
+
+        with (
+            patch.object(
+                CSVOnboardingService.validate_stream, "__defaults__", (2, MAX_STREAM_ROWS)
+            ),
+            patch("app.services.enterprise.csv_onboarding.MAX_REPORTED_ERRORS", 3),
+            patch("app.db.engine.AsyncSessionLocal", return_value=session_cm),
+            patch("redis.asyncio.from_url", return_value=AsyncMock()),
+            patch("app.services.enterprise.bulk_onboarding.track_upload_chunk", AsyncMock()),
+            patch("app.services.enterprise.bulk_onboarding.seal_upload", AsyncMock()),
+            patch("app.worker.tasks.bulk_onboard_employees.delay", MagicMock()),
+        ):
+            response = await bulk_upload_employees(file=upload, admin_ctx=admin)
+
+        assert (response.total, response.queued, response.invalid) == (6, 1, 5)
+        assert [e.email for e in response.errors] == ["bad0", "bad1", "bad2"]
+        assert response.errors_truncated is True
+
     def test_bulk_upload_endpoint_exists(self):
         """Verify the bulk-upload endpoint is registered on the admin router."""
         from app.api.v1.admin import router
@@ -263,3 +472,37 @@ class TestCeleryTask:
 
         assert bulk_onboard_employees.name == "app.worker.tasks.bulk_onboard_employees"
         assert bulk_onboard_employees.max_retries == 2
+
+    def test_chunk_of_upload_reports_to_upload_not_admin(self):
+        """A chunk adds its counters to the upload instead of announcing completion."""
+        from app.worker.tasks import bulk_onboard_employees
+
+        session_cm = AsyncMock()
+        session_cm.__aenter__ = AsyncMock(return_value=AsyncMock())
+        session_cm.__aexit__ = AsyncMock(return_value=False)
+        outcome = {"invited": 2, "emails_sent": 2, "errors": []}
+        finish = AsyncMock()
+        publish = AsyncMock()
+
+        with (
+            patch("app.db.engine.AsyncSessionLocal", return_value=session_cm),
+            patch("redis.asyncio.from_url", return_value=AsyncMock()),
+            patch(
+                "app.services.enterprise.bulk_onboarding.onboard_employees",
+                AsyncMock(return_value=outcome),
+            ),
+            patch("app.services.enterprise.bulk_onboarding.finish_upload_chunk", finish),
+            patch("app.services.enterprise.bulk_onboarding.publish_onboarding_event", publish),
+        ):
+            summary = bulk_onboard_employees(
+                org_id="org-1",
+                valid_rows=[{"email": "a@example.com"}, {"email": "b@example.com"}],
+                invited_by="admin-1",
+                upload_id="up-1",
+            )
+
+        assert summary["processed"] == 2
+        _, upload_id, user_id, org_id, reported = finish.await_args.args
+        assert (upload_id, user_id, org_id) == ("up-1", "admin-1", "org-1")
+        assert reported["total"] == 2
+        publish.assert_not_awaited()
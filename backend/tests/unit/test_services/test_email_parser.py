@@ -1,14 +1,22 @@
 """Tests for the Email Status Detection service (Stories 6-1, 6-4).
 
 Covers: rejection, interview, offer, applied, screening detection,
-ambiguous emails, empty input, confidence thresholds, LLM fallback.
+ambiguous emails, empty input, confidence thresholds, LLM fallback,
+batched LLM classification, and equivalence of the keyword-prefiltered classifier with a plain scan of
+every pattern.
 """
 
+import random
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from app.services.email_parser import CONFIDENCE_THRESHOLD, EmailStatusDetector
+from app.services.email_parser import (
+    _ALL_PATTERNS,
+    CONFIDENCE_THRESHOLD,
+    EmailStatusDetector,
+    StatusDetection,
+)
 
 
 # ---------------------------------------------------------------------------
@@ -338,3 +346,216 @@ class TestLLMFallback:
         assert result.detected_status is None
         assert result.is_ambiguous
         assert result.detection_method == "llm"
+
+
+# ---------------------------------------------------------------------------
+# Test: batched LLM classification
+# ---------------------------------------------------------------------------
+
+
+def _completion(content: str):
+    choice = MagicMock()
+    choice.message.content = content
+    response = MagicMock()
+    response.choices = [choice]
+    return response
+
+
+class TestBatchedLLM:
+    """Tests for packed multi-email LLM prompts."""
+
+    @pytest.mark.asyncio
+    async def test_packs_emails_and_maps_results_by_id(self):
+        """Emails are sent batch_size per prompt over one client; answers map by id."""
+        d = _detector()
+        mock_client = AsyncMock()
+        mock_client.chat.completions.create = AsyncMock(side_effect=[
+            _completion('{"results": [{"id": 2, "status": "offer", "confidence": 0.9, "evidence": "offer"}, '
+                        '{"id": 1, "status": "none", "confidence": 0.0}]}'),
+            _completion('{"results": [{"id": "1", "status": "interview", "confidence": 0.8}]}'),
+        ])
+
+        with (
+            patch("openai.AsyncOpenAI", return_value=mock_client) as mock_cls,
+            patch("app.config.settings") as s,
+        ):
+            s.OPENAI_API_KEY = "test-key"
+            results = await d.detect_batch_with_llm(
+                [("a", "newsletter"), ("b", "offer?"), ("c", "chat?")], batch_size=2
+            )
+        await d.aclose()
+
+        mock_cls.assert_called_once()
+        mock_client.close.assert_awaited_once()
+        assert mock_client.chat.completions.create.await_count == 2
+        first_prompt = mock_client.chat.completions.create.await_args_list[0].kwargs["messages"][0]["content"]
+        assert "### Email 1" in first_prompt and "### Email 2" in first_prompt
+        assert [r.detected_status for r in results] == [None, "offer", "interview"]
+        assert all(r.detection_method == "llm" for r in results)
+
+    @pytest.mark.asyncio
+    async def test_failed_or_missing_answers_are_ambiguous(self):
+        d = _detector()
+        mock_client = AsyncMock()
+        mock_client.chat.completions.create = AsyncMock(side_effect=[
+            _completion('{"results": [{"id": 1, "status": "rejected", "confidence": "high"}]}'),
+            Exception("rate limited"),
+        ])
+
+        with (
+            patch("openai.AsyncOpenAI", return_value=mock_client),
+            patch("app.config.settings"),
+        ):
+            results = await d.detect_batch_with_llm(
+                [("a", "x"), ("b", "y"), ("c", "z")], batch_size=2, concurrency=1
+            )
+
+        assert all(r.detected_status is None and r.is_ambiguous for r in results)
+
+    @pytest.mark.asyncio
+    async def test_strict_batch_raises_on_failed_call(self):
+        d = _detector()
+        mock_client = AsyncMock()
+        mock_client.chat.completions.create = AsyncMock(side_effect=Exception("rate limited"))
+
+        with (
+            patch("openai.AsyncOpenAI", return_value=mock_client),
+            patch("app.config.settings"),
+            pytest.raises(Exception, match="rate limited"),
+        ):
+            await d.detect_batch_with_llm([("a", "x")], strict=True)
+
+    @pytest.mark.asyncio
+    async def test_detect_many_only_sends_ambiguous_emails(self):
+        """Confident regex results skip the LLM; the rest fall back to regex."""
+        from app.services.email_parser import StatusDetection
+
+        d = _detector()
+        llm = [
+            StatusDetection("interview", 0.85, "chat", False, "llm"),
+            StatusDetection(None, 0.0, "", True, "llm"),
+        ]
+        emails = [
+            ("Offer Letter", "We are pleased to offer you the position."),
+            ("Quick question", "We'd love to chat about the role."),
+            ("Newsletter", "Check out our blog."),
+        ]
+        with patch.object(
+            d, "detect_batch_with_llm", new_callable=AsyncMock, return_value=llm
+        ) as mock_batch:
+            results = await d.detect_many(emails)
+
+        mock_batch.assert_awaited_once_with(emails[1:], strict=False)
+        assert [r.detected_status for r in results] == ["offer", "interview", None]
+        assert [r.detection_method for r in results] == ["regex", "llm", "regex"]
+
+
+# ---------------------------------------------------------------------------
+# Test: compiled classifier equivalence
+# ---------------------------------------------------------------------------
+
+
+def _reference_detect(subject: str, body: str) -> StatusDetection:
+    """Run every pattern in order, as detect() did before the prefilter."""
+    text = f"{subject}\n{body}"
+    if not text.strip():
+        return StatusDetection(None, 0.0, "", True)
+    best = None
+    for pattern, status, base_confidence, _ in _ALL_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            confidence = base_confidence
+            if pattern.search(subject):
+                confidence = min(confidence + 0.05, 1.0)
+            if best is None or confidence > best.confidence:
+                best = StatusDetection(
+                    detected_status=status,
+                    confidence=confidence,
+                    evidence_snippet=EmailStatusDetector._extract_snippet(text, match),
+                    is_ambiguous=confidence < CONFIDENCE_THRESHOLD,
+                )
+    return best or StatusDetection(None, 0.0, "", True)
+
+
+_PHRASES = [
+    "We have decided to move forward with other candidates",
+    "we will not be moving forward with your application",
+    "Unfortunately, you were not selected",
+    "After careful consideration we chose other candidates",
+    "the position has been filled",
+    "We regret to inform you",
+    "we will not be able to offer you a role",
+    "We'd love to schedule an interview",
+    "I'd like to invite you to an interview",
+    "Would you be available for a quick call?",
+    "schedule a phone screen",
+    "the next step is a technical interview",
+    "We are pleased to advance you",
+    "We are pleased to offer you the position",
+    "Your offer letter attached",
+    "Congratulations! You have been selected",
+    "We would like to offer you",
+    "Thank you for applying",
+    "We received your application",
+    "Application submitted successfully",
+    "We are reviewing your resume",
+    "Your application is currently being reviewed",
+    "You have been shortlisted",
+    "Hope you are well",
+    "Our team is growing",
+    "Quarterly newsletter",
+]
+
+
+def _mutate(rng: random.Random, phrase: str) -> str:
+    choice = rng.randrange(5)
+    if choice == 0:
+        return phrase.upper()
+    if choice == 1:
+        # Characters IGNORECASE matches to ASCII letters but lower() keeps.
+        return phrase.replace("i", "\u0131").replace("I", "\u0130").replace("s", "\u017f")
+    if choice == 2:
+        return phrase.replace(" ", "\n", 1)
+    if choice == 3:
+        return phrase.replace(" ", "  \t")
+    return phrase
+
+
+class TestCompiledClassifierEquivalence:
+    """The prefiltered classifier must return exactly what a full scan would."""
+
+    def test_keywords_are_required_literals(self):
+        """Every pattern's keywords are lowercase and cover its example phrases."""
+        for pattern, _, _, keywords in _ALL_PATTERNS:
+            assert keywords and all(k == k.lower() for k in keywords)
+            for phrase in _PHRASES:
+                if pattern.search(phrase):
+                    assert any(k in phrase.lower() for k in keywords), pattern.pattern
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_random_emails_match_full_scan(self, seed):
+        rng = random.Random(seed)
+        d = _detector()
+        for _ in range(400):
+            parts = [_mutate(rng, rng.choice(_PHRASES)) for _ in range(rng.randint(0, 4))]
+            split = rng.randint(0, len(parts))
+            subject = " ".join(parts[:split])
+            body = ". ".join(parts[split:])
+            assert d.detect(subject, body) == _reference_detect(subject, body), (subject, body)
+
+    def test_unicode_case_variants_still_match(self):
+        """Dotted/dotless i and long s match under IGNORECASE; so must the prefilter."""
+        d = _detector()
+        subject = "\u0130NV\u0130TE"
+        body = "We'd l\u0131ke to \u0131nv\u0131te you to an \u0131nterv\u0131ew"
+        result = d.detect(subject, body)
+        assert result == _reference_detect(subject, body)
+        assert result.detected_status == "interview"
+
+    def test_subject_boost_matches_full_scan(self):
+        d = _detector()
+        subject = "Thank you for applying"
+        body = "Thank you for applying to Acme."
+        result = d.detect(subject, body)
+        assert result == _reference_detect(subject, body)
+        assert result.confidence == pytest.approx(0.85)
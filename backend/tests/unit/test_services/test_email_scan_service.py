@@ -1,6 +1,9 @@
 """Tests for email scan service (Story 6-4, Task 2).
 
-Covers: Gmail scan, Outlook scan, no connections, batch processing.
+Covers: Gmail scan, Outlook scan, no connections, batch processing,
+sync cursor bookkeeping (kept when detection fails), concurrent
+connections and users, batched LLM classification of a scan's ambiguous
+emails, and the periodic scan schedule.
 """
 
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -8,6 +11,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 
 from app.services.email_parser import StatusDetection
+from app.services.gmail_service import GmailSync
 
 
 def _mock_session_cm():
@@ -18,6 +22,11 @@ def _mock_session_cm():
     return mock_cm, mock_sess
 
 
+def _each(detection):
+    """detect_many stand-in returning ``detection`` for every email."""
+    return lambda emails, strict=False: [detection] * len(emails)
+
+
 class TestScanUserEmails:
     @pytest.mark.asyncio
     async def test_no_connections_returns_empty(self):
@@ -64,8 +73,8 @@ class TestScanUserEmails:
 
         with (
             patch("app.db.engine.AsyncSessionLocal", return_value=mock_cm),
-            patch("app.services.gmail_service.fetch_job_emails", new_callable=AsyncMock, return_value=mock_emails),
-            patch("app.services.email_parser.EmailStatusDetector.detect_enhanced", new_callable=AsyncMock, return_value=detection),
+            patch("app.services.gmail_service.sync_job_emails", new_callable=AsyncMock, return_value=GmailSync(mock_emails, "h2")),
+            patch("app.services.email_parser.EmailStatusDetector.detect_many", new_callable=AsyncMock, side_effect=_each(detection)),
         ):
             from app.services.email_scan_service import scan_user_emails
 
@@ -105,7 +114,7 @@ class TestScanUserEmails:
         with (
             patch("app.db.engine.AsyncSessionLocal", return_value=mock_cm),
             patch("app.services.outlook_service.fetch_job_emails", new_callable=AsyncMock, return_value=mock_emails),
-            patch("app.services.email_parser.EmailStatusDetector.detect_enhanced", new_callable=AsyncMock, return_value=detection),
+            patch("app.services.email_parser.EmailStatusDetector.detect_many", new_callable=AsyncMock, side_effect=_each(detection)),
         ):
             from app.services.email_scan_service import scan_user_emails
 
@@ -143,8 +152,8 @@ class TestScanUserEmails:
 
         with (
             patch("app.db.engine.AsyncSessionLocal", return_value=mock_cm),
-            patch("app.services.gmail_service.fetch_job_emails", new_callable=AsyncMock, return_value=mock_emails),
-            patch("app.services.email_parser.EmailStatusDetector.detect_enhanced", new_callable=AsyncMock, return_value=detection),
+            patch("app.services.gmail_service.sync_job_emails", new_callable=AsyncMock, return_value=GmailSync(mock_emails, "h2")),
+            patch("app.services.email_parser.EmailStatusDetector.detect_many", new_callable=AsyncMock, side_effect=_each(detection)),
         ):
             from app.services.email_scan_service import scan_user_emails
 
@@ -183,8 +192,8 @@ class TestScanUserEmails:
 
         with (
             patch("app.db.engine.AsyncSessionLocal", return_value=mock_cm),
-            patch("app.services.gmail_service.fetch_job_emails", new_callable=AsyncMock, return_value=mock_emails),
-            patch("app.services.email_parser.EmailStatusDetector.detect_enhanced", new_callable=AsyncMock, side_effect=detections),
+            patch("app.services.gmail_service.sync_job_emails", new_callable=AsyncMock, return_value=GmailSync(mock_emails, "h2")),
+            patch("app.services.email_parser.EmailStatusDetector.detect_many", new_callable=AsyncMock, return_value=detections),
         ):
             from app.services.email_scan_service import scan_user_emails
 
@@ -194,3 +203,145 @@ class TestScanUserEmails:
         assert result.statuses_detected == 2
         assert result.flagged_for_review == 0
         assert len(result.details) == 3
+
+
+class TestIncrementalScan:
+    def _connections(self, *rows):
+        mock_cm, mock_sess = _mock_session_cm()
+        mock_result = MagicMock()
+        mock_result.mappings.return_value.all.return_value = list(rows)
+        mock_sess.execute = AsyncMock(return_value=mock_result)
+        return mock_cm, mock_sess
+
+    @pytest.mark.asyncio
+    async def test_stored_cursor_is_used_and_advanced(self):
+        """Gmail syncs from the stored cursor and the new one is persisted."""
+        mock_cm, _ = self._connections({
+            "id": "conn-1",
+            "provider": "gmail",
+            "email_address": "test@gmail.com",
+            "access_token_encrypted": "token",
+            "sync_cursor": "100",
+        })
+        detection = StatusDetection("interview", 0.95, "schedule", False, "regex")
+
+        with (
+            patch("app.db.engine.AsyncSessionLocal", return_value=mock_cm),
+            patch(
+                "app.services.gmail_service.sync_job_emails",
+                new_callable=AsyncMock,
+                return_value=GmailSync([{"id": "e1", "subject": "Interview"}], "250"),
+            ) as mock_sync,
+            patch("app.services.email_parser.EmailStatusDetector.detect_many", new_callable=AsyncMock, side_effect=_each(detection)),
+            patch("app.services.email_scan_service._record_sync", new_callable=AsyncMock) as mock_record,
+        ):
+            from app.services.email_scan_service import scan_user_emails
+
+            result = await scan_user_emails("user123", gmail_client=MagicMock())
+
+        assert mock_sync.await_args.args[1] == "100"
+        mock_record.assert_awaited_once_with("conn-1", "250")
+        assert result.statuses_detected == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_fetch_keeps_cursor(self):
+        """A connection that fails to fetch is not marked as synced."""
+        mock_cm, _ = self._connections(
+            {"id": "conn-1", "provider": "gmail", "email_address": "a@gmail.com", "access_token_encrypted": "t"},
+            {"id": "conn-2", "provider": "outlook", "email_address": "b@outlook.com", "access_token_encrypted": "t"},
+        )
+        detection = StatusDetection("rejected", 0.9, "regret", False, "regex")
+
+        with (
+            patch("app.db.engine.AsyncSessionLocal", return_value=mock_cm),
+            patch("app.services.gmail_service.sync_job_emails", new_callable=AsyncMock, side_effect=RuntimeError("401")),
+            patch("app.services.outlook_service.fetch_job_emails", new_callable=AsyncMock, return_value=[{"id": "o1", "subject": "Update"}]),
+            patch("app.services.email_parser.EmailStatusDetector.detect_many", new_callable=AsyncMock, side_effect=_each(detection)),
+            patch("app.services.email_scan_service._record_sync", new_callable=AsyncMock) as mock_record,
+        ):
+            from app.services.email_scan_service import scan_user_emails
+
+            result = await scan_user_emails("user123", gmail_client=MagicMock())
+
+        assert result.errors == 1
+        assert result.statuses_detected == 1
+        mock_record.assert_awaited_once_with("conn-2", None)
+
+    @pytest.mark.asyncio
+    async def test_failed_detection_keeps_cursor(self):
+        """Cursors only advance once the fetched emails were classified."""
+        mock_cm, _ = self._connections(
+            {"id": "conn-1", "provider": "gmail", "email_address": "a@gmail.com", "access_token_encrypted": "t"},
+        )
+
+        with (
+            patch("app.db.engine.AsyncSessionLocal", return_value=mock_cm),
+            patch("app.services.gmail_service.sync_job_emails", new_callable=AsyncMock,
+                  return_value=GmailSync([{"id": "g1", "subject": "Hello", "snippet": "hi"}], "9")),
+            patch("app.services.email_parser.EmailStatusDetector.detect_many", new_callable=AsyncMock,
+                  side_effect=RuntimeError("LLM unavailable")) as mock_detect,
+            patch("app.services.email_scan_service._record_sync", new_callable=AsyncMock) as mock_record,
+        ):
+            from app.services.email_scan_service import scan_user_emails
+
+            result = await scan_user_emails("user123", gmail_client=MagicMock())
+
+        assert mock_detect.await_args.kwargs["strict"] is True
+        mock_record.assert_not_awaited()
+        assert result.errors == 1
+        assert result.emails_processed == 0
+
+    @pytest.mark.asyncio
+    async def test_emails_from_all_connections_are_classified_together(self):
+        """One detect_many call covers every connection, so LLM batches span them."""
+        mock_cm, _ = self._connections(
+            {"id": "conn-1", "provider": "gmail", "email_address": "a@gmail.com", "access_token_encrypted": "t"},
+            {"id": "conn-2", "provider": "outlook", "email_address": "b@outlook.com", "access_token_encrypted": "t"},
+        )
+        detection = StatusDetection("screening", 0.6, "", True, "llm")
+
+        with (
+            patch("app.db.engine.AsyncSessionLocal", return_value=mock_cm),
+            patch("app.services.gmail_service.sync_job_emails", new_callable=AsyncMock,
+                  return_value=GmailSync([{"id": "g1", "subject": "Hello", "snippet": "hi"}], "9")),
+            patch("app.services.outlook_service.fetch_job_emails", new_callable=AsyncMock,
+                  return_value=[{"id": "o1", "subject": "Update", "snippet": "news"}]),
+            patch("app.services.email_parser.EmailStatusDetector.detect_many", new_callable=AsyncMock,
+                  side_effect=_each(detection)) as mock_detect,
+            patch("app.services.email_scan_service._record_sync", new_callable=AsyncMock),
+        ):
+            from app.services.email_scan_service import scan_user_emails
+
+            result = await scan_user_emails("user123", gmail_client=MagicMock())
+
+        mock_detect.assert_awaited_once()
+        assert sorted(mock_detect.await_args.args[0]) == [("Hello", "hi"), ("Update", "news")]
+        assert result.flagged_for_review == 2
+
+    @pytest.mark.asyncio
+    async def test_scan_users_isolates_failures(self):
+        """scan_users_emails() scans every user and isolates failures."""
+        from app.services.email_scan_service import ScanResult, scan_users_emails
+
+        async def _scan(user_id, gmail_client=None):
+            assert gmail_client is not None
+            if user_id == "bad":
+                raise RuntimeError("db down")
+            return ScanResult(emails_processed=2)
+
+        with patch("app.services.email_scan_service.scan_user_emails", side_effect=_scan):
+            results = await scan_users_emails(["u1", "bad", "u2"], concurrency=2)
+
+        assert results["u1"].emails_processed == 2
+        assert results["u2"].emails_processed == 2
+        assert results["bad"].errors == 1
+
+
+def test_inbox_scan_is_not_scheduled():
+    """Only the manual scan advances sync cursors; nothing scans in the background."""
+    from app.worker.celery_app import celery_app
+
+    import app.worker.tasks  # noqa: F401
+
+    assert "scan-connected-inboxes" not in celery_app.conf.beat_schedule
+    assert "app.worker.tasks.scan_connected_inboxes" not in celery_app.tasks
@@ -8,6 +8,7 @@ Tests verify:
 - CSV export format (AC5)
 - Admin auth requirement (AC7)
 - Placement rate calculation (AC1)
+- Daily breakdown and fused totals from the daily rollup
 """
 
 from __future__ import annotations
@@ -27,6 +28,21 @@ from app.services.enterprise.metrics import (
 )
 
 
+def _totals(**overrides) -> dict:
+    """What ``EnterpriseMetricsService._query_totals`` returns for an org."""
+    totals = {
+        "enrolled": 0,
+        "applications": 0,
+        "interviews": 0,
+        "placements": 0,
+        "placement_days_sum": 0.0,
+        "jobs_reviewed": 0,
+        "active": 0,
+    }
+    totals.update(overrides)
+    return totals
+
+
 # ---------------------------------------------------------------------------
 # OrgMetrics dataclass tests (AC4: no user_id field)
 # ---------------------------------------------------------------------------
@@ -138,39 +154,15 @@ class TestDateRangeDefaults:
         """get_aggregate_metrics defaults to 30-day window when no dates provided."""
         service = EnterpriseMetricsService()
 
-        # Mock all internal methods to verify date args
+        # Mock the totals lookup to verify date args
         captured_dates: dict = {}
 
-        async def mock_count_enrolled(session, org_uuid):
-            return 10
-
-        async def mock_count_active(session, org_uuid, start_dt, end_dt):
+        async def mock_query_totals(session, org_uuid, start_dt, end_dt, ):
             captured_dates["start"] = start_dt
             captured_dates["end"] = end_dt
-            return 5
-
-        async def mock_count_jobs_reviewed(session, org_uuid, start_dt, end_dt):
-            return 0
-
-        async def mock_count_applications(session, org_uuid, start_dt, end_dt):
-            return 20
+            return _totals(enrolled=10, active=5, applications=20, interviews=5, placements=2)
 
-        async def mock_count_interviews(session, org_uuid, start_dt, end_dt):
-            return 5
-
-        async def mock_count_placements(session, org_uuid, start_dt, end_dt):
-            return 2
-
-        async def mock_avg_time(session, org_uuid, start_dt, end_dt):
-            return 25.0
-
-        service._count_enrolled = mock_count_enrolled
-        service._count_active = mock_count_active
-        service._count_jobs_reviewed = mock_count_jobs_reviewed
-        service._count_applications = mock_count_applications
-        service._count_interviews = mock_count_interviews
-        service._count_placements = mock_count_placements
-        service._calc_avg_time_to_placement = mock_avg_time
+        service._query_totals = mock_query_totals
 
         mock_session = AsyncMock()
         result = await service.get_aggregate_metrics(
@@ -283,14 +275,15 @@ class TestAggregateMetricsStructure:
         """get_aggregate_metrics returns OrgMetrics with all fields populated."""
         service = EnterpriseMetricsService()
 
-        # Mock all internal methods
-        service._count_enrolled = AsyncMock(return_value=25)
-        service._count_active = AsyncMock(return_value=18)
-        service._count_jobs_reviewed = AsyncMock(return_value=500)
-        service._count_applications = AsyncMock(return_value=100)
-        service._count_interviews = AsyncMock(return_value=30)
-        service._count_placements = AsyncMock(return_value=10)
-        service._calc_avg_time_to_placement = AsyncMock(return_value=28.5)
+        service._query_totals = AsyncMock(return_value=_totals(
+            enrolled=25,
+            active=18,
+            jobs_reviewed=500,
+            applications=100,
+            interviews=30,
+            placements=10,
+            placement_days_sum=285.0,
+        ))
 
         mock_session = AsyncMock()
         result = await service.get_aggregate_metrics(
@@ -325,3 +318,82 @@ class TestDailyBreakdownStructure:
         assert d.applications == 10
         assert d.interviews == 3
         assert d.placements == 1
+
+
+# ---------------------------------------------------------------------------
+# Rollup reads (org_daily_metrics)
+# ---------------------------------------------------------------------------
+
+
+class TestRollupReads:
+    """Metrics answered from range sums over the daily rollup."""
+
+    @pytest.mark.asyncio
+    async def test_daily_breakdown_maps_rollup_rows(self):
+        service = EnterpriseMetricsService()
+        row = MagicMock(day=date(2026, 1, 3), applications=12, interviews=3, placements=1)
+        mock_result = MagicMock()
+        mock_result.all.return_value = [row]
+        mock_session = AsyncMock()
+        mock_session.execute = AsyncMock(return_value=mock_result)
+
+        daily = await service.get_daily_breakdown(
+            mock_session, "00000000-0000-0000-0000-000000000001",
+            date(2026, 1, 1), date(2026, 1, 31),
+        )
+
+        assert daily == [
+            DailyMetrics(date="2026-01-03", applications=12, interviews=3, placements=1)
+        ]
+        stmt = mock_session.execute.await_args.args[0]
+        assert "org_daily_metrics" in str(stmt)
+
+    @pytest.mark.asyncio
+    async def test_no_placements_has_no_avg_time(self):
+        service = EnterpriseMetricsService()
+        service._query_totals = AsyncMock(
+            return_value=_totals(placements=0, placement_days_sum=0.0)
+        )
+
+        result = await service.get_aggregate_metrics(
+            AsyncMock(), "00000000-0000-0000-0000-000000000001",
+            date(2026, 1, 1), date(2026, 1, 31),
+        )
+
+        assert result.placements_count == 0
+        assert result.placement_rate == 0.0
+        assert result.avg_time_to_placement_days is None
+
+    @pytest.mark.asyncio
+    async def test_totals_planned_as_three_statements(self):
+        """Members count, rollup sums and active members: one SELECT each."""
+        service = EnterpriseMetricsService()
+        results = []
+        for row in (
+            {"enrolled": 8},
+            {"applications": 6, "interviews": 2, "placements": 1,
+             "placement_days_sum": 30.0, "jobs_reviewed": 40},
+            {"active": 5},
+        ):
+            result = MagicMock()
+            result.mappings.return_value.first.return_value = row
+            results.append(result)
+        mock_session = AsyncMock()
+        mock_session.execute = AsyncMock(side_effect=results)
+
+        metrics = await service.get_aggregate_metrics(
+            mock_session, "00000000-0000-0000-0000-000000000001",
+            date(2026, 1, 1), date(2026, 1, 31),
+        )
+
+        assert mock_session.execute.await_count == 3
+        assert metrics == OrgMetrics(
+            enrolled_count=8,
+            active_count=5,
+            jobs_reviewed_count=40,
+            applications_submitted_count=6,
+            interviews_scheduled_count=2,
+            placements_count=1,
+            placement_rate=16.67,
+            avg_time_to_placement_days=30.0,
+        )
@@ -0,0 +1,318 @@
+"""Tests for incremental Gmail sync against a local fake Gmail API.
+
+Covers: full sync seeding the historyId cursor, history deltas fetching
+only new messages, pagination, capped deltas resuming where they
+stopped, expired history falling back to a full
+sync, failed Gmail calls raising instead of dropping messages, bounded
+concurrent detail fetches on one pooled client, and full
+scan_user_emails() runs over two connections (one of them failing).
+"""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from app.services import gmail_service
+from app.services.email_parser import StatusDetection
+from app.services.gmail_service import (
+    GmailSyncError,
+    fetch_job_emails,
+    gmail_client,
+    is_job_subject,
+    sync_job_emails,
+)
+
+
+class FakeGmail:
+    """In-memory Gmail API serving the endpoints the sync engine uses."""
+
+    def __init__(self, history_page_size: int = 2, oldest_history: int = 1):
+        self.messages: dict[str, dict] = {}
+        self.history: list[tuple[int, str]] = []  # (historyId, message id)
+        self.history_id = 100
+        self.history_page_size = history_page_size
+        self.oldest_history = oldest_history
+        self.requests: list[str] = []
+        self.failures: dict[str, int] = {}  # path -> status code to return
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def add(self, message_id: str, subject: str, labels=("INBOX",)) -> None:
+        self.history_id += 1
+        self.messages[message_id] = {
+            "subject": subject,
+            "from": "recruiter@acme.com",
+            "snippet": f"snippet {message_id}",
+            "labels": list(labels),
+        }
+        self.history.append((self.history_id, message_id))
+
+    def client(self) -> httpx.AsyncClient:
+        return gmail_client(transport=httpx.MockTransport(self.handle))
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path.removeprefix("/gmail/v1")
+        self.requests.append(path)
+        params = request.url.params
+        if path in self.failures:
+            return httpx.Response(self.failures[path])
+
+        if path == "/users/me/profile":
+            return httpx.Response(200, json={"historyId": str(self.history_id)})
+
+        if path == "/users/me/messages":
+            max_results = int(params.get("maxResults", 100))
+            ids = [
+                mid for _, mid in reversed(self.history)
+                if is_job_subject(self.messages[mid]["subject"])
+            ][:max_results]
+            return httpx.Response(200, json={"messages": [{"id": i} for i in ids]})
+
+        if path.startswith("/users/me/messages/"):
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            try:
+                await asyncio.sleep(0.001)
+                message = self.messages.get(path.rsplit("/", 1)[1])
+                if message is None:
+                    return httpx.Response(404)
+                return httpx.Response(200, json={
+                    "snippet": message["snippet"],
+                    "payload": {"headers": [
+                        {"name": "Subject", "value": message["subject"]},
+                        {"name": "From", "value": message["from"]},
+                    ]},
+                })
+            finally:
+                self.in_flight -= 1
+
+        if path == "/users/me/history":
+            start = int(params["startHistoryId"])
+            if start < self.oldest_history:
+                return httpx.Response(404)
+            entries = [(h, mid) for h, mid in self.history if h > start]
+            offset = int(params.get("pageToken", 0))
+            page = entries[offset:offset + self.history_page_size]
+            body = {
+                "historyId": str(self.history_id),
+                "history": [
+                    {"id": str(h), "messagesAdded": [
+                        {"message": {"id": mid, "labelIds": self.messages[mid]["labels"]}}
+                    ]}
+                    for h, mid in page
+                ],
+            }
+            if offset + self.history_page_size < len(entries):
+                body["nextPageToken"] = str(offset + self.history_page_size)
+            return httpx.Response(200, json=body)
+
+        return httpx.Response(404)
+
+
+@pytest.fixture
+def gmail():
+    fake = FakeGmail()
+    fake.add("m1", "Interview invitation")
+    fake.add("m2", "Weekly newsletter")
+    fake.add("m3", "Your application to Acme")
+    return fake
+
+
+class TestSyncJobEmails:
+    def test_job_subject_matching(self):
+        assert is_job_subject("Re: Interview next week")
+        assert not is_job_subject("Interviewing tips newsletter")
+
+    @pytest.mark.asyncio
+    async def test_first_sync_is_full_and_seeds_cursor(self, gmail):
+        async with gmail.client() as client:
+            sync = await sync_job_emails("token", None, client=client)
+
+        assert sync.full_sync
+        assert sync.history_id == "103"
+        assert [e["id"] for e in sync.emails] == ["m3", "m1"]
+
+    @pytest.mark.asyncio
+    async def test_delta_fetches_only_new_messages(self, gmail):
+        async with gmail.client() as client:
+            first = await sync_job_emails("token", None, client=client)
+            gmail.add("m4", "Offer letter")
+            gmail.add("m5", "Lunch?")
+            gmail.add("m6", "Draft: application", labels=("DRAFT",))
+            gmail.requests.clear()
+
+            sync = await sync_job_emails("token", first.history_id, client=client)
+
+        assert not sync.full_sync
+        assert [e["id"] for e in sync.emails] == ["m4"]
+        assert sync.history_id == "106"
+        detail_requests = [p for p in gmail.requests if p.startswith("/users/me/messages/")]
+        assert sorted(detail_requests) == ["/users/me/messages/m4", "/users/me/messages/m5"]
+
+    @pytest.mark.asyncio
+    async def test_delta_pages_are_followed(self, gmail):
+        for i in range(5):
+            gmail.add(f"n{i}", f"Interview round {i}")
+
+        async with gmail.client() as client:
+            sync = await sync_job_emails("token", "103", client=client)
+
+        assert [e["id"] for e in sync.emails] == [f"n{i}" for i in range(5)]
+        assert gmail.requests.count("/users/me/history") == 3
+
+    @pytest.mark.asyncio
+    async def test_capped_delta_resumes_after_last_record_read(self, gmail):
+        for i in range(5):
+            gmail.add(f"n{i}", f"Interview round {i}")
+
+        with patch.object(gmail_service, "MAX_DELTA_MESSAGES", 3):
+            async with gmail.client() as client:
+                first = await sync_job_emails("token", "103", client=client)
+                second = await sync_job_emails("token", first.history_id, client=client)
+
+        assert [e["id"] for e in first.emails] == ["n0", "n1", "n2"]
+        assert first.history_id == "106"
+        assert [e["id"] for e in second.emails] == ["n3", "n4"]
+        assert second.history_id == "108"
+
+    @pytest.mark.asyncio
+    async def test_no_changes_keeps_cursor(self, gmail):
+        async with gmail.client() as client:
+            sync = await sync_job_emails("token", "103", client=client)
+
+        assert sync.emails == []
+        assert sync.history_id == "103"
+
+    @pytest.mark.asyncio
+    async def test_expired_history_falls_back_to_full_sync(self, gmail):
+        gmail.oldest_history = 102
+
+        async with gmail.client() as client:
+            sync = await sync_job_emails("token", "50", client=client)
+
+        assert sync.full_sync
+        assert sync.history_id == "103"
+        assert {e["id"] for e in sync.emails} == {"m1", "m3"}
+
+
+class TestFailedCalls:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("status", [429, 500, 503])
+    async def test_failed_detail_fetch_raises(self, gmail, status):
+        gmail.add("m4", "Offer letter")
+        gmail.failures["/users/me/messages/m4"] = status
+
+        async with gmail.client() as client:
+            with pytest.raises(GmailSyncError):
+                await sync_job_emails("token", "103", client=client)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("path", ["/users/me/history", "/users/me/messages"])
+    async def test_failed_history_or_list_raises(self, gmail, path):
+        gmail.failures[path] = 429
+
+        async with gmail.client() as client:
+            with pytest.raises(GmailSyncError):
+                await sync_job_emails("token", "103" if "history" in path else None, client=client)
+
+    @pytest.mark.asyncio
+    async def test_deleted_message_is_skipped(self, gmail):
+        gmail.add("m4", "Offer letter")
+        gmail.add("m5", "Interview moved")
+        gmail.failures["/users/me/messages/m4"] = 404  # deleted since listed
+
+        async with gmail.client() as client:
+            sync = await sync_job_emails("token", "103", client=client)
+
+        assert [e["id"] for e in sync.emails] == ["m5"]
+        assert sync.history_id == "105"
+
+
+class TestConcurrentDetails:
+    @pytest.mark.asyncio
+    async def test_details_fetched_concurrently_with_bound(self):
+        gmail = FakeGmail()
+        for i in range(30):
+            gmail.add(f"m{i}", f"Application update {i}")
+
+        with patch.object(gmail_service, "GMAIL_FETCH_CONCURRENCY", 4):
+            async with gmail.client() as client:
+                emails = await fetch_job_emails("token", max_results=30, client=client)
+
+        assert len(emails) == 30
+        assert [e["id"] for e in emails] == [f"m{i}" for i in reversed(range(30))]
+        assert 1 < gmail.max_in_flight <= 4
+
+
+class TestScanAgainstFakeGmail:
+    @pytest.mark.asyncio
+    async def test_two_connections_scanned_incrementally(self, gmail):
+        other = FakeGmail()
+        other.add("x1", "Recruiter reaching out")
+
+        async def _route(request):
+            token = request.headers["Authorization"].removeprefix("Bearer ")
+            return await (gmail if token == "t1" else other).handle(request)
+
+        connections = [
+            {"id": "c1", "provider": "gmail", "email_address": "a@gmail.com",
+             "access_token_encrypted": "t1", "sync_cursor": "101"},
+            {"id": "c2", "provider": "gmail", "email_address": "b@gmail.com",
+             "access_token_encrypted": "t2", "sync_cursor": None},
+        ]
+        mock_sess = AsyncMock()
+        mock_result = MagicMock()
+        mock_result.mappings.return_value.all.return_value = connections
+        mock_sess.execute = AsyncMock(return_value=mock_result)
+        mock_cm = AsyncMock()
+        mock_cm.__aenter__ = AsyncMock(return_value=mock_sess)
+        mock_cm.__aexit__ = AsyncMock(return_value=False)
+        detection = StatusDetection("interview", 0.9, "", False, "regex")
+
+        with (
+            patch("app.db.engine.AsyncSessionLocal", return_value=mock_cm),
+            patch("app.services.email_parser.EmailStatusDetector.detect_many", new_callable=AsyncMock, side_effect=lambda emails, strict=False: [detection] * len(emails)),
+            patch("app.services.email_scan_service._record_sync", new_callable=AsyncMock) as mock_record,
+        ):
+            from app.services.email_scan_service import scan_user_emails
+
+            async with gmail_client(transport=httpx.MockTransport(_route)) as client:
+                result = await scan_user_emails("user123", gmail_client=client)
+
+        # c1: delta since 101 -> m2 (not a job email), m3; c2: full sync -> x1
+        assert sorted(d["email_id"] for d in result.details) == ["m3", "x1"]
+        recorded = {call.args[0]: call.args[1] for call in mock_record.await_args_list}
+        assert recorded == {"c1": "103", "c2": "101"}
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_connection_keeps_its_cursor(self, gmail):
+        gmail.add("m4", "Offer letter")
+        gmail.failures["/users/me/messages/m4"] = 429
+        connections = [
+            {"id": "c1", "provider": "gmail", "email_address": "a@gmail.com",
+             "access_token_encrypted": "t1", "sync_cursor": "103"},
+        ]
+        mock_sess = AsyncMock()
+        mock_result = MagicMock()
+        mock_result.mappings.return_value.all.return_value = connections
+        mock_sess.execute = AsyncMock(return_value=mock_result)
+        mock_cm = AsyncMock()
+        mock_cm.__aenter__ = AsyncMock(return_value=mock_sess)
+        mock_cm.__aexit__ = AsyncMock(return_value=False)
+
+        with (
+            patch("app.db.engine.AsyncSessionLocal", return_value=mock_cm),
+            patch("app.services.email_parser.EmailStatusDetector.detect_many", new_callable=AsyncMock, return_value=[]),
+            patch("app.services.email_scan_service._record_sync", new_callable=AsyncMock) as mock_record,
+        ):
+            from app.services.email_scan_service import scan_user_emails
+
+            async with gmail.client() as client:
+                result = await scan_user_emails("user123", gmail_client=client)
+
+        assert result.errors == 1
+        mock_record.assert_not_awaited()
@@ -2,6 +2,7 @@
 
 Tests cover:
 - Invitation creation with correct fields and UUID token
+- Bulk invitation creation with set-based statements
 - Duplicate invitation revocation
 - Accept flow (OrganizationMember creation + tier upgrade)
 - Decline flow
@@ -224,6 +225,80 @@ class TestCreateInvitation:
         assert invitation.email == "dup@example.com"
 
 
+# ---------------------------------------------------------------------------
+# Tests: create_invitations (bulk)
+# ---------------------------------------------------------------------------
+
+
+class TestCreateInvitations:
+    @staticmethod
+    def _session(revoked_rows=()):
+        session = AsyncMock()
+        revoke_result = MagicMock()
+        revoke_result.all.return_value = list(revoked_rows)
+        session.execute = AsyncMock(side_effect=[revoke_result, MagicMock(), MagicMock()])
+        return session
+
+    @pytest.mark.asyncio
+    async def test_fixed_statement_count_for_any_batch(self, service, org_id, admin_user_id):
+        session = self._session()
+        rows = [{"email": f"user{i}@example.com", "first_name": "U"} for i in range(500)]
+
+        created = await service.create_invitations(session, org_id, rows, admin_user_id)
+
+        # revoke UPDATE, invitation INSERT, audit INSERT
+        assert session.execute.await_count == 3
+        session.add.assert_not_called()
+        assert len(created) == 500
+        invitation_params = session.execute.await_args_list[1].args[1]
+        assert len(invitation_params) == 500
+        assert all(p["org_id"] == UUID(org_id) for p in invitation_params)
+        assert all(p["invited_by"] == UUID(admin_user_id) for p in invitation_params)
+        assert all(p["status"] == InvitationStatus.PENDING for p in invitation_params)
+        assert len({p["token"] for p in invitation_params}) == 500
+
+    @pytest.mark.asyncio
+    async def test_normalizes_and_dedupes_emails(self, service, org_id, admin_user_id):
+        session = self._session()
+        rows = [
+            {"email": "  Alice@Example.COM ", "first_name": "Alice", "last_name": ""},
+            {"email": "alice@example.com", "first_name": "Duplicate"},
+        ]
+
+        created = await service.create_invitations(session, org_id, rows, admin_user_id)
+
+        assert len(created) == 1
+        assert created[0]["email"] == "alice@example.com"
+        assert created[0]["first_name"] == "Alice"
+        assert created[0]["last_name"] is None
+
+    @pytest.mark.asyncio
+    async def test_audits_revocations_and_creations(self, service, org_id, admin_user_id):
+        revoked = MagicMock(id=uuid4(), email="dup@example.com")
+        session = self._session([revoked])
+        rows = [{"email": "dup@example.com"}, {"email": "new@example.com"}]
+
+        created = await service.create_invitations(session, org_id, rows, admin_user_id)
+
+        revoke_sql = str(session.execute.await_args_list[0].args[0])
+        assert "UPDATE invitations" in revoke_sql and "RETURNING" in revoke_sql
+        audit_params = session.execute.await_args_list[2].args[1]
+        assert [a["action"] for a in audit_params] == [
+            "invitation_revoked",
+            "invitation_created",
+            "invitation_created",
+        ]
+        assert audit_params[0]["resource_id"] == revoked.id
+        assert audit_params[0]["changes"]["reason"] == "replaced_by_new_invitation"
+        assert {a["resource_id"] for a in audit_params[1:]} == {c["id"] for c in created}
+
+    @pytest.mark.asyncio
+    async def test_no_rows_no_statements(self, service, org_id, admin_user_id):
+        session = self._session()
+        assert await service.create_invitations(session, org_id, [], admin_user_id) == []
+        session.execute.assert_not_called()
+
+
 # ---------------------------------------------------------------------------
 # Tests: accept_invitation
 # ---------------------------------------------------------------------------
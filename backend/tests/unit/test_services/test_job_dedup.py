@@ -209,9 +209,11 @@ class TestUpsertJobs:
              patch("app.services.job_dedup.select", mock_select), \
              patch("sqlalchemy.and_", mock_and):
             from app.services.job_dedup import upsert_jobs
-            result = await upsert_jobs([raw], session)
+            new_jobs: list = []
+            result = await upsert_jobs([raw], session, new_jobs=new_jobs)
 
         assert len(result) == 1
+        assert new_jobs == [mock_instance]
         session.add.assert_called_once()
         session.flush.assert_awaited_once()
 
@@ -245,12 +247,16 @@ class TestUpsertJobs:
         with patch.dict(sys.modules, modules_patch), \
              patch("app.services.job_dedup.select", mock_select):
             from app.services.job_dedup import upsert_jobs
-            result = await upsert_jobs([raw], session)
+            new_jobs: list = []
+            result = await upsert_jobs([raw], session, new_jobs=new_jobs)
 
         assert len(result) == 1
         assert result[0] is existing
+        assert new_jobs == []
         # salary_min should have been updated
         assert existing.salary_min == 80000
+        # features are recomputed from the updated row
+        assert existing.features["salary"] == 80000
         # Should not have called session.add for existing job
         session.add.assert_not_called()
 
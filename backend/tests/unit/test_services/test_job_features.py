@@ -0,0 +1,196 @@
+"""
+Tests for the per-job feature store.
+
+Covers: feature derivation, skill terms, persistence round trip and
+memoisation, stale versions, the batched backfill, and scout scoring giving
+the same results from stored features as from raw job fields.
+"""
+
+from __future__ import annotations
+
+import random
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.agents.core.job_scout import JobScoutAgent
+from app.services.job_features import (
+    FEATURES_VERSION,
+    backfill_job_features,
+    compute_job_features,
+    job_features,
+    refresh_job_features,
+)
+
+
+def _job(**kwargs) -> SimpleNamespace:
+    defaults = {
+        "title": "Senior Backend Engineer",
+        "company": "Acme Corp",
+        "description": "Python and PostgreSQL. Python services at scale; lead projects.",
+        "location": "Remote, US",
+        "salary_min": 150000,
+        "salary_max": None,
+        "remote": True,
+    }
+    defaults.update(kwargs)
+    return SimpleNamespace(**defaults)
+
+
+class TestComputeJobFeatures:
+    def test_derives_scoring_features(self):
+        features = compute_job_features(_job())
+
+        assert features.title == "senior backend engineer"
+        assert features.text.startswith("senior backend engineer python")
+        assert features.title_tokens == {"senior", "backend", "engineer"}
+        assert features.seniority == {"senior"}
+        assert features.keywords[0] == "python"
+        assert features.salary == 150000
+        assert features.remote is True
+
+    def test_salary_prefers_max(self):
+        assert compute_job_features(_job(salary_min=90000, salary_max=120000)).salary == 120000
+
+    def test_empty_job(self):
+        features = compute_job_features(SimpleNamespace())
+
+        assert features.text == " "
+        assert features.seniority == frozenset()
+        assert features.salary is None
+
+
+class TestSkillTerms:
+    def test_phrases_up_to_three_words(self):
+        job = _job(description="Machine learning on Google Cloud Platform with node.js and C++.")
+        terms = compute_job_features(job).skill_terms
+
+        assert {"machine learning", "google cloud platform", "node.js", "c++"} <= terms
+        assert "learning on" not in terms  # ends with a stop word
+
+    def test_scout_matches_whole_words(self):
+        agent = JobScoutAgent()
+        job = _job(description="JavaScript, Django and Kubernetes/Helm")
+
+        assert agent._score_skills(job, {"skills": ["Java", "Go"]}) == 0
+        assert agent._score_skills(job, {"skills": ["javascript", "Helm"]}) == 20
+
+    def test_scout_falls_back_to_text_for_long_skills(self):
+        agent = JobScoutAgent()
+        job = _job(description="Experience with continuous integration and delivery pipelines.")
+
+        skills = ["Continuous integration and delivery pipelines"]
+        assert agent._score_skills(job, {"skills": skills}) == 20
+
+
+class TestStoredFeatures:
+    def test_round_trip_through_stored_dict(self):
+        job = _job()
+        computed = refresh_job_features(job)
+        job.features = dict(job.features)  # as loaded from the database
+
+        assert job.features["version"] == FEATURES_VERSION
+        assert job_features(job) == computed
+
+    def test_parsed_features_are_memoised_per_stored_value(self):
+        job = _job()
+        refresh_job_features(job)
+
+        first = job_features(job)
+        assert job_features(job) is first
+
+        job.salary_max = 300000
+        refresh_job_features(job)
+        assert job_features(job).salary == 300000
+
+    def test_stale_version_is_recomputed(self):
+        job = _job(features={"version": FEATURES_VERSION - 1, "salary": 1})
+
+        assert job_features(job).salary == 150000
+
+    def test_computed_features_are_memoised(self):
+        job = _job()
+
+        first = job_features(job)
+        assert job_features(job) is first
+
+        refresh_job_features(job)
+        assert job.features["version"] == FEATURES_VERSION
+
+
+class TestBackfill:
+    @staticmethod
+    def _session(*batches):
+        session = MagicMock()
+        results = []
+        for batch in (*batches, []):
+            result = MagicMock()
+            result.scalars.return_value.all.return_value = batch
+            results.append(result)
+        session.execute = AsyncMock(side_effect=results)
+        session.commit = AsyncMock()
+        return session
+
+    async def test_fills_jobs_batch_by_batch(self):
+        batches = [[_job(id=1, features=None), _job(id=2, features=None)], [_job(id=3)]]
+        session = self._session(*batches)
+
+        assert await backfill_job_features(session, batch_size=2) == 3
+
+        for job in (*batches[0], *batches[1]):
+            assert job.features["version"] == FEATURES_VERSION
+        assert session.commit.await_count == 2
+        later = str(session.execute.await_args_list[1].args[0])
+        assert "jobs.id >" in later
+
+    async def test_nothing_to_do(self):
+        session = self._session()
+
+        assert await backfill_job_features(session) == 0
+        session.commit.assert_not_awaited()
+
+    def test_runs_daily(self):
+        from app.worker.tasks import celery_app
+
+        schedule = celery_app.conf.beat_schedule
+        assert schedule["backfill-job-features"]["task"] == "app.worker.tasks.backfill_job_features"
+
+
+_TITLES = ["Senior Engineer", "Staff Data Scientist", "Engineering Manager", "Jr. Developer", "Analyst"]
+_PHRASES = [
+    "python", "react", "gambling platform", "entry-level", "head of data",
+    "principal", "mid level", "tobacco", "go", "kubernetes", "Sr. role",
+]
+
+
+class TestScoutEquivalence:
+    @pytest.mark.parametrize("seed", range(3))
+    def test_stored_features_score_like_raw_fields(self, seed):
+        rng = random.Random(seed)
+        agent = JobScoutAgent()
+        preferences = {
+            "target_titles": ["Senior Engineer"],
+            "target_locations": ["Remote"],
+            "salary_minimum": 100000,
+            "salary_target": 160000,
+            "excluded_companies": ["EvilCorp"],
+            "excluded_industries": ["gambling"],
+            "seniority_levels": ["senior", "staff", "lead"],
+        }
+        profile = {"skills": ["Python", "React", "Go"]}
+
+        for _ in range(50):
+            raw = _job(
+                title=rng.choice(_TITLES),
+                company=rng.choice(["Acme", "EvilCorp Inc"]),
+                description=" ".join(rng.sample(_PHRASES, 4)),
+                salary_min=rng.choice([None, 90000, 130000]),
+                salary_max=rng.choice([None, 170000]),
+                remote=rng.random() < 0.5,
+            )
+            stored = _job(**vars(raw))
+            refresh_job_features(stored)
+
+            assert agent._check_deal_breakers(stored, preferences) == agent._check_deal_breakers(raw, preferences)
+            assert agent._score_job(stored, preferences, profile) == agent._score_job(raw, preferences, profile)
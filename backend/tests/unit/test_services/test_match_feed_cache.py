@@ -0,0 +1,161 @@
+"""
+Tests for the per-user match feed cache.
+
+Covers: version-stamped windows, invalidation by version bump (including
+cached totals), in-place removal of swiped rows, and Redis failures
+degrading to cache misses.
+"""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.services.match_feed_cache import (
+    FeedWindow,
+    bump_match_version,
+    get_window,
+    remove_from_window,
+    store_window,
+    total_key,
+)
+
+_USER_ID = "user-feed-1"
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self._redis = redis
+        self._ops = []
+
+    def incr(self, key):
+        self._ops.append(("incr", key))
+
+    def delete(self, *keys):
+        self._ops.append(("delete", keys))
+
+    async def execute(self):
+        results = []
+        for op, arg in self._ops:
+            if op == "incr":
+                results.append(await self._redis.incr(arg))
+            else:
+                results.append(sum(1 for k in arg if self._redis.data.pop(k, None) is not None))
+        return results
+
+
+class _FakeRedis:
+    """Minimal in-memory stand-in for the redis.asyncio commands used."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def mget(self, *keys):
+        return [self.data.get(k) for k in keys]
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    async def incr(self, key):
+        self.data[key] = str(int(self.data.get(key) or 0) + 1)
+        return int(self.data[key])
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+
+def _window(version, ids, total=None, complete=True):
+    return FeedWindow(
+        version=version,
+        total=total if total is not None else len(ids),
+        items=[{"sort_score": "90.00", "match": {"id": i}} for i in ids],
+        complete=complete,
+    )
+
+
+@pytest.fixture
+def fake_redis():
+    redis = _FakeRedis()
+    with patch("app.cache.redis_client.get_redis_client", AsyncMock(return_value=redis)):
+        yield redis
+
+
+class TestFeedWindow:
+    def test_covers_partial_window(self):
+        window = _window(1, ["a", "b", "c"], total=10, complete=False)
+
+        assert window.covers(0, 3)
+        assert not window.covers(2, 2)
+
+    def test_complete_window_covers_any_page(self):
+        assert _window(1, ["a"]).covers(40, 20)
+
+    def test_json_round_trip(self):
+        window = _window(3, ["a", "b"], total=7, complete=False)
+
+        assert FeedWindow.from_json(window.to_json()) == window
+
+
+class TestVersioning:
+    @pytest.mark.asyncio
+    async def test_stored_window_is_returned_at_current_version(self, fake_redis):
+        _, version = await get_window(_USER_ID, "new")
+        await store_window(_USER_ID, "new", _window(version, ["a"]))
+
+        window, current = await get_window(_USER_ID, "new")
+
+        assert current == 0
+        assert [i["match"]["id"] for i in window.items] == ["a"]
+
+    @pytest.mark.asyncio
+    async def test_bump_invalidates_windows_and_totals(self, fake_redis):
+        await store_window(_USER_ID, "saved", _window(0, ["a"]))
+        fake_redis.data[total_key(_USER_ID, "new")] = "12"
+
+        assert await bump_match_version(_USER_ID) == 1
+
+        window, current = await get_window(_USER_ID, "saved")
+        assert window is None
+        assert current == 1
+        assert total_key(_USER_ID, "new") not in fake_redis.data
+
+    @pytest.mark.asyncio
+    async def test_redis_down_reports_no_version(self):
+        with patch(
+            "app.cache.redis_client.get_redis_client",
+            AsyncMock(side_effect=ConnectionError("down")),
+        ):
+            window, version = await get_window(_USER_ID, "new")
+            bumped = await bump_match_version(_USER_ID)
+
+        assert window is None
+        assert version is None
+        assert bumped is None
+
+
+class TestRemoveFromWindow:
+    @pytest.mark.asyncio
+    async def test_swipe_patches_current_window(self, fake_redis):
+        await store_window(_USER_ID, "new", _window(0, ["a", "b", "c"], total=9, complete=False))
+
+        await remove_from_window(_USER_ID, "b")
+
+        window, version = await get_window(_USER_ID, "new")
+        assert version == 1
+        assert [i["match"]["id"] for i in window.items] == ["a", "c"]
+        assert window.total == 8
+
+    @pytest.mark.asyncio
+    async def test_stale_window_is_not_revived(self, fake_redis):
+        await store_window(_USER_ID, "new", _window(0, ["a", "b"]))
+        await bump_match_version(_USER_ID)  # e.g. new matches arrived
+
+        await remove_from_window(_USER_ID, "a")
+
+        window, version = await get_window(_USER_ID, "new")
+        assert version == 2
+        assert window is None
@@ -0,0 +1,90 @@
+"""
+Tests for the enterprise metrics query planner.
+
+Covers: fusing a group's metrics into one SELECT, FILTER clauses for
+per-metric predicates, execution on one session, and groups without a
+row.
+"""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql
+
+from app.db.models import OrganizationMember, OrgRole
+from app.services.enterprise.metrics_planner import Metric, MetricsQueryPlanner
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def _result(row) -> MagicMock:
+    result = MagicMock()
+    result.mappings.return_value.first.return_value = row
+    return result
+
+
+def _session(*rows) -> MagicMock:
+    session = MagicMock()
+    session.execute = AsyncMock(side_effect=[_result(row) for row in rows])
+    return session
+
+
+def _planner() -> MetricsQueryPlanner:
+    org_id = uuid4()
+    return (
+        MetricsQueryPlanner()
+        .add(
+            "members",
+            Metric("enrolled", func.count(OrganizationMember.id)),
+            Metric(
+                "admins",
+                func.count(OrganizationMember.id),
+                where=OrganizationMember.role == OrgRole.ADMIN,
+            ),
+            where=(OrganizationMember.org_id == org_id,),
+        )
+        .add("members_again", Metric("members", func.count(OrganizationMember.id)))
+    )
+
+
+class TestStatements:
+    def test_group_is_one_select_with_filter(self):
+        statements = _planner().statements()
+
+        assert list(statements) == ["members", "members_again"]
+        sql = _sql(statements["members"])
+        assert sql.count("SELECT") == 1
+        assert "count(organization_members.id) AS enrolled" in sql
+        assert "FILTER (WHERE organization_members.role" in sql
+        assert "WHERE organization_members.org_id" in sql
+
+    def test_group_predicates_are_set_once(self):
+        planner = MetricsQueryPlanner().add(
+            "g", Metric("a", func.count(OrganizationMember.id)),
+            where=(OrganizationMember.role == OrgRole.ADMIN,),
+        )
+        planner.add("g", Metric("b", func.count(OrganizationMember.id)))
+        with pytest.raises(ValueError):
+            planner.add("g", where=(OrganizationMember.role == OrgRole.MEMBER,))
+
+
+class TestRun:
+    @pytest.mark.asyncio
+    async def test_sequential_on_one_session(self):
+        session = _session({"enrolled": 9, "admins": 1}, {"members": 30})
+
+        values = await _planner().run(session)
+
+        assert values == {"enrolled": 9, "admins": 1, "members": 30}
+        assert session.execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_group_without_row_adds_nothing(self):
+        session = _session({"enrolled": 0, "admins": 0}, None)
+        assert await _planner().run(session) == {"enrolled": 0, "admins": 0}
@@ -0,0 +1,336 @@
+"""
+Tests for the org_daily_metrics rollup jobs.
+
+Covers: nightly rebuild aggregates (members only, review-only days,
+placement time), incremental refresh of status changes, applications
+moved to another day or deleted, members joining, agreement with a full
+rebuild, pruning of logged bucket changes, and the beat schedule.
+
+The rollup is PostgreSQL SQL, so these run it against the database in
+``DATABASE_URL`` (CI's PostgreSQL service) inside a throwaway schema
+holding the columns it reads plus the real 00011 migration; they are
+skipped when ``DATABASE_URL`` is not PostgreSQL.
+"""
+
+from __future__ import annotations
+
+import os
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+
+from app.services.enterprise.metrics_rollup import (
+    rebuild_org_daily_metrics,
+    refresh_org_daily_metrics,
+)
+
+MIGRATION = (
+    Path(__file__).resolve().parents[4]
+    / "supabase"
+    / "migrations"
+    / "00011_org_daily_metrics.sql"
+)
+
+# Just the columns the rollup reads; the migration adds the rest.
+_BASE_SCHEMA = """
+CREATE TABLE organizations (id UUID PRIMARY KEY);
+CREATE TABLE organization_members (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    org_id UUID NOT NULL REFERENCES organizations(id),
+    user_id UUID NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL
+);
+CREATE TABLE applications (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    user_id UUID NOT NULL,
+    status TEXT NOT NULL,
+    applied_at TIMESTAMPTZ NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL
+);
+CREATE TABLE agent_activities (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    user_id UUID NOT NULL,
+    event_type TEXT NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL
+);
+"""
+
+DAY_1 = date(2026, 10, 1)
+DAY_2 = date(2026, 10, 2)
+ENROLLED = datetime(2026, 9, 1, tzinfo=timezone.utc)
+LONG_AGO = datetime(2026, 10, 3, tzinfo=timezone.utc)
+
+
+def _at(day: date, hour: int = 12) -> datetime:
+    return datetime(day.year, day.month, day.day, hour, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+async def db():
+    """A session on a fresh schema with the rollup tables, dropped afterwards."""
+    url = os.environ.get("DATABASE_URL", "")
+    if not url.startswith("postgresql"):
+        pytest.skip("rollup SQL needs PostgreSQL in DATABASE_URL")
+
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+    schema = f"rollup_test_{uuid4().hex[:12]}"
+    engine = create_async_engine(
+        url, connect_args={"server_settings": {"search_path": schema}}
+    )
+    async with engine.connect() as conn:
+        raw = (await conn.get_raw_connection()).driver_connection
+        await raw.execute(f"CREATE SCHEMA {schema}")
+        await raw.execute(_BASE_SCHEMA)
+        await raw.execute(MIGRATION.read_text(encoding="utf-8"))
+        await conn.commit()
+    try:
+        async with AsyncSession(engine) as session:
+            yield session
+    finally:
+        async with engine.connect() as conn:
+            raw = (await conn.get_raw_connection()).driver_connection
+            await raw.execute(f"DROP SCHEMA {schema} CASCADE")
+        await engine.dispose()
+
+
+class _Org:
+    """Seeds one organization's members, applications and reviews."""
+
+    def __init__(self, session):
+        self.session = session
+        self.id = uuid4()
+
+    async def _execute(self, sql: str, params: dict) -> None:
+        from sqlalchemy import text
+
+        await self.session.execute(text(sql), params)
+        await self.session.commit()
+
+    async def create(self) -> _Org:
+        await self._execute("INSERT INTO organizations (id) VALUES (:id)", {"id": self.id})
+        return self
+
+    async def member(self, joined: datetime = ENROLLED):
+        user_id = uuid4()
+        await self._execute(
+            "INSERT INTO organization_members (org_id, user_id, created_at) "
+            "VALUES (:org, :user, :joined)",
+            {"org": self.id, "user": user_id, "joined": joined},
+        )
+        return user_id
+
+    async def apply(self, user_id, day: date, status: str = "applied", updated=None):
+        app_id = uuid4()
+        await self._execute(
+            "INSERT INTO applications (id, user_id, status, applied_at, updated_at) "
+            "VALUES (:id, :user, :status, :applied, :updated)",
+            {
+                "id": app_id, "user": user_id, "status": status,
+                "applied": _at(day), "updated": updated or _at(day),
+            },
+        )
+        return app_id
+
+    async def review(self, user_id, day: date):
+        await self._execute(
+            "INSERT INTO agent_activities (user_id, event_type, created_at) "
+            "VALUES (:user, 'job_review', :at)",
+            {"user": user_id, "at": _at(day)},
+        )
+
+    async def update_application(self, app_id, **values):
+        values.setdefault("updated_at", datetime.now(timezone.utc))
+        assignments = ", ".join(f"{column} = :{column}" for column in values)
+        await self._execute(
+            f"UPDATE applications SET {assignments} WHERE id = :id", {"id": app_id, **values}
+        )
+
+    async def buckets(self) -> dict:
+        from sqlalchemy import text
+
+        result = await self.session.execute(
+            text(
+                "SELECT day, applications, interviews, placements, placement_days_sum, "
+                "jobs_reviewed, active_user_ids FROM org_daily_metrics "
+                "WHERE org_id = :org ORDER BY day"
+            ),
+            {"org": self.id},
+        )
+        return {
+            row.day: {
+                "applications": row.applications,
+                "interviews": row.interviews,
+                "placements": row.placements,
+                "placement_days_sum": row.placement_days_sum,
+                "jobs_reviewed": row.jobs_reviewed,
+                "active": set(row.active_user_ids),
+            }
+            for row in result
+        }
+
+
+def _bucket(applications=0, interviews=0, placements=0, placement_days_sum=0.0,
+            jobs_reviewed=0, active=()):
+    return {
+        "applications": applications,
+        "interviews": interviews,
+        "placements": placements,
+        "placement_days_sum": placement_days_sum,
+        "jobs_reviewed": jobs_reviewed,
+        "active": set(active),
+    }
+
+
+class TestRebuild:
+    async def test_aggregates_members_by_applied_day(self, db):
+        org = await _Org(db).create()
+        alice, bob = await org.member(), await org.member()
+        outsider = uuid4()
+        await org.apply(alice, DAY_1)
+        await org.apply(alice, DAY_1, status="interview")
+        await org.apply(bob, DAY_1, status="offer", updated=_at(DAY_1) + timedelta(days=1))
+        await org.apply(outsider, DAY_1)
+        await org.review(bob, DAY_2)
+
+        assert await rebuild_org_daily_metrics(db) == 2
+
+        offer_days = (_at(DAY_1) + timedelta(days=1) - ENROLLED) / timedelta(days=1)
+        assert await org.buckets() == {
+            DAY_1: _bucket(
+                applications=3, interviews=2, placements=1,
+                placement_days_sum=pytest.approx(offer_days), active={alice, bob},
+            ),
+            DAY_2: _bucket(jobs_reviewed=1),
+        }
+
+    async def test_replaces_previous_rollup(self, db):
+        org = await _Org(db).create()
+        alice = await org.member()
+        app_id = await org.apply(alice, DAY_1)
+        await rebuild_org_daily_metrics(db)
+
+        await org.update_application(app_id, applied_at=_at(DAY_2))
+        await rebuild_org_daily_metrics(db)
+
+        assert await org.buckets() == {DAY_2: _bucket(applications=1, active={alice})}
+
+
+class TestRefresh:
+    async def _rebuilt(self, db):
+        org = await _Org(db).create()
+        alice, bob = await org.member(), await org.member()
+        apps = [await org.apply(alice, DAY_1), await org.apply(bob, DAY_1)]
+        await rebuild_org_daily_metrics(db)
+        return org, alice, bob, apps
+
+    async def test_status_change_updates_its_bucket(self, db):
+        org, alice, bob, (app_id, _) = await self._rebuilt(db)
+        since = datetime.now(timezone.utc)
+
+        await org.update_application(app_id, status="interview")
+        assert await refresh_org_daily_metrics(db, since) == 1
+
+        assert (await org.buckets())[DAY_1] == _bucket(
+            applications=2, interviews=1, active={alice, bob}
+        )
+
+    async def test_moved_application_clears_its_old_bucket(self, db):
+        org, alice, bob, (app_id, _) = await self._rebuilt(db)
+        since = datetime.now(timezone.utc)
+
+        await org.update_application(app_id, applied_at=_at(DAY_2))
+        assert await refresh_org_daily_metrics(db, since) == 2
+
+        assert await org.buckets() == {
+            DAY_1: _bucket(applications=1, active={bob}),
+            DAY_2: _bucket(applications=1, active={alice}),
+        }
+
+    async def test_deleted_application_clears_its_bucket(self, db):
+        from sqlalchemy import text
+
+        org, _, _, (app_id, other_id) = await self._rebuilt(db)
+        since = datetime.now(timezone.utc)
+
+        await db.execute(
+            text("DELETE FROM applications WHERE id IN (:a, :b)"), {"a": app_id, "b": other_id}
+        )
+        await db.commit()
+        await refresh_org_daily_metrics(db, since)
+
+        assert await org.buckets() == {DAY_1: _bucket()}
+
+    async def test_same_day_reschedule_logs_no_change(self, db):
+        from sqlalchemy import text
+
+        org, _, _, (app_id, _) = await self._rebuilt(db)
+
+        await org.update_application(app_id, applied_at=_at(DAY_1, hour=20), status="screening")
+
+        changes = await db.execute(text("SELECT COUNT(*) FROM application_day_changes"))
+        assert changes.scalar() == 0
+
+    async def test_new_member_history_counts(self, db):
+        org, *_ = await self._rebuilt(db)
+        since = datetime.now(timezone.utc)
+
+        carol = await org.member(joined=datetime.now(timezone.utc))
+        await org._execute(
+            "INSERT INTO applications (user_id, status, applied_at, updated_at) "
+            "VALUES (:user, 'applied', :applied, :applied)",
+            {"user": carol, "applied": _at(DAY_2)},
+        )
+        await refresh_org_daily_metrics(db, since)
+
+        assert (await org.buckets())[DAY_2] == _bucket(applications=1, active={carol})
+
+    async def test_refresh_matches_full_rebuild(self, db):
+        org, alice, bob, (first, second) = await self._rebuilt(db)
+        await org.review(alice, DAY_2)
+        since = datetime.now(timezone.utc)
+
+        await org.update_application(first, applied_at=_at(DAY_2), status="offer")
+        await org.update_application(second, user_id=alice)
+        await org.review(bob, DAY_1)
+        await refresh_org_daily_metrics(db, since)
+        refreshed = await org.buckets()
+
+        await rebuild_org_daily_metrics(db)
+        rebuilt = await org.buckets()
+        # The rebuild drops buckets that became empty; the refresh zeroes them.
+        assert {day: b for day, b in refreshed.items() if b != _bucket()} == rebuilt
+
+
+async def test_rebuild_prunes_old_bucket_changes(db):
+    from sqlalchemy import text
+
+    org = await _Org(db).create()
+    alice = await org.member()
+    old, recent = await org.apply(alice, DAY_1), await org.apply(alice, DAY_1)
+    await org.update_application(old, applied_at=_at(DAY_2))
+    await db.execute(text("UPDATE application_day_changes SET changed_at = :t"), {"t": LONG_AGO})
+    await org.update_application(recent, applied_at=_at(DAY_2))
+
+    await rebuild_org_daily_metrics(db)
+
+    changes = await db.execute(text("SELECT changed_at FROM application_day_changes"))
+    assert [row.changed_at > LONG_AGO for row in changes] == [True]
+
+
+def test_beat_schedule_includes_rollup_jobs():
+    from app.worker.celery_app import celery_app
+
+    import app.worker.tasks  # noqa: F401
+
+    schedule = celery_app.conf.beat_schedule
+    assert schedule["rebuild-org-daily-metrics"]["task"] == (
+        "app.worker.tasks.rebuild_org_daily_metrics"
+    )
+    assert schedule["rebuild-org-daily-metrics"]["schedule"] == 24 * 60 * 60
+    assert schedule["refresh-org-daily-metrics"]["task"] == (
+        "app.worker.tasks.refresh_org_daily_metrics"
+    )
+    assert schedule["refresh-org-daily-metrics"]["schedule"] == 15 * 60
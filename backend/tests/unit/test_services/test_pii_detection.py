@@ -8,25 +8,39 @@ Covers:
 - PII hook check_pii() return values
 - RBAC enforcement (403 for non-admin)
 - Pattern CRUD via API
+- Compiled per-org scanner: caching, invalidation, prefilter equivalence
 """
 
 from __future__ import annotations
 
 import hashlib
+import re
 from typing import Any, Dict, List, Optional
 from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
 import pytest
 
+from app.services.enterprise import pii_detection
 from app.services.enterprise.pii_detection import (
     DEFAULT_PATTERNS,
     PIICheckResult,
     PIIDetection,
     PIIDetectionService,
+    PIIScanner,
+    invalidate_scanner,
+    required_literal,
 )
 
 
+@pytest.fixture(autouse=True)
+def _fresh_scanner_cache():
+    """Every test loads its own org settings."""
+    invalidate_scanner()
+    yield
+    invalidate_scanner()
+
+
 # ---------------------------------------------------------------------------
 # Helpers: lightweight fakes for SQLAlchemy
 # ---------------------------------------------------------------------------
@@ -92,10 +106,9 @@ async def test_scan_detects_internal_email():
     service = PIIDetectionService()
     settings = {}  # No custom patterns, no whitelist
 
-    # Two calls to execute: _load_patterns, _apply_whitelist
     session = FakeSession([
-        FakeScalarResult(settings),  # _load_patterns
-        FakeScalarResult(settings),  # _apply_whitelist
+        FakeScalarResult(settings),
+        FakeScalarResult(settings),
     ])
 
     text = "Contact me at john.doe@acme.internal for details."
@@ -319,8 +332,8 @@ async def test_check_pii_creates_anonymized_alert():
     settings = {}
 
     session = FakeSession([
-        FakeScalarResult(settings),  # _load_patterns
-        FakeScalarResult(settings),  # _apply_whitelist
+        FakeScalarResult(settings),
+        FakeScalarResult(settings),
     ])
 
     text = "Contact me at dev@acme.internal for questions."
@@ -566,6 +579,8 @@ async def test_pii_config_put_saves_valid_patterns():
     mock_begin.__aexit__ = AsyncMock(return_value=False)
     mock_session.begin = MagicMock(return_value=mock_begin)
 
+    pii_detection._SCANNER_CACHE["org-1"] = (0.0, PIIScanner([]))
+
     with patch("app.db.engine.AsyncSessionLocal", return_value=mock_session_ctx):
         client = TestClient(app)
         response = client.put(
@@ -589,6 +604,8 @@ async def test_pii_config_put_saves_valid_patterns():
     assert body["patterns"][0]["category"] == "code_name"
     assert body["whitelist"] == ["safe_term"]
     assert len(body["default_patterns"]) == len(DEFAULT_PATTERNS)
+    # The org's cached scanner was dropped
+    assert "org-1" not in pii_detection._SCANNER_CACHE
 
     app.dependency_overrides.clear()
 
@@ -613,6 +630,134 @@ async def test_scan_empty_text():
     assert detections == []
 
 
+# ---------------------------------------------------------------------------
+# Test: Compiled per-org scanner
+# ---------------------------------------------------------------------------
+
+
+def _reference_scan(patterns, whitelist, text):
+    """Every enabled pattern run on its own over the full text."""
+    lowered = {term.lower() for term in whitelist}
+    detections = []
+    for pat in patterns:
+        if not pat.get("enabled", True):
+            continue
+        for match in re.finditer(pat["pattern"], text):
+            if match.group().lower() not in lowered:
+                detections.append(
+                    PIIDetection(match.group(), pat["category"], match.start(), pat["id"])
+                )
+    return detections
+
+
+_CUSTOM = [
+    {"pattern": r"\bAtlas\w*", "category": "code_name", "id": "c1"},
+    {"pattern": r"acme\.internal", "category": "domain", "id": "c2"},
+    {"pattern": r"(?<=ticket )[A-Z]+-\d+", "category": "ticket", "id": "c3"},
+]
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "Plain resume text with no internal references at all.",
+    "Mail bob@acme.internal or see https://jira.acme.internal/browse/X-1 now.",
+    "Built AtlasDB during Project Phoenix; ticket ABC-12 and ticket XY-3.",
+    "https://wiki.acme.internal/a https://gitlab.corp.io/repo Operation Nightfall",
+])
+def test_scanner_matches_independent_pattern_runs(text):
+    """The prefiltered scan finds exactly what each pattern finds alone."""
+    patterns = DEFAULT_PATTERNS + _CUSTOM
+    scanner = PIIScanner(patterns, ["project phoenix"])
+
+    assert scanner.scan(text) == _reference_scan(patterns, ["project phoenix"], text)
+
+
+def test_scanner_overlapping_patterns_all_reported():
+    """A URL matching two patterns is reported by both, as before."""
+    scanner = PIIScanner(DEFAULT_PATTERNS)
+    detections = scanner.scan("See https://jira.acme.internal/browse/X-1")
+    assert {d.category for d in detections} == {"internal_url", "internal_tool_url"}
+
+
+@pytest.mark.parametrize("pattern,literal", [
+    (r"\bNimbus\b", "Nimbus"),
+    (r"[a-z]+@[a-z.]+\.internal\b", ".internal"),
+    (r"https?://example", "://example"),
+    (r"colou?r", "colo"),
+    (r"ab{0,2}cd", "cd"),
+    (r"(?:Project|Operation)\s+X", "X"),
+    (r"\b(?:Project|Operation)\s+[A-Z]", ""),
+    (r"alpha|beta", ""),
+    (r"(?i)secret", ""),
+    (r"\x41bc", "bc"),
+    (r"(\w+)-\1", "-"),
+])
+def test_required_literal(pattern, literal):
+    assert required_literal(re.compile(pattern)) == literal
+
+
+def test_scanner_skips_patterns_whose_literal_is_absent():
+    scanner = PIIScanner([
+        {"pattern": r"\bNimbus\b", "category": "code_name", "id": "n"},
+        {"pattern": r"(\w+)-\1", "category": "repeat", "id": "r"},
+    ])
+    assert [d.matched_term for d in scanner.scan("abc-abc Nimbus")] == ["Nimbus", "abc-abc"]
+    assert scanner.scan("abc abc Nimbo") == []
+
+
+def test_scanner_skips_invalid_and_disabled_patterns():
+    scanner = PIIScanner([
+        {"pattern": "[broken", "category": "bad"},
+        {"pattern": r"\bOff\b", "category": "off", "enabled": False},
+    ])
+    assert scanner.patterns == []
+    assert scanner.scan("Off [broken") == []
+
+
+@pytest.mark.asyncio
+async def test_scanner_cached_across_scans():
+    """The org's settings are loaded once, then scans run without queries."""
+    service = PIIDetectionService()
+    session = FakeSession([FakeScalarResult({"pii_whitelist": []})])
+
+    await service.scan_text("dev@acme.internal", org_id="org-1", session=session)
+    detections = await PIIDetectionService().scan_text(
+        "ops@acme.internal", org_id="org-1", session=session
+    )
+
+    assert session._call_idx == 1
+    assert [d.matched_term for d in detections] == ["ops@acme.internal"]
+
+
+@pytest.mark.asyncio
+async def test_invalidate_scanner_reloads_settings():
+    service = PIIDetectionService()
+    session = FakeSession([
+        FakeScalarResult({}),
+        FakeScalarResult({"pii_whitelist": ["dev@acme.internal"]}),
+    ])
+
+    assert await service.scan_text("dev@acme.internal", "org-1", session)
+    invalidate_scanner("org-1")
+    assert await service.scan_text("dev@acme.internal", "org-1", session) == []
+
+
+@pytest.mark.asyncio
+async def test_scanner_cache_expires():
+    service = PIIDetectionService()
+    session = FakeSession([FakeScalarResult({}), FakeScalarResult({})])
+
+    with patch.object(pii_detection.time, "monotonic", return_value=1000.0):
+        await service.scan_text("text", "org-1", session)
+    with patch.object(
+        pii_detection.time, "monotonic",
+        return_value=1000.0 + pii_detection.SCANNER_TTL_SECONDS + 1,
+    ):
+        await service.scan_text("text", "org-1", session)
+
+    assert session._call_idx == 2
+
+
 # ---------------------------------------------------------------------------
 # Test: Default patterns are well-formed
 # ---------------------------------------------------------------------------
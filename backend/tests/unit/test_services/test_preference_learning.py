@@ -1,8 +1,8 @@
 """
 Unit tests for the preference learning service.
 
-Tests detect_patterns and apply_learned_preferences with mocked
-database sessions using SimpleNamespace objects.
+Tests swipe statistics, detect_patterns and apply_learned_preferences
+with mocked database sessions using SimpleNamespace objects.
 """
 
 from __future__ import annotations
@@ -15,8 +15,12 @@ from uuid import uuid4
 import pytest
 
 from app.services.preference_learning import (
+    PreferenceAdjuster,
+    aggregate_swipes,
     apply_learned_preferences,
     detect_patterns,
+    record_swipe_stats,
+    swipe_pattern_keys,
 )
 
 
@@ -66,14 +70,23 @@ def _make_job(company="Acme Corp", location="SF", remote=True,
     )
 
 
+def _stats_for(events):
+    """Fold swipe events into swipe_pattern_stats-like rows."""
+    counts = aggregate_swipes(vars(e) for e in events)
+    return [
+        SimpleNamespace(pattern_type=ptype, pattern_value=value, total=total, dismissed=dismissed)
+        for (ptype, value), (total, dismissed) in counts.items()
+    ]
+
+
 def _mock_db_for_detect(events, existing_prefs=None):
-    """Create a mock db session that returns events and existing prefs."""
+    """Create a mock db session that returns pattern stats and existing prefs."""
     mock_db = AsyncMock()
     added_objects = []
 
-    # First call: swipe events query
+    # First call: pattern stats query (built from the events)
     events_result = MagicMock()
-    events_result.scalars.return_value.all.return_value = events
+    events_result.scalars.return_value.all.return_value = _stats_for(events)
 
     # Second call: existing learned preferences query
     prefs_result = MagicMock()
@@ -82,11 +95,8 @@ def _mock_db_for_detect(events, existing_prefs=None):
     mock_db.execute = AsyncMock(side_effect=[events_result, prefs_result])
     mock_db.flush = AsyncMock()
 
-    original_add = mock_db.add
-    def capture_add(obj):
-        added_objects.append(obj)
-        return original_add(obj)
-    mock_db.add = capture_add
+    # Session.add is synchronous
+    mock_db.add = MagicMock(side_effect=added_objects.append)
 
     return mock_db, added_objects
 
@@ -100,6 +110,55 @@ def _mock_db_for_apply(preferences):
     return mock_db
 
 
+# ---------------------------------------------------------------------------
+# Tests: swipe statistics
+# ---------------------------------------------------------------------------
+
+class TestSwipeStats:
+    def test_pattern_keys_skip_missing_attributes(self):
+        assert swipe_pattern_keys("Acme", None, False, "") == [
+            ("company", "Acme"),
+            ("remote", "false"),
+        ]
+
+    def test_aggregate_counts_totals_and_dismissals(self):
+        counts = aggregate_swipes([
+            {"action": "dismissed", "job_company": "BadCo", "job_remote": True},
+            {"action": "saved", "job_company": "BadCo", "job_remote": True},
+            {"action": "dismissed", "job_company": "OtherCo"},
+        ])
+
+        assert counts[("company", "BadCo")] == [2, 1]
+        assert counts[("remote", "true")] == [2, 1]
+        assert counts[("company", "OtherCo")] == [1, 1]
+
+    @pytest.mark.asyncio
+    async def test_record_issues_single_upsert(self):
+        from sqlalchemy.dialects import postgresql
+
+        mock_db = AsyncMock()
+        await record_swipe_stats(
+            uuid4(),
+            [
+                {"action": "dismissed", "job_company": "BadCo", "job_location": "NYC"},
+                {"action": "dismissed", "job_company": "BadCo"},
+            ],
+            mock_db,
+        )
+
+        mock_db.execute.assert_awaited_once()
+        sql = str(mock_db.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+        assert sql.startswith("INSERT INTO swipe_pattern_stats")
+        assert "ON CONFLICT ON CONSTRAINT uq_swipe_pattern_stat DO UPDATE" in sql
+        assert "total = (swipe_pattern_stats.total + excluded.total)" in sql
+
+    @pytest.mark.asyncio
+    async def test_record_without_attributes_is_noop(self):
+        mock_db = AsyncMock()
+        await record_swipe_stats(uuid4(), [{"action": "saved"}], mock_db)
+        mock_db.execute.assert_not_awaited()
+
+
 # ---------------------------------------------------------------------------
 # Tests: detect_patterns
 # ---------------------------------------------------------------------------
@@ -215,6 +274,19 @@ class TestDetectPatterns:
         assert len(company_prefs) == 1
         assert float(company_prefs[0].confidence) == 0.95
 
+    @pytest.mark.asyncio
+    async def test_threshold_applied_in_query(self):
+        """Counters are filtered in SQL; swipe_events are never read."""
+        user_id = uuid4()
+        mock_db, _ = _mock_db_for_detect([])
+
+        await detect_patterns(user_id, mock_db)
+
+        sql = str(mock_db.execute.await_args_list[0].args[0])
+        assert "FROM swipe_pattern_stats" in sql
+        assert "swipe_pattern_stats.dismissed >=" in sql
+        assert "swipe_events" not in sql
+
     @pytest.mark.asyncio
     async def test_returns_empty_for_no_events(self):
         """No swipe events should return empty list."""
@@ -320,3 +392,57 @@ class TestApplyLearnedPreferences:
 
         result = await apply_learned_preferences(user_id, 80, job, mock_db)
         assert result == 80
+
+
+# ---------------------------------------------------------------------------
+# Tests: PreferenceAdjuster
+# ---------------------------------------------------------------------------
+
+class TestPreferenceAdjuster:
+    def test_matches_per_job_adjustment(self):
+        user_id = uuid4()
+        adjuster = PreferenceAdjuster([
+            _make_learned_pref(user_id, pattern_type="company", pattern_value="BadCo", confidence=0.80),
+            _make_learned_pref(user_id, pattern_type="remote", pattern_value="true", confidence=0.30),
+        ])
+
+        # -12 for the company, +7 for remote
+        assert adjuster.adjust(_make_job(company="badco", remote=True), 80) == 75
+        assert adjuster.adjust(_make_job(company="GoodCo", remote=False), 80) == 80
+
+    def test_duplicate_patterns_accumulate(self):
+        user_id = uuid4()
+        adjuster = PreferenceAdjuster([
+            _make_learned_pref(user_id, pattern_value="BadCo", confidence=0.80),
+            _make_learned_pref(user_id, pattern_value="badco", confidence=0.80),
+        ])
+
+        assert adjuster.adjustment(_make_job(company="BadCo")) == -24
+
+    def test_apply_adjusts_list_in_one_pass(self):
+        adjuster = PreferenceAdjuster([
+            _make_learned_pref(uuid4(), pattern_value="BadCo", confidence=0.95),
+        ])
+        scored = [
+            (_make_job(company="BadCo"), 50, "r1"),
+            (_make_job(company="GoodCo"), 50, "r2"),
+        ]
+
+        assert [s for _, s, _ in adjuster.apply(scored)] == [36, 50]
+
+    def test_empty_adjuster_is_falsy_and_passthrough(self):
+        adjuster = PreferenceAdjuster()
+        scored = [(_make_job(), 42, "r")]
+
+        assert not adjuster
+        assert adjuster.apply(scored) == scored
+
+    @pytest.mark.asyncio
+    async def test_load_issues_single_query(self):
+        user_id = uuid4()
+        mock_db = _mock_db_for_apply([_make_learned_pref(user_id, pattern_value="BadCo")])
+
+        adjuster = await PreferenceAdjuster.load(user_id, mock_db)
+
+        mock_db.execute.assert_awaited_once()
+        assert adjuster.adjust(_make_job(company="BadCo"), 80) == 68
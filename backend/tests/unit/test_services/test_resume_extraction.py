@@ -0,0 +1,179 @@
+"""
+Tests for resume text extraction in the process pool and its cache.
+
+Covers: parsing in a real worker process (text and errors), content-hash
+text cache hits and misses, best-effort Redis, and the profile cache that
+lets ``extract_profile_from_resume`` skip parsing and the LLM call.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services import resume_extraction
+from app.services.resume_extraction import (
+    content_digest,
+    extract_text,
+    run_extraction,
+    shutdown_executor,
+)
+from app.services.resume_parser import (
+    ExtractedProfile,
+    extract_profile_from_resume,
+    extract_text_from_docx,
+    extract_text_from_pdf,
+)
+
+_REDIS = "app.cache.redis_client"
+
+
+def _docx_bytes(*paragraphs: str) -> bytes:
+    from docx import Document
+
+    doc = Document()
+    for text in paragraphs:
+        doc.add_paragraph(text)
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+class TestProcessPool:
+    @pytest.mark.asyncio
+    async def test_parses_in_worker_process_and_propagates_errors(self):
+        resume = _docx_bytes("Jane Doe", "Senior engineer building data platforms since 2015.")
+        try:
+            text = await run_extraction(extract_text_from_docx, resume)
+            with pytest.raises(ValueError, match="empty or contains only images"):
+                await run_extraction(extract_text_from_docx, _docx_bytes("hi"))
+        finally:
+            shutdown_executor()
+
+        assert text == "Jane Doe\nSenior engineer building data platforms since 2015."
+
+    def test_executor_is_bounded_and_recreated_after_shutdown(self):
+        first = resume_extraction.get_executor()
+        try:
+            assert first._max_workers == resume_extraction.EXTRACTION_WORKERS
+            assert resume_extraction.get_executor() is first
+        finally:
+            shutdown_executor()
+        second = resume_extraction.get_executor()
+        shutdown_executor()
+        assert second is not first
+
+
+class TestExtractTextCache:
+    @pytest.mark.asyncio
+    async def test_cache_hit_skips_parsing(self):
+        with (
+            patch(f"{_REDIS}.cache_get", new_callable=AsyncMock, return_value="cached text") as get,
+            patch.object(resume_extraction, "run_extraction", new_callable=AsyncMock) as run,
+        ):
+            text = await extract_text(b"%PDF-bytes", "resume.pdf")
+
+        assert text == "cached text"
+        run.assert_not_called()
+        digest = hashlib.sha256(b"%PDF-bytes").hexdigest()
+        get.assert_awaited_once_with(f"resume_text:{digest}")
+
+    @pytest.mark.asyncio
+    async def test_cache_miss_parses_and_stores(self):
+        with (
+            patch(f"{_REDIS}.cache_get", new_callable=AsyncMock, return_value=None),
+            patch(f"{_REDIS}.cache_set", new_callable=AsyncMock) as put,
+            patch.object(
+                resume_extraction, "run_extraction", new_callable=AsyncMock, return_value="parsed"
+            ) as run,
+        ):
+            text = await extract_text(b"%PDF-bytes", "Resume.PDF")
+
+        assert text == "parsed"
+        run.assert_awaited_once_with(extract_text_from_pdf, b"%PDF-bytes")
+        key, value = put.await_args.args
+        assert key == f"resume_text:{content_digest(b'%PDF-bytes')}"
+        assert value == "parsed"
+        assert put.await_args.kwargs["ttl"] == resume_extraction._CACHE_TTL_SECONDS
+
+    @pytest.mark.asyncio
+    async def test_redis_errors_fall_back_to_parsing(self):
+        with (
+            patch(f"{_REDIS}.cache_get", new_callable=AsyncMock, side_effect=ConnectionError),
+            patch(f"{_REDIS}.cache_set", new_callable=AsyncMock, side_effect=ConnectionError),
+            patch.object(
+                resume_extraction, "run_extraction", new_callable=AsyncMock, return_value="parsed"
+            ),
+        ):
+            assert await extract_text(b"docx", "cv.docx") == "parsed"
+
+    @pytest.mark.asyncio
+    async def test_unsupported_type_rejected(self):
+        with patch(f"{_REDIS}.cache_get", new_callable=AsyncMock) as get:
+            with pytest.raises(ValueError, match="Unsupported file type '.txt'"):
+                await extract_text(b"plain", "resume.txt")
+        get.assert_not_called()
+
+
+def _openai_returning(profile: ExtractedProfile) -> MagicMock:
+    completion = MagicMock()
+    completion.choices = [MagicMock()]
+    completion.choices[0].message.parsed = profile
+    client = MagicMock()
+    client.beta.chat.completions.parse = AsyncMock(return_value=completion)
+    return MagicMock(return_value=client)
+
+
+class TestProfileCache:
+    @pytest.mark.asyncio
+    async def test_cached_profile_skips_parsing_and_llm(self):
+        profile = ExtractedProfile(name="Jane Doe", skills=["python"])
+        openai_cls = _openai_returning(profile)
+
+        with (
+            patch(f"{_REDIS}.cache_get", new_callable=AsyncMock, return_value=profile.model_dump_json()) as get,
+            patch.object(resume_extraction, "run_extraction", new_callable=AsyncMock) as run,
+            patch("openai.AsyncOpenAI", openai_cls),
+        ):
+            result = await extract_profile_from_resume(b"same file", "resume.pdf")
+
+        assert result == profile
+        run.assert_not_called()
+        openai_cls.assert_not_called()
+        assert get.await_args.args[0] == f"resume_profile:v1:{content_digest(b'same file')}"
+
+    @pytest.mark.asyncio
+    async def test_miss_extracts_calls_llm_and_caches_both(self):
+        profile = ExtractedProfile(name="Jane Doe")
+        openai_cls = _openai_returning(profile)
+
+        with (
+            patch(f"{_REDIS}.cache_get", new_callable=AsyncMock, return_value=None),
+            patch(f"{_REDIS}.cache_set", new_callable=AsyncMock) as put,
+            patch.object(
+                resume_extraction, "run_extraction", new_callable=AsyncMock, return_value="resume text"
+            ),
+            patch("openai.AsyncOpenAI", openai_cls),
+        ):
+            result = await extract_profile_from_resume(b"new file", "resume.docx")
+
+        assert result == profile
+        digest = content_digest(b"new file")
+        assert [c.args[0] for c in put.await_args_list] == [
+            f"resume_text:{digest}",
+            f"resume_profile:v1:{digest}",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_malformed_cached_profile_is_ignored(self):
+        profile = ExtractedProfile(name="Jane Doe")
+
+        with (
+            patch(f"{_REDIS}.cache_get", new_callable=AsyncMock, side_effect=["{not json", "text"]),
+            patch(f"{_REDIS}.cache_set", new_callable=AsyncMock),
+            patch("openai.AsyncOpenAI", _openai_returning(profile)),
+        ):
+            assert await extract_profile_from_resume(b"file", "resume.pdf") == profile
@@ -0,0 +1,322 @@
+"""
+Tests for section-level incremental resume tailoring.
+
+Covers: splitting the master resume into sections, section name
+normalization, job requirement fingerprints, reuse planning (similarity
+threshold, changed master content, changed section requirements, another
+company) and the best-effort per-user Redis history (one hash field per
+job, trimming, concurrent writes).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.services import resume_tailoring
+from app.services.resume_tailoring import (
+    JobFingerprint,
+    ResumeSection,
+    jaccard,
+    job_fingerprint,
+    load_tailoring_history,
+    normalize_section_name,
+    plan_tailoring,
+    remember_tailoring,
+    section_requirements,
+    split_master_resume,
+)
+
+_REDIS = "app.cache.redis_client"
+
+_PROFILE = {
+    "headline": "Senior Software Engineer",
+    "skills": ["Python", "FastAPI", "Docker"],
+    "experience": [
+        {
+            "title": "Engineer",
+            "company": "TechCorp",
+            "start_date": "2021-01",
+            "description": "Built Python microservices",
+        }
+    ],
+    "education": ["BS Computer Science"],
+}
+
+_KEYWORDS = ["python", "fastapi", "microservices", "apis", "scalable", "backend", "cloud"]
+
+
+def _fingerprint(*extra: str, company: str = "BigTech") -> JobFingerprint:
+    return job_fingerprint(
+        {"title": "Backend Engineer", "company": company, "keywords": _KEYWORDS + list(extra)}
+    )
+
+
+def _entry(sections, fingerprint, job_id="job-1", tailored=None):
+    return {
+        "job_id": job_id,
+        "terms": sorted(fingerprint.terms),
+        "baseline": {"prompt_tokens": 900, "completion_tokens": 400, "latency_ms": 3000.0},
+        "sections": {
+            s.name: {
+                "digest": s.digest,
+                "requirements": section_requirements(s, fingerprint, sections),
+                "tailored": (tailored or {}).get(s.name, {"section_name": s.name}),
+            }
+            for s in sections
+        },
+    }
+
+
+class _FakeRedis:
+    """Hashes as decoded strings, with transactional pipelines."""
+
+    def __init__(self):
+        self.hashes: dict[str, dict[str, str]] = {}
+        self.ttl: dict[str, int] = {}
+
+    async def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    async def hset(self, key, field, value):
+        await asyncio.sleep(0)
+        self.hashes.setdefault(key, {})[field] = value
+
+    async def hdel(self, key, *fields):
+        for f in fields:
+            self.hashes.get(key, {}).pop(f, None)
+
+    async def expire(self, key, seconds):
+        self.ttl[key] = seconds
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self._redis = redis
+        self._calls = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        return lambda *args: self._calls.append((name, args))
+
+    async def execute(self):
+        return [await getattr(self._redis, name)(*args) for name, args in self._calls]
+
+
+def _redis(client):
+    return patch(f"{_REDIS}.get_redis_client", AsyncMock(return_value=client))
+
+
+async def _remember(job_id, sections=(), tailored=None):
+    await remember_tailoring(
+        "user_1",
+        job_id,
+        list(sections),
+        _fingerprint(),
+        tailored or {},
+        {"prompt_tokens": 10, "completion_tokens": 5, "latency_ms": 100.0},
+    )
+
+
+class TestSplitMasterResume:
+    def test_sections_in_prompt_order(self):
+        sections = split_master_resume(_PROFILE)
+
+        assert [s.name for s in sections] == ["summary", "skills", "experience", "education"]
+        assert sections[1].content == "Skills: Python, FastAPI, Docker"
+        assert sections[2].content == (
+            "- Engineer at TechCorp (2021-01 - Present)\n  Built Python microservices"
+        )
+        assert sections[3].content == "- BS Computer Science"
+
+    def test_missing_sections_skipped_and_digest_tracks_content(self):
+        sections = split_master_resume({"skills": "Python"})
+
+        assert [s.name for s in sections] == ["skills"]
+        assert sections[0].digest == ResumeSection("skills", "Skills: Python").digest
+        assert sections[0].digest != ResumeSection("skills", "Skills: Go").digest
+
+
+class TestNormalizeSectionName:
+    @pytest.mark.parametrize("name", ["summary", "Summary", " [Summary] ", "[summary]"])
+    def test_llm_variants_match_heading(self, name):
+        assert normalize_section_name(name) == "summary"
+
+    def test_inner_whitespace_collapsed(self):
+        assert normalize_section_name("Work   Experience") == "work experience"
+
+
+class TestFingerprint:
+    def test_title_tokens_and_keywords(self):
+        fp = job_fingerprint({
+            "title": "Sr Backend Engineer", "company": " BigTech  Inc ",
+            "keywords": ["Python", "apis"],
+        })
+
+        assert fp.title_tokens == {"sr", "backend", "engineer"}
+        assert fp.terms == {"sr", "backend", "engineer", "python", "apis"}
+        assert fp.company == "bigtech inc"
+
+    def test_jaccard(self):
+        assert jaccard(frozenset("ab"), frozenset("bc")) == pytest.approx(1 / 3)
+        assert jaccard(frozenset(), frozenset()) == 0.0
+
+    def test_section_requirements(self):
+        sections = split_master_resume(_PROFILE)
+        fp = _fingerprint()
+
+        assert section_requirements(sections[1], fp, sections) == ["fastapi", "python"]
+        assert section_requirements(sections[2], fp, sections) == ["microservices", "python"]
+        # Summary: role title, company and every keyword the resume covers.
+        assert section_requirements(sections[0], fp, sections) == [
+            "backend", "company:bigtech", "engineer", "fastapi", "microservices", "python",
+        ]
+
+
+class TestPlanTailoring:
+    def test_no_history_regenerates_everything(self):
+        sections = split_master_resume(_PROFILE)
+
+        plan = plan_tailoring(sections, _fingerprint(), [])
+
+        assert plan.mode == "full"
+        assert plan.regenerate == sections
+        assert plan.source_job_id is None
+
+    def test_identical_requirements_reuse_every_section(self):
+        sections = split_master_resume(_PROFILE)
+        fp = _fingerprint()
+
+        plan = plan_tailoring(sections, fp, [_entry(sections, fp)])
+
+        assert plan.mode == "reused"
+        assert plan.regenerate == []
+        assert set(plan.reused) == {"summary", "skills", "experience", "education"}
+        assert plan.similarity == 1.0
+        assert plan.baseline["prompt_tokens"] == 900
+
+    def test_only_sections_touched_by_new_requirement_regenerate(self):
+        sections = split_master_resume(_PROFILE)
+        old = _fingerprint()
+
+        plan = plan_tailoring(sections, _fingerprint("docker"), [_entry(sections, old)])
+
+        assert plan.mode == "incremental"
+        # "docker" is in the skills section, so skills and the summary change.
+        assert [s.name for s in plan.regenerate] == ["summary", "skills"]
+        assert set(plan.reused) == {"experience", "education"}
+        assert plan.source_job_id == "job-1"
+
+    def test_other_company_regenerates_only_the_summary(self):
+        sections = split_master_resume(_PROFILE)
+
+        plan = plan_tailoring(
+            sections, _fingerprint(company="OtherCo"), [_entry(sections, _fingerprint())]
+        )
+
+        assert plan.similarity == 1.0
+        assert [s.name for s in plan.regenerate] == ["summary"]
+        assert set(plan.reused) == {"skills", "experience", "education"}
+
+    def test_changed_master_content_regenerates_that_section(self):
+        sections = split_master_resume(_PROFILE)
+        fp = _fingerprint()
+        entry = _entry(sections, fp)
+
+        edited = split_master_resume({**_PROFILE, "education": ["MS Computer Science"]})
+        plan = plan_tailoring(edited, fp, [entry])
+
+        assert [s.name for s in plan.regenerate] == ["education"]
+
+    def test_dissimilar_jobs_are_not_reused(self):
+        sections = split_master_resume(_PROFILE)
+        other = job_fingerprint({"title": "Data Scientist", "keywords": ["pandas", "statistics"]})
+
+        plan = plan_tailoring(sections, _fingerprint(), [_entry(sections, other)])
+
+        assert plan.mode == "full"
+
+    def test_most_similar_entry_wins(self):
+        sections = split_master_resume(_PROFILE)
+        fp = _fingerprint()
+        near = _entry(sections, _fingerprint("kafka"), job_id="near")
+        exact = _entry(sections, fp, job_id="exact")
+
+        plan = plan_tailoring(sections, fp, [near, exact])
+
+        assert plan.source_job_id == "exact"
+
+
+class TestHistoryCache:
+    @pytest.mark.asyncio
+    async def test_remember_writes_the_jobs_field(self):
+        sections = split_master_resume(_PROFILE)
+        client = _FakeRedis()
+
+        with _redis(client):
+            await _remember(
+                "job-new", sections, {"skills": {"section_name": "skills", "tailored_content": "Py"}}
+            )
+
+        key = "resume_tailoring:v2:user_1"
+        assert client.ttl[key] == resume_tailoring._CACHE_TTL_SECONDS
+        entry = json.loads(client.hashes[key]["job-new"])
+        assert entry["job_id"] == "job-new"
+        # Only sections with a tailored result are remembered.
+        assert list(entry["sections"]) == ["skills"]
+        assert entry["sections"]["skills"]["digest"] == sections[1].digest
+
+    @pytest.mark.asyncio
+    async def test_concurrent_runs_keep_both_entries(self):
+        client = _FakeRedis()
+
+        with _redis(client):
+            await asyncio.gather(_remember("job-a"), _remember("job-b"))
+            history = await load_tailoring_history("user_1")
+
+        assert {e["job_id"] for e in history} == {"job-a", "job-b"}
+
+    @pytest.mark.asyncio
+    async def test_rerun_replaces_entry_and_history_is_most_recent_first(self):
+        client = _FakeRedis()
+
+        with _redis(client):
+            for job_id in ("job-a", "job-b", "job-a"):
+                await _remember(job_id)
+            history = await load_tailoring_history("user_1")
+
+        assert [e["job_id"] for e in history] == ["job-a", "job-b"]
+
+    @pytest.mark.asyncio
+    async def test_load_trims_old_and_malformed_entries(self):
+        client = _FakeRedis()
+        key = "resume_tailoring:v2:user_1"
+        client.hashes[key] = {
+            f"job-{i}": json.dumps({"job_id": f"job-{i}", "remembered_at": i})
+            for i in range(resume_tailoring.MAX_CACHED_JOBS + 2)
+        }
+        client.hashes[key]["broken"] = "{not json"
+
+        with _redis(client):
+            history = await load_tailoring_history("user_1")
+
+        assert len(history) == resume_tailoring.MAX_CACHED_JOBS
+        assert history[0]["job_id"] == f"job-{resume_tailoring.MAX_CACHED_JOBS + 1}"
+        assert set(client.hashes[key]) == {e["job_id"] for e in history}
+
+    @pytest.mark.asyncio
+    async def test_redis_errors_are_swallowed(self):
+        with patch(f"{_REDIS}.get_redis_client", AsyncMock(side_effect=ConnectionError)):
+            assert await load_tailoring_history("user_1") == []
+            await _remember("job")
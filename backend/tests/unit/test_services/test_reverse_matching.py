@@ -0,0 +1,312 @@
+"""
+Tests for reverse matching of newly ingested jobs.
+
+Covers: the preference index (title words and word fragments, salary
+floors, excluded companies and industries, in-place updates), the cached
+index kept up to date from changed rows, candidate scoring with skipped
+users, and the bulk fan-out (threshold, braked and deleted users,
+conflict-safe insert in bounded batches, commit and feed invalidation).
+"""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.config import settings
+from app.services import reverse_matching
+from app.services.reverse_matching import (
+    ReverseMatchIndex,
+    Subscriber,
+    fan_out_jobs,
+    match_jobs,
+    subscriber_index,
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_index_cache():
+    reverse_matching._index_cache = None
+    yield
+    reverse_matching._index_cache = None
+
+
+def _job(**kwargs) -> SimpleNamespace:
+    defaults = {
+        "id": uuid4(),
+        "title": "Senior Backend Engineer",
+        "company": "Acme Corp",
+        "location": "Remote",
+        "description": "Python and PostgreSQL services.",
+        "salary_min": None,
+        "salary_max": None,
+        "remote": True,
+        "raw_data": {},
+    }
+    defaults.update(kwargs)
+    return SimpleNamespace(**defaults)
+
+
+def _subscriber(titles, **prefs) -> Subscriber:
+    return Subscriber(
+        user_id=uuid4(),
+        preferences={"target_titles": titles, **prefs},
+        profile={"skills": ["Python", "PostgreSQL"]},
+    )
+
+
+class TestReverseMatchIndex:
+    def test_candidates_share_a_title_token(self):
+        backend = _subscriber(["Backend Engineer"])
+        designer = _subscriber(["Product Designer"])
+        index = ReverseMatchIndex([backend, designer])
+
+        assert index.candidates(_job()) == [backend]
+        assert index.candidates(_job(title="Office Manager")) == []
+
+    def test_users_without_titles_are_not_indexed(self):
+        index = ReverseMatchIndex([_subscriber([]), _subscriber(["Engineer"])])
+        assert len(index) == 1
+
+    def test_salary_floor_above_job_salary_is_excluded(self):
+        low = _subscriber(["Engineer"], salary_minimum=100_000)
+        high = _subscriber(["Engineer"], salary_minimum=200_000)
+        no_floor = _subscriber(["Engineer"])
+        index = ReverseMatchIndex([low, high, no_floor])
+
+        assert index.candidates(_job(salary_max=150_000)) == [low, no_floor]
+        # Unknown salary is not a deal-breaker.
+        assert index.candidates(_job()) == [low, high, no_floor]
+
+    def test_title_words_match_inside_longer_words(self):
+        engineer = _subscriber(["Engineer"])
+        engineering = _subscriber(["Engineering Lead"])
+        index = ReverseMatchIndex([engineer, engineering])
+
+        assert index.candidates(_job(title="Engineering Manager")) == [engineer, engineering]
+        assert index.candidates(_job(title="Engineer")) == [engineer, engineering]
+        assert index.candidates(_job(title="Eng")) == [engineer, engineering]
+        # Shorter than a fragment: only whole target-title words count.
+        assert index.candidates(_job(title="En")) == []
+
+    def test_upsert_and_remove_update_every_index(self):
+        user = _subscriber(["Backend Engineer"], salary_minimum=200_000,
+                           excluded_companies=["Globex"])
+        index = ReverseMatchIndex([user])
+        moved = Subscriber(user.user_id, {"target_titles": ["Product Designer"]})
+
+        index.upsert(moved)
+
+        assert len(index) == 1
+        assert index.candidates(_job()) == []
+        assert index.candidates(_job(title="Product Designer", salary_max=100_000)) == [moved]
+        assert index._floors == [] and not index._excluded_companies
+
+        index.remove(user.user_id)
+        assert len(index) == 0
+        assert not index._title_index and not index._fragment_index
+
+    def test_excluded_company_and_industry(self):
+        no_acme = _subscriber(["Engineer"], excluded_companies=["Acme"])
+        no_gambling = _subscriber(["Engineer"], excluded_industries=["Gambling"])
+        index = ReverseMatchIndex([no_acme, no_gambling])
+
+        assert index.candidates(_job()) == [no_gambling]
+        assert index.candidates(
+            _job(company="Globex", description="Online gambling platform")
+        ) == [no_acme]
+
+
+class TestSubscriberIndex:
+    @pytest.mark.asyncio
+    async def test_patches_cached_index_with_changed_rows(self):
+        kept, dropped = _subscriber(["Engineer"]), _subscriber(["Engineer"])
+        edited = Subscriber(kept.user_id, {"target_titles": ["Designer"]})
+        joined = _subscriber(["Engineer"])
+        session = MagicMock()
+
+        with patch(
+            "app.services.reverse_matching.load_subscribers",
+            new_callable=AsyncMock, return_value=[kept, dropped],
+        ) as mock_full, patch(
+            "app.services.reverse_matching.load_subscriber_changes",
+            new_callable=AsyncMock,
+            return_value=[(kept.user_id, edited), (dropped.user_id, None), (joined.user_id, joined)],
+        ) as mock_changes:
+            first = await subscriber_index(session)
+            synced_at = reverse_matching._index_cache[2]
+            second = await subscriber_index(session)
+
+        assert second is first
+        mock_full.assert_awaited_once()
+        since = mock_changes.await_args.args[1]
+        assert since == synced_at - reverse_matching._SYNC_OVERLAP
+        assert second.candidates(_job()) == [joined]
+        assert second.candidates(_job(title="Designer")) == [edited]
+
+    @pytest.mark.asyncio
+    async def test_rebuilds_after_interval(self):
+        stale = ReverseMatchIndex([_subscriber(["Engineer"])])
+        built = reverse_matching.datetime.now(reverse_matching.timezone.utc) - timedelta(
+            seconds=reverse_matching.INDEX_REBUILD_SECONDS + 1
+        )
+        reverse_matching._index_cache = (stale, built, built)
+
+        with patch(
+            "app.services.reverse_matching.load_subscribers",
+            new_callable=AsyncMock, return_value=[],
+        ) as mock_full:
+            index = await subscriber_index(MagicMock())
+
+        mock_full.assert_awaited_once()
+        assert index is not stale and len(index) == 0
+
+
+class TestMatchJobs:
+    def test_scores_every_candidate_except_skipped_users(self):
+        source = _subscriber(["Backend Engineer"])
+        other = _subscriber(["Backend Engineer"])
+        index = ReverseMatchIndex([source, other])
+        job = _job()
+
+        pairs = match_jobs(index, [job], skip_user_ids=[str(source.user_id)])
+
+        assert [(s, j) for s, j, _, _ in pairs] == [(other, job)]
+        score, rationale = pairs[0][2], pairs[0][3]
+        assert 0 < score <= 100
+        assert rationale
+
+
+class TestFanOutJobs:
+    @staticmethod
+    def _session(users=(), inserted=(), *more_inserted):
+        session = MagicMock()
+        users_result = MagicMock()
+        users_result.all.return_value = list(users)
+        insert_results = []
+        for batch in (inserted, *more_inserted):
+            insert_result = MagicMock()
+            insert_result.scalars.return_value.all.return_value = list(batch)
+            insert_results.append(insert_result)
+        session.execute = AsyncMock(side_effect=[users_result, *insert_results])
+        session.commit = AsyncMock()
+        return session
+
+    @staticmethod
+    def _patches(subscribers, paused=()):
+        return (
+            patch(
+                "app.services.reverse_matching.load_subscribers",
+                new_callable=AsyncMock, return_value=subscribers,
+            ),
+            patch(
+                "app.services.reverse_matching._load_adjusters",
+                new_callable=AsyncMock, return_value={},
+            ),
+            patch(
+                "app.agents.brake.paused_users",
+                new_callable=AsyncMock, return_value=set(paused),
+            ),
+        )
+
+    @pytest.mark.asyncio
+    async def test_bulk_inserts_new_pairs_and_bumps_feeds(self):
+        first, second = _subscriber(["Backend Engineer"]), _subscriber(["Engineer"])
+        job = _job()
+        # second already had the match: the insert skips it on conflict.
+        session = self._session(
+            users=[(first.user_id, "clerk_1"), (second.user_id, "clerk_2")],
+            inserted=[first.user_id],
+        )
+        load, adjusters, brake = self._patches([first, second])
+
+        with load, adjusters, brake, patch(
+            "app.services.match_feed_cache.bump_match_version", new_callable=AsyncMock,
+        ) as mock_bump, patch.object(settings, "MATCH_SCORE_THRESHOLD", 0):
+            created = await fan_out_jobs([job], session)
+
+        assert created == {str(first.user_id): 1}
+        stmt = session.execute.await_args_list[1].args[0]
+        sql = str(stmt.compile(dialect=_pg_dialect()))
+        assert "ON CONFLICT (user_id, job_id) DO NOTHING" in sql
+        assert "RETURNING matches.user_id" in sql
+        rows = stmt.compile().params
+        assert {rows[f"user_id_m{i}"] for i in range(2)} == {first.user_id, second.user_id}
+        session.commit.assert_awaited_once()
+        mock_bump.assert_awaited_once_with(str(first.user_id))
+
+    @pytest.mark.asyncio
+    async def test_large_fan_out_is_inserted_in_batches(self):
+        user = _subscriber(["Engineer"])
+        jobs = [_job() for _ in range(5)]
+        session = self._session(
+            [(user.user_id, "clerk_1")], [user.user_id] * 2, [user.user_id] * 2, [user.user_id],
+        )
+        load, adjusters, brake = self._patches([user])
+
+        with load, adjusters, brake, patch(
+            "app.services.match_feed_cache.bump_match_version", new_callable=AsyncMock,
+        ), patch.object(settings, "MATCH_SCORE_THRESHOLD", 0), patch.object(
+            reverse_matching, "INSERT_BATCH_ROWS", 2
+        ):
+            created = await fan_out_jobs(jobs, session)
+
+        assert created == {str(user.user_id): 5}
+        inserts = [c.args[0] for c in session.execute.await_args_list[1:]]
+        batches = [
+            sorted(v for k, v in stmt.compile().params.items() if k.startswith("job_id_m"))
+            for stmt in inserts
+        ]
+        assert [len(b) for b in batches] == [2, 2, 1]
+        assert sorted(j for b in batches for j in b) == sorted(j.id for j in jobs)
+        session.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_braked_and_deleted_users_get_nothing(self):
+        braked, by_clerk, deleted = (_subscriber(["Engineer"]) for _ in range(3))
+        session = self._session(
+            users=[(braked.user_id, "clerk_1"), (by_clerk.user_id, "clerk_2")],
+        )
+        load, adjusters, brake = self._patches(
+            [braked, by_clerk, deleted], paused={str(braked.user_id), "clerk_2"}
+        )
+
+        with load, adjusters, brake as mock_paused, patch.object(
+            settings, "MATCH_SCORE_THRESHOLD", 0
+        ):
+            created = await fan_out_jobs([_job()], session)
+
+        assert created == {}
+        checked = mock_paused.await_args.args[0]
+        assert set(checked) == {str(braked.user_id), str(by_clerk.user_id), "clerk_1", "clerk_2"}
+        assert session.execute.await_count == 1
+        session.commit.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_nothing_written_below_threshold(self):
+        user = _subscriber(["Engineer"])
+        session = self._session(users=[(user.user_id, "clerk_1")])
+        load, adjusters, brake = self._patches([user])
+
+        with load, adjusters, brake, patch.object(settings, "MATCH_SCORE_THRESHOLD", 101):
+            created = await fan_out_jobs([_job()], session)
+
+        assert created == {}
+        assert session.execute.await_count == 1
+        session.commit.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_no_jobs_is_a_no_op(self):
+        session = self._session()
+        assert await fan_out_jobs([], session) == {}
+        session.execute.assert_not_awaited()
+
+
+def _pg_dialect():
+    from sqlalchemy.dialects import postgresql
+
+    return postgresql.dialect()
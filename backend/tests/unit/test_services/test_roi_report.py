@@ -3,6 +3,7 @@
 Tests verify:
 - Cost per placement computation (AC1)
 - Time to placement computation (AC1)
+- All metrics derived from one totals lookup (fused statements)
 - Engagement rate computation (AC1)
 - Satisfaction score stub returns None (AC1)
 - Benchmark comparison with defaults and overrides (AC2)
@@ -22,6 +23,22 @@ import pytest
 from app.services.enterprise.roi_report import ROIReportService
 
 
+def _totals(**overrides) -> dict:
+    """What ``ROIReportService._query_totals`` returns for an org."""
+    totals = {
+        "enrolled": 20,
+        "applications": 40,
+        "interviews": 10,
+        "placements": 4,
+        "placement_days_sum": 180.0,
+        "jobs_reviewed": 300,
+        "active": 12,
+        "settings": {},
+    }
+    totals.update(overrides)
+    return totals
+
+
 # ---------------------------------------------------------------------------
 # Benchmark comparison tests (AC2)
 # ---------------------------------------------------------------------------
@@ -207,33 +224,12 @@ class TestDateRangeDefaults:
 
         captured_dates: dict = {}
 
-        async def mock_cost(session, org_uuid, start_dt, end_dt):
+        async def mock_totals(session, org_uuid, start_dt, end_dt, ):
             captured_dates["start"] = start_dt
             captured_dates["end"] = end_dt
-            return None
-
-        async def mock_time(session, org_uuid, start_dt, end_dt):
-            return None
-
-        async def mock_engagement(session, org_uuid, start_dt, end_dt):
-            return 0.0
+            return _totals(placements=0, placement_days_sum=0.0)
 
-        async def mock_satisfaction(session, org_uuid, start_dt, end_dt):
-            return None
-
-        async def mock_benchmarks(session, org_uuid):
-            return {
-                "time_to_placement_days": 90,
-                "engagement_rate": 0.35,
-                "cost_per_placement": 15000.0,
-                "satisfaction_score": 3.5,
-            }
-
-        service._compute_cost_per_placement = mock_cost
-        service._compute_time_to_placement = mock_time
-        service._compute_engagement_rate = mock_engagement
-        service._compute_satisfaction_score = mock_satisfaction
-        service._load_org_benchmarks = mock_benchmarks
+        service._query_totals = mock_totals
 
         mock_session = AsyncMock()
         result = await service.compute_metrics(
@@ -260,33 +256,12 @@ class TestDateRangeDefaults:
 
         captured_dates: dict = {}
 
-        async def mock_cost(session, org_uuid, start_dt, end_dt):
+        async def mock_totals(session, org_uuid, start_dt, end_dt, ):
             captured_dates["start"] = start_dt
             captured_dates["end"] = end_dt
-            return 5000.0
-
-        async def mock_time(session, org_uuid, start_dt, end_dt):
-            return 45.0
+            return _totals()
 
-        async def mock_engagement(session, org_uuid, start_dt, end_dt):
-            return 0.60
-
-        async def mock_satisfaction(session, org_uuid, start_dt, end_dt):
-            return None
-
-        async def mock_benchmarks(session, org_uuid):
-            return {
-                "time_to_placement_days": 90,
-                "engagement_rate": 0.35,
-                "cost_per_placement": 15000.0,
-                "satisfaction_score": 3.5,
-            }
-
-        service._compute_cost_per_placement = mock_cost
-        service._compute_time_to_placement = mock_time
-        service._compute_engagement_rate = mock_engagement
-        service._compute_satisfaction_score = mock_satisfaction
-        service._load_org_benchmarks = mock_benchmarks
+        service._query_totals = mock_totals
 
         mock_session = AsyncMock()
         result = await service.compute_metrics(
@@ -310,110 +285,71 @@ class TestDateRangeDefaults:
 class TestCostPerPlacement:
     """Test cost per placement computation."""
 
-    @pytest.mark.asyncio
-    async def test_returns_none_when_no_placements(self):
+    def test_returns_none_when_no_placements(self):
         """No placements => None (avoid division by zero)."""
-        service = ROIReportService()
-        mock_session = AsyncMock()
-
-        # Mock execute to return 0 placements
-        mock_result_zero = MagicMock()
-        mock_result_zero.scalar.return_value = 0
-        mock_session.execute = AsyncMock(return_value=mock_result_zero)
+        assert ROIReportService._compute_cost_per_placement(0, 50, {}) is None
 
-        result = await service._compute_cost_per_placement(
-            mock_session,
-            "00000000-0000-0000-0000-000000000001",
-            datetime(2026, 1, 1),
-            datetime(2026, 1, 31, 23, 59, 59),
-        )
-        assert result is None
-
-    @pytest.mark.asyncio
-    async def test_computes_cost_with_placements(self):
+    def test_computes_cost_with_placements(self):
         """With placements, returns total_cost / placements."""
-        service = ROIReportService()
-        mock_session = AsyncMock()
-
-        call_count = 0
-
-        async def mock_execute(stmt):
-            nonlocal call_count
-            call_count += 1
-            mock_result = MagicMock()
-            if call_count == 1:
-                # placements count
-                mock_result.scalar.return_value = 5
-            elif call_count == 2:
-                # enrolled count
-                mock_result.scalar.return_value = 50
-            elif call_count == 3:
-                # org settings
-                mock_result.scalar.return_value = {"seat_cost_monthly": 200.0}
-            return mock_result
-
-        mock_session.execute = mock_execute
-
-        result = await service._compute_cost_per_placement(
-            mock_session,
-            "00000000-0000-0000-0000-000000000001",
-            datetime(2026, 1, 1),
-            datetime(2026, 1, 31, 23, 59, 59),
+        result = ROIReportService._compute_cost_per_placement(
+            5, 50, {"seat_cost_monthly": 200.0}
         )
         # 50 enrolled * $200 seat cost / 5 placements = $2000
         assert result == 2000.0
 
+    def test_default_seat_cost(self):
+        # 10 enrolled * $500 default seat cost / 2 placements
+        assert ROIReportService._compute_cost_per_placement(2, 10, {}) == 2500.0
+
 
 class TestEngagementRate:
     """Test engagement rate computation."""
 
-    @pytest.mark.asyncio
-    async def test_zero_enrolled_returns_zero(self):
+    def test_zero_enrolled_returns_zero(self):
         """No enrolled users => 0.0 engagement rate."""
-        service = ROIReportService()
-        mock_session = AsyncMock()
+        assert ROIReportService._compute_engagement_rate(0, 0) == 0.0
 
-        mock_result = MagicMock()
-        mock_result.scalar.return_value = 0
-        mock_session.execute = AsyncMock(return_value=mock_result)
+    def test_computes_rate_with_active_users(self):
+        """Returns active / enrolled ratio."""
+        assert ROIReportService._compute_engagement_rate(12, 20) == 0.6  # 12/20 = 0.6
 
-        result = await service._compute_engagement_rate(
-            mock_session,
-            "00000000-0000-0000-0000-000000000001",
-            datetime(2026, 1, 1),
-            datetime(2026, 1, 31, 23, 59, 59),
-        )
-        assert result == 0.0
+
+class TestComputeMetricsFromTotals:
+    """compute_metrics derives every metric from one totals lookup."""
 
     @pytest.mark.asyncio
-    async def test_computes_rate_with_active_users(self):
-        """Returns active / enrolled ratio."""
+    async def test_metrics_and_benchmark_overrides(self):
         service = ROIReportService()
-        mock_session = AsyncMock()
+        service._query_totals = AsyncMock(return_value=_totals(
+            settings={"seat_cost_monthly": 100.0, "benchmarks": {"engagement_rate": 0.5}},
+        ))
 
-        call_count = 0
+        result = await service.compute_metrics(
+            AsyncMock(), "00000000-0000-0000-0000-000000000001",
+            date(2026, 1, 1), date(2026, 1, 31),
+        )
 
-        async def mock_execute(stmt):
-            nonlocal call_count
-            call_count += 1
-            mock_result = MagicMock()
-            if call_count == 1:
-                # enrolled count
-                mock_result.scalar.return_value = 20
-            elif call_count == 2:
-                # active count
-                mock_result.scalar.return_value = 12
-            return mock_result
+        assert result["cost_per_placement"] == 500.0  # 20 * $100 / 4
+        assert result["time_to_placement_days"] == 45.0  # 180 days / 4
+        assert result["engagement_rate"] == 0.6
+        assert result["benchmarks"]["engagement_rate"]["benchmark_value"] == 0.5
+        assert result["benchmarks"]["cost_per_placement"]["benchmark_value"] == 15000.0
 
-        mock_session.execute = mock_execute
+    @pytest.mark.asyncio
+    async def test_no_placements(self):
+        service = ROIReportService()
+        service._query_totals = AsyncMock(
+            return_value=_totals(placements=0, placement_days_sum=0.0)
+        )
 
-        result = await service._compute_engagement_rate(
-            mock_session,
-            "00000000-0000-0000-0000-000000000001",
-            datetime(2026, 1, 1),
-            datetime(2026, 1, 31, 23, 59, 59),
+        result = await service.compute_metrics(
+            AsyncMock(), "00000000-0000-0000-0000-000000000001",
+            date(2026, 1, 1), date(2026, 1, 31),
         )
-        assert result == 0.6  # 12/20 = 0.6
+
+        assert result["cost_per_placement"] is None
+        assert result["time_to_placement_days"] is None
+        assert result["benchmarks"]["cost_per_placement"]["comparison"] == "no_data"
 
 
 class TestSatisfactionScore:
@@ -519,31 +455,7 @@ class TestPrivacySafe:
         """Metrics dict must not contain user_id, email, or name fields."""
         service = ROIReportService()
 
-        async def mock_cost(session, org_uuid, start_dt, end_dt):
-            return 5000.0
-
-        async def mock_time(session, org_uuid, start_dt, end_dt):
-            return 45.0
-
-        async def mock_engagement(session, org_uuid, start_dt, end_dt):
-            return 0.60
-
-        async def mock_satisfaction(session, org_uuid, start_dt, end_dt):
-            return None
-
-        async def mock_benchmarks(session, org_uuid):
-            return {
-                "time_to_placement_days": 90,
-                "engagement_rate": 0.35,
-                "cost_per_placement": 15000.0,
-                "satisfaction_score": 3.5,
-            }
-
-        service._compute_cost_per_placement = mock_cost
-        service._compute_time_to_placement = mock_time
-        service._compute_engagement_rate = mock_engagement
-        service._compute_satisfaction_score = mock_satisfaction
-        service._load_org_benchmarks = mock_benchmarks
+        service._query_totals = AsyncMock(return_value=_totals())
 
         mock_session = AsyncMock()
         result = await service.compute_metrics(
@@ -0,0 +1,196 @@
+"""
+Tests for semantic pre-ranking before LLM refinement.
+
+Covers: hashing embedder determinism and similarity, exact cosine index
+ordering, top-k selection, pass-through cases (few jobs, empty profile,
+embedding failure), the job_embeddings store (only new or changed jobs
+embedded, ranking by the ANN query, in-memory fallback), and the
+provider embedder's batching.
+"""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pytest
+
+from app.services.semantic_matching import (
+    HashingEmbedder,
+    OpenAIEmbedder,
+    VectorIndex,
+    content_hash,
+    job_text,
+    select_for_refinement,
+)
+
+_PREFS = {"target_titles": ["Backend Engineer"], "seniority_levels": ["senior"]}
+_PROFILE = {"skills": ["Python", "PostgreSQL", "Kubernetes"]}
+
+
+def _job(title: str, description: str, job_id=None) -> SimpleNamespace:
+    return SimpleNamespace(id=job_id, title=title, description=description, company="Acme")
+
+
+class _Store:
+    """Session stand-in for ``job_embeddings``: cached hashes and an ANN answer."""
+
+    def __init__(self, cached, ranked, fail=False):
+        self.cached = cached
+        self.ranked = ranked
+        self.fail = fail
+        self.upserts = []
+        self.queries = []
+        self.session = MagicMock()
+        savepoint = AsyncMock()
+        savepoint.__aexit__ = AsyncMock(return_value=False)
+        self.session.begin_nested = MagicMock(return_value=savepoint)
+        self.session.execute = AsyncMock(side_effect=self._execute)
+
+    async def _execute(self, stmt, params=None):
+        sql = str(stmt)
+        if self.fail:
+            raise RuntimeError('type "vector" does not exist')
+        result = MagicMock()
+        if sql.startswith("SELECT job_id, content_hash"):
+            result.all.return_value = list(self.cached.items())
+        elif sql.startswith("INSERT"):
+            self.upserts.extend(params)
+        elif "<=>" in sql:
+            self.queries.append((sql, params))
+            result.scalars.return_value.all.return_value = self.ranked
+        return result
+
+
+class TestHashingEmbedder:
+    @pytest.mark.asyncio
+    async def test_unit_norm_and_deterministic(self):
+        embedder = HashingEmbedder()
+        first = await embedder.embed(["python backend engineer", ""])
+        second = await embedder.embed(["python backend engineer"])
+
+        assert first.shape == (2, embedder.dim)
+        assert np.isclose(np.linalg.norm(first[0]), 1.0)
+        assert not first[1].any()
+        assert np.array_equal(first[0], second[0])
+
+    @pytest.mark.asyncio
+    async def test_related_texts_are_closer(self):
+        query, near, far = await HashingEmbedder().embed([
+            "senior backend engineer python",
+            "backend engineer python services",
+            "pastry chef bakery",
+        ])
+
+        assert query @ near > query @ far
+
+
+class TestVectorIndex:
+    def test_search_orders_by_similarity(self):
+        index = VectorIndex([[1, 0], [0.6, 0.8], [0, 1], [1, 0]])
+
+        hits = index.search([1, 0], 3)
+
+        assert [i for i, _ in hits] == [0, 3, 1]
+        assert hits[0][1] == pytest.approx(1.0)
+
+    def test_k_larger_than_index(self):
+        assert len(VectorIndex([[1, 0]]).search([1, 0], 5)) == 1
+
+
+class TestSelectForRefinement:
+    @pytest.mark.asyncio
+    async def test_keeps_top_k_most_similar_in_input_order(self):
+        jobs = [
+            _job("Pastry Chef", "Croissants and bread"),
+            _job("Senior Backend Engineer", "Python, PostgreSQL and Kubernetes"),
+            _job("Store Manager", "Retail operations"),
+            _job("Backend Engineer", "Python APIs on PostgreSQL"),
+        ]
+
+        selected = await select_for_refinement(jobs, _PREFS, _PROFILE, top_k=2)
+
+        assert selected == [1, 3]
+
+    @pytest.mark.asyncio
+    async def test_passes_everything_through_when_not_ranking(self):
+        jobs = [_job("A", ""), _job("B", ""), _job("C", "")]
+
+        assert await select_for_refinement(jobs, _PREFS, _PROFILE, top_k=3) == [0, 1, 2]
+        assert await select_for_refinement(jobs, _PREFS, _PROFILE, top_k=0) == [0, 1, 2]
+        assert await select_for_refinement(jobs, {}, {}, top_k=1) == [0, 1, 2]
+
+    @pytest.mark.asyncio
+    async def test_embedding_failure_refines_every_job(self):
+        embedder = SimpleNamespace(name="x", embed=AsyncMock(side_effect=RuntimeError("down")))
+        jobs = [_job("A", ""), _job("B", "")]
+
+        assert await select_for_refinement(jobs, _PREFS, _PROFILE, top_k=1, embedder=embedder) == [0, 1]
+
+
+class TestEmbeddingStore:
+    @pytest.mark.asyncio
+    async def test_embeds_only_new_or_changed_jobs_and_ranks_by_index(self):
+        jobs = [_job("Pastry Chef", "Croissants", "j0"), _job("Backend Engineer", "Python", "j1"),
+                _job("Store Manager", "Retail", "j2")]
+        store = _Store(
+            cached={"j0": content_hash(job_text(jobs[0])), "j1": "stale"},
+            ranked=["j2", "j1"],
+        )
+        embedder = HashingEmbedder()
+        embedder.embed = AsyncMock(wraps=embedder.embed)
+
+        selected = await select_for_refinement(
+            jobs, _PREFS, _PROFILE, top_k=2, embedder=embedder, session=store.session
+        )
+
+        assert selected == [1, 2]
+        texts = embedder.embed.await_args.args[0]
+        assert texts[1:] == [job_text(jobs[1]), job_text(jobs[2])]
+        assert [u["job_id"] for u in store.upserts] == ["j1", "j2"]
+        assert store.upserts[0]["hash"] == content_hash(job_text(jobs[1]))
+        (sql, params), = store.queries
+        assert "model = 'hashing-512'" in sql
+        assert "embedding::vector(512) <=>" in sql
+        assert params["k"] == 2 and params["ids"] == ["j0", "j1", "j2"]
+
+    @pytest.mark.asyncio
+    async def test_unavailable_store_ranks_in_memory(self):
+        jobs = [
+            _job("Pastry Chef", "Croissants and bread", "j0"),
+            _job("Senior Backend Engineer", "Python, PostgreSQL and Kubernetes", "j1"),
+            _job("Store Manager", "Retail operations", "j2"),
+            _job("Backend Engineer", "Python APIs on PostgreSQL", "j3"),
+        ]
+        store = _Store(cached={}, ranked=[], fail=True)
+
+        selected = await select_for_refinement(
+            jobs, _PREFS, _PROFILE, top_k=2, session=store.session
+        )
+
+        assert selected == [1, 3]
+
+
+class TestOpenAIEmbedder:
+    @pytest.mark.asyncio
+    async def test_batches_requests_on_one_client(self):
+        client = AsyncMock()
+        client.embeddings.create = AsyncMock(side_effect=lambda model, input: MagicMock(
+            data=[MagicMock(embedding=[3.0, 4.0]) for _ in input]
+        ))
+
+        with (
+            patch("openai.AsyncOpenAI", return_value=client) as mock_cls,
+            patch("app.services.semantic_matching.EMBEDDING_BATCH_SIZE", 2),
+            patch("app.config.settings"),
+        ):
+            embedder = OpenAIEmbedder()
+            vectors = await embedder.embed(["a", "b", "c"])
+            await embedder.aclose()
+
+        mock_cls.assert_called_once()
+        assert client.embeddings.create.await_count == 2
+        assert vectors.shape == (3, 2)
+        assert vectors[0] == pytest.approx([0.6, 0.8])
+        client.close.assert_awaited_once()
@@ -1,14 +1,17 @@
 """Tests for Relationship Temperature Scoring Service (Story 9-5).
 
 Covers: score_contacts(), temperature classification, recency decay,
-frequency scoring, depth scoring, ready_for_outreach, to_dict(), empty history.
+frequency scoring, depth scoring, ready_for_outreach, to_dict(), empty history,
+and the columnar path for large histories.
 """
 
 from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
 
 import pytest
 
 from app.services.network.temperature_scoring import (
+    COLUMNAR_MIN_RECORDS,
     RelationshipTemperatureService,
     TemperatureScore,
 )
@@ -234,3 +237,108 @@ class TestToDict:
         assert d["interaction_count"] == 5
         assert d["data_quality"] == "complete"
         assert len(d) == 8
+
+
+# ---------------------------------------------------------------------------
+# Columnar path for large histories
+# ---------------------------------------------------------------------------
+
+
+def _per_contact(service, history):
+    """Reference result: the per-contact path, in first-seen order."""
+    by_contact = {}
+    for record in history:
+        by_contact.setdefault(record.get("contact_name", "Unknown"), []).append(record)
+    return [service._score_contact(name, records) for name, records in by_contact.items()]
+
+
+def _large_history(timestamp_for, n=COLUMNAR_MIN_RECORDS + 200, contacts=120):
+    types = ["conversation", "Comment", "share", "like", "connection", ""]
+    return [
+        {
+            "contact_name": f"Contact {i % contacts}",
+            "engagement_type": types[i % len(types)],
+            "timestamp": timestamp_for(i),
+        }
+        for i in range(n)
+    ]
+
+
+class TestColumnarScoring:
+    def test_large_history_uses_columnar_path(self, service):
+        history = _large_history(lambda i: _ts(i % 120))
+        with patch.object(
+            service, "_score_contacts_columnar", wraps=service._score_contacts_columnar
+        ) as columnar:
+            service.score_contacts(history)
+        columnar.assert_called_once()
+
+    def test_matches_per_contact_path_for_utc_timestamps(self, service):
+        history = _large_history(lambda i: _ts((i * 7) % 130))
+        assert service.score_contacts(history) == _per_contact(service, history)
+
+    def test_matches_per_contact_path_for_mixed_inputs(self, service):
+        now = datetime.now(timezone.utc)
+        offset = timezone(timedelta(hours=-5))
+
+        def timestamp_for(i):
+            contact = i % 120
+            if i % 17 == 0:
+                return ""
+            if i % 23 == 0:
+                return "not-a-date"
+            moment = now - timedelta(hours=(i * 13) % 2000)
+            if contact % 3 == 0:
+                return moment.replace(tzinfo=None).isoformat()
+            if contact % 3 == 1:
+                return moment.astimezone(offset).isoformat()
+            return moment.isoformat().replace("+00:00", "Z")
+
+        history = _large_history(timestamp_for)
+        assert service.score_contacts(history) == _per_contact(service, history)
+
+    def test_matches_per_contact_path_for_basic_and_week_dates(self, service):
+        now = datetime.now(timezone.utc)
+
+        def timestamp_for(i):
+            # All naive: the per-contact path cannot compare naive and
+            # aware timestamps of one contact.
+            moment = (now - timedelta(hours=(i * 13) % 2000)).replace(tzinfo=None)
+            if i % 5 == 0:
+                return moment.strftime("%Y%m%d")  # "20261001"
+            if i % 7 == 0:
+                year, week, _ = moment.isocalendar()
+                return f"{year}-W{week:02d}"  # "2026-W40"
+            if i % 11 == 0:
+                return moment.strftime("%Y%m%dT%H%M%S")
+            return moment.isoformat()
+
+        history = _large_history(timestamp_for)
+        assert service.score_contacts(history) == _per_contact(service, history)
+
+    def test_utc_micros_sends_other_forms_to_fromisoformat(self):
+        from app.services.network.temperature_scoring import _utc_micros, _utc_micros_slow
+
+        values = ["2026-10-01T10:00:00Z", "20261001", "2026-W40", "", None, "junk"]
+        micros, has_ts = _utc_micros(values)
+        slow_micros, slow_has_ts = _utc_micros_slow(values)
+
+        assert micros.tolist() == slow_micros.tolist()
+        assert has_ts.tolist() == slow_has_ts.tolist() == [True, True, True, False, False, False]
+
+    def test_contacts_without_timestamps(self, service):
+        history = _large_history(lambda i: "" if i % 120 < 10 else _ts(i % 50))
+        result = service.score_contacts(history)
+
+        assert result == _per_contact(service, history)
+        assert result[0].last_interaction == ""
+        assert result[0].factors["recency"] == 0.0
+
+    def test_falls_back_without_numpy(self, service):
+        history = _large_history(lambda i: _ts(i % 120))
+        with patch("app.services.network.temperature_scoring.np", None), \
+                patch.object(service, "_score_contacts_columnar") as columnar:
+            result = service.score_contacts(history)
+
+        columnar.assert_not_called()
+        assert len(result) == 120
@@ -7,15 +7,19 @@ import hashlib
 import hmac
 import json
 import time
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from app.services.transactional_email import (
+    EMAIL_BATCH_SIZE,
     TEMPLATES,
+    build_invitation_email,
     send_account_deletion_notice,
     send_briefing,
     send_email,
+    send_email_batch,
+    send_email_batches,
     send_welcome,
 )
 
@@ -95,6 +99,125 @@ class TestSendEmail:
         assert call_args["reply_to"] == "reply@example.com"
 
 
+# ---------------------------------------------------------------------------
+# Batch sending tests
+# ---------------------------------------------------------------------------
+
+
+def _messages(n):
+    return [
+        {"from": "a@b.c", "to": [f"user{i}@example.com"], "subject": "Hi", "html": "<p>Hi</p>"}
+        for i in range(n)
+    ]
+
+
+class TestSendEmailBatch:
+    """Test a single Resend batch request."""
+
+    @pytest.mark.asyncio
+    @patch("app.services.transactional_email.settings")
+    async def test_suppressed_when_api_key_not_set(self, mock_settings):
+        mock_settings.RESEND_API_KEY = ""
+
+        result = await send_email_batch(_messages(3))
+
+        assert result == [{"id": None, "suppressed": True}] * 3
+
+    @pytest.mark.asyncio
+    @patch("app.services.transactional_email.settings")
+    async def test_calls_resend_batch_api(self, mock_settings):
+        mock_settings.RESEND_API_KEY = "re_test"
+        mock_resend = MagicMock()
+        mock_resend.Batch.send.return_value = {"data": [{"id": "e1"}, {"id": "e2"}]}
+
+        with patch.dict("sys.modules", {"resend": mock_resend}):
+            result = await send_email_batch(_messages(2))
+
+        mock_resend.Batch.send.assert_called_once_with(_messages(2))
+        assert result == [{"id": "e1"}, {"id": "e2"}]
+
+    @pytest.mark.asyncio
+    async def test_rejects_oversized_batch(self):
+        with pytest.raises(ValueError, match="exceeds the limit"):
+            await send_email_batch(_messages(EMAIL_BATCH_SIZE + 1))
+
+
+class TestSendEmailBatches:
+    """Test bounded concurrent dispatch of many messages."""
+
+    @pytest.mark.asyncio
+    async def test_chunks_messages_and_reports_progress(self):
+        progress = []
+
+        async def _on_progress(sent, failed):
+            progress.append((sent, failed))
+
+        with patch(
+            "app.services.transactional_email.send_email_batch", new_callable=AsyncMock
+        ) as mock_batch:
+            result = await send_email_batches(_messages(250), on_progress=_on_progress)
+
+        assert [len(c.args[0]) for c in mock_batch.await_args_list] == [100, 100, 50]
+        assert result == {"sent": 250, "failed": []}
+        assert len(progress) == 3
+        assert progress[-1] == (250, 0)
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_recorded_per_recipient(self):
+        async def _batch(chunk):
+            if chunk[0]["to"] == ["user2@example.com"]:
+                raise RuntimeError("rate limited")
+            return [{"id": "x"}] * len(chunk)
+
+        with patch("app.services.transactional_email.send_email_batch", side_effect=_batch):
+            result = await send_email_batches(_messages(5), batch_size=2)
+
+        assert result["sent"] == 3
+        assert result["failed"] == [
+            {"email": "user2@example.com", "error": "rate limited"},
+            {"email": "user3@example.com", "error": "rate limited"},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self):
+        import asyncio
+
+        in_flight = 0
+        peak = 0
+
+        async def _batch(chunk):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+        with patch("app.services.transactional_email.send_email_batch", side_effect=_batch):
+            result = await send_email_batches(_messages(20), batch_size=1, concurrency=3)
+
+        assert result["sent"] == 20
+        assert peak == 3
+
+
+class TestBuildInvitationEmail:
+    """Test invitation rendering for batch dispatch."""
+
+    def test_renders_resend_params(self):
+        message = build_invitation_email(
+            to="bob@example.com",
+            admin_name="Acme",
+            company_name="Acme",
+            accept_url="https://app/accept",
+            decline_url="https://app/decline",
+            recipient_first_name="Bob",
+        )
+
+        assert message["to"] == ["bob@example.com"]
+        assert message["subject"] == "You have been invited to join Acme on JobPilot"
+        assert "Hi Bob" in message["html"]
+        assert "https://app/accept" in message["html"]
+
+
 # ---------------------------------------------------------------------------
 # Template helper tests
 # ---------------------------------------------------------------------------
@@ -1,14 +1,20 @@
 """Tests for Warm Path Finder Service (Story 9-2).
 
-Covers: analyze(), path types, strength scoring, suggested actions,
-graceful degradation, to_dict(), agent integration.
+Covers: analyze(), graph-derived path types, strength scoring and ranking,
+suggested actions (templated and LLM-phrased), graceful degradation,
+to_dict(), agent integration.
 """
 
 from unittest.mock import AsyncMock, patch
 
 import pytest
 
-from app.services.network.warm_path import WarmPath, WarmPathService
+from app.services.network.connection_graph import ConnectionGraph
+from app.services.network.warm_path import (
+    MAX_PATHS_PER_COMPANY,
+    WarmPath,
+    WarmPathService,
+)
 
 
 # ---------------------------------------------------------------------------
@@ -18,41 +24,26 @@ from app.services.network.warm_path import WarmPath, WarmPathService
 
 @pytest.fixture
 def service():
-    return WarmPathService()
-
-
-@pytest.fixture
-def mock_llm_response():
-    """Standard LLM response for warm path analysis."""
-    return {
-        "paths": [
-            {
-                "contact_name": "Alice Smith",
-                "path_type": "1st_degree",
-                "strength": "strong",
-                "relationship_context": "Worked together at TechCo for 3 years",
-                "suggested_action": "Reach out directly to Alice",
-                "mutual_connections": ["Bob Jones", "Carol Lee"],
-            },
-            {
-                "contact_name": "Dave Wilson",
-                "path_type": "alumni",
-                "strength": "medium",
-                "relationship_context": "Same university, graduated 2020",
-                "suggested_action": "Mention shared alma mater",
-                "mutual_connections": [],
-            },
-        ]
-    }
+    return WarmPathService(phrase_top_k=0)
 
 
 @pytest.fixture
 def connection_data():
     return {
+        "schools": ["MIT"],
         "contacts": [
-            {"name": "Alice Smith", "company": "Acme Corp"},
-            {"name": "Bob Jones", "company": "Other Co"},
-        ]
+            {
+                "name": "Alice Smith",
+                "company": "Acme Corp",
+                "relationship_context": "Worked together at TechCo",
+                "connections": [
+                    "Bob Jones",
+                    {"name": "Charlie Park", "company": "Acme"},
+                    {"name": "Eve Moss", "company": "Acme Inc.", "school": "MIT"},
+                ],
+            },
+            {"name": "Bob Jones", "company": "Other Co", "connections": ["Charlie Park"]},
+        ],
     }
 
 
@@ -63,15 +54,9 @@ def connection_data():
 
 class TestAnalyze:
     @pytest.mark.asyncio
-    async def test_returns_warm_path_list(
-        self, service, mock_llm_response, connection_data
-    ):
+    async def test_returns_warm_path_list(self, service, connection_data):
         """analyze() returns list of WarmPath objects."""
-        with patch("app.core.llm_clients.LLMClient") as MockClient:
-            instance = MockClient.return_value
-            instance.generate_json = AsyncMock(return_value=mock_llm_response)
-
-            result = await service.analyze(["Acme Corp"], connection_data)
+        result = await service.analyze(["Acme Corp"], connection_data)
 
         assert len(result) > 0
         assert all(isinstance(p, WarmPath) for p in result)
@@ -83,23 +68,41 @@ class TestAnalyze:
         assert result == []
 
     @pytest.mark.asyncio
-    async def test_multiple_companies_parallel(
-        self, service, mock_llm_response, connection_data
-    ):
-        """analyze() handles multiple companies via asyncio.gather."""
+    async def test_multiple_companies(self, service, connection_data):
+        """analyze() returns paths for every target company."""
+        result = await service.analyze(["Acme Corp", "Other Co"], connection_data)
+
+        companies = {p.company for p in result}
+        assert companies == {"Acme Corp", "Other Co"}
+
+    @pytest.mark.asyncio
+    async def test_no_llm_calls_per_company(self, service, connection_data):
+        """Paths are computed from the graph without calling the LLM."""
         with patch("app.core.llm_clients.LLMClient") as MockClient:
-            instance = MockClient.return_value
-            instance.generate_json = AsyncMock(return_value=mock_llm_response)
+            await service.analyze(["Acme", "Other Co", "Globex"], connection_data)
 
-            result = await service.analyze(
-                ["Acme Corp", "Globex Inc"], connection_data
-            )
+        MockClient.assert_not_called()
 
-        # Should have paths for both companies
-        assert len(result) >= 2
-        companies = {p.company for p in result}
-        assert "Acme Corp" in companies
-        assert "Globex Inc" in companies
+    @pytest.mark.asyncio
+    async def test_uses_given_graph(self, service, connection_data):
+        """A pre-loaded graph is used instead of the request payload."""
+        graph = ConnectionGraph.from_connection_data(connection_data)
+
+        result = await service.analyze(["Acme"], {}, graph=graph)
+
+        assert result[0].contact_name == "Alice Smith"
+
+    @pytest.mark.asyncio
+    async def test_paths_capped_per_company(self, service):
+        """At most MAX_PATHS_PER_COMPANY paths per company."""
+        data = {
+            "contacts": [
+                {"name": f"Person {i}", "company": "Acme"} for i in range(6)
+            ]
+        }
+        result = await service.analyze(["Acme"], data)
+
+        assert len(result) == MAX_PATHS_PER_COMPANY
 
 
 # ---------------------------------------------------------------------------
@@ -110,66 +113,38 @@ class TestAnalyze:
 class TestPathTypes:
     @pytest.mark.asyncio
     async def test_1st_degree_path(self, service, connection_data):
-        """1st_degree path type is correctly set."""
-        response = {
-            "paths": [
-                {
-                    "contact_name": "Alice",
-                    "path_type": "1st_degree",
-                    "relationship_context": "Direct connection",
-                    "mutual_connections": ["Bob"],
-                }
-            ]
-        }
-        with patch("app.core.llm_clients.LLMClient") as MockClient:
-            instance = MockClient.return_value
-            instance.generate_json = AsyncMock(return_value=response)
-
-            result = await service.analyze(["Acme"], connection_data)
+        """Direct connections at the company are 1st_degree."""
+        result = await service.analyze(["Acme"], connection_data)
 
-        assert result[0].path_type == "1st_degree"
+        alice = next(p for p in result if p.contact_name == "Alice Smith")
+        assert alice.path_type == "1st_degree"
+        assert alice.relationship_context == "Worked together at TechCo"
 
     @pytest.mark.asyncio
     async def test_2nd_degree_path(self, service, connection_data):
-        """2nd_degree path type is correctly set."""
-        response = {
-            "paths": [
-                {
-                    "contact_name": "Charlie",
-                    "path_type": "2nd_degree",
-                    "relationship_context": "Friend of friend",
-                    "mutual_connections": [],
-                }
-            ]
-        }
-        with patch("app.core.llm_clients.LLMClient") as MockClient:
-            instance = MockClient.return_value
-            instance.generate_json = AsyncMock(return_value=response)
+        """Connections of connections are 2nd_degree with their mutuals."""
+        result = await service.analyze(["Acme"], connection_data)
 
-            result = await service.analyze(["Acme"], connection_data)
-
-        assert result[0].path_type == "2nd_degree"
+        charlie = next(p for p in result if p.contact_name == "Charlie Park")
+        assert charlie.path_type == "2nd_degree"
+        assert charlie.mutual_connections == ["Alice Smith", "Bob Jones"]
 
     @pytest.mark.asyncio
     async def test_alumni_path(self, service, connection_data):
-        """alumni path type is correctly set."""
-        response = {
-            "paths": [
-                {
-                    "contact_name": "Eve",
-                    "path_type": "alumni",
-                    "relationship_context": "MIT alumni",
-                    "mutual_connections": [],
-                }
-            ]
-        }
-        with patch("app.core.llm_clients.LLMClient") as MockClient:
-            instance = MockClient.return_value
-            instance.generate_json = AsyncMock(return_value=response)
+        """People sharing one of the user's schools are alumni paths."""
+        result = await service.analyze(["Acme"], connection_data)
 
-            result = await service.analyze(["Acme"], connection_data)
+        eve = next(p for p in result if p.contact_name == "Eve Moss")
+        assert eve.path_type == "alumni"
+        assert "MIT" in eve.relationship_context
 
-        assert result[0].path_type == "alumni"
+    @pytest.mark.asyncio
+    async def test_strongest_path_first(self, service, connection_data):
+        """Paths are ranked by strength."""
+        result = await service.analyze(["Acme"], connection_data)
+
+        assert [p.contact_name for p in result] == ["Alice Smith", "Eve Moss", "Charlie Park"]
+        assert result[0].strength == "strong"
 
 
 # ---------------------------------------------------------------------------
@@ -231,18 +206,35 @@ class TestSuggestedActions:
         assert "intro" in action.lower() or "mutual" in action.lower()
 
     @pytest.mark.asyncio
-    async def test_suggested_actions_populated(
-        self, service, mock_llm_response, connection_data
-    ):
+    async def test_suggested_actions_populated(self, service, connection_data):
         """Warm paths have suggested_action set."""
+        result = await service.analyze(["Acme"], connection_data)
+
+        for path in result:
+            assert path.suggested_action != ""
+
+    @pytest.mark.asyncio
+    async def test_top_paths_phrased_in_one_call(self, connection_data):
+        """The LLM phrases actions for the top-k paths in a single call."""
+        service = WarmPathService(phrase_top_k=2)
+        response = {
+            "actions": [
+                {"index": 0, "suggested_action": "Ask Alice about the TechCo days"},
+                {"index": 1, "suggested_action": "Open with your MIT years"},
+                {"index": 7, "suggested_action": "out of range"},
+            ]
+        }
         with patch("app.core.llm_clients.LLMClient") as MockClient:
             instance = MockClient.return_value
-            instance.generate_json = AsyncMock(return_value=mock_llm_response)
+            instance.generate_json = AsyncMock(return_value=response)
 
-            result = await service.analyze(["Acme"], connection_data)
+            result = await service.analyze(["Acme", "Other Co"], connection_data)
 
-        for path in result:
-            assert path.suggested_action != ""
+        instance.generate_json.assert_awaited_once()
+        actions = {p.contact_name: p.suggested_action for p in result}
+        assert actions["Alice Smith"] == "Ask Alice about the TechCo days"
+        assert actions["Eve Moss"] == "Open with your MIT years"
+        assert "intro" in actions["Charlie Park"].lower()
 
 
 # ---------------------------------------------------------------------------
@@ -252,30 +244,32 @@ class TestSuggestedActions:
 
 class TestGracefulDegradation:
     @pytest.mark.asyncio
-    async def test_llm_failure_returns_partial(self, service, connection_data):
-        """When LLM fails, returns partial results."""
-        with patch("app.core.llm_clients.LLMClient") as MockClient:
-            instance = MockClient.return_value
-            instance.generate_json = AsyncMock(
-                side_effect=Exception("LLM down")
-            )
+    async def test_no_paths_returns_partial(self, service, connection_data):
+        """Companies without paths in the graph get a partial stub."""
+        result = await service.analyze(["Globex"], connection_data)
 
-            result = await service.analyze(["Acme"], connection_data)
+        assert len(result) == 1
+        assert result[0].data_quality == "partial"
+
+    @pytest.mark.asyncio
+    async def test_no_connection_data(self, service):
+        """Without any connection data every company is partial."""
+        result = await service.analyze(["Acme"], {})
 
-        assert len(result) > 0
         assert result[0].data_quality == "partial"
 
     @pytest.mark.asyncio
-    async def test_empty_llm_response(self, service, connection_data):
-        """When LLM returns empty, returns partial results."""
+    async def test_llm_failure_keeps_templated_actions(self, connection_data):
+        """When phrasing fails, the templated actions are kept."""
+        service = WarmPathService(phrase_top_k=3)
         with patch("app.core.llm_clients.LLMClient") as MockClient:
             instance = MockClient.return_value
-            instance.generate_json = AsyncMock(return_value={})
+            instance.generate_json = AsyncMock(side_effect=Exception("LLM down"))
 
             result = await service.analyze(["Acme"], connection_data)
 
-        assert len(result) > 0
-        assert result[0].data_quality == "partial"
+        assert result[0].data_quality == "complete"
+        assert "reach out directly" in result[0].suggested_action.lower()
 
 
 # ---------------------------------------------------------------------------
@@ -344,3 +338,47 @@ class TestAgentIntegration:
         assert len(result) == 1
         assert result[0]["contact_name"] == "Alice"
         instance.analyze.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_agent_merges_import_into_persisted_graph(self):
+        """With a user_id the agent updates and uses the persisted graph."""
+        from app.agents.core.network_agent import NetworkAgent
+
+        agent = NetworkAgent()
+        data = {"contacts": [{"name": "Alice", "company": "Acme"}]}
+        graph = ConnectionGraph.from_connection_data(data)
+
+        with patch(
+            "app.services.network.connection_graph.update_connection_graph",
+            new_callable=AsyncMock,
+            return_value=graph,
+        ) as mock_update, patch(
+            "app.services.network.warm_path.WarmPathService"
+        ) as MockService:
+            instance = MockService.return_value
+            instance.analyze = AsyncMock(return_value=[])
+
+            await agent._analyze_warm_paths(["Acme"], data, user_id="user-1")
+
+        mock_update.assert_awaited_once_with("user-1", data)
+        assert instance.analyze.await_args.kwargs["graph"] is graph
+
+    @pytest.mark.asyncio
+    async def test_agent_survives_graph_store_failure(self):
+        """If the graph cannot be loaded, paths come from the payload."""
+        from app.agents.core.network_agent import NetworkAgent
+
+        agent = NetworkAgent()
+        with patch(
+            "app.services.network.connection_graph.update_connection_graph",
+            new_callable=AsyncMock,
+            side_effect=RuntimeError("db down"),
+        ), patch(
+            "app.services.network.warm_path.WarmPathService"
+        ) as MockService:
+            instance = MockService.return_value
+            instance.analyze = AsyncMock(return_value=[])
+
+            await agent._analyze_warm_paths(["Acme"], {}, user_id="user-1")
+
+        assert instance.analyze.await_args.kwargs["graph"] is None
@@ -0,0 +1,29 @@
+-- Migration: 00005_briefing_digests.sql
+-- Description: Running per-user briefing digest maintained as agents complete
+-- Depends on: 00001_initial_schema.sql (users)
+-- Date: 2026-10-18
+
+-- ============================================================
+-- TABLE: briefing_digests
+-- ============================================================
+
+CREATE TABLE briefing_digests (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    user_id UUID NOT NULL UNIQUE REFERENCES users(id) ON DELETE CASCADE,
+    window_start TIMESTAMPTZ NOT NULL,
+    content JSONB NOT NULL DEFAULT '{}',
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- ============================================================
+-- ROW LEVEL SECURITY
+-- ============================================================
+
+ALTER TABLE briefing_digests ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY briefing_digests_owner_select ON briefing_digests FOR SELECT
+    USING (user_id = current_setting('app.current_user_id')::uuid);
+
+CREATE POLICY briefing_digests_service_role ON briefing_digests FOR ALL
+    USING (current_setting('role', true) = 'service_role');
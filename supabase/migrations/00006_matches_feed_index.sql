@@ -0,0 +1,13 @@
+-- Migration: 00006_matches_feed_index.sql
+-- Description: Composite index for the matches feed (status filter, score
+--              ordering and keyset cursor on (score DESC, id))
+-- Depends on: 00001_initial_schema.sql (matches)
+-- Date: 2026-10-18
+--
+-- Migrations run inside a transaction, so this is a plain CREATE INDEX
+-- (it blocks writes to matches while it builds). On a large production
+-- table, build it by hand first with CREATE INDEX CONCURRENTLY under the
+-- same name; the IF NOT EXISTS below then makes this a no-op.
+
+CREATE INDEX IF NOT EXISTS ix_matches_user_status_score_id
+    ON matches (user_id, status, score DESC, id);
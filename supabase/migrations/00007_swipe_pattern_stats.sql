@@ -0,0 +1,57 @@
+-- Migration: 00007_swipe_pattern_stats.sql
+-- Description: Per-user swipe counters by job attribute, maintained by upsert
+--              as swipes are recorded (replaces full swipe_events rescans in
+--              preference learning)
+-- Depends on: 00002_swipe_events_learned_preferences.sql (swipe_events)
+-- Date: 2026-10-18
+
+-- ============================================================
+-- TABLE: swipe_pattern_stats
+-- ============================================================
+
+CREATE TABLE swipe_pattern_stats (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    pattern_type TEXT NOT NULL,  -- 'company' | 'location' | 'remote' | 'employment_type'
+    pattern_value TEXT NOT NULL,
+    total INTEGER NOT NULL DEFAULT 0,
+    dismissed INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    CONSTRAINT uq_swipe_pattern_stat UNIQUE (user_id, pattern_type, pattern_value)
+);
+
+-- ============================================================
+-- BACKFILL from existing swipe events
+-- ============================================================
+
+INSERT INTO swipe_pattern_stats (user_id, pattern_type, pattern_value, total, dismissed)
+SELECT user_id, pattern_type, pattern_value,
+       COUNT(*),
+       COUNT(*) FILTER (WHERE action = 'dismissed')
+FROM (
+    SELECT user_id, action, 'company' AS pattern_type, job_company AS pattern_value
+        FROM swipe_events WHERE job_company IS NOT NULL AND job_company <> ''
+    UNION ALL
+    SELECT user_id, action, 'location', job_location
+        FROM swipe_events WHERE job_location IS NOT NULL AND job_location <> ''
+    UNION ALL
+    SELECT user_id, action, 'remote', lower(job_remote::text)
+        FROM swipe_events WHERE job_remote IS NOT NULL
+    UNION ALL
+    SELECT user_id, action, 'employment_type', job_employment_type
+        FROM swipe_events WHERE job_employment_type IS NOT NULL AND job_employment_type <> ''
+) AS attrs
+GROUP BY user_id, pattern_type, pattern_value;
+
+-- ============================================================
+-- ROW LEVEL SECURITY
+-- ============================================================
+
+ALTER TABLE swipe_pattern_stats ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY swipe_pattern_stats_owner_select ON swipe_pattern_stats FOR SELECT
+    USING (user_id = current_setting('app.current_user_id')::uuid);
+
+CREATE POLICY swipe_pattern_stats_service_role ON swipe_pattern_stats FOR ALL
+    USING (current_setting('role', true) = 'service_role');
@@ -0,0 +1,31 @@
+-- Migration: 00008_network_graphs.sql
+-- Description: Per-user connection graph (nodes, edges, schools) merged
+--              incrementally on each connection import; warm paths are
+--              computed from it instead of per-company LLM calls
+-- Depends on: 00001_initial_schema.sql (users)
+-- Date: 2026-10-18
+
+-- ============================================================
+-- TABLE: network_graphs
+-- ============================================================
+
+CREATE TABLE network_graphs (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    user_id UUID NOT NULL UNIQUE REFERENCES users(id) ON DELETE CASCADE,
+    graph JSONB NOT NULL DEFAULT '{}',
+    node_count INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- ============================================================
+-- ROW LEVEL SECURITY
+-- ============================================================
+
+ALTER TABLE network_graphs ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY network_graphs_owner_select ON network_graphs FOR SELECT
+    USING (user_id = current_setting('app.current_user_id')::uuid);
+
+CREATE POLICY network_graphs_service_role ON network_graphs FOR ALL
+    USING (current_setting('role', true) = 'service_role');
@@ -0,0 +1,10 @@
+-- Migration: 00009_email_sync_cursor.sql
+-- Description: Per-connection incremental sync cursor (Gmail historyId) so
+--              email scans fetch only messages added since the last scan
+-- Depends on: 00002_pipeline_tables.sql (email_connections)
+-- Date: 2026-10-18
+
+ALTER TABLE email_connections ADD COLUMN sync_cursor TEXT;
+
+COMMENT ON COLUMN email_connections.sync_cursor IS
+    'Provider sync cursor (Gmail historyId); NULL forces a full sync';
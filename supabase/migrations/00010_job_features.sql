@@ -0,0 +1,15 @@
+-- Migration: 00010_job_features.sql
+-- Description: Per-job scoring features (seniority levels, description
+--              keywords, best salary, remote flag) computed once at upsert
+--              so job scoring does not re-scan descriptions per user
+-- Depends on: 00001_initial_schema.sql (jobs)
+-- Date: 2026-10-18
+
+ALTER TABLE jobs ADD COLUMN features JSONB;
+
+-- Existing rows are filled in by the backfill_job_features task (the
+-- features are derived in Python, not SQL). It runs daily, so it also
+-- re-derives every job after a FEATURES_VERSION bump.
+
+COMMENT ON COLUMN jobs.features IS
+    'Scoring features from app.services.job_features; NULL or an old version is backfilled by backfill_job_features';
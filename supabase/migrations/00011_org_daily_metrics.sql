@@ -0,0 +1,125 @@
+-- Migration: 00011_org_daily_metrics.sql
+-- Description: Per-(org, day) outcome counters maintained by the nightly and
+--              incremental rollup tasks (replaces raw applications /
+--              agent_activities scans in enterprise metrics and ROI reports),
+--              plus the trigger-fed log of buckets applications moved out of
+-- Depends on: 00002_enterprise_admin.sql (organizations, organization_members),
+--             00001_initial_schema.sql (applications), agent_activities
+-- Date: 2026-10-18
+
+-- ============================================================
+-- TABLE: org_daily_metrics
+-- ============================================================
+
+CREATE TABLE org_daily_metrics (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    org_id UUID NOT NULL REFERENCES organizations(id) ON DELETE CASCADE,
+    day DATE NOT NULL,  -- UTC day of applications.applied_at / agent_activities.created_at
+    applications INTEGER NOT NULL DEFAULT 0,
+    interviews INTEGER NOT NULL DEFAULT 0,  -- status 'interview' or 'offer'
+    placements INTEGER NOT NULL DEFAULT 0,  -- status 'offer'
+    placement_days_sum DOUBLE PRECISION NOT NULL DEFAULT 0,  -- enrollment -> offer, days
+    jobs_reviewed INTEGER NOT NULL DEFAULT 0,
+    active_user_ids UUID[] NOT NULL DEFAULT '{}',
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    CONSTRAINT uq_org_daily_metric UNIQUE (org_id, day)
+);
+
+-- Incremental refresh scans recently changed applications and re-aggregates
+-- single (member, day) ranges.
+CREATE INDEX IF NOT EXISTS idx_applications_updated_at ON applications (updated_at);
+CREATE INDEX IF NOT EXISTS idx_applications_user_applied ON applications (user_id, applied_at);
+
+-- ============================================================
+-- TABLE: application_day_changes
+-- ============================================================
+
+-- The (user, UTC day) an application left when its applied_at or user_id
+-- changed or it was deleted. The row itself now points elsewhere (or is
+-- gone), so the incremental refresh reads the old bucket from here; the
+-- nightly rebuild prunes it.
+CREATE TABLE application_day_changes (
+    id BIGSERIAL PRIMARY KEY,
+    user_id UUID NOT NULL,
+    day DATE NOT NULL,
+    changed_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX idx_application_day_changes_changed_at
+    ON application_day_changes (changed_at);
+
+CREATE OR REPLACE FUNCTION mark_application_day_changed()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'DELETE'
+        OR NEW.user_id IS DISTINCT FROM OLD.user_id
+        OR (NEW.applied_at AT TIME ZONE 'UTC')::date
+            IS DISTINCT FROM (OLD.applied_at AT TIME ZONE 'UTC')::date
+    THEN
+        INSERT INTO application_day_changes (user_id, day)
+        VALUES (OLD.user_id, (OLD.applied_at AT TIME ZONE 'UTC')::date);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER applications_mark_day_changed
+    AFTER UPDATE OF applied_at, user_id OR DELETE ON applications
+    FOR EACH ROW
+    EXECUTE FUNCTION mark_application_day_changed();
+
+-- ============================================================
+-- BACKFILL from existing applications and review activity
+-- ============================================================
+
+INSERT INTO org_daily_metrics (
+    org_id, day, applications, interviews, placements,
+    placement_days_sum, active_user_ids, jobs_reviewed
+)
+WITH app_days AS (
+    SELECT om.org_id,
+           (a.applied_at AT TIME ZONE 'UTC')::date AS day,
+           COUNT(*) AS applications,
+           COUNT(*) FILTER (WHERE a.status IN ('interview', 'offer')) AS interviews,
+           COUNT(*) FILTER (WHERE a.status = 'offer') AS placements,
+           COALESCE(SUM(
+               EXTRACT(EPOCH FROM a.updated_at) - EXTRACT(EPOCH FROM om.created_at)
+           ) FILTER (WHERE a.status = 'offer'), 0) / 86400.0 AS placement_days_sum,
+           array_agg(DISTINCT a.user_id) AS active_user_ids
+    FROM applications a
+    JOIN organization_members om ON om.user_id = a.user_id
+    GROUP BY 1, 2
+),
+review_days AS (
+    SELECT om.org_id,
+           (aa.created_at AT TIME ZONE 'UTC')::date AS day,
+           COUNT(*) AS jobs_reviewed
+    FROM agent_activities aa
+    JOIN organization_members om ON om.user_id = aa.user_id
+    WHERE aa.event_type = 'job_review'
+    GROUP BY 1, 2
+)
+SELECT org_id, day,
+       COALESCE(a.applications, 0), COALESCE(a.interviews, 0),
+       COALESCE(a.placements, 0), COALESCE(a.placement_days_sum, 0),
+       COALESCE(a.active_user_ids, '{}'), COALESCE(r.jobs_reviewed, 0)
+FROM app_days a
+FULL JOIN review_days r USING (org_id, day);
+
+-- ============================================================
+-- ROW LEVEL SECURITY
+-- ============================================================
+
+-- Service role only: active_user_ids lists which members applied on each
+-- day, so admins read the rollup through the metrics services, which only
+-- return aggregates.
+ALTER TABLE org_daily_metrics ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY org_daily_metrics_service_role ON org_daily_metrics FOR ALL
+    USING (current_setting('role', true) = 'service_role');
+
+ALTER TABLE application_day_changes ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY application_day_changes_service_role ON application_day_changes FOR ALL
+    USING (current_setting('role', true) = 'service_role');
@@ -0,0 +1,32 @@
+-- Migration: 00012_ats_analysis.sql
+-- Description: Local ATS keyword scoring -- the jobs-corpus IDF snapshot
+--              rebuilt nightly, and the per-document cached analysis
+--              (replaces the LLM-reported ats_score in documents.content)
+-- Depends on: 00001_initial_schema.sql (documents, jobs)
+-- Date: 2026-10-18
+
+-- ============================================================
+-- TABLE: ats_idf_snapshots
+-- ============================================================
+
+CREATE TABLE ats_idf_snapshots (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    corpus_size INTEGER NOT NULL,  -- jobs counted
+    doc_freq JSONB NOT NULL,  -- term -> number of jobs containing it
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+ALTER TABLE ats_idf_snapshots ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY ats_idf_snapshots_service_role ON ats_idf_snapshots FOR ALL
+    USING (current_setting('role', true) = 'service_role');
+
+-- ============================================================
+-- COLUMN: documents.ats_analysis
+-- ============================================================
+
+ALTER TABLE documents ADD COLUMN ats_analysis JSONB;
+
+COMMENT ON COLUMN documents.ats_analysis IS
+    'Cached analysis from app.services.ats_scoring; NULL or an old version is recomputed on read';
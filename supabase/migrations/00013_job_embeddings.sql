@@ -0,0 +1,37 @@
+-- Migration: 00013_job_embeddings.sql
+-- Description: Cached job embeddings for the semantic pre-ranking stage of
+--              the job scout, keyed by job and embedding model, with an
+--              HNSW index per model for nearest-neighbour queries
+-- Depends on: 00001_initial_schema.sql (jobs)
+-- Date: 2026-10-18
+
+CREATE EXTENSION IF NOT EXISTS vector;
+
+-- ============================================================
+-- TABLE: job_embeddings
+-- ============================================================
+
+CREATE TABLE job_embeddings (
+    job_id UUID NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,
+    model TEXT NOT NULL,  -- Embedder name, e.g. 'hashing-512'
+    content_hash TEXT NOT NULL,  -- Hash of the embedded text; re-embedded on change
+    embedding vector NOT NULL,  -- L2-normalised; dimension depends on model
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (job_id, model)
+);
+
+-- One HNSW index per model, over the column cast to that model's
+-- dimension; queries must repeat the cast and the model literal.
+CREATE INDEX idx_job_embeddings_hashing_512 ON job_embeddings
+    USING hnsw ((embedding::vector(512)) vector_cosine_ops)
+    WHERE model = 'hashing-512';
+
+CREATE INDEX idx_job_embeddings_openai_small ON job_embeddings
+    USING hnsw ((embedding::vector(1536)) vector_cosine_ops)
+    WHERE model = 'text-embedding-3-small';
+
+ALTER TABLE job_embeddings ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY job_embeddings_service_role ON job_embeddings FOR ALL
+    USING (current_setting('role', true) = 'service_role');
@@ -0,0 +1,23 @@
+-- Migration: 00014_matches_user_job_unique.sql
+-- Description: One match per (user, job). Scout runs and reverse-matching
+--              fan-outs insert with ON CONFLICT DO NOTHING on this key
+--              instead of checking for existing rows first
+-- Depends on: 00001_initial_schema.sql (matches)
+-- Date: 2026-10-18
+
+-- Keep one row per pair: the one the user already acted on, else the oldest.
+-- Swipe events of the removed duplicates cascade with them.
+DELETE FROM matches
+WHERE id IN (
+    SELECT id FROM (
+        SELECT id, ROW_NUMBER() OVER (
+            PARTITION BY user_id, job_id
+            ORDER BY (status = 'new'), created_at, id
+        ) AS rn
+        FROM matches
+    ) ranked
+    WHERE rn > 1
+);
+
+ALTER TABLE matches
+    ADD CONSTRAINT uq_matches_user_job UNIQUE (user_id, job_id);